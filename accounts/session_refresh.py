@@ -0,0 +1,149 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+from django.db import close_old_connections
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from supabase_client import SUPABASE_URL, SUPABASE_ANON_KEY
+import base64
+import hashlib
+import httpx
+import json
+import threading
+import time
+
+
+def token_expires_at(access_token):
+    """
+    Returns the `exp` claim (Unix time) of a Supabase access token, or None.
+
+    The JWT is only decoded, not verified: the value just decides when to
+    refresh, and Supabase still verifies the token on every use.
+    """
+    try:
+        payload = access_token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class SessionRefresher:
+    """
+    Renews Supabase sessions shortly before their access token expires.
+
+    The auth middleware calls schedule() when a request arrives with a token
+    that expires within `margin` seconds. The refresh_token grant then runs on
+    a small thread pool after the request has moved on, and the new tokens are
+    written straight to the session store, so no user request waits for the
+    refresh or the session write. A refresh is single-flight per session:
+    concurrent tabs (which share the session) schedule it once per process,
+    and a lock in the shared cache ('shared', when configured) stops other
+    workers from repeating it. Requests whose token has already expired still
+    refresh inline in the middleware. A request that itself writes to the
+    session while a refresh runs would save its older copy of the tokens, so
+    the middleware calls keep_refreshed_tokens() before the session is saved.
+    """
+    def __init__(self, margin=300, max_workers=2, lock_timeout=30):
+        self.margin = margin
+        self.lock_timeout = lock_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='session-refresh')
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def due(self, access_token):
+        """True if the token is still valid but expires within the margin."""
+        expires_at = token_expires_at(access_token)
+        if expires_at is None:
+            return False
+        return 0 < expires_at - time.time() <= self.margin
+
+    def schedule(self, session_key, refresh_token):
+        """Queues a refresh of the session unless one is already running; returns True if queued."""
+        if not session_key:
+            return False
+        with self._lock:
+            if session_key in self._in_flight:
+                return False
+            self._in_flight.add(session_key)
+        self._executor.submit(self._run, session_key, refresh_token)
+        return True
+
+    def _shared_lock(self, session_key):
+        """Takes the cross-process refresh lock for the session; True if this process got it."""
+        try:
+            cache = caches['shared']
+        except InvalidCacheBackendError:
+            return True
+        key = 'session-refresh:' + hashlib.sha256(session_key.encode()).hexdigest()[:32]
+        try:
+            return cache.add(key, 1, self.lock_timeout)
+        except Exception:
+            return True  # A cache outage shouldn't stop refreshes
+
+    def _run(self, session_key, refresh_token):
+        try:
+            if self._shared_lock(session_key):
+                self.refresh(session_key, refresh_token)
+        except Exception as e:
+            print(f"Error refreshing Supabase session in the background: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(session_key)
+            close_old_connections()
+
+    def keep_refreshed_tokens(self, session):
+        """
+        Merges tokens a background refresh stored into a session about to be saved.
+
+        A request loads the whole session, so if it changes anything and saves
+        after a refresh finished, it writes back the rotated (now revoked)
+        refresh token and the user is logged out. Re-reads the stored session
+        and copies just its token fields over the request's stale ones.
+        Callers skip requests that set the tokens themselves (login, an inline
+        refresh). Returns True if the tokens were replaced.
+        """
+        refresh_token = session.get('supa_refresh_token')
+        if not self.margin or not session.modified or not refresh_token or not session.session_key:
+            return False
+        stored = import_module(settings.SESSION_ENGINE).SessionStore(session.session_key)
+        stored_refresh_token = stored.get('supa_refresh_token')
+        if not stored_refresh_token or stored_refresh_token == refresh_token:
+            return False
+        session['supa_access_token'] = stored.get('supa_access_token')
+        session['supa_refresh_token'] = stored_refresh_token
+        return True
+
+    def refresh(self, session_key, refresh_token):
+        """
+        Exchanges `refresh_token` for a new session and stores the new tokens
+        in the Django session `session_key`. Returns True if it was updated.
+        """
+        session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+        if session.get('supa_refresh_token') != refresh_token:
+            return False  # Already refreshed elsewhere, or the user logged out
+
+        response = httpx.post(
+            f"{SUPABASE_URL}/auth/v1/token",
+            params={'grant_type': 'refresh_token'},
+            json={'refresh_token': refresh_token},
+            headers={'apikey': SUPABASE_ANON_KEY},
+            timeout=10,
+        )
+        response.raise_for_status()
+        tokens = response.json()
+
+        # Re-read right before writing to keep the window for lost updates small
+        session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+        if session.get('supa_refresh_token') != refresh_token:
+            return False
+        session['supa_access_token'] = tokens['access_token']
+        session['supa_refresh_token'] = tokens['refresh_token']
+        session.save()
+        return True
+
+
+session_refresher = SessionRefresher(
+    margin=getattr(settings, 'SUPABASE_SESSION_REFRESH_MARGIN', 300),
+    max_workers=getattr(settings, 'SUPABASE_SESSION_REFRESH_WORKERS', 2),
+)
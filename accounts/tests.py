@@ -1,3 +1,161 @@
-from django.test import TestCase
+from importlib import import_module
 
-# Create your tests here.
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from accounts.session_refresh import session_refresher
+from supabase_auth_middleware import SupabaseAuthMiddleware
+
+from supabase_client import supabase
+from supabase_fake import fake_supabase, user_id_for
+
+AJAX = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+
+class RegisterTests(TestCase):
+    def setUp(self):
+        fake_supabase.reset()
+
+    def register(self, **fields):
+        data = {
+            'email': 'new.student@cit.edu', 'password1': 'Secret@123', 'password2': 'Secret@123',
+            'full_name': 'New Student', 'student_id': '22-0002-002',
+            'phone_number': '+63 912 345 6789', 'address': 'Street, Barangay, City, Province',
+            **fields,
+        }
+        return self.client.post(reverse('register'), data, **AJAX)
+
+    def test_register_creates_the_user_and_profile(self):
+        response = self.register()
+        self.assertTrue(response.json()['success'])
+        user = fake_supabase.user_by_email('new.student@cit.edu')
+        self.assertEqual(user['user_metadata']['user_type'], 'student')
+        profile = next(p for p in fake_supabase.tables['user_profiles'] if p['user_id'] == user['id'])
+        self.assertEqual(profile['full_name'], 'New Student')
+
+    def test_register_rejects_a_taken_email(self):
+        response = self.register(email='student@cit.edu')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], ['This email is already registered.'])
+
+    def test_register_validates_the_form(self):
+        response = self.register(email='someone@gmail.com', password2='Different@123')
+        errors = response.json()['errors']
+        self.assertIn('Only CIT institutional email addresses (@cit.edu) are allowed.', errors)
+        self.assertIn('Passwords do not match.', errors)
+        self.assertIsNone(fake_supabase.user_by_email('someone@gmail.com'))
+
+
+class LoginTests(TestCase):
+    def setUp(self):
+        fake_supabase.reset()
+
+    def login(self, email, password, user_type):
+        return self.client.post(reverse('login'), {'email': email, 'password': password, 'user_type': user_type}, **AJAX)
+
+    def test_student_login(self):
+        response = self.login('student@cit.edu', 'Student@123', 'student')
+        self.assertEqual(response.json()['redirect_url'], reverse('student_dashboard'))
+        self.assertIn('supa_access_token', self.client.session)
+        self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 200)
+
+    def test_admin_login(self):
+        response = self.login('admin@cit.edu', 'Admin@123', 'admin')
+        self.assertEqual(response.json()['redirect_url'], reverse('admin_dashboard'))
+
+    def test_wrong_password(self):
+        response = self.login('student@cit.edu', 'Wrong@123', 'student')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['error'], 'Invalid email or password.')
+        self.assertNotIn('supa_access_token', self.client.session)
+
+    def test_wrong_login_option(self):
+        response = self.login('student@cit.edu', 'Student@123', 'admin')
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn('supa_access_token', self.client.session)
+
+    def test_blocked_student(self):
+        fake_supabase.users[user_id_for('student@cit.edu')]['user_metadata']['is_blocked'] = True
+        response = self.login('student@cit.edu', 'Student@123', 'student')
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('blocked', response.json()['error'])
+
+    def test_logout_clears_the_session(self):
+        self.login('student@cit.edu', 'Student@123', 'student')
+        response = self.client.get(reverse('logout'))
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+        self.assertNotIn('supa_access_token', self.client.session)
+        self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 302)
+
+    def test_logout_only_revokes_the_requests_own_session(self):
+        self.login('student@cit.edu', 'Student@123', 'student')
+        student_token = self.client.session['supa_access_token']
+        # The admin signs in last, so the shared client now holds the admin's session
+        admin_client = Client()
+        admin_client.post(reverse('login'), {'email': 'admin@cit.edu', 'password': 'Admin@123', 'user_type': 'admin'}, **AJAX)
+        admin_token = admin_client.session['supa_access_token']
+
+        self.client.get(reverse('logout'))
+
+        with self.assertRaises(Exception):
+            supabase.auth.get_user(student_token)
+        self.assertEqual(supabase.auth.get_user(admin_token).user.email, 'admin@cit.edu')
+        self.assertEqual(admin_client.get(reverse('admin_dashboard')).status_code, 200)
+
+
+class PasswordResetTests(TestCase):
+    def setUp(self):
+        fake_supabase.reset()
+
+    def test_forgot_password_then_otp_then_reset(self):
+        email = 'student@cit.edu'
+        response = self.client.post(reverse('forgot_password'), {'email': email}, **AJAX)
+        self.assertEqual(response.json()['redirect_url'], reverse('verify_otp', kwargs={'email': email}))
+
+        response = self.client.post(reverse('verify_otp', kwargs={'email': email}), {'otp': fake_supabase.otp_code}, **AJAX)
+        self.assertEqual(response.json()['redirect_url'], reverse('reset_password'))
+
+        response = self.client.post(reverse('reset_password'), {'password1': 'Changed@123', 'password2': 'Changed@123'}, **AJAX)
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(fake_supabase.user_by_email(email)['password'], 'Changed@123')
+
+    def test_wrong_otp(self):
+        response = self.client.post(reverse('verify_otp', kwargs={'email': 'student@cit.edu'}), {'otp': '000000'}, **AJAX)
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn('supa_access_token', self.client.session)
+
+    def test_forgot_password_does_not_reveal_unknown_emails(self):
+        response = self.client.post(reverse('forgot_password'), {'email': 'nobody@cit.edu'}, **AJAX)
+        self.assertTrue(response.json()['success'])
+
+    def test_reset_requires_a_verified_otp(self):
+        response = self.client.post(reverse('reset_password'), {'password1': 'Changed@123', 'password2': 'Changed@123'})
+        self.assertRedirects(response, reverse('forgot_password'), fetch_redirect_response=False)
+
+
+class BackgroundSessionRefreshTests(TestCase):
+    def setUp(self):
+        fake_supabase.reset()
+        fake_supabase.sign_in(self.client, 'student@cit.edu')
+        self.session_key = self.client.session.session_key
+        self.refresh_token = self.client.session['supa_refresh_token']
+
+    def stored_session(self):
+        return import_module(settings.SESSION_ENGINE).SessionStore(self.session_key)
+
+    def test_request_saving_its_session_keeps_the_refreshed_tokens(self):
+        request = RequestFactory().get(reverse('student_dashboard'))
+        request.session = self.stored_session()
+        request.session['last_page'] = 'dashboard'  # Loads the current tokens
+        # The background refresh finishes while the request is still running
+        self.assertTrue(session_refresher.refresh(self.session_key, self.refresh_token))
+
+        SupabaseAuthMiddleware(lambda request: HttpResponse()).process_response(request, HttpResponse())
+        request.session.save()  # As SessionMiddleware does after the response
+
+        stored = self.stored_session()
+        self.assertNotEqual(stored['supa_refresh_token'], self.refresh_token)
+        self.assertEqual(stored['last_page'], 'dashboard')
+        self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 200)
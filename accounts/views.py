@@ -4,7 +4,7 @@ Supabase-based authentication views for CIT Shop
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.views.decorators.http import require_http_methods
-from supabase_client import supabase
+from supabase_client import supabase, supabase_service
 import re
 from django.http import JsonResponse
 from django.urls import reverse
@@ -161,7 +161,7 @@ def login_view(request):
                 is_blocked = user_metadata.get('is_blocked', False)
 
                 if is_blocked:
-                    supabase.auth.sign_out() # Sign them out of Supabase immediately
+                    supabase.auth.admin.sign_out(response.session.access_token) # Sign them out of Supabase immediately
                     error_msg = "You are currently blocked. Please visit the Custodian Department to resolve this issue."
                     
                     if is_ajax:
@@ -192,7 +192,7 @@ def login_view(request):
                         return redirect(redirect_url)
                 else:
                     # ERROR: Role mismatch
-                    supabase.auth.sign_out() # Invalidate session
+                    supabase.auth.admin.sign_out(response.session.access_token) # Invalidate session
                     error_msg = f"Access restricted. Please use the '{actual_user_type.capitalize()}' login option."
                     if is_ajax:
                         return JsonResponse({'success': False, 'error': error_msg}, status=403) # 403 Forbidden
@@ -233,8 +233,10 @@ def login_view(request):
 def logout_view(request):
     """Logout user from Supabase and clear the Django session."""
     try:
-        # Sign out from Supabase
-        supabase.auth.sign_out()
+        # Sign out this request's own session; the shared client may hold another user's
+        access_token = request.session.get('supa_access_token')
+        if access_token:
+            supabase.auth.admin.sign_out(access_token)
     except:
         pass
     
@@ -410,8 +412,9 @@ def reset_password(request):
             return render(request, 'registration/reset_password.html')
         
         try:
-            # Update password in Supabase
-            supabase.auth.update_user({'password': password1})
+            # Update the password of the user who verified the OTP (not the shared client's session)
+            user = supabase.auth.get_user(request.session['supa_access_token']).user
+            supabase_service.auth.admin.update_user_by_id(user.id, {'password': password1})
             
             # Clear session
             if 'reset_email' in request.session: del request.session['reset_email']
@@ -5,5 +5,7 @@ set -o errexit
 pip install --upgrade pip
 pip install -r requirements.txt
 
+python manage.py build_icon_font
 python manage.py collectstatic --noinput
+python manage.py migrate --database=mirror
 
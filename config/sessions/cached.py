@@ -0,0 +1,127 @@
+"""
+Cache-first session engine with write-behind to the database.
+
+SESSION_ENGINE = 'config.sessions.cached' (SESSION_STORE=cache in settings).
+"""
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.db import close_old_connections
+import atexit
+import threading
+
+
+class _WriteBehind:
+    """
+    Writes session rows to the database on a background thread.
+
+    Pending writes are keyed by session key, so a burst of saves to one
+    session (a token refresh racing a page load) becomes one UPDATE with the
+    latest data.
+    """
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def put(self, obj):
+        with self._lock:
+            self._pending[obj.session_key] = obj
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='session-write-behind', daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def get(self, session_key):
+        with self._lock:
+            return self._pending.get(session_key)
+
+    def discard(self, session_key):
+        with self._lock:
+            self._pending.pop(session_key, None)
+
+    def flush(self):
+        """Writes every pending session row; returns how many were written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        written = 0
+        for obj in pending.values():
+            try:
+                # The row exists: new sessions are created synchronously
+                if obj.__class__.objects.filter(session_key=obj.session_key).update(
+                    session_data=obj.session_data, expire_date=obj.expire_date,
+                ):
+                    written += 1
+            except Exception as e:
+                print(f"Error writing session {obj.session_key[:8]}... to the database: {e}")
+        return written
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            close_old_connections()
+            self.flush()
+
+
+write_behind = _WriteBehind()
+atexit.register(write_behind.flush)
+
+
+class SessionStore(CachedDBStore):
+    """
+    Like Django's cached_db engine, but updates don't wait for the database.
+
+    Sessions are read from SESSION_CACHE_ALIAS, so a request with a warm
+    cache entry makes no database query. Saving updates the cache at once and
+    hands the database write to a background thread. New sessions (at login)
+    are inserted synchronously, because the insert is what guarantees the key
+    is unique, and so are sessions missing from the cache or whose cache
+    write fails, so the database never misses data. With several workers, use
+    the shared cache tier so they all see each other's updates.
+    """
+    def load(self):
+        pending = write_behind.get(self.session_key) if self.session_key else None
+        if pending is not None:
+            return self.decode(pending.session_data)
+        return super().load()
+
+    def save(self, must_create=False):
+        if self.session_key is None or must_create:
+            return super().save(must_create)
+        obj = self.create_model_instance(self._get_session())
+        try:
+            # A missing entry may mean the session was deleted (logged out in
+            # another tab); the inline save raises UpdateError in that case.
+            cached = self.cache_key in self._cache
+            if cached:
+                self._cache.set(self.cache_key, self._session, self.get_expiry_age())
+        except Exception as e:
+            print(f"Error saving session to the cache, writing it to the database instead: {e}")
+            cached = False
+        if not cached:
+            return super().save(must_create)
+        write_behind.put(obj)
+
+    async def asave(self, must_create=False):
+        if self.session_key is None or must_create:
+            return await super().asave(must_create)
+        obj = await self.acreate_model_instance(self._get_session())
+        try:
+            cache_key = await self.acache_key()
+            cached = await self._cache.aget(cache_key) is not None
+            if cached:
+                await self._cache.aset(cache_key, self._session, await self.aget_expiry_age())
+        except Exception as e:
+            print(f"Error saving session to the cache, writing it to the database instead: {e}")
+            cached = False
+        if not cached:
+            return await super().asave(must_create)
+        write_behind.put(obj)
+
+    def delete(self, session_key=None):
+        write_behind.discard(session_key or self.session_key)
+        super().delete(session_key)
+
+    async def adelete(self, session_key=None):
+        write_behind.discard(session_key or self.session_key)
+        await super().adelete(session_key)
@@ -0,0 +1,51 @@
+"""
+Encrypted, signed cookie session engine.
+
+SESSION_ENGINE = 'config.sessions.encrypted_cookies' (SESSION_STORE=cookie in settings).
+"""
+from django.conf import settings
+from django.contrib.sessions.backends.signed_cookies import SessionStore as SignedCookieStore
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from django.core import signing
+import base64
+import functools
+import hashlib
+
+SALT = 'django.contrib.sessions.backends.signed_cookies'
+
+
+@functools.cache
+def _fernet():
+    """Fernet keys derived from SECRET_KEY, then SECRET_KEY_FALLBACKS so rotating the key doesn't log everyone out."""
+    secrets = [settings.SECRET_KEY, *getattr(settings, 'SECRET_KEY_FALLBACKS', [])]
+    return MultiFernet([
+        Fernet(base64.urlsafe_b64encode(hashlib.sha256(f'session-cookie-encryption:{secret}'.encode()).digest()))
+        for secret in secrets
+    ])
+
+
+class SessionStore(SignedCookieStore):
+    """
+    Django's signed cookie sessions, encrypted.
+
+    The whole session lives in the cookie, so reading it needs no database or
+    cache lookup at all. The signed payload is additionally encrypted, so the
+    Supabase tokens inside it can't be read from the browser or the logs; the
+    signature still rejects any tampered cookie, and Supabase verifies the
+    tokens on use. The cookie is about 2-3 KB with a session's tokens.
+    """
+    def load(self):
+        try:
+            return signing.loads(
+                _fernet().decrypt(self.session_key.encode()).decode(),
+                serializer=self.serializer,
+                max_age=self.get_session_cookie_age(),
+                salt=SALT,
+            )
+        except (AttributeError, InvalidToken, UnicodeError, signing.BadSignature, ValueError):
+            # Reset the session, like the signed cookie engine does
+            self.create()
+        return {}
+
+    def _get_session_key(self):
+        return _fernet().encrypt(super()._get_session_key().encode()).decode()
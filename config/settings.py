@@ -4,6 +4,7 @@ Django settings for config project.
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 import dj_database_url
 
@@ -27,6 +28,9 @@ DEBUG = os.environ.get('DEBUG', 'False') == 'True'
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.environ.get('DEBUG', 'False') == 'True'
 
+# `manage.py test` runs on SQLite against the in-memory Supabase fake (see SUPABASE CONFIGURATION)
+TESTING = sys.argv[1:2] == ['test']
+
 ALLOWED_HOSTS = []
 
 # Configure allowed hosts for Render deployment
@@ -69,6 +73,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'dashboards.supabase_calls.SupabaseCallAccountingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -78,6 +83,22 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Paths served without Supabase authentication (request.user is always
+# AnonymousUser there). Regexes matched against the path without its leading
+# slash, like SECURE_REDIRECT_EXEMPT. Everything else authenticates lazily,
+# on the first read of request.user.
+SUPABASE_AUTH_PUBLIC_PATHS = [
+    r'^$',  # root redirect to the login page
+    r'^accounts/(register|login|logout|forgot-password|verify-otp|reset-password)/',
+    r'^static/',
+    r'^media/',
+]
+
+# Access tokens expiring within this many seconds are renewed in the background
+# (accounts.session_refresh), so users rarely hit an inline refresh.
+SUPABASE_SESSION_REFRESH_MARGIN = int(os.environ.get('SUPABASE_SESSION_REFRESH_MARGIN', '300'))
+SUPABASE_SESSION_REFRESH_WORKERS = 2
+
 ROOT_URLCONF = 'config.urls'
 
 # ============================================================================
@@ -100,6 +121,7 @@ TEMPLATES = [
                 'django.contrib.messages.context_processors.messages',
                 'dashboards.context_processors.profile_context',
                 'dashboards.context_processors.notifications_context',
+                'dashboards.context_processors.chrome_cache_context',
             ],
         },
     },
@@ -113,8 +135,8 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # ============================================================================
 # Use SQLite for development and PostgreSQL (Supabase) for production
 
-if DEBUG:
-    # Development (local) database
+if DEBUG or TESTING:
+    # Development (local) and test database
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
@@ -169,14 +191,26 @@ USE_TZ = True
 # ============================================================================
 # STATIC FILES CONFIGURATION
 # ============================================================================
-# Configure CSS, JavaScript, and image file handling
+# Configure CSS, JavaScript, and image file handling. Page scripts live in
+# static/js and read their Django values from {% js_config %} JSON blocks, so
+# collectstatic can minify, hash and compress them for long-lived caching.
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'config.storage.MinifiedManifestStaticFilesStorage',
+    },
+}
+if TESTING:
+    # Tests render templates without running collectstatic first
+    STORAGES['staticfiles']['BACKEND'] = 'django.contrib.staticfiles.storage.StaticFilesStorage'
 
 
 # ============================================================================
@@ -205,10 +239,25 @@ LOGIN_URL = 'login'
 # ============================================================================
 # Load Supabase credentials from environment variables for authentication
 
+# SUPABASE_FAKE=True swaps Supabase for the in-memory fake in supabase_fake.py
+# (tests and benchmarks; demo logins admin@cit.edu / student@cit.edu).
+# SUPABASE_FAKE_LATENCY_MS adds a delay per call, SUPABASE_FAKE_DATA loads rows from a JSON file.
+SUPABASE_FAKE = os.environ.get('SUPABASE_FAKE', 'False') == 'True' or TESTING
+if SUPABASE_FAKE:
+    import supabase_fake
+    supabase_fake.configure_environment()
+
 SUPABASE_URL = os.environ.get('SUPABASE_URL', '')
 SUPABASE_ANON_KEY = os.environ.get('SUPABASE_ANON_KEY', '')
 SUPABASE_SERVICE_ROLE = os.environ.get('SUPABASE_SERVICE_ROLE', '')
 
+# Per-request accounting of Supabase calls (dashboards.supabase_calls): adds a
+# Server-Timing header (under DEBUG or for admins) and warns about requests over
+# budget or repeating a query.
+SUPABASE_CALL_ACCOUNTING = os.environ.get('SUPABASE_CALL_ACCOUNTING', 'True') == 'True'
+SUPABASE_CALL_BUDGET = int(os.environ.get('SUPABASE_CALL_BUDGET', '10'))  # calls per request; 0 = no limit
+SUPABASE_CALL_LOG = os.environ.get('SUPABASE_CALL_LOG', str(DEBUG)) == 'True'  # a JSON line per request
+
 
 # ============================================================================
 # EMAIL CONFIGURATION
@@ -216,4 +265,162 @@ SUPABASE_SERVICE_ROLE = os.environ.get('SUPABASE_SERVICE_ROLE', '')
 # Configure email backend for development and production
 
 # For development: Use console backend (prints to terminal)
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
\ No newline at end of file
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+# ============================================================================
+# BACKGROUND JOBS
+# ============================================================================
+# Interval (seconds) for the in-process order/reservation expiry sweeper.
+# Set to 0 to disable it and schedule `python manage.py expire_orders` instead.
+
+ORDER_EXPIRY_SWEEP_INTERVAL = int(os.environ.get('ORDER_EXPIRY_SWEEP_INTERVAL', '300'))
+
+# ============================================================================
+# PURCHASE ADMISSION QUEUE
+# ============================================================================
+# Per-product waiting room in front of the buy_product RPC (per worker process)
+
+ADMISSION_MAX_CONCURRENCY_PER_PRODUCT = int(os.environ.get('ADMISSION_MAX_CONCURRENCY_PER_PRODUCT', '1'))
+ADMISSION_MAX_QUEUE_DEPTH = int(os.environ.get('ADMISSION_MAX_QUEUE_DEPTH', '50'))
+ADMISSION_WAIT_TIMEOUT = float(os.environ.get('ADMISSION_WAIT_TIMEOUT', '10'))
+ADMISSION_STOCK_TTL = float(os.environ.get('ADMISSION_STOCK_TTL', '30'))
+
+# ============================================================================
+# BULK ACTIONS
+# ============================================================================
+# Batch endpoints split id lists into chunks to keep PostgREST URLs short
+
+BULK_ACTION_CHUNK_SIZE = int(os.environ.get('BULK_ACTION_CHUNK_SIZE', '100'))
+BULK_ACTION_MAX_WORKERS = int(os.environ.get('BULK_ACTION_MAX_WORKERS', '4'))
+PRODUCT_IMPORT_CHUNK_SIZE = int(os.environ.get('PRODUCT_IMPORT_CHUNK_SIZE', '500'))  # rows per multi-row write in catalog imports
+
+# ============================================================================
+# FILE UPLOAD LIMITS
+# ============================================================================
+# Uploads above FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to a temporary file and
+# streamed to Supabase Storage from disk instead of being held in worker memory.
+
+FILE_UPLOAD_MAX_MEMORY_SIZE = 512 * 1024
+IMAGE_UPLOAD_MAX_BYTES = int(os.environ.get('IMAGE_UPLOAD_MAX_BYTES', str(8 * 1024 * 1024)))
+IMAGE_UPLOAD_ALLOWED_TYPES = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
+
+
+# ============================================================================
+# BACKGROUND IMAGE PROCESSING
+# ============================================================================
+# Product images are spooled locally and uploaded by a worker thread pool, so
+# add/edit product requests return before the derivative uploads. Jobs are
+# recorded in the dashboards ImageJob table and resumed at start-up; a staged
+# copy under IMAGE_JOB_STAGING_PREFIX in the product images bucket lets any
+# instance resume them after the local spool is gone.
+
+IMAGE_JOBS_ENABLED = os.environ.get('IMAGE_JOBS_ENABLED', 'True') == 'True'
+IMAGE_JOB_WORKERS = int(os.environ.get('IMAGE_JOB_WORKERS', '2'))
+IMAGE_JOB_MAX_ATTEMPTS = 5
+IMAGE_JOB_STALE_AFTER = 600  # seconds before a 'running' job is assumed abandoned
+IMAGE_JOB_SPOOL_DIR = os.environ.get('IMAGE_JOB_SPOOL_DIR', str(BASE_DIR / 'media' / 'image_jobs'))
+IMAGE_JOB_STAGING_PREFIX = 'image_jobs'
+
+
+# ============================================================================
+# LOCAL READ MIRROR
+# ============================================================================
+# Copies products, orders, notifications and activity_log into a SQLite file
+# on the instance's own disk (dashboards.mirror) so browse, manage products and
+# reports can read them without a Supabase round trip. Writes still go to
+# Supabase. Views fall back to Supabase when the mirror is older than
+# MIRROR_MAX_STALENESS or the app changed a table since its last sync.
+# The file is rebuilt by a full sync when missing; build.sh creates its tables.
+
+DATABASES['mirror'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': os.environ.get('MIRROR_DATABASE_PATH', str(BASE_DIR / 'mirror.sqlite3')),
+}
+DATABASE_ROUTERS = ['dashboards.routers.MirrorRouter']
+
+MIRROR_READS_ENABLED = os.environ.get('MIRROR_READS_ENABLED', 'False') == 'True'
+MIRROR_SYNC_INTERVAL = int(os.environ.get('MIRROR_SYNC_INTERVAL', '30'))  # seconds; 0 = use `manage.py sync_mirror`
+MIRROR_FULL_SYNC_INTERVAL = 3600  # seconds between full syncs that pick up deletions
+MIRROR_MAX_STALENESS = 300  # seconds
+
+
+# ============================================================================
+# REALTIME CACHE INVALIDATION
+# ============================================================================
+# One worker per host subscribes to Supabase Realtime changes on these tables
+# (they must be in the supabase_realtime publication) and bumps a per-table
+# generation counter in a shared memory-mapped file that every worker reads.
+
+REALTIME_INVALIDATION_ENABLED = os.environ.get('REALTIME_INVALIDATION_ENABLED', 'False') == 'True'
+REALTIME_INVALIDATION_TABLES = ['products', 'orders', 'notifications', 'user_profiles']
+CACHE_GENERATION_FILE = os.environ.get('CACHE_GENERATION_FILE', str(BASE_DIR / 'media' / 'cache_generations.bin'))
+
+
+# ============================================================================
+# CACHING
+# ============================================================================
+# 'default' is the per-process L1 cache. Set CACHE_L2_URL to add a 'shared' L2
+# cache used by every worker and host: redis://host:6379/0 (or rediss://) for
+# Redis-compatible servers, file:///path/to/dir for a file-based cache.
+# dashboards.caching caches view data in both tiers, keyed by user_type (and
+# user id where needed) and invalidated by table tags.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'uniform-l1',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+CACHE_L2_URL = os.environ.get('CACHE_L2_URL', '')
+if CACHE_L2_URL.startswith(('redis://', 'rediss://')):
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_L2_URL,
+        'KEY_PREFIX': 'uniform',
+    }
+elif CACHE_L2_URL.startswith('file://'):
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_L2_URL[len('file://'):],
+    }
+
+VIEW_CACHE_ENABLED = os.environ.get('VIEW_CACHE_ENABLED', 'True') == 'True'
+VIEW_CACHE_TIMEOUT = int(os.environ.get('VIEW_CACHE_TIMEOUT', '60'))  # seconds; tags usually expire entries sooner
+CHROME_CACHE_TIMEOUT = 120  # seconds; bounds how stale 'x minutes ago' in the notification dropdown gets
+SINGLE_FLIGHT_ENABLED = os.environ.get('SINGLE_FLIGHT_ENABLED', 'True') == 'True'  # coalesce identical in-flight reads
+
+
+# ============================================================================
+# SESSIONS
+# ============================================================================
+# SESSION_STORE decides where sessions (and the Supabase tokens in them) live:
+#   'db'     - the django_session table; every request reads its row.
+#   'cache'  - the shared cache tier (or a per-process cache without one), with
+#              updates written to django_session in the background
+#              (config.sessions.cached).
+#   'cookie' - an encrypted, signed cookie; nothing is stored server-side
+#              (config.sessions.encrypted_cookies).
+
+SESSION_STORE = os.environ.get('SESSION_STORE', 'db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cache': 'config.sessions.cached',
+    'cookie': 'config.sessions.encrypted_cookies',
+}[SESSION_STORE]
+
+if SESSION_STORE == 'cache':
+    if 'shared' not in CACHES:
+        # Kept apart from 'default' so view data doesn't evict sessions
+        CACHES['sessions'] = {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'uniform-sessions',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    SESSION_CACHE_ALIAS = 'shared' if 'shared' in CACHES else 'sessions'
+
+if SESSION_STORE == 'cookie':
+    # There is no server-side copy for accounts.session_refresh to update, so
+    # tokens are only refreshed inline once they expire.
+    SUPABASE_SESSION_REFRESH_MARGIN = 0
@@ -14,3 +14,14 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Start background jobs only in web server processes, not in management commands.
+from dashboards.expiry import start_expiry_sweeper  # noqa: E402
+from dashboards.jobs import start_image_workers  # noqa: E402
+from dashboards.mirror import start_mirror_sync  # noqa: E402
+from dashboards.change_feed import start_change_listener  # noqa: E402
+
+start_expiry_sweeper()
+start_image_workers()
+start_mirror_sync()
+start_change_listener()
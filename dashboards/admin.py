@@ -1,15 +1,15 @@
 from django.contrib import admin
-from .models import Product, Order, ActivityLog
+from .models import Product, Order, Notification, ActivityLog, MirrorSyncState
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     """
     Customizes the display of the Product model in the Django admin.
+    Rows are a mirror of Supabase and are overwritten on every sync, so they aren't editable here.
     """
-    list_display = ('name', 'category', 'price', 'stock_quantity', 'is_available', 'created_at')
+    list_display = ('name', 'category', 'size', 'price', 'stock_quantity', 'is_available', 'created_at')
     list_filter = ('is_available', 'category')
     search_fields = ('name', 'description', 'category')
-    list_editable = ('price', 'stock_quantity', 'is_available')
     ordering = ('-created_at',)
 
 @admin.register(Order)
@@ -17,10 +17,19 @@ class OrderAdmin(admin.ModelAdmin):
     """
     Customizes the display of the Order model in the Django admin.
     """
-    list_display = ('id', 'user', 'product', 'quantity', 'total_price', 'status', 'order_type', 'created_at')
+    list_display = ('id', 'user_id', 'product', 'quantity', 'total_price', 'status', 'order_type', 'created_at')
     list_filter = ('status', 'order_type', 'created_at')
-    search_fields = ('user__email', 'product__name')
-    autocomplete_fields = ('user', 'product')
+    search_fields = ('user_id', 'product__name')
+    ordering = ('-created_at',)
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    """
+    Customizes the display of the mirrored Notification model in the Django admin.
+    """
+    list_display = ('id', 'user_id', 'message', 'is_read', 'created_at')
+    list_filter = ('is_read', 'created_at')
+    search_fields = ('user_id', 'message')
     ordering = ('-created_at',)
 
 @admin.register(ActivityLog)
@@ -28,10 +37,10 @@ class ActivityLogAdmin(admin.ModelAdmin):
     """
     Provides a read-only view of the ActivityLog in the Django admin.
     """
-    list_display = ('user', 'action', 'created_at')
+    list_display = ('user_id', 'action', 'created_at')
     list_filter = ('action', 'created_at')
-    search_fields = ('user__email', 'action', 'details')
-    readonly_fields = ('user', 'action', 'details', 'created_at')
+    search_fields = ('user_id', 'action', 'details')
+    readonly_fields = ('user_id', 'action', 'details', 'created_at')
     ordering = ('-created_at',)
 
     def has_add_permission(self, request):
@@ -41,4 +50,12 @@ class ActivityLogAdmin(admin.ModelAdmin):
         return False
 
     def has_delete_permission(self, request, obj=None):
-        return False
\ No newline at end of file
+        return False
+
+@admin.register(MirrorSyncState)
+class MirrorSyncStateAdmin(admin.ModelAdmin):
+    """
+    Shows how far each mirrored table has been synced.
+    """
+    list_display = ('table', 'row_count', 'cursor', 'last_synced_at', 'last_full_sync_at', 'last_error')
+    readonly_fields = ('table', 'cursor', 'row_count', 'last_synced_at', 'last_full_sync_at', 'last_error')
@@ -0,0 +1,176 @@
+from django.conf import settings
+from contextlib import contextmanager
+from .invalidation import generations
+import threading
+import time
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a purchase is turned away before reaching the database.
+    `reason` is 'sold_out' (the local stock counter says there isn't enough)
+    or 'busy' (the product's waiting room is full or the wait timed out).
+    """
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+class _ProductGate:
+    """Per-product state: a condition variable guarding slots and the stock counter."""
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.stock = None
+        self.stock_seen_at = 0.0
+        self.stock_generation = 0
+
+
+class ProductAdmissionQueue:
+    """
+    A per-product virtual waiting room in front of the buy_product RPC.
+
+    Each product gets its own gate that admits at most `max_concurrency`
+    purchases at a time; everyone else waits in FIFO-ish order on a condition
+    variable instead of piling onto the same stock row in Postgres. At most
+    `max_depth` requests may wait per product and each waits at most
+    `wait_timeout` seconds, so latency stays bounded. The gate also remembers the
+    last stock quantity the RPC reported; while that value is fresh (younger
+    than `stock_ttl` seconds and no change to the products table has been
+    seen since, see dashboards.invalidation) and too small for a request, the
+    request is rejected immediately without any network call. State is per process.
+    """
+    def __init__(self, max_concurrency=1, max_depth=50, wait_timeout=10.0, stock_ttl=30.0):
+        self.max_concurrency = max_concurrency
+        self.max_depth = max_depth
+        self.wait_timeout = wait_timeout
+        self.stock_ttl = stock_ttl
+        self._gates = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            'admitted': 0,
+            'rejected_sold_out': 0,
+            'rejected_busy': 0,
+            'timed_out': 0,
+        }
+
+    def _gate(self, product_id):
+        with self._lock:
+            gate = self._gates.get(product_id)
+            if gate is None:
+                gate = self._gates[product_id] = _ProductGate()
+            return gate
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _known_stock(self, gate):
+        if gate.stock is None or time.monotonic() - gate.stock_seen_at > self.stock_ttl:
+            return None
+        if gate.stock_generation != generations.get('products'):
+            return None  # Someone restocked or edited products since we looked
+        return gate.stock
+
+    @contextmanager
+    def admit(self, product_id, quantity):
+        """
+        Context manager that holds one purchase slot for `product_id`.
+
+        Raises AdmissionRejected if the locally tracked stock can't cover
+        `quantity`, if too many requests are already waiting, or if no slot frees
+        up within the wait timeout. The stock check is repeated after waiting,
+        because the purchases ahead in the queue may have sold the item out.
+        """
+        gate = self._gate(product_id)
+        with gate.condition:
+            known_stock = self._known_stock(gate)
+            if known_stock is not None and known_stock < quantity:
+                self._count('rejected_sold_out')
+                raise AdmissionRejected('sold_out', 'Sorry, this item just sold out.')
+
+            if gate.in_flight >= self.max_concurrency and gate.waiting >= self.max_depth:
+                self._count('rejected_busy')
+                raise AdmissionRejected('busy', 'This item is in high demand right now. Please try again in a moment.')
+
+            gate.waiting += 1
+            try:
+                admitted = gate.condition.wait_for(
+                    lambda: gate.in_flight < self.max_concurrency,
+                    timeout=self.wait_timeout,
+                )
+            finally:
+                gate.waiting -= 1
+
+            if not admitted:
+                self._count('timed_out')
+                raise AdmissionRejected('busy', 'This item is in high demand right now. Please try again in a moment.')
+
+            known_stock = self._known_stock(gate)
+            if known_stock is not None and known_stock < quantity:
+                self._count('rejected_sold_out')
+                gate.condition.notify()
+                raise AdmissionRejected('sold_out', 'Sorry, this item just sold out.')
+
+            gate.in_flight += 1
+        self._count('admitted')
+
+        try:
+            yield
+        finally:
+            with gate.condition:
+                gate.in_flight -= 1
+                gate.condition.notify()
+
+    def record_stock(self, product_id, stock_quantity):
+        """
+        Stores the latest stock quantity reported for a product, valid until the
+        products generation changes. Call it after invalidating the 'products'
+        tag for the write that produced the quantity, not before.
+        """
+        if stock_quantity is None:
+            return
+        gate = self._gate(product_id)
+        with gate.condition:
+            gate.stock = int(stock_quantity)
+            gate.stock_seen_at = time.monotonic()
+            gate.stock_generation = generations.get('products')
+
+    def forget_stock(self, product_id):
+        """Drops the cached stock for a product, e.g. after an admin restock."""
+        gate = self._gate(product_id)
+        with gate.condition:
+            gate.stock = None
+
+    def metrics(self):
+        """
+        Returns queue metrics for this process: global admission counters plus
+        the current depth, in-flight count and known stock of every product
+        that has a non-idle gate or a cached stock value.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            gates = list(self._gates.items())
+
+        products = {}
+        for product_id, gate in gates:
+            with gate.condition:
+                if gate.waiting or gate.in_flight or gate.stock is not None:
+                    products[product_id] = {
+                        'queue_depth': gate.waiting,
+                        'in_flight': gate.in_flight,
+                        'known_stock': self._known_stock(gate),
+                    }
+
+        counters['queue_depth'] = sum(p['queue_depth'] for p in products.values())
+        counters['products'] = products
+        return counters
+
+
+purchase_queue = ProductAdmissionQueue(
+    max_concurrency=getattr(settings, 'ADMISSION_MAX_CONCURRENCY_PER_PRODUCT', 1),
+    max_depth=getattr(settings, 'ADMISSION_MAX_QUEUE_DEPTH', 50),
+    wait_timeout=getattr(settings, 'ADMISSION_WAIT_TIMEOUT', 10.0),
+    stock_ttl=getattr(settings, 'ADMISSION_STOCK_TTL', 30.0),
+)
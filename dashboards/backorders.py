@@ -0,0 +1,125 @@
+from supabase_client import supabase_service
+from django.urls import reverse
+from datetime import datetime, timedelta, timezone
+from .inventory import adjust_stock_levels
+from .utils import notify_users
+from .caching import invalidate_tags
+
+# Fulfilled backorders become reservations that hold stock for the same
+# 3-day window admins give approved orders.
+RESERVATION_HOLD_DAYS = 3
+
+
+def allocate_backorders(backorders, available_stock):
+    """
+    Chooses which queued backorders can be filled from `available_stock`.
+
+    Expects the backorders already ordered by priority (urgent first, then oldest
+    first). Walks the queue once and takes every backorder whose full quantity
+    still fits; a large request that doesn't fit is skipped rather than blocking
+    smaller ones behind it. Partial fills are never made. Returns a tuple of
+    (allocated backorders, total quantity allocated).
+    """
+    allocated = []
+    remaining = available_stock
+    for backorder in backorders:
+        quantity = backorder.get('quantity') or 0
+        if 0 < quantity <= remaining:
+            allocated.append(backorder)
+            remaining -= quantity
+        if remaining <= 0:
+            break
+    return allocated, available_stock - remaining
+
+
+def fulfil_backorders(product_id, max_retries=5):
+    """
+    Converts pending backorders for a restocked product into reservations.
+
+    Reads the product's stock and its pending backorder queue (urgent first, then
+    FIFO), allocates whole backorders, and reserves the allocated quantity with a
+    conditional stock decrement so a purchase racing with the restock can't be
+    oversold; on a conflict the allocation is recomputed. The chosen backorders
+    are flipped to pending reservations with a single update, any that were
+    cancelled in the meantime have their stock handed back, and the students are
+    notified in one bulk insert. Returns a summary dictionary.
+    """
+    summary = {'fulfilled': 0, 'quantity': 0, 'order_ids': [], 'remaining_stock': None}
+
+    for _ in range(max_retries):
+        product_res = supabase_service.table('products') \
+            .select('id, name, stock_quantity') \
+            .eq('id', product_id) \
+            .single() \
+            .execute()
+        product = product_res.data
+        if not product:
+            return summary
+
+        stock = product.get('stock_quantity') or 0
+        summary['remaining_stock'] = stock
+        if stock <= 0:
+            return summary
+
+        queue_res = supabase_service.table('orders') \
+            .select('id, user_id, quantity, is_urgent, created_at') \
+            .eq('product_id', product_id) \
+            .eq('status', 'pending') \
+            .eq('order_type', 'backorder') \
+            .order('is_urgent', desc=True) \
+            .order('created_at') \
+            .execute()
+        allocated, total_quantity = allocate_backorders(queue_res.data or [], stock)
+        if not allocated:
+            return summary
+
+        new_stock = stock - total_quantity
+        reserve_res = supabase_service.table('products') \
+            .update({'stock_quantity': new_stock, 'is_available': new_stock > 0}) \
+            .eq('id', product_id) \
+            .eq('stock_quantity', stock) \
+            .execute()
+        if reserve_res.data:
+            break
+    else:
+        print(f"Could not reserve stock for backorders of product {product_id} after {max_retries} attempts.")
+        return summary
+
+    allocated_by_id = {backorder['id']: backorder for backorder in allocated}
+    expires_at = datetime.now(timezone.utc) + timedelta(days=RESERVATION_HOLD_DAYS)
+    converted_res = supabase_service.table('orders') \
+        .update({'order_type': 'reservation', 'expires_at': expires_at.isoformat()}) \
+        .in_('id', list(allocated_by_id.keys())) \
+        .eq('status', 'pending') \
+        .eq('order_type', 'backorder') \
+        .execute()
+    converted_ids = [row['id'] for row in (converted_res.data or [])]
+
+    # Backorders cancelled between the queue read and the update keep nothing.
+    unclaimed = sum(
+        allocated_by_id[order_id].get('quantity') or 0
+        for order_id in allocated_by_id
+        if order_id not in converted_ids
+    )
+    if unclaimed:
+        new_stock = adjust_stock_levels({product_id: unclaimed}).get(product_id, new_stock)
+
+    notify_users([
+        {
+            'user_id': allocated_by_id[order_id]['user_id'],
+            'product_id': product_id,
+            'message': f"Good news! {product['name']} is back in stock and has been reserved for you. "
+                       f"Check out before {expires_at.strftime('%b %d, %Y')}.",
+            'link_url': reverse('my_reservations'),
+        }
+        for order_id in converted_ids
+    ])
+
+    invalidate_tags('orders', 'products')
+    summary.update({
+        'fulfilled': len(converted_ids),
+        'quantity': sum(allocated_by_id[order_id].get('quantity') or 0 for order_id in converted_ids),
+        'order_ids': converted_ids,
+        'remaining_stock': new_stock,
+    })
+    return summary
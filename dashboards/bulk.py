@@ -0,0 +1,122 @@
+from django.conf import settings
+from concurrent.futures import ThreadPoolExecutor
+from .utils import log_activity
+import time
+
+
+def parse_id_list(ids_str):
+    """
+    Parses a comma-separated string of ids (e.g. "4,8,15") into a list of ints.
+
+    Ignores blanks and anything that isn't a positive integer, and drops
+    duplicates while keeping the original order. Returns an empty list for
+    None or an empty string so callers can raise their own validation error.
+    """
+    if not ids_str:
+        return []
+    seen = set()
+    ids = []
+    for part in ids_str.split(','):
+        part = part.strip()
+        if part.isdigit() and int(part) not in seen:
+            seen.add(int(part))
+            ids.append(int(part))
+    return ids
+
+
+class BulkResult:
+    """
+    Aggregated outcome of a chunked bulk action.
+
+    `succeeded` lists the ids whose chunk completed, `failures` holds one
+    {'ids': [...], 'error': '...'} entry per failed chunk. A chunk either
+    succeeds or fails as a whole, matching how a single `.in_()` call behaves.
+    """
+    def __init__(self):
+        self.succeeded = []
+        self.failures = []
+        self.chunks = 0
+        self.duration_ms = 0.0
+
+    @property
+    def failed_ids(self):
+        return [i for failure in self.failures for i in failure['ids']]
+
+    @property
+    def ok(self):
+        return not self.failures
+
+    def summary(self):
+        """Returns a JSON-serialisable summary suitable for activity logs and responses."""
+        return {
+            'count': len(self.succeeded),
+            'failed_count': len(self.failed_ids),
+            'chunks': self.chunks,
+            'duration_ms': self.duration_ms,
+        }
+
+
+def run_bulk_action(ids, action, chunk_size=None, max_workers=None):
+    """
+    Runs `action` over `ids` in fixed-size chunks with bounded parallelism.
+
+    `action` receives one chunk (a list of ids) and performs the upstream call,
+    typically a single `.in_('id', chunk)` update or delete. Splitting keeps each
+    PostgREST URL short no matter how many rows were selected, and running up to
+    `max_workers` chunks at once keeps large selections fast without flooding
+    Supabase. Exceptions are captured per chunk instead of aborting the rest.
+    Returns a BulkResult.
+    """
+    chunk_size = chunk_size or getattr(settings, 'BULK_ACTION_CHUNK_SIZE', 100)
+    max_workers = max_workers or getattr(settings, 'BULK_ACTION_MAX_WORKERS', 4)
+
+    result = BulkResult()
+    chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+    result.chunks = len(chunks)
+    started = time.monotonic()
+
+    def run_chunk(chunk):
+        try:
+            action(chunk)
+            return chunk, None
+        except Exception as e:
+            return chunk, str(e)
+
+    if len(chunks) == 1:
+        outcomes = [run_chunk(chunks[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            outcomes = list(executor.map(run_chunk, chunks))
+
+    for chunk, error in outcomes:
+        if error is None:
+            result.succeeded.extend(chunk)
+        else:
+            print(f"Bulk action chunk of {len(chunk)} id(s) failed: {error}")
+            result.failures.append({'ids': chunk, 'error': error})
+
+    result.duration_ms = round((time.monotonic() - started) * 1000, 1)
+    return result
+
+
+def run_logged_bulk_action(user, action_type, ids, action, details=None, ids_key='ids', **kwargs):
+    """
+    Runs a chunked bulk action and records one summarised activity log entry.
+
+    The entry holds the counts from BulkResult.summary(), the affected ids (under
+    `ids_key`, e.g. 'order_ids', which the reports page displays) and any failed
+    ids, merged with the optional `details` dictionary, instead of one log row
+    per chunk. Nothing is logged when every chunk failed. Returns the
+    BulkResult.
+    """
+    result = run_bulk_action(ids, action, **kwargs)
+
+    if result.succeeded:
+        log_details = dict(details or {})
+        log_details.update(result.summary())
+        log_details[ids_key] = result.succeeded
+        if result.failures:
+            log_details['failed_ids'] = result.failed_ids
+        log_activity(user, action_type, log_details)
+
+    return result
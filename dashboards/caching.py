@@ -0,0 +1,189 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+from .invalidation import generations, INVALIDATION_TOPICS
+import hashlib
+import threading
+
+_MISSING = object()
+
+
+class ViewDataCache:
+    """
+    Two-tier cache for the data behind read-heavy views.
+
+    L1 is the per-process local-memory cache ('default'); L2 is the optional
+    shared cache ('shared', file-based or Redis, see settings.CACHE_L2_URL).
+    Lookups try L1, then L2 (copying hits back into L1), then run the producer.
+
+    Entries are tagged with Supabase tables. A tag's version is its shared
+    generation counter (dashboards.invalidation), which realtime changes and
+    invalidate_tags() bump for every worker on the host, plus a version key
+    in L2 so other hosts see app-side invalidations too. Versions are part of
+    the cache key, so invalidation never has to find and delete entries.
+
+    Only view data is cached, never rendered responses: pages carry CSRF
+    tokens, flash messages and per-user notification chrome.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'VIEW_CACHE_ENABLED', False)
+
+    @property
+    def l1(self):
+        return caches['default']
+
+    @property
+    def l2(self):
+        try:
+            return caches['shared']
+        except InvalidCacheBackendError:
+            return None
+
+    def _count(self, name, outcome):
+        with self._lock:
+            counters = self._counters.setdefault(name, {'l1_hits': 0, 'l2_hits': 0, 'misses': 0})
+            counters[outcome] += 1
+
+    def tag_versions(self, tags):
+        """Returns the combined current version of `tags` as a string for use in cache keys."""
+        versions = [str(generation) for generation in generations.snapshot(*tags)]
+        if self.l2 is not None:
+            shared = self.l2.get_many([f'cache-tag:{tag}' for tag in tags])
+            versions.extend(str(shared.get(f'cache-tag:{tag}', 0)) for tag in tags)
+        return '.'.join(versions)
+
+    def make_key(self, request, name, tags, vary=(), per_user=False):
+        """
+        Builds the cache key for one view's data: the view name, the viewer's
+        user_type (and id when `per_user`), the `vary` values such as a search
+        term or page number, and the current versions of `tags`.
+        """
+        user = getattr(request, 'user', None)
+        role = getattr(user, 'user_type', 'anonymous') if user is not None else 'anonymous'
+        user_part = str(getattr(user, 'id', '-')) if per_user else '-'
+        vary_part = hashlib.sha1(repr(tuple(vary)).encode()).hexdigest()[:16]
+        return f'view:{name}:{role}:{user_part}:{vary_part}:{self.tag_versions(tags)}'
+
+    def _lookup(self, request, name, tags, vary, per_user):
+        """Returns (key, value) with value _MISSING on a miss; key is None if the cache failed."""
+        try:
+            key = self.make_key(request, name, tags, vary, per_user)
+            value = self.l1.get(key, _MISSING)
+            if value is not _MISSING:
+                self._count(name, 'l1_hits')
+                return key, value
+            if self.l2 is not None:
+                value = self.l2.get(key, _MISSING)
+                if value is not _MISSING:
+                    self._count(name, 'l2_hits')
+                    self.l1.set(key, value, self._timeout())
+                    return key, value
+        except Exception as e:
+            print(f"View cache lookup failed for '{name}': {e}")
+            return None, _MISSING
+        self._count(name, 'misses')
+        return key, _MISSING
+
+    def _store(self, name, key, value, timeout):
+        try:
+            self.l1.set(key, value, timeout)
+            if self.l2 is not None:
+                self.l2.set(key, value, timeout)
+        except Exception as e:
+            print(f"View cache store failed for '{name}': {e}")
+
+    def _timeout(self, timeout=None):
+        return timeout or getattr(settings, 'VIEW_CACHE_TIMEOUT', 60)
+
+    def get_or_set(self, request, name, producer, tags, vary=(), per_user=False, timeout=None):
+        """
+        Returns the cached data for a view, calling `producer()` on a miss.
+
+        `tags` lists the tables the data is read from; any change to one of
+        them makes the entry unreachable. Data is shared by every user of the
+        same user_type unless `per_user` is set. Producers that raise are not
+        cached. When VIEW_CACHE_ENABLED is off the producer always runs.
+        """
+        if not self.enabled:
+            return producer()
+
+        key, value = self._lookup(request, name, tags, vary, per_user)
+        if value is not _MISSING:
+            return value
+        value = producer()
+        if key is not None:
+            self._store(name, key, value, self._timeout(timeout))
+        return value
+
+    async def aget_or_set(self, request, name, producer, tags, vary=(), per_user=False, timeout=None):
+        """
+        Async get_or_set() for async views: `producer` is a coroutine function.
+
+        The L1 lookup runs on the event loop; a shared L2 (a network or disk
+        round trip) is consulted from a worker thread.
+        """
+        if not self.enabled:
+            return await producer()
+
+        if self.l2 is None:
+            key, value = self._lookup(request, name, tags, vary, per_user)
+        else:
+            key, value = await sync_to_async(self._lookup, thread_sensitive=False)(request, name, tags, vary, per_user)
+        if value is not _MISSING:
+            return value
+        value = await producer()
+        if key is not None:
+            if self.l2 is None:
+                self._store(name, key, value, self._timeout(timeout))
+            else:
+                await sync_to_async(self._store, thread_sensitive=False)(name, key, value, self._timeout(timeout))
+        return value
+
+    def invalidate_tags(self, *tags):
+        """
+        Makes every entry tagged with any of `tags` unreachable, in all workers
+        on this host immediately and on other hosts sharing the L2 cache.
+        """
+        tags = [tag for tag in tags if tag in INVALIDATION_TOPICS]
+        if not tags:
+            return
+        generations.bump(*tags)
+        if self.l2 is not None:
+            for tag in tags:
+                try:
+                    self.l2.incr(f'cache-tag:{tag}')
+                except ValueError:
+                    self.l2.add(f'cache-tag:{tag}', 1, None)
+                except Exception as e:
+                    print(f"Could not bump shared cache tag '{tag}': {e}")
+
+    def metrics(self):
+        """Returns per-view hit/miss counters for this process, plus totals and the hit ratio."""
+        with self._lock:
+            views = {name: dict(counters) for name, counters in self._counters.items()}
+        totals = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0}
+        for counters in views.values():
+            for outcome, count in counters.items():
+                totals[outcome] += count
+        lookups = sum(totals.values())
+        totals['hit_ratio'] = round((totals['l1_hits'] + totals['l2_hits']) / lookups, 3) if lookups else None
+        return {
+            'enabled': self.enabled,
+            'l2': self.l2 is not None,
+            'totals': totals,
+            'views': views,
+        }
+
+
+view_cache = ViewDataCache()
+
+
+def invalidate_tags(*tags):
+    """Invalidates cached view data that depends on the given tables (see ViewDataCache)."""
+    view_cache.invalidate_tags(*tags)
@@ -0,0 +1,321 @@
+from supabase_client import supabase_service
+from django.conf import settings
+from .admission import purchase_queue
+from .backorders import fulfil_backorders
+from .bulk import run_bulk_action
+from .mirror import mirror_rows
+from .caching import invalidate_tags
+import csv
+import io
+import time
+
+try:
+    from openpyxl import load_workbook
+except ImportError:  # openpyxl is optional; without it only CSV files can be imported
+    load_workbook = None
+
+PRODUCT_CATEGORIES = [
+    'Uniforms',
+    'Accessories',
+    'Office & School Supplies',
+    'Equipment & Tools',
+    'Merchandise & Souvenirs',
+]
+UNIFORM_SIZES = ['XS', 'S', 'M', 'L', 'XL', 'XXL']
+
+# Import file header -> product field. Headers are matched case-insensitively
+# and the add product form's field names ('product-name', ...) work too.
+IMPORT_COLUMNS = {
+    'id': 'id',
+    'product_id': 'id',
+    'name': 'name',
+    'product_name': 'name',
+    'description': 'description',
+    'product_description': 'description',
+    'price': 'price',
+    'product_price': 'price',
+    'stock': 'stock_quantity',
+    'stock_quantity': 'stock_quantity',
+    'category': 'category',
+    'product_category': 'category',
+    'size': 'size',
+    'product_size': 'size',
+    'image_url': 'image_url',
+}
+MAX_REPORTED_ERRORS = 200
+
+
+class ProductValidationError(ValueError):
+    """Raised when product fields break the catalog rules; carries one message per problem."""
+    def __init__(self, errors):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+
+
+def clean_product_fields(name, description, price, stock_quantity, category, size=None):
+    """
+    Validates and normalises the fields of a new product.
+
+    Applies the rules used by the add product form and the catalog import: a
+    name, a known category, a non-negative price and whole stock quantity, and
+    a valid size for Uniforms (other categories never keep a size). Raises
+    ProductValidationError listing every problem, or returns the product data
+    ready to insert, including is_available.
+    """
+    errors = []
+    name = (name or '').strip()
+    category = (category or '').strip()
+    size = (size or '').strip().upper() or None
+
+    if not name:
+        errors.append("Name is required.")
+    elif len(name) > 255:
+        errors.append("Name must be at most 255 characters.")
+
+    try:
+        price = round(float(price), 2)
+        if price < 0:
+            errors.append("Price cannot be negative.")
+    except (TypeError, ValueError):
+        errors.append(f"Price '{price}' is not a number.")
+
+    try:
+        stock_quantity = int(str(stock_quantity).strip() or 0)
+        if stock_quantity < 0:
+            errors.append("Stock quantity cannot be negative.")
+    except (TypeError, ValueError):
+        errors.append(f"Stock quantity '{stock_quantity}' is not a whole number.")
+
+    if category not in PRODUCT_CATEGORIES:
+        errors.append(f"Unknown category '{category}'.")
+    elif category == 'Uniforms':
+        if size not in UNIFORM_SIZES:
+            errors.append(f"Uniforms need a size ({', '.join(UNIFORM_SIZES)}).")
+    else:
+        size = None
+
+    if errors:
+        raise ProductValidationError(errors)
+
+    return {
+        'name': name,
+        'description': (description or '').strip(),
+        'price': price,
+        'stock_quantity': stock_quantity,
+        'category': category,
+        'size': size,
+        'is_available': stock_quantity > 0,
+    }
+
+
+def _normalise_header(header):
+    key = str(header or '').strip().lower().replace('-', '_').replace(' ', '_')
+    return IMPORT_COLUMNS.get(key)
+
+
+def _iter_csv_rows(binary_file):
+    text = io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline='')
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        fields = [_normalise_header(column) for column in header]
+        for row_number, values in enumerate(reader, start=2):
+            if any(value.strip() for value in values):
+                yield row_number, {field: value for field, value in zip(fields, values) if field}
+    finally:
+        text.detach()
+
+
+def _iter_xlsx_rows(binary_file):
+    if load_workbook is None:
+        raise ValueError("Importing .xlsx files requires openpyxl. Please upload a CSV file instead.")
+    workbook = load_workbook(binary_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        fields = [_normalise_header(column) for column in header]
+        for row_number, values in enumerate(rows, start=2):
+            values = ['' if value is None else str(value) for value in values]
+            if any(value.strip() for value in values):
+                yield row_number, {field: value for field, value in zip(fields, values) if field}
+    finally:
+        workbook.close()
+
+
+def iter_import_rows(binary_file, file_name):
+    """
+    Yields (row number, {field: value}) for each non-empty data row of an import file.
+
+    CSV files are decoded on the fly and XLSX files are read with openpyxl in
+    read-only mode, so rows stream from the upload without loading the whole
+    sheet. The first row is the header; unknown columns are ignored.
+    """
+    extension = file_name.rsplit('.', 1)[-1].lower() if '.' in file_name else ''
+    if extension == 'csv':
+        return _iter_csv_rows(binary_file)
+    if extension == 'xlsx':
+        return _iter_xlsx_rows(binary_file)
+    raise ValueError("Unsupported file type. Please upload a .csv or .xlsx file.")
+
+
+def _product_key(name, size):
+    return (name.strip().lower(), (size or '').strip().upper())
+
+
+def _existing_products(page_size=1000):
+    """Maps (name, size) and id to the current products with one paged read."""
+    by_key, by_id = {}, {}
+    start = 0
+    while True:
+        rows = supabase_service.table('products') \
+            .select('id, name, size, stock_quantity') \
+            .order('id') \
+            .range(start, start + page_size - 1) \
+            .execute().data or []
+        for row in rows:
+            by_id[row['id']] = row
+            by_key.setdefault(_product_key(row['name'], row.get('size')), row)
+        if len(rows) < page_size:
+            return by_key, by_id
+        start += page_size
+
+
+def import_products(binary_file, file_name, dry_run=False, chunk_size=None):
+    """
+    Imports a product catalog from a CSV or XLSX file.
+
+    Every row is validated with clean_product_fields(). A row updates an
+    existing product when it carries an id or matches one by name and size, so
+    re-running an import doesn't create duplicates; other rows are inserted.
+    New rows and updates that leave the stock alone are written with chunked
+    multi-row inserts and upserts (see run_bulk_action), so a catalog of
+    hundreds of products takes a handful of requests. An update that changes
+    the stock is a conditional update per row on the stock read at the start,
+    so a purchase made during the import isn't overwritten; such a row is
+    reported as an error instead. Restocked products serve their backorders
+    afterwards. With
+    dry_run=True nothing is written. Returns a report dictionary with counts and
+    per-row errors (the first MAX_REPORTED_ERRORS of them).
+    """
+    started = time.monotonic()
+    chunk_size = chunk_size or getattr(settings, 'PRODUCT_IMPORT_CHUNK_SIZE', 500)
+    report = {
+        'dry_run': dry_run,
+        'rows': 0,
+        'valid': 0,
+        'created': 0,
+        'updated': 0,
+        'error_count': 0,
+        'errors': [],
+        'backorders_fulfilled': 0,
+    }
+
+    def add_error(row_number, messages):
+        report['error_count'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': row_number, 'errors': messages})
+
+    by_key, by_id = _existing_products()
+    seen_rows = {}
+    # Rows are grouped by target (insert/update) and column set, because a
+    # multi-row PostgREST write needs the same columns in every row.
+    groups = {}
+
+    for row_number, fields in iter_import_rows(binary_file, file_name):
+        report['rows'] += 1
+        try:
+            product_data = clean_product_fields(
+                fields.get('name'), fields.get('description'), fields.get('price'),
+                fields.get('stock_quantity'), fields.get('category'), fields.get('size'),
+            )
+        except ProductValidationError as e:
+            add_error(row_number, e.errors)
+            continue
+
+        image_url = (fields.get('image_url') or '').strip()
+        if image_url:
+            product_data['image_url'] = image_url
+
+        key = _product_key(product_data['name'], product_data['size'])
+        if key in seen_rows:
+            add_error(row_number, [f"Duplicate of row {seen_rows[key]}."])
+            continue
+        seen_rows[key] = row_number
+
+        product_id = (fields.get('id') or '').strip()
+        if product_id:
+            existing = by_id.get(int(product_id)) if product_id.isdigit() else None
+            if existing is None:
+                add_error(row_number, [f"No product with id '{product_id}'."])
+                continue
+        else:
+            existing = by_key.get(key)
+
+        if existing is None:
+            mode = 'insert'
+        elif product_data['stock_quantity'] == existing.get('stock_quantity'):
+            # Leave the stock columns out, so purchases made meanwhile are kept
+            mode = 'upsert'
+            del product_data['stock_quantity'], product_data['is_available']
+        else:
+            mode = 'update'
+        if existing is not None:
+            product_data['id'] = existing['id']
+        report['valid'] += 1
+        group_key = (mode, tuple(sorted(product_data)))
+        groups.setdefault(group_key, []).append((row_number, product_data, existing))
+
+    if dry_run:
+        report['duration_ms'] = round((time.monotonic() - started) * 1000, 1)
+        return report
+
+    restocked_ids = []
+    saved_rows = []
+    for (mode, _), entries in groups.items():
+        def write_chunk(chunk, mode=mode):
+            rows = [product_data for _, product_data, _ in chunk]
+            if mode == 'insert':
+                response = supabase_service.table('products').insert(rows).execute()
+            elif mode == 'upsert':
+                response = supabase_service.table('products').upsert(rows, on_conflict='id').execute()
+            else:
+                _, product_data, existing = chunk[0]
+                response = supabase_service.table('products') \
+                    .update(product_data) \
+                    .eq('id', existing['id']) \
+                    .eq('stock_quantity', existing.get('stock_quantity')) \
+                    .execute()
+                if not response.data:
+                    raise ValueError("the stock changed while importing. Please import this row again.")
+            saved_rows.extend(response.data or [])
+
+        # Conditional updates go one row per chunk, so a changed stock only fails its own row
+        result = run_bulk_action(entries, write_chunk, chunk_size=1 if mode == 'update' else chunk_size)
+        for failure in result.failures:
+            for row_number, _, _ in failure['ids']:
+                add_error(row_number, [f"Could not be saved: {failure['error']}"])
+
+        if mode == 'insert':
+            report['created'] += len(result.succeeded)
+        else:
+            report['updated'] += len(result.succeeded)
+            for _, product_data, existing in result.succeeded:
+                purchase_queue.forget_stock(existing['id'])
+                if product_data.get('stock_quantity', 0) > (existing.get('stock_quantity') or 0):
+                    restocked_ids.append(existing['id'])
+
+    mirror_rows('products', saved_rows)
+    if saved_rows:
+        invalidate_tags('products')
+    for product_id in restocked_ids:
+        try:
+            report['backorders_fulfilled'] += fulfil_backorders(product_id)['fulfilled']
+        except Exception as e:
+            print(f"Error fulfilling backorders for product {product_id}: {e}")
+
+    report['duration_ms'] = round((time.monotonic() - started) * 1000, 1)
+    return report
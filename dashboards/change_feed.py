@@ -0,0 +1,139 @@
+from django.conf import settings
+from .invalidation import generations, INVALIDATION_TOPICS
+import asyncio
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # No flock on Windows; there every process subscribes on its own
+    fcntl = None
+
+try:
+    from realtime import AsyncRealtimeClient
+except ImportError:  # realtime ships with supabase-py; without it only local bumps happen
+    AsyncRealtimeClient = None
+
+_listener_thread = None
+_listener_lock = threading.Lock()
+_stats = {
+    'leader': False,
+    'connected': False,
+    'events': 0,
+    'reconnects': 0,
+    'last_event_at': None,
+}
+
+
+def change_feed_stats():
+    """Returns the change listener's counters for this process, plus the current generations."""
+    stats = dict(_stats)
+    stats['generations'] = dict(zip(INVALIDATION_TOPICS, generations.snapshot()))
+    return stats
+
+
+def _on_change(table):
+    def callback(payload):
+        generations.bump(table)
+        _stats['events'] += 1
+        _stats['last_event_at'] = time.time()
+    return callback
+
+
+async def _listen_once(url, key, tables):
+    """Connects, subscribes to every table and blocks until the connection drops."""
+    client = AsyncRealtimeClient(f"{url}/realtime/v1", key, auto_reconnect=False)
+    await client.connect()
+    channel = client.channel('cache-invalidation')
+    for table in tables:
+        channel.on_postgres_changes('*', table=table, callback=_on_change(table))
+    await channel.subscribe()
+    _stats['connected'] = True
+    # Anything could have changed while we weren't listening
+    generations.bump(*tables)
+    try:
+        await client.listen()
+    finally:
+        _stats['connected'] = False
+        try:
+            await client.close()
+        except Exception:
+            pass
+
+
+def _acquire_leadership(lock_path):
+    """Tries to become the one process on this host that holds the subscription."""
+    if fcntl is None:
+        return -1  # No leader election without flock; each process is its own leader
+    os.makedirs(os.path.dirname(lock_path) or '.', exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _run_listener(stop_event):
+    """
+    Thread body: waits to become leader, then keeps one realtime subscription
+    open, reconnecting with capped exponential backoff. The leader lock is an
+    flock, so it is released automatically if the leader process dies and
+    another worker takes over within one retry interval.
+    """
+    url = settings.SUPABASE_URL
+    key = settings.SUPABASE_SERVICE_ROLE
+    tables = [table for table in getattr(settings, 'REALTIME_INVALIDATION_TABLES', INVALIDATION_TOPICS)]
+    lock_path = getattr(settings, 'REALTIME_LEADER_LOCK_FILE', generations.path + '.lock')
+
+    leader_fd = None
+    while leader_fd is None:
+        leader_fd = _acquire_leadership(lock_path)
+        if leader_fd is None and stop_event.wait(30):
+            return
+    _stats['leader'] = True
+
+    backoff = 1
+    while not stop_event.is_set():
+        started = time.monotonic()
+        try:
+            asyncio.run(_listen_once(url, key, tables))
+        except Exception as e:
+            print(f"--- Realtime change feed error: {e} ---")
+        if time.monotonic() - started > 60:
+            backoff = 1  # The connection was healthy for a while; start over
+        _stats['reconnects'] += 1
+        if stop_event.wait(backoff):
+            break
+        backoff = min(backoff * 2, 60)
+
+
+def start_change_listener():
+    """
+    Starts the realtime change listener thread for this process (at most once).
+
+    Every worker starts the thread, but only the one holding the leader lock
+    subscribes to Supabase Realtime; each change bumps the table's shared
+    generation counter, which every worker reads. Runs only when
+    settings.REALTIME_INVALIDATION_ENABLED is set. Returns the threading.Event
+    that stops it, or None if it didn't start.
+    """
+    global _listener_thread
+
+    if not getattr(settings, 'REALTIME_INVALIDATION_ENABLED', False) or AsyncRealtimeClient is None:
+        return None
+
+    with _listener_lock:
+        if _listener_thread is not None and _listener_thread.is_alive():
+            return None
+        stop_event = threading.Event()
+        _listener_thread = threading.Thread(
+            target=_run_listener,
+            args=(stop_event,),
+            name='supabase-change-feed',
+            daemon=True,
+        )
+        _listener_thread.start()
+    return stop_event
@@ -1,5 +1,10 @@
-from supabase_client import supabase
+from supabase_client import supabase, with_access_token
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
 from datetime import datetime
+from .caching import view_cache
+from .singleflight import single_flight
+import functools
 
 def profile_context(request):
     """
@@ -47,6 +52,46 @@ def profile_context(request):
     return context
 
 
+def _fetch_notifications(access_token):
+    """Runs the two notification queries for the header dropdown and bell count, as the signed-in user (RLS)."""
+    try:
+        # selecting 'is_read' but NOT filtering by it.
+        response = single_flight.execute(with_access_token(
+            supabase.table('notifications')
+            .select('id, message, link_url, created_at, is_read, products(image_url)')
+            .order('created_at', desc=True)
+            .limit(20),
+            access_token
+        ))
+        
+        # Fetch the TOTAL unread count for the "red dot"
+        count_response = single_flight.execute(with_access_token(
+            supabase.table('notifications')
+            .select('id', count='exact')
+            .eq('is_read', False),
+            access_token
+        ))
+
+        notifications_data = []
+        if response.data:
+            for item in response.data:
+                try:
+                    # Convert ISO 8601 string to a timezone-aware datetime object
+                    item['created_at'] = datetime.fromisoformat(item['created_at'])
+                    notifications_data.append(item)
+                except (ValueError, TypeError, KeyError):
+                    # Skip this notification if its date is missing or malformed
+                    pass
+
+        return {
+            'notifications': response.data,
+            'notification_count': count_response.count
+        }
+    except Exception as e:
+        print(f"Error fetching notifications: {e}")
+        return {'notifications': [], 'notification_count': 0}
+
+
 def notifications_context(request):
     """
     Context processor that adds unread notifications to template context.
@@ -56,41 +101,33 @@ def notifications_context(request):
     product images. Separately queries the total count of unread notifications for use
     in UI indicators (red dot badges). Converts ISO 8601 timestamp strings to Python
     datetime objects for proper template formatting and filtering.
+    Both values are lazy: the queries only run if a template actually uses them, so
+    admin pages and student pages served from the cached header chrome skip them.
     Returns a dictionary containing 'notifications' (list of notification objects)
     and 'notification_count' (integer count of unread notifications).
     """
     if hasattr(request, 'user') and request.user.is_authenticated:
-        try:
-            # selecting 'is_read' but NOT filtering by it.
-            response = supabase.table('notifications') \
-                .select('id, message, link_url, created_at, is_read, products(image_url)') \
-                .order('created_at', desc=True) \
-                .limit(20) \
-                .execute()
-            
-            # Fetch the TOTAL unread count for the "red dot"
-            count_response = supabase.table('notifications') \
-                .select('id', count='exact') \
-                .eq('is_read', False) \
-                .execute()
+        fetch = functools.cache(functools.partial(_fetch_notifications, request.session.get('supa_access_token')))
+        return {
+            'notifications': SimpleLazyObject(lambda: fetch()['notifications']),
+            'notification_count': SimpleLazyObject(lambda: fetch()['notification_count']),
+        }
+    
+    # Return empty values if the user is not logged in
+    return {'notifications': [], 'notification_count': 0}
 
-            notifications_data = []
-            if response.data:
-                for item in response.data:
-                    try:
-                        # Convert ISO 8601 string to a timezone-aware datetime object
-                        item['created_at'] = datetime.fromisoformat(item['created_at'])
-                        notifications_data.append(item)
-                    except (ValueError, TypeError, KeyError):
-                        # Skip this notification if its date is missing or malformed
-                        pass
 
-            return {
-                'notifications': response.data,
-                'notification_count': count_response.count
-            }
-        except Exception as e:
-            print(f"Error fetching notifications: {e}")
+def chrome_cache_context(request):
+    """
+    Context processor for the cached page chrome (header, avatar and notification dropdown).
     
-    # Return empty values if the user is not logged in or an error occurs
-    return {'notifications': [], 'notification_count': 0}
\ No newline at end of file
+    Adds 'chrome_version', which changes whenever notifications or user profiles change
+    (see ViewDataCache.tag_versions), and 'chrome_cache_timeout' for the {% cache %}
+    blocks in student_base.html and admin_base.html. The fragments are also keyed by
+    user id and active page. A timeout of 0 disables the cache (VIEW_CACHE_ENABLED off).
+    """
+    enabled = getattr(settings, 'VIEW_CACHE_ENABLED', False)
+    return {
+        'chrome_version': SimpleLazyObject(lambda: view_cache.tag_versions(['notifications', 'user_profiles'])),
+        'chrome_cache_timeout': getattr(settings, 'CHROME_CACHE_TIMEOUT', 120) if enabled else 0,
+    }
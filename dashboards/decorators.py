@@ -1,5 +1,30 @@
 from django.shortcuts import redirect
 from django.contrib import messages
+from asgiref.sync import iscoroutinefunction
+from functools import wraps
+from .caching import invalidate_tags
+
+def _guard(function, denied):
+    """Wraps a view so it only runs when `denied(request)` returns None, else returns its response."""
+    if iscoroutinefunction(function):
+        @wraps(function)
+        async def async_wrap(request, *args, **kwargs):
+            if hasattr(request, 'auser'):
+                # Authenticate without blocking the event loop; request.user is then resolved
+                await request.auser()
+            response = denied(request)
+            if response is not None:
+                return response
+            return await function(request, *args, **kwargs)
+        return async_wrap
+
+    def wrap(request, *args, **kwargs):
+        response = denied(request)
+        if response is not None:
+            return response
+        return function(request, *args, **kwargs)
+    return wrap
+
 
 def student_required(function):
     """
@@ -9,21 +34,21 @@ def student_required(function):
     and verifies their user_type is 'student'. Redirects unauthenticated users to the login page
     and non-student users (such as admins) to the admin dashboard with appropriate warning messages.
     Returns the original function result if authorization checks pass.
+    Works on both regular and async views.
     """
-    def wrap(request, *args, **kwargs):
+    def denied(request):
         if not hasattr(request, 'user') or not request.user.is_authenticated:
             messages.error(request, "You must be logged in to view this page.")
             return redirect('login') 
 
         user_type = getattr(request.user, 'user_type', 'student')
 
-        if user_type == 'student':
-            return function(request, *args, **kwargs)
-        else:
+        if user_type != 'student':
             messages.warning(request, "This page is for students only.")
             return redirect('admin_dashboard') 
-    
-    return wrap
+        return None
+
+    return _guard(function, denied)
 
 
 def admin_required(function):
@@ -34,18 +59,47 @@ def admin_required(function):
     and verifies their user_type is 'admin'. Redirects unauthenticated users to the login page
     and non-admin users (such as students) to the student dashboard with appropriate warning messages.
     Returns the original function result if authorization checks pass.
+    Works on both regular and async views.
     """
-    def wrap(request, *args, **kwargs):
+    def denied(request):
         if not hasattr(request, 'user') or not request.user.is_authenticated:
             messages.error(request, "You must be logged in to view this page.")
             return redirect('login') 
 
         user_type = getattr(request.user, 'user_type', 'student')
 
-        if user_type == 'admin':
-            return function(request, *args, **kwargs)
-        else:
+        if user_type != 'admin':
             messages.warning(request, "You do not have permission to access this page.")
             return redirect('student_dashboard') 
+        return None
+
+    return _guard(function, denied)
+
+
+def invalidates(*tags):
+    """
+    Decorator for views that write to Supabase.
     
-    return wrap
+    After a successful POST (any response below 400, including redirects) it
+    invalidates cached view data tagged with the given tables, e.g.
+    @invalidates('products', 'orders') on a view that changes stock. Failed
+    requests leave the cache alone. Works on both regular and async views.
+    """
+    def decorator(function):
+        if iscoroutinefunction(function):
+            @wraps(function)
+            async def async_wrap(request, *args, **kwargs):
+                response = await function(request, *args, **kwargs)
+                if request.method == 'POST' and response.status_code < 400:
+                    invalidate_tags(*tags)
+                return response
+            return async_wrap
+
+        @wraps(function)
+        def wrap(request, *args, **kwargs):
+            response = function(request, *args, **kwargs)
+            if request.method == 'POST' and response.status_code < 400:
+                invalidate_tags(*tags)
+            return response
+        return wrap
+    return decorator
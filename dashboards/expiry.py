@@ -0,0 +1,147 @@
+from supabase_client import supabase_service
+from django.conf import settings
+from django.urls import reverse
+from collections import defaultdict
+from datetime import datetime, timezone
+from .inventory import adjust_stock_levels
+from .utils import notify_users
+from .caching import invalidate_tags
+import threading
+import time
+
+# Approved orders and pending reservations both hold stock until they expire.
+# Backorders never took stock, so they are left alone.
+EXPIRABLE_FILTER = 'status.eq.approved,and(status.eq.pending,order_type.eq.reservation)'
+
+_sweeper_thread = None
+_sweeper_lock = threading.Lock()
+
+
+def sweep_expired_orders(batch_size=200, max_batches=50):
+    """
+    Cancels every approved order and pending reservation whose expires_at has passed.
+
+    Works in batches: each pass selects up to batch_size overdue rows, flips them
+    to 'cancelled' with a single conditional update (only rows that are still
+    overdue and still in their original status are claimed, so two sweepers
+    running at once never double-restore stock), then returns the claimed
+    quantities to their products grouped per product and queues one bulk insert
+    of student notifications. Returns a summary dictionary with row counts and
+    the duration of each pass in milliseconds.
+    """
+    summary = {
+        'expired_orders': 0,
+        'expired_reservations': 0,
+        'products_restocked': 0,
+        'notifications_sent': 0,
+        'passes': [],
+    }
+    started = time.monotonic()
+
+    for _ in range(max_batches):
+        pass_started = time.monotonic()
+        now_iso = datetime.now(timezone.utc).isoformat()
+
+        overdue_res = supabase_service.table('orders') \
+            .select('id, user_id, product_id, quantity, status, order_type, products(name)') \
+            .lt('expires_at', now_iso) \
+            .or_(EXPIRABLE_FILTER) \
+            .order('expires_at') \
+            .limit(batch_size) \
+            .execute()
+        overdue = overdue_res.data or []
+        if not overdue:
+            break
+
+        overdue_by_id = {row['id']: row for row in overdue}
+        claimed_res = supabase_service.table('orders') \
+            .update({'status': 'cancelled'}) \
+            .in_('id', list(overdue_by_id.keys())) \
+            .in_('status', ['approved', 'pending']) \
+            .lt('expires_at', now_iso) \
+            .execute()
+        claimed_ids = [row['id'] for row in (claimed_res.data or [])]
+
+        restock = defaultdict(int)
+        notifications = []
+        for order_id in claimed_ids:
+            order = overdue_by_id[order_id]
+            restock[order.get('product_id')] += order.get('quantity') or 0
+            product_name = (order.get('products') or {}).get('name', 'your item')
+
+            if order.get('order_type') == 'reservation':
+                summary['expired_reservations'] += 1
+                notifications.append({
+                    'user_id': order['user_id'],
+                    'product_id': order.get('product_id'),
+                    'message': f"Your reservation for {product_name} has expired and was cancelled.",
+                    'link_url': reverse('my_reservations'),
+                })
+            else:
+                summary['expired_orders'] += 1
+                notifications.append({
+                    'user_id': order['user_id'],
+                    'product_id': order.get('product_id'),
+                    'message': f"Your order for {product_name} was not picked up in time and has expired.",
+                    'link_url': reverse('my_orders'),
+                })
+
+        summary['products_restocked'] += len(adjust_stock_levels(restock))
+        invalidate_tags('orders', 'products')
+        summary['notifications_sent'] += notify_users(notifications)
+        summary['passes'].append({
+            'rows': len(claimed_ids),
+            'duration_ms': round((time.monotonic() - pass_started) * 1000, 1),
+        })
+
+        if len(overdue) < batch_size:
+            break
+
+    summary['duration_ms'] = round((time.monotonic() - started) * 1000, 1)
+    return summary
+
+
+def _run_sweeper(interval, stop_event):
+    """
+    Loop body for the in-process sweeper thread. Sleeps for `interval` seconds
+    between passes and keeps running after errors so one failed Supabase call
+    doesn't permanently stop expiry.
+    """
+    while not stop_event.wait(interval):
+        try:
+            summary = sweep_expired_orders()
+            processed = summary['expired_orders'] + summary['expired_reservations']
+            if processed:
+                print(f"🕒 Expiry sweep: {processed} row(s) expired in {summary['duration_ms']} ms.")
+        except Exception as e:
+            print(f"--- Expiry sweeper error: {e} ---")
+
+
+def start_expiry_sweeper(interval=None):
+    """
+    Starts the background expiry sweeper thread for this process (at most once).
+
+    The interval defaults to settings.ORDER_EXPIRY_SWEEP_INTERVAL (seconds); a
+    value of 0 disables the in-process sweeper, e.g. when the management command
+    is scheduled by cron instead. Returns the threading.Event that stops the
+    thread, or None if the sweeper is disabled or already running.
+    """
+    global _sweeper_thread
+
+    if interval is None:
+        interval = getattr(settings, 'ORDER_EXPIRY_SWEEP_INTERVAL', 0)
+    if not interval or interval <= 0:
+        return None
+
+    with _sweeper_lock:
+        if _sweeper_thread is not None and _sweeper_thread.is_alive():
+            return None
+        stop_event = threading.Event()
+        _sweeper_thread = threading.Thread(
+            target=_run_sweeper,
+            args=(interval, stop_event),
+            name='order-expiry-sweeper',
+            daemon=True,
+        )
+        _sweeper_thread.start()
+    return stop_event
@@ -0,0 +1,297 @@
+from supabase_client import supabase_service
+from django.conf import settings
+import hashlib
+import io
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it only originals are stored
+    Image = None
+
+PRODUCT_IMAGES_BUCKET = 'product_images'
+AVATARS_BUCKET = 'avatars'
+
+# Derivative name -> (width, height). A height of None keeps the aspect ratio;
+# a fixed height crops to exactly that size (used for square thumbnails).
+PRODUCT_IMAGE_VARIANTS = {
+    'thumb': (160, 160),
+    'sm': (480, None),
+    'md': (960, None),
+}
+AVATAR_VARIANTS = {
+    'thumb': (96, 96),
+    'sm': (256, 256),
+}
+
+# File names of originals that have WebP derivatives carry this marker, so
+# templates only rewrite URLs that are known to have them.
+VARIANT_MARKER = '__rs'
+WEBP_QUALITY = 80
+
+# Leading bytes of the image formats we accept, used to double-check the
+# browser-supplied content type before anything is sent to storage.
+IMAGE_SIGNATURES = {
+    'image/jpeg': (b'\xff\xd8\xff',),
+    'image/png': (b'\x89PNG\r\n\x1a\n',),
+    'image/gif': (b'GIF87a', b'GIF89a'),
+    'image/webp': (b'RIFF',),
+}
+
+
+class ImageUploadError(ValueError):
+    """Raised when an uploaded file is rejected before it reaches storage."""
+
+
+def validate_image_upload(uploaded_file):
+    """
+    Checks an uploaded image against the configured size and type limits.
+
+    Rejects files larger than settings.IMAGE_UPLOAD_MAX_BYTES, content types not
+    in settings.IMAGE_UPLOAD_ALLOWED_TYPES, and files whose first bytes don't
+    match the claimed type (a renamed PDF, for example). Only the first few
+    bytes are read. Raises ImageUploadError with a user-facing message.
+    """
+    max_bytes = getattr(settings, 'IMAGE_UPLOAD_MAX_BYTES', 5 * 1024 * 1024)
+    allowed_types = getattr(settings, 'IMAGE_UPLOAD_ALLOWED_TYPES', list(IMAGE_SIGNATURES))
+
+    if uploaded_file.size > max_bytes:
+        raise ImageUploadError(f"Image is too large ({uploaded_file.size // 1024} KB). The limit is {max_bytes // 1024} KB.")
+
+    content_type = (uploaded_file.content_type or '').lower()
+    if content_type not in allowed_types:
+        raise ImageUploadError(f"Unsupported image type '{content_type}'. Please upload a JPEG, PNG, GIF or WebP file.")
+
+    uploaded_file.seek(0)
+    header = uploaded_file.read(16)
+    uploaded_file.seek(0)
+    signatures = IMAGE_SIGNATURES.get(content_type, ())
+    if signatures and not any(header.startswith(signature) for signature in signatures):
+        raise ImageUploadError("The uploaded file does not look like a valid image.")
+    if content_type == 'image/webp' and header[8:12] != b'WEBP':
+        raise ImageUploadError("The uploaded file does not look like a valid image.")
+
+
+def upload_source(uploaded_file):
+    """
+    Returns what to hand to storage3 for an uploaded file without loading it twice.
+
+    Files Django spooled to disk (anything over FILE_UPLOAD_MAX_MEMORY_SIZE) are
+    passed by path, which storage3 opens and httpx streams to Supabase in small
+    chunks. Small in-memory uploads are already bounded in size, so their bytes
+    are passed directly.
+    """
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        return uploaded_file.temporary_file_path()
+    uploaded_file.seek(0)
+    return uploaded_file.read()
+
+
+def build_derivatives(image_file, variants):
+    """
+    Renders WebP derivatives of an image file.
+
+    Reads from the (possibly on-disk) file object rather than a bytes copy, and
+    for JPEGs asks the decoder for a reduced-scale draft close to the largest
+    variant, so a 12 MP phone photo is never fully decoded in memory. Applies
+    the EXIF orientation first so phone photos aren't sideways, then
+    produces one WebP per entry in `variants`: fixed-size entries are centre
+    cropped to exactly (width, height), width-only entries are scaled down
+    (never up) keeping the aspect ratio. Returns a dict of variant name -> bytes,
+    or an empty dict if Pillow isn't installed or the file isn't a readable image.
+    """
+    if Image is None:
+        return {}
+
+    largest = max(max(width, height or 0) for width, height in variants.values())
+    try:
+        image_file.seek(0)
+        with Image.open(image_file) as source:
+            source.draft('RGB', (largest, largest))
+            source = ImageOps.exif_transpose(source)
+            if source.mode not in ('RGB', 'RGBA'):
+                source = source.convert('RGBA' if 'transparency' in source.info else 'RGB')
+
+            derivatives = {}
+            for name, (width, height) in variants.items():
+                if height:
+                    rendered = ImageOps.fit(source, (width, height), Image.LANCZOS)
+                else:
+                    rendered = source.copy()
+                    rendered.thumbnail((width, width * 10), Image.LANCZOS)
+                buffer = io.BytesIO()
+                rendered.save(buffer, format='WEBP', quality=WEBP_QUALITY, method=4)
+                derivatives[name] = buffer.getvalue()
+            return derivatives
+    except Exception as e:
+        print(f"Could not build image derivatives: {e}")
+        return {}
+    finally:
+        image_file.seek(0)
+
+
+def variant_path(path, variant):
+    """Returns the storage path of `variant` for an original path such as 'product_x__rs.jpg'."""
+    stem = path.rsplit('.', 1)[0]
+    return f'{stem}_{variant}.webp'
+
+
+def derivative_paths(path, variants):
+    """Lists the storage paths of every derivative of an original, or [] if it has none."""
+    if VARIANT_MARKER not in path:
+        return []
+    return [variant_path(path, variant) for variant in variants]
+
+
+def variant_url(url, variant):
+    """
+    Maps the public URL of an original to the URL of one of its derivatives.
+
+    Only URLs whose file name carries VARIANT_MARKER are rewritten; older uploads
+    and external placeholder URLs are returned unchanged, so callers can always
+    use the result directly.
+    """
+    if not url or variant is None:
+        return url
+    base, _, query = url.partition('?')
+    head, _, file_name = base.rpartition('/')
+    if VARIANT_MARKER not in file_name or '.' not in file_name:
+        return url
+    rewritten = f'{head}/{variant_path(file_name, variant)}'
+    return f'{rewritten}?{query}' if query else rewritten
+
+
+# Storage file extension per accepted content type, so identical bytes always
+# map to the same object name whatever the uploaded file was called.
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+}
+
+# Which table column references objects in each bucket.
+BUCKET_REFERENCES = {
+    PRODUCT_IMAGES_BUCKET: ('products', 'image_url'),
+    AVATARS_BUCKET: ('user_profiles', 'avatar_url'),
+}
+
+# Object names are content hashes, so stored files never change.
+IMMUTABLE_CACHE_CONTROL = '31536000'
+
+
+def content_hash(uploaded_file):
+    """
+    Returns the SHA-256 hex digest of an uploaded file.
+    Hashes Django's upload chunks one at a time, so large files aren't read into memory.
+    """
+    digest = hashlib.sha256()
+    uploaded_file.seek(0)
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def find_stored_original(storage, stem):
+    """
+    Looks for an already stored original whose name starts with `stem`.
+
+    Returns its file name (with or without the derivative marker) or None.
+    Derivative files share the stem, so they are skipped.
+    """
+    try:
+        entries = storage.list('', {'limit': 10, 'offset': 0, 'search': stem})
+    except Exception as e:
+        print(f"Could not look up '{stem}' in storage: {e}")
+        return None
+    for entry in entries or []:
+        name = entry.get('name', '')
+        if not name.startswith(stem):
+            continue
+        remainder = name[len(stem):]
+        if remainder.startswith(VARIANT_MARKER):
+            remainder = remainder[len(VARIANT_MARKER):]
+        if remainder.startswith('.'):
+            return name
+    return None
+
+
+def upload_image(bucket, uploaded_file, name_prefix, variants=PRODUCT_IMAGE_VARIANTS):
+    """
+    Uploads an image and its WebP derivatives to a Supabase Storage bucket.
+
+    Validates the file first (size, type and magic bytes), so a rejected upload
+    never sends a byte upstream. Objects are keyed by content: the original is
+    stored as '<name_prefix>_<sha256>.<ext>', so uploading the same photo again
+    (another product variant, the same avatar) finds the existing object and
+    skips the upload and the derivative rendering entirely. New originals are
+    stored next to a WebP file per variant ('..._thumb.webp', '..._sm.webp', ...)
+    that templates request via variant_url(), and are streamed from Django's
+    temporary upload file rather than read into memory. If the derivatives can't
+    be built, only the original is stored and its name has no marker. Returns
+    the public URL of the original.
+    """
+    validate_image_upload(uploaded_file)
+    content_type = uploaded_file.content_type.lower()
+    file_ext = CONTENT_TYPE_EXTENSIONS.get(content_type) or uploaded_file.name.split('.')[-1].lower()
+
+    storage = supabase_service.storage.from_(bucket)
+    stem = f'{name_prefix}_{content_hash(uploaded_file)}'
+
+    existing = find_stored_original(storage, stem)
+    if existing:
+        return storage.get_public_url(existing)
+
+    derivatives = build_derivatives(uploaded_file, variants)
+    file_name = f'{stem}{VARIANT_MARKER if derivatives else ""}.{file_ext}'
+
+    # upsert: two admins uploading the same photo at once both end up with the same object
+    storage.upload(
+        file=upload_source(uploaded_file),
+        path=file_name,
+        file_options={"content-type": content_type, "cache-control": IMMUTABLE_CACHE_CONTROL, "upsert": "true"}
+    )
+    for variant, variant_data in derivatives.items():
+        storage.upload(
+            file=variant_data,
+            path=variant_path(file_name, variant),
+            file_options={"content-type": "image/webp", "cache-control": IMMUTABLE_CACHE_CONTROL, "upsert": "true"}
+        )
+
+    return storage.get_public_url(file_name)
+
+
+def count_image_references(bucket, url):
+    """
+    Counts rows that still point at `url` in the table column that owns the bucket
+    (products.image_url or user_profiles.avatar_url). Returns None if unknown.
+    """
+    table, column = BUCKET_REFERENCES[bucket]
+    try:
+        response = supabase_service.table(table).select(column, count='exact').eq(column, url).limit(1).execute()
+        return response.count
+    except Exception as e:
+        print(f"Could not count references to '{url}': {e}")
+        return None
+
+
+def remove_image(bucket, url, variants=PRODUCT_IMAGE_VARIANTS):
+    """
+    Best-effort removal of an original (given by its public URL) and its derivatives.
+
+    Because identical uploads share one object, the object is only removed when
+    no row references it any more; if the reference count can't be determined
+    the file is kept (the storage garbage collector can reclaim it later).
+    Errors are printed, not raised, because a leftover file is never worth
+    failing a save.
+    """
+    if not url or not url.strip():
+        return
+    references = count_image_references(bucket, url)
+    if references is None or references > 0:
+        return
+    file_name = url.split('?')[0].split('/')[-1]
+    try:
+        supabase_service.storage.from_(bucket).remove([file_name] + derivative_paths(file_name, variants))
+    except Exception as e:
+        print(f"Could not remove old image '{file_name}': {e}")
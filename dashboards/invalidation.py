@@ -0,0 +1,121 @@
+from django.conf import settings
+import mmap
+import os
+import struct
+import threading
+
+try:
+    import fcntl
+except ImportError:  # No flock on Windows; generations are then counted per process
+    fcntl = None
+
+# Topics with a shared generation counter. Each one is bumped whenever rows of
+# the Supabase table of the same name change, by this app or anyone else.
+# New topics must be appended, since a topic's slot is its position here.
+INVALIDATION_TOPICS = (
+    'products',
+    'orders',
+    'notifications',
+    'user_profiles',
+    'activity_log',
+)
+
+_SLOT = struct.Struct('<Q')
+_SLOT_COUNT = 64
+
+
+class GenerationCounters:
+    """
+    Per-topic generation counters shared by every process on the host.
+
+    The counters live in a small memory-mapped file, so all gunicorn workers
+    see a bump immediately without any messaging: reading a generation is a
+    single 8-byte load from shared memory. Bumps take an exclusive flock on the
+    file so concurrent increments from several processes are never lost. A
+    cache that remembers the generation it was filled at knows it is stale as
+    soon as the current generation differs. Without fcntl (Windows) the
+    counters live in process memory instead, which still covers the single
+    process of the development server.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._mmap = None
+        self._fd = None
+        self._pid = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def _map(self):
+        # Reopen after a fork: flock() locks belong to the open file, so a
+        # descriptor inherited from a preloading master wouldn't exclude anyone.
+        if self._mmap is not None and self._pid == os.getpid():
+            return self._mmap
+        with self._lock:
+            if fcntl is None:
+                if self._mmap is None:
+                    self._mmap = bytearray(_SLOT.size * _SLOT_COUNT)
+                    self._pid = os.getpid()
+            elif self._mmap is None or self._pid != os.getpid():
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                size = _SLOT.size * _SLOT_COUNT
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    if os.fstat(fd).st_size < size:
+                        os.ftruncate(fd, size)
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                self._fd = fd
+                self._mmap = mmap.mmap(fd, size)
+                self._pid = os.getpid()
+        return self._mmap
+
+    @staticmethod
+    def _offset(topic):
+        return INVALIDATION_TOPICS.index(topic) * _SLOT.size
+
+    def _shared(self):
+        # A counter file that can't be created (read-only disk) just means no
+        # shared invalidation: generations stay at 0 and caches fall back to TTLs.
+        try:
+            return self._map()
+        except OSError as e:
+            if not self._failed:
+                print(f"Could not open cache generation file '{self.path}': {e}")
+                self._failed = True
+            return None
+
+    def get(self, topic):
+        """Returns the current generation of `topic`."""
+        offset = self._offset(topic)
+        shared = self._shared()
+        return _SLOT.unpack_from(shared, offset)[0] if shared is not None else 0
+
+    def snapshot(self, *topics):
+        """Returns a tuple of the generations of `topics`, suitable as part of a cache key."""
+        return tuple(self.get(topic) for topic in topics or INVALIDATION_TOPICS)
+
+    def bump(self, *topics):
+        """Increments the generation of each topic, invalidating everything cached against it."""
+        shared = self._shared()
+        if shared is None:
+            return
+        if fcntl is None:
+            with self._lock:
+                self._increment(shared, topics)
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            self._increment(shared, topics)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _increment(self, shared, topics):
+        for topic in topics:
+            offset = self._offset(topic)
+            _SLOT.pack_into(shared, offset, _SLOT.unpack_from(shared, offset)[0] + 1)
+
+
+generations = GenerationCounters(
+    getattr(settings, 'CACHE_GENERATION_FILE', os.path.join(str(settings.BASE_DIR), 'media', 'cache_generations.bin'))
+)
@@ -0,0 +1,54 @@
+from supabase_client import supabase_service
+from collections import defaultdict
+
+
+def adjust_stock_levels(product_quantities, max_retries=5):
+    """
+    Applies stock deltas to many products, one conditional update per product.
+
+    Accepts a mapping of product_id -> quantity delta (positive restores stock,
+    negative consumes it). Quantities for the same product are summed first so a
+    batch of 200 expired orders against 3 products costs 3 writes, not 200.
+    Current stock for every affected product is read in a single query. Each
+    write is conditional on the stock value that was read, so a concurrent
+    purchase between the read and the write makes the update match zero rows;
+    those products are re-read and retried. Returns a dict of
+    product_id -> new stock quantity for the products that were updated.
+    """
+    pending = defaultdict(int)
+    for product_id, delta in product_quantities.items():
+        if product_id is not None and delta:
+            pending[int(product_id)] += int(delta)
+
+    updated = {}
+    attempt = 0
+    while pending and attempt < max_retries:
+        attempt += 1
+        current_res = supabase_service.table('products') \
+            .select('id, stock_quantity') \
+            .in_('id', list(pending.keys())) \
+            .execute()
+        current_stock = {row['id']: row.get('stock_quantity') or 0 for row in (current_res.data or [])}
+
+        conflicts = {}
+        for product_id, delta in pending.items():
+            if product_id not in current_stock:
+                # Product was deleted; nothing left to restore.
+                continue
+            old_stock = current_stock[product_id]
+            new_stock = max(old_stock + delta, 0)
+            res = supabase_service.table('products') \
+                .update({'stock_quantity': new_stock, 'is_available': new_stock > 0}) \
+                .eq('id', product_id) \
+                .eq('stock_quantity', old_stock) \
+                .execute()
+            if res.data:
+                updated[product_id] = new_stock
+            else:
+                conflicts[product_id] = delta
+        pending = conflicts
+
+    if pending:
+        print(f"Could not adjust stock after {max_retries} attempts for products: {list(pending.keys())}")
+
+    return updated
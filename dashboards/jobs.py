@@ -0,0 +1,275 @@
+from supabase_client import supabase_service
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from storage3.utils import StorageException
+from .images import upload_image, remove_image, ImageUploadError, PRODUCT_IMAGES_BUCKET
+from .models import ImageJob
+from .mirror import mirror_rows
+from .caching import invalidate_tags
+import os
+import tempfile
+import threading
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class SpooledImage(UploadedFile):
+    """
+    A spooled upload reopened from disk by a worker.
+    Exposes temporary_file_path() so upload_image streams it by path like a Django temp upload.
+    """
+    def __init__(self, path, name, content_type):
+        super().__init__(open(path, 'rb'), name=name, content_type=content_type, size=os.path.getsize(path))
+        self._path = path
+
+    def temporary_file_path(self):
+        return self._path
+
+
+def image_jobs_enabled():
+    """Whether product images are processed by background workers (settings.IMAGE_JOBS_ENABLED)."""
+    return getattr(settings, 'IMAGE_JOBS_ENABLED', False)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'IMAGE_JOB_WORKERS', 2),
+                thread_name_prefix='image-job',
+            )
+        return _executor
+
+
+def _staging_path(spool_path):
+    prefix = getattr(settings, 'IMAGE_JOB_STAGING_PREFIX', 'image_jobs')
+    return f"{prefix}/{os.path.basename(spool_path)}"
+
+
+def stage_upload(spool_path, content_type):
+    """
+    Copies a spooled upload to the staging prefix of the product images bucket.
+
+    The spool directory is on the instance's own disk, which a redeploy wipes
+    and other instances can't read, so the staged copy is what lets any
+    process resume the job. Streams the file by path. Returns the object path.
+    """
+    staging_path = _staging_path(spool_path)
+    supabase_service.storage.from_(PRODUCT_IMAGES_BUCKET).upload(
+        file=spool_path,
+        path=staging_path,
+        file_options={"content-type": content_type, "upsert": "true"},
+    )
+    return staging_path
+
+
+def spool_upload(uploaded_file):
+    """
+    Copies an uploaded file into settings.IMAGE_JOB_SPOOL_DIR chunk by chunk.
+    Django deletes its own temporary upload file when the request ends, so the
+    worker needs a copy that outlives the request. Returns the spooled path.
+    """
+    spool_dir = Path(settings.IMAGE_JOB_SPOOL_DIR)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=spool_dir, suffix='.upload')
+    with os.fdopen(fd, 'wb') as spooled:
+        for chunk in uploaded_file.chunks():
+            spooled.write(chunk)
+    uploaded_file.seek(0)
+    return path
+
+
+def enqueue_image_job(product_id, uploaded_file, replaces_url=None):
+    """
+    Queues an already validated product image for background upload.
+
+    Spools the file locally, stages a copy in Supabase Storage and records an
+    ImageJob row, so any process can resume the job after a restart or
+    redeploy, then hands it to the worker pool. Only that one upload happens
+    on the request path; the derivatives are rendered and uploaded by the
+    worker, which sets products.image_url and removes `replaces_url` when it
+    finishes. Returns the ImageJob.
+    """
+    spool_path = spool_upload(uploaded_file)
+    try:
+        staging_path = stage_upload(spool_path, uploaded_file.content_type)
+        job = ImageJob.objects.create(
+            product_id=product_id,
+            spool_path=spool_path,
+            staging_path=staging_path,
+            original_name=uploaded_file.name,
+            content_type=uploaded_file.content_type,
+            replaces_url=replaces_url or None,
+        )
+    except Exception:
+        _discard_spool(spool_path)
+        raise
+    submit_image_job(job.id)
+    return job
+
+
+def submit_image_job(job_id, delay=0):
+    """Schedules a queued job on the worker pool, optionally after `delay` seconds."""
+    if delay:
+        timer = threading.Timer(delay, submit_image_job, args=(job_id,))
+        timer.daemon = True
+        timer.start()
+        return
+    _get_executor().submit(run_image_job, job_id)
+
+
+def _discard_spool(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Could not remove spooled upload '{path}': {e}")
+
+
+def _discard_staged(staging_path):
+    if not staging_path:
+        return
+    try:
+        supabase_service.storage.from_(PRODUCT_IMAGES_BUCKET).remove([staging_path])
+    except Exception as e:
+        print(f"Could not remove staged upload '{staging_path}': {e}")
+
+
+def _local_payload(job):
+    """
+    Returns a local path holding the job's upload: the spool file when this
+    process spooled it, otherwise a fresh download of the staged copy.
+    """
+    if os.path.exists(job.spool_path):
+        return job.spool_path
+    if not job.staging_path:
+        raise ImageUploadError("The spooled upload is missing.")
+    try:
+        data = supabase_service.storage.from_(PRODUCT_IMAGES_BUCKET).download(job.staging_path)
+    except StorageException as e:
+        details = e.args[0] if e.args and isinstance(e.args[0], dict) else {}
+        if details.get('statusCode') in (400, 404):  # Storage answers 400 for a missing object
+            raise ImageUploadError("The staged upload is missing.")
+        raise
+    spool_dir = Path(settings.IMAGE_JOB_SPOOL_DIR)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=spool_dir, suffix='.upload')
+    with os.fdopen(fd, 'wb') as spooled:
+        spooled.write(data)
+    return path
+
+
+def _finish(job, status, **fields):
+    ImageJob.objects.filter(id=job.id).update(status=status, updated_at=timezone.now(), **fields)
+    _discard_spool(job.spool_path)
+    _discard_staged(job.staging_path)
+
+
+def run_image_job(job_id):
+    """
+    Processes one image job: upload (with derivatives), then patch the product.
+
+    The job is claimed with a conditional update from 'queued' to 'running', so
+    when several server processes resume the same backlog only one runs it. A
+    job is marked 'superseded' instead of patching if a newer image was queued
+    for the same product in the meantime. Failures are retried with exponential
+    backoff up to settings.IMAGE_JOB_MAX_ATTEMPTS; a rejected image fails at once.
+    """
+    close_old_connections()
+    try:
+        claimed = ImageJob.objects.filter(id=job_id, status=ImageJob.Status.QUEUED) \
+            .update(status=ImageJob.Status.RUNNING, attempts=F('attempts') + 1, updated_at=timezone.now())
+        if not claimed:
+            return
+        job = ImageJob.objects.get(id=job_id)
+
+        try:
+            payload_path = _local_payload(job)
+            image = SpooledImage(payload_path, job.original_name, job.content_type)
+            try:
+                image_url = upload_image(PRODUCT_IMAGES_BUCKET, image, 'product')
+            finally:
+                image.close()
+                if payload_path != job.spool_path:
+                    _discard_spool(payload_path)
+
+            newer_job = ImageJob.objects.filter(product_id=job.product_id, id__gt=job.id) \
+                .exclude(status=ImageJob.Status.FAILED) \
+                .exists()
+            if newer_job:
+                _finish(job, ImageJob.Status.SUPERSEDED, image_url=image_url)
+                return
+
+            patched = supabase_service.table('products').update({'image_url': image_url}).eq('id', job.product_id).execute()
+            mirror_rows('products', patched.data or [])
+            invalidate_tags('products')
+            _finish(job, ImageJob.Status.DONE, image_url=image_url, error='')
+            if job.replaces_url and job.replaces_url != image_url:
+                remove_image(PRODUCT_IMAGES_BUCKET, job.replaces_url)
+
+        except ImageUploadError as e:
+            print(f"Image job #{job.id} rejected: {e}")
+            _finish(job, ImageJob.Status.FAILED, error=str(e))
+        except Exception as e:
+            max_attempts = getattr(settings, 'IMAGE_JOB_MAX_ATTEMPTS', 5)
+            if job.attempts < max_attempts:
+                print(f"Image job #{job.id} failed (attempt {job.attempts}), retrying: {e}")
+                ImageJob.objects.filter(id=job.id).update(status=ImageJob.Status.QUEUED, error=str(e), updated_at=timezone.now())
+                submit_image_job(job.id, delay=2 ** job.attempts)
+            else:
+                print(f"Image job #{job.id} failed after {job.attempts} attempts: {e}")
+                _finish(job, ImageJob.Status.FAILED, error=str(e))
+    except Exception as e:
+        print(f"Error running image job #{job_id}: {e}")
+    finally:
+        close_old_connections()
+
+
+def resume_image_jobs():
+    """
+    Re-submits jobs left over from a previous run.
+
+    Queued jobs are submitted as they are; 'running' jobs that haven't been
+    touched for settings.IMAGE_JOB_STALE_AFTER seconds belonged to a process
+    that died mid-upload and are put back in the queue first. Returns the
+    number of jobs submitted.
+    """
+    stale_before = timezone.now() - timedelta(seconds=getattr(settings, 'IMAGE_JOB_STALE_AFTER', 600))
+    ImageJob.objects.filter(status=ImageJob.Status.RUNNING, updated_at__lt=stale_before) \
+        .update(status=ImageJob.Status.QUEUED, updated_at=timezone.now())
+
+    job_ids = list(ImageJob.objects.filter(status=ImageJob.Status.QUEUED).order_by('id').values_list('id', flat=True))
+    for job_id in job_ids:
+        submit_image_job(job_id)
+    return len(job_ids)
+
+
+def start_image_workers():
+    """
+    Resumes pending image jobs for this process at start-up.
+
+    Does nothing when background image processing is disabled. Errors (for
+    example a database without the job table yet) are printed, not raised, so
+    a missing migration never stops the site from starting.
+    """
+    if not image_jobs_enabled():
+        return 0
+    try:
+        resumed = resume_image_jobs()
+    except Exception as e:
+        print(f"Could not resume image jobs: {e}")
+        return 0
+    finally:
+        close_old_connections()
+    if resumed:
+        print(f"Resumed {resumed} pending image job(s).")
+    return resumed
@@ -0,0 +1,143 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from pathlib import Path
+import re
+
+try:
+    from fontTools import subset
+except ImportError:  # fonttools (with brotli for WOFF2) is only needed to rebuild the font
+    subset = None
+
+# Font Awesome style class -> (webfont file, font-family, font-weight)
+ICON_STYLES = {
+    'fa-solid': ('fa-solid-900', 'Font Awesome 6 Free', 900),
+    'fa-regular': ('fa-regular-400', 'Font Awesome 6 Free', 400),
+    'fa-brands': ('fa-brands-400', 'Font Awesome 6 Brands', 400),
+}
+STYLE_ALIASES = {'fas': 'fa-solid', 'far': 'fa-regular', 'fab': 'fa-brands'}
+
+ICON_CLASS_RE = re.compile(r'\bfa-[a-z0-9]+(?:-[a-z0-9]+)*\b')
+ICON_RULE_RE = re.compile(r'((?:\.fa-[a-z0-9-]+::before,?\s*)+)\{\s*content:\s*"\\([0-9a-f]+)";\s*\}')
+
+BASE_CSS = """\
+.fa-solid, .fa-regular, .fa-brands, .fas, .far, .fab {
+  -moz-osx-font-smoothing: grayscale;
+  -webkit-font-smoothing: antialiased;
+  display: var(--fa-display, inline-block);
+  font-style: normal;
+  font-variant: normal;
+  line-height: 1;
+  text-rendering: auto; }
+
+.fa-solid, .fa-regular, .fas, .far {
+  font-family: 'Font Awesome 6 Free'; }
+
+.fa-solid, .fas {
+  font-weight: 900; }
+
+.fa-regular, .far {
+  font-weight: 400; }
+
+.fa-brands, .fab {
+  font-family: 'Font Awesome 6 Brands';
+  font-weight: 400; }
+"""
+
+
+def _default_source():
+    try:
+        import fontawesomefree
+    except ImportError:
+        return None
+    return Path(fontawesomefree.__file__).parent / 'static' / 'fontawesomefree'
+
+
+class Command(BaseCommand):
+    """
+    Builds static/css/icons.css and subsetted Font Awesome webfonts.
+
+    Scans the templates and static scripts for fa-* classes, keeps only those
+    icons' glyphs in each style's font, and writes a stylesheet with just their
+    rules. The result is a few KB served from our own static files instead of
+    the full Font Awesome CSS and fonts from cdnjs, so pages also work on the
+    offline campus LAN. Run it again after using a new icon. Reads Font Awesome
+    Free from the fontawesomefree package (or --source) and needs fonttools.
+    """
+    help = 'Subset the Font Awesome icons used by the templates into static/css/icons.css and static/fonts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', help='Font Awesome Free directory containing css/all.css and webfonts/.')
+
+    def _used_classes(self):
+        base_dir = Path(settings.BASE_DIR)
+        paths = list((base_dir / 'templates').rglob('*.html')) + list((base_dir / 'static' / 'js').glob('*.js'))
+        classes = set()
+        for path in paths:
+            text = path.read_text(encoding='utf-8')
+            classes.update(ICON_CLASS_RE.findall(text))
+            classes.update(STYLE_ALIASES[alias] for alias in re.findall(r'\b(fa[srb])\b', text))
+        return classes
+
+    def handle(self, *args, **options):
+        if subset is None:
+            raise CommandError("fonttools is required: pip install fonttools brotli")
+        source = Path(options['source']) if options['source'] else _default_source()
+        if source is None or not (source / 'css' / 'all.css').exists():
+            raise CommandError("Font Awesome Free not found. Install fontawesomefree or pass --source.")
+
+        codepoints = {}
+        for selectors, codepoint in ICON_RULE_RE.findall((source / 'css' / 'all.css').read_text(encoding='utf-8')):
+            for selector in re.findall(r'\.(fa-[a-z0-9-]+)::before', selectors):
+                codepoints[selector] = codepoint
+
+        used = self._used_classes()
+        styles = sorted(style for style in ICON_STYLES if style in used) or ['fa-solid']
+        icons = sorted(name for name in used if name in codepoints)
+        unknown = sorted(name for name in used - set(codepoints) - set(ICON_STYLES))
+        if unknown:
+            self.stdout.write(self.style.WARNING(f"Not icons, ignored: {', '.join(unknown)}"))
+
+        static_dir = Path(settings.BASE_DIR) / 'static'
+        fonts_dir = static_dir / 'fonts'
+        fonts_dir.mkdir(parents=True, exist_ok=True)
+        unicodes = [int(codepoints[name], 16) for name in icons]
+
+        font_faces = []
+        for style in styles:
+            file_name, family, weight = ICON_STYLES[style]
+            subset_options = subset.Options()
+            subset_options.flavor = 'woff2'
+            subset_options.layout_features = []
+            subset_options.name_IDs = ['*']
+            subset_options.notdef_outline = True
+            font = subset.load_font(str(source / 'webfonts' / f'{file_name}.ttf'), subset_options)
+            subsetter = subset.Subsetter(subset_options)
+            subsetter.populate(unicodes=unicodes)
+            subsetter.subset(font)
+            output = fonts_dir / f'{file_name}.subset.woff2'
+            subset.save_font(font, str(output), subset_options)
+            font_faces.append(
+                "@font-face {\n"
+                f"  font-family: '{family}';\n"
+                "  font-style: normal;\n"
+                f"  font-weight: {weight};\n"
+                "  font-display: block;\n"
+                f"  src: url(\"../fonts/{output.name}\") format(\"woff2\"); }}\n"
+            )
+            self.stdout.write(f"{output.relative_to(static_dir)}: {output.stat().st_size} bytes")
+
+        css = [
+            "/*!\n"
+            " * Generated by `python manage.py build_icon_font`; do not edit by hand.\n"
+            " * Font Awesome Free by @fontawesome - https://fontawesome.com\n"
+            " * License - https://fontawesome.com/license/free (Icons: CC BY 4.0, Fonts: SIL OFL 1.1, Code: MIT License)\n"
+            " */\n",
+            BASE_CSS,
+            *font_faces,
+            *(f'.{name}::before {{\n  content: "\\{codepoints[name]}"; }}\n' for name in icons),
+        ]
+        stylesheet = static_dir / 'css' / 'icons.css'
+        stylesheet.write_text('\n'.join(css), encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(icons)} icon(s) in {len(styles)} style(s) to {stylesheet.relative_to(static_dir)}."
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from dashboards.expiry import sweep_expired_orders
+
+
+class Command(BaseCommand):
+    """
+    Expires overdue approved orders and pending reservations and restores their stock.
+
+    Intended to be scheduled (e.g. a Render cron job) when the in-process sweeper
+    is disabled. Prints how many rows were processed and how long each pass took.
+    """
+    help = 'Cancel approved orders and reservations whose expires_at has passed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='Rows claimed per pass.')
+        parser.add_argument('--max-batches', type=int, default=50, help='Upper bound on passes per run.')
+
+    def handle(self, *args, **options):
+        summary = sweep_expired_orders(
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+        )
+
+        for index, sweep_pass in enumerate(summary['passes'], start=1):
+            self.stdout.write(f"Pass {index}: {sweep_pass['rows']} row(s) in {sweep_pass['duration_ms']} ms")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired {summary['expired_orders']} order(s) and {summary['expired_reservations']} reservation(s), "
+            f"restocked {summary['products_restocked']} product(s), sent {summary['notifications_sent']} "
+            f"notification(s) in {summary['duration_ms']} ms."
+        ))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from datetime import timedelta
+from dashboards.images import BUCKET_REFERENCES
+from dashboards.storage_gc import collect_orphaned_objects
+
+
+class Command(BaseCommand):
+    """
+    Deletes storage objects that no product or profile references any more.
+
+    Covers images left behind by deleted products, batch deletes, replaced
+    avatars and deleted students. Run with --dry-run first to see what would go.
+    """
+    help = 'Garbage-collect unreferenced objects in the product_images and avatars buckets.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bucket', action='append', choices=sorted(BUCKET_REFERENCES),
+                            help='Bucket to collect (repeatable). Defaults to all buckets.')
+        parser.add_argument('--dry-run', action='store_true', help='Report orphaned objects without deleting them.')
+        parser.add_argument('--batch-size', type=int, default=100, help='Objects removed per delete request.')
+        parser.add_argument('--min-age-hours', type=float, default=1.0,
+                            help='Keep objects uploaded more recently than this.')
+
+    def handle(self, *args, **options):
+        for bucket in options['bucket'] or sorted(BUCKET_REFERENCES):
+            summary = collect_orphaned_objects(
+                bucket,
+                dry_run=options['dry_run'],
+                batch_size=options['batch_size'],
+                min_age=timedelta(hours=options['min_age_hours']),
+            )
+
+            if summary['dry_run']:
+                for name in summary['orphan_names']:
+                    self.stdout.write(f"  would delete {bucket}/{name}")
+
+            verb = 'Would delete' if summary['dry_run'] else 'Deleted'
+            count = summary['orphaned'] if summary['dry_run'] else summary['deleted']
+            self.stdout.write(self.style.SUCCESS(
+                f"[{bucket}] Scanned {summary['scanned']} object(s) in {summary['duration_s']} s "
+                f"({summary['objects_per_s']} objects/s): {summary['referenced']} referenced, "
+                f"{summary['too_recent']} too recent. {verb} {count} orphan(s), "
+                f"{summary['bytes'] / (1024 * 1024):.1f} MB."
+            ))
+            if summary['reused']:
+                self.stdout.write(f"[{bucket}] Kept {summary['reused']} object(s) that were reused during the run.")
+            if summary['failed']:
+                self.stdout.write(self.style.WARNING(f"[{bucket}] {summary['failed']} object(s) could not be deleted."))
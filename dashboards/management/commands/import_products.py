@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from dashboards.catalog import import_products, IMPORT_COLUMNS
+import os
+
+
+class Command(BaseCommand):
+    """
+    Loads a product catalog from a CSV or XLSX file.
+
+    Uses the same validation and chunked writes as the import button on the
+    manage products page. Run with --dry-run first to check the file.
+    """
+    help = 'Import products from a CSV or XLSX file (columns: ' + ', '.join(sorted(set(IMPORT_COLUMNS.values()))) + ').'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file to import.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the file without writing anything.')
+        parser.add_argument('--chunk-size', type=int, default=None, help='Products written per request.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isfile(path):
+            raise CommandError(f"File not found: {path}")
+
+        try:
+            with open(path, 'rb') as import_file:
+                report = import_products(import_file, path, dry_run=options['dry_run'], chunk_size=options['chunk_size'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for error in report['errors']:
+            self.stdout.write(self.style.WARNING(f"  row {error['row']}: {' '.join(error['errors'])}"))
+        if report['error_count'] > len(report['errors']):
+            self.stdout.write(self.style.WARNING(f"  ... and {report['error_count'] - len(report['errors'])} more"))
+
+        if report['dry_run']:
+            summary = f"{report['valid']} of {report['rows']} row(s) are valid"
+        else:
+            summary = (
+                f"Created {report['created']} and updated {report['updated']} product(s) "
+                f"from {report['rows']} row(s)"
+            )
+            if report['backorders_fulfilled']:
+                summary += f", reserving {report['backorders_fulfilled']} backorder(s)"
+        self.stdout.write(self.style.SUCCESS(f"{summary} in {report['duration_ms']} ms. {report['error_count']} row(s) had errors."))
@@ -0,0 +1,139 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+try:
+    import httpx
+except ImportError:  # httpx ships with supabase-py
+    httpx = None
+
+# name -> gunicorn arguments for one worker process of each kind
+SERVERS = {
+    'wsgi': ['config.wsgi:application', '--worker-class', 'gthread', '--threads', '{threads}'],
+    'asgi': ['config.asgi:application', '--worker-class', 'uvicorn.workers.UvicornWorker'],
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def _run_load(base_url, paths, total, concurrency, cookies, timeout):
+    """Sends `total` GETs spread over `paths` with `concurrency` in flight; returns the stats."""
+    latencies, statuses = [], {}
+    queue = asyncio.Queue()
+    for index in range(total):
+        queue.put_nowait(paths[index % len(paths)])
+
+    async with httpx.AsyncClient(base_url=base_url, cookies=cookies, timeout=timeout, follow_redirects=False) as client:
+        async def worker():
+            while True:
+                try:
+                    path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    status = response.status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': total,
+        'seconds': round(elapsed, 2),
+        'throughput': round(total / elapsed, 1),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 1),
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+        'statuses': statuses,
+    }
+
+
+class Command(BaseCommand):
+    """
+    Compares the throughput of one WSGI and one ASGI worker process on the async pages.
+
+    For each server kind it starts a single gunicorn worker (gthread for WSGI,
+    uvicorn for ASGI) on a free local port, waits for it to answer, sends the
+    same concurrent GET load to the given paths and stops it. Reports requests
+    per second, median and p95 latency and the response status counts. Pages
+    behind login need a session: pass the sessionid cookie of a signed-in
+    admin with --cookie. With --url the load goes to an already running server
+    instead, which is how to test a deployed instance. Locally, run it with
+    DEBUG=True so the workers accept 127.0.0.1 as a host.
+    """
+    help = 'Load test the reports, student dashboard and order management pages under WSGI and ASGI.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Path to request (repeatable). Defaults to the async views.')
+        parser.add_argument('--requests', type=int, default=200, help='Total requests per server.')
+        parser.add_argument('--concurrency', type=int, default=20, help='Requests in flight at once.')
+        parser.add_argument('--threads', type=int, default=4, help='Threads of the WSGI worker.')
+        parser.add_argument('--cookie', action='append', default=[], help='Cookie as name=value (repeatable).')
+        parser.add_argument('--server', action='append', choices=list(SERVERS), help='Server kinds to test. Defaults to both.')
+        parser.add_argument('--url', help='Test this running server instead of starting local workers.')
+        parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds.')
+
+    def _start_server(self, kind, port, threads):
+        command = [sys.executable, '-m', 'gunicorn', '--workers', '1', '--bind', f'127.0.0.1:{port}', '--log-level', 'warning']
+        command += [argument.format(threads=threads) for argument in SERVERS[kind]]
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=os.environ.copy())
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"The {kind} server exited with code {process.returncode}.")
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+                return process
+            except OSError:
+                time.sleep(0.2)
+        process.terminate()
+        raise CommandError(f"The {kind} server did not start within 30 seconds.")
+
+    def _report(self, label, stats):
+        statuses = ', '.join(f"{status}: {count}" for status, count in sorted(stats['statuses'].items(), key=str))
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: {stats['throughput']} req/s ({stats['requests']} in {stats['seconds']} s), "
+            f"p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms [{statuses}]"
+        ))
+
+    def handle(self, *args, **options):
+        if httpx is None:
+            raise CommandError("httpx is required for the load test.")
+        paths = options['paths'] or ['/dashboard/admin/reports/', '/dashboard/admin/order-management/', '/dashboard/student/']
+        cookies = dict(cookie.split('=', 1) for cookie in options['cookie'])
+
+        def load(base_url):
+            return asyncio.run(_run_load(
+                base_url, paths, options['requests'], options['concurrency'], cookies, options['timeout'],
+            ))
+
+        if options['url']:
+            self._report(options['url'], load(options['url']))
+            return
+
+        for kind in options['server'] or list(SERVERS):
+            port = _free_port()
+            process = self._start_server(kind, port, options['threads'])
+            try:
+                stats = load(f'http://127.0.0.1:{port}')
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+            self._report(f"{kind.upper()} (1 process)", stats)
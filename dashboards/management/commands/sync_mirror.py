@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from dashboards.mirror import MIRRORED_TABLES, sync_mirror
+
+
+class Command(BaseCommand):
+    """
+    Copies Supabase tables into the local read mirror.
+
+    The first run (or --full) loads every row; later runs only fetch rows
+    changed since the previous sync. Schedule it with cron when the in-process
+    sync thread is disabled (MIRROR_SYNC_INTERVAL=0).
+    """
+    help = 'Sync the local read mirror of the products, orders, notifications and activity_log tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--table', action='append', choices=list(MIRRORED_TABLES),
+                            help='Table to sync (repeatable). Defaults to all mirrored tables.')
+        parser.add_argument('--full', action='store_true', help='Reload every row and drop rows deleted upstream.')
+
+    def handle(self, *args, **options):
+        for summary in sync_mirror(tables=options['table'], full=options['full']):
+            if summary.get('error'):
+                self.stdout.write(self.style.ERROR(f"[{summary['table']}] {summary['mode']} sync failed: {summary['error']}"))
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f"[{summary['table']}] {summary['mode'].title()} sync: {summary['fetched']} row(s) fetched, "
+                f"{summary['deleted']} deleted in {summary['duration_ms']} ms."
+            ))
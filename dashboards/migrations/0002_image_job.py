@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-19 01:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboards', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageJob',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('product_id', models.IntegerField(db_index=True, help_text='Supabase products.id to patch')),
+                ('spool_path', models.CharField(max_length=1024)),
+                ('original_name', models.CharField(max_length=255)),
+                ('content_type', models.CharField(max_length=100)),
+                ('replaces_url', models.URLField(blank=True, help_text='Image to remove once the new one is live', max_length=1024, null=True)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('superseded', 'Superseded'), ('failed', 'Failed')], db_index=True, default='queued', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('image_url', models.URLField(blank=True, max_length=1024, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
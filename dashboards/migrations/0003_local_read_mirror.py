@@ -0,0 +1,164 @@
+# Generated by Django 5.1.1 on 2026-10-19 01:53
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboards', '0002_image_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MirrorSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=64, unique=True)),
+                ('cursor', models.CharField(blank=True, max_length=64, null=True)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('last_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('last_full_sync_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('user_id', models.UUIDField()),
+                ('message', models.TextField()),
+                ('link_url', models.CharField(blank=True, max_length=1024, null=True)),
+                ('is_read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+            ],
+        ),
+        migrations.RemoveField(
+            model_name='activitylog',
+            name='user',
+        ),
+        migrations.RemoveField(
+            model_name='order',
+            name='user',
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='user_id',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='is_urgent',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='user_id',
+            field=models.UUIDField(db_index=True, default=uuid.UUID('00000000-0000-0000-0000-000000000000')),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='size',
+            field=models.CharField(blank=True, help_text='Only set for Uniforms', max_length=10, null=True),
+        ),
+        migrations.AlterField(
+            model_name='activitylog',
+            name='created_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='created_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='order_type',
+            field=models.CharField(choices=[('order', 'Order'), ('reservation', 'Reservation'), ('backorder', 'Backorder')], default='order', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='payment_method',
+            field=models.CharField(blank=True, default='Cash', max_length=50, null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='product',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='orders', to='dashboards.product'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='total_price',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='updated_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='created_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='description',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='updated_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['-created_at'], name='activitylog_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['action'], name='activitylog_action_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'order_type'], name='order_status_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['product', 'status', 'order_type'], name='order_product_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user_id', '-created_at'], name='order_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'name'], name='product_category_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['is_available', 'stock_quantity'], name='product_availability_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-created_at'], name='product_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='product',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='dashboards.product'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user_id', 'is_read', '-created_at'], name='notification_user_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 03:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboards', '0003_local_read_mirror'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mirrorsyncstate',
+            name='generation',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
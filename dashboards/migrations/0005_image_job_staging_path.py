@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboards', '0004_mirror_sync_generation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagejob',
+            name='staging_path',
+            field=models.CharField(blank=True, help_text='Staged copy in the product images bucket', max_length=1024),
+        ),
+    ]
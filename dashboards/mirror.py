@@ -0,0 +1,287 @@
+from supabase_client import supabase_service
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import UUID
+from .invalidation import generations
+from .models import Product, Order, Notification, ActivityLog, MirrorSyncState
+import threading
+import time
+
+# Supabase table -> (local model, column used as the incremental sync cursor).
+# Products are listed first so orders and notifications find their product.
+# activity_log rows are never edited, so its id is enough as a cursor.
+MIRRORED_TABLES = {
+    'products': (Product, 'updated_at'),
+    'orders': (Order, 'updated_at'),
+    'notifications': (Notification, 'updated_at'),
+    'activity_log': (ActivityLog, 'id'),
+}
+
+_sync_thread = None
+_sync_lock = threading.Lock()
+
+
+def mirror_reads_enabled():
+    """Whether read-heavy views may use the local mirror (settings.MIRROR_READS_ENABLED)."""
+    return getattr(settings, 'MIRROR_READS_ENABLED', False)
+
+
+def mirror_ready(*tables):
+    """
+    Returns True if every table in `tables` may be read from the local mirror.
+
+    Requires mirror reads to be enabled and each table to have synced within
+    settings.MIRROR_MAX_STALENESS seconds, so a stopped sync thread makes views
+    fall back to Supabase instead of serving stale rows. A table the app has
+    changed since its last sync (its invalidation generation moved on) isn't
+    ready either: RPCs and triggers don't bump updated_at, so only the next
+    sync, which is then a full one, is sure to have the change.
+    """
+    if not mirror_reads_enabled():
+        return False
+    fresh_after = timezone.now() - timedelta(seconds=getattr(settings, 'MIRROR_MAX_STALENESS', 300))
+    try:
+        synced = dict(MirrorSyncState.objects
+                      .filter(table__in=tables, last_synced_at__gte=fresh_after)
+                      .values_list('table', 'generation'))
+    except DatabaseError:
+        return False
+    return all(synced.get(table) == generations.get(table) for table in tables)
+
+
+def _mirrored_fields(model):
+    return [field for field in model._meta.concrete_fields]
+
+
+def _to_instance(model, row):
+    values = {}
+    for field in _mirrored_fields(model):
+        if field.attname not in row:
+            continue
+        value = row[field.attname]
+        if value is None and not field.null:
+            value = field.get_default()
+        values[field.attname] = field.to_python(value) if value is not None else None
+    return model(**values)
+
+
+def store_rows(table, rows, batch_size=500):
+    """Inserts or updates Supabase rows (dicts) in the local mirror with one upsert per batch."""
+    if not rows:
+        return 0
+    model, _ = MIRRORED_TABLES[table]
+    update_fields = [field.name for field in _mirrored_fields(model) if not field.primary_key]
+    model.objects.bulk_create(
+        [_to_instance(model, row) for row in rows],
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['id'],
+        update_fields=update_fields,
+    )
+    return len(rows)
+
+
+def delete_rows(table, ids, batch_size=500):
+    """Removes rows from the local mirror by id, in batches to stay under SQL variable limits."""
+    model, _ = MIRRORED_TABLES[table]
+    ids = list(ids)
+    deleted = 0
+    for i in range(0, len(ids), batch_size):
+        deleted += model.objects.filter(id__in=ids[i:i + batch_size]).delete()[0]
+    return deleted
+
+
+def mirror_rows(table, rows):
+    """
+    Write-through for rows the app itself just changed in Supabase.
+    Keeps the mirror current between syncs; a no-op when mirror reads are off.
+    Errors are printed, not raised, because the next sync repairs the mirror.
+    """
+    if not mirror_reads_enabled():
+        return
+    try:
+        store_rows(table, [row for row in rows if row])
+    except Exception as e:
+        print(f"Could not update the local {table} mirror: {e}")
+
+
+def forget_mirrored_rows(table, ids):
+    """Write-through for rows the app just deleted in Supabase (see mirror_rows)."""
+    if not mirror_reads_enabled():
+        return
+    try:
+        delete_rows(table, ids)
+    except Exception as e:
+        print(f"Could not update the local {table} mirror: {e}")
+
+
+def as_rows(queryset):
+    """
+    Returns mirror rows as dictionaries shaped like Supabase responses, so
+    views and templates can use either source: timestamps become ISO strings,
+    decimals floats, UUIDs strings and foreign keys keep their '_id' names.
+    """
+    rows = []
+    for row in queryset.values():
+        for key, value in row.items():
+            if isinstance(value, datetime):
+                row[key] = value.isoformat()
+            elif isinstance(value, Decimal):
+                row[key] = float(value)
+            elif isinstance(value, UUID):
+                row[key] = str(value)
+        rows.append(row)
+    return rows
+
+
+def _cursor_value(cursor_field, value):
+    if value is None:
+        return None
+    if cursor_field == 'id':
+        return int(value)
+    return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+
+
+def sync_table(table, full=False, page_size=1000):
+    """
+    Copies one Supabase table into the local mirror.
+
+    An incremental sync fetches only rows whose cursor column (updated_at, or
+    id for activity_log) is at or after the last value seen, paging in cursor
+    order with range() and upserting each page locally. A full sync (the first
+    one, or full=True) pages through the whole table in id order and then
+    deletes local rows that no longer exist upstream, which incremental syncs
+    can't see. Tables without the cursor column are always synced in full.
+    Returns a summary dictionary.
+    """
+    model, cursor_field = MIRRORED_TABLES[table]
+    state, _ = MirrorSyncState.objects.get_or_create(table=table)
+    full = full or not state.cursor
+    generation = generations.get(table)
+    started = time.monotonic()
+    summary = {'table': table, 'mode': 'full' if full else 'incremental', 'fetched': 0, 'deleted': 0}
+
+    cursor = state.cursor
+    best = _cursor_value(cursor_field, cursor) if cursor else None
+    seen_ids = set()
+    start = 0
+    try:
+        while True:
+            query = supabase_service.table(table).select('*')
+            if not full:
+                query = query.gt('id', int(cursor)) if cursor_field == 'id' else query.gte(cursor_field, cursor)
+                if cursor_field != 'id':
+                    query = query.order(cursor_field)
+            rows = query.order('id').range(start, start + page_size - 1).execute().data or []
+
+            store_rows(table, rows)
+            summary['fetched'] += len(rows)
+            for row in rows:
+                seen_ids.add(row['id'])
+                value = _cursor_value(cursor_field, row.get(cursor_field))
+                if value is not None and (best is None or value > best):
+                    best = value
+                    state.cursor = str(row[cursor_field])
+
+            if len(rows) < page_size:
+                break
+            start += page_size
+
+        if full:
+            stale_ids = set(model.objects.values_list('id', flat=True)) - seen_ids
+            summary['deleted'] = delete_rows(table, stale_ids)
+            state.last_full_sync_at = timezone.now()
+            if best is None:
+                state.cursor = None  # No cursor column upstream; keep doing full syncs
+
+        state.row_count = model.objects.count()
+        state.generation = generation
+        state.last_synced_at = timezone.now()
+        state.last_error = ''
+        state.save()
+    except Exception as e:
+        MirrorSyncState.objects.filter(id=state.id).update(last_error=str(e))
+        summary['error'] = str(e)
+
+    summary['duration_ms'] = round((time.monotonic() - started) * 1000, 1)
+    return summary
+
+
+def sync_mirror(tables=None, full=False):
+    """
+    Syncs the mirrored tables in dependency order.
+
+    A table is synced in full when `full` is set, its last full sync is older
+    than settings.MIRROR_FULL_SYNC_INTERVAL seconds (to pick up deletions), or
+    the app changed it since the last sync (a write that didn't bump
+    updated_at would escape an incremental sync); otherwise incrementally.
+    Returns one summary per table.
+    """
+    full_every = timedelta(seconds=getattr(settings, 'MIRROR_FULL_SYNC_INTERVAL', 3600))
+    summaries = []
+    for table in MIRRORED_TABLES:
+        if tables and table not in tables:
+            continue
+        state = MirrorSyncState.objects.filter(table=table).first()
+        due = state is None or state.last_full_sync_at is None or timezone.now() - state.last_full_sync_at > full_every
+        changed = state is not None and state.generation != generations.get(table)
+        summaries.append(sync_table(table, full=full or due or changed))
+    return summaries
+
+
+def _run_sync(interval, stop_event):
+    """
+    Loop body for the in-process mirror sync thread. Syncs once right away
+    so the mirror is usable soon after start-up, then every `interval` seconds,
+    or within a second of the app changing a mirrored table (a bump of its
+    invalidation generation), so views aren't sent to Supabase for long.
+    """
+    next_sync = 0
+    synced_generations = None
+    while True:
+        current = generations.snapshot(*MIRRORED_TABLES)
+        if time.monotonic() >= next_sync or current != synced_generations:
+            try:
+                for summary in sync_mirror():
+                    if summary.get('error'):
+                        print(f"--- Mirror sync error ({summary['table']}): {summary['error']} ---")
+            except Exception as e:
+                print(f"--- Mirror sync error: {e} ---")
+            finally:
+                close_old_connections()
+            synced_generations = current
+            next_sync = time.monotonic() + interval
+        if stop_event.wait(1):
+            return
+
+
+def start_mirror_sync(interval=None):
+    """
+    Starts the background mirror sync thread for this process (at most once).
+
+    The interval defaults to settings.MIRROR_SYNC_INTERVAL (seconds); the thread
+    only runs while mirror reads are enabled and the interval is positive.
+    Returns the threading.Event that stops it, or None if it didn't start.
+    """
+    global _sync_thread
+
+    if interval is None:
+        interval = getattr(settings, 'MIRROR_SYNC_INTERVAL', 0)
+    if not mirror_reads_enabled() or not interval or interval <= 0:
+        return None
+
+    with _sync_lock:
+        if _sync_thread is not None and _sync_thread.is_alive():
+            return None
+        stop_event = threading.Event()
+        _sync_thread = threading.Thread(
+            target=_run_sync,
+            args=(interval, stop_event),
+            name='supabase-mirror-sync',
+            daemon=True,
+        )
+        _sync_thread.start()
+    return stop_event
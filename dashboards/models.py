@@ -8,19 +8,28 @@ USER_MODEL = settings.AUTH_USER_MODEL
 class Product(models.Model):
     """
     Represents a school supply item available for order or reservation.
+    Also serves as the local read mirror of the Supabase products table (see dashboards.mirror).
     """
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=255)
-    description = models.TextField()
+    description = models.TextField(blank=True, default='')
     price = models.DecimalField(max_digits=10, decimal_places=2, help_text="Price in PHP")
     stock_quantity = models.PositiveIntegerField(default=0)
     category = models.CharField(max_length=100, blank=True)
+    size = models.CharField(max_length=10, blank=True, null=True, help_text="Only set for Uniforms")
     image_url = models.URLField(max_length=1024, blank=True, null=True)
     is_available = models.BooleanField(default=True, help_text="Is the product available for students to see and order?")
     
-    # Timestamps
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Timestamps (copied from Supabase, so not auto-managed)
+    created_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['category', 'name'], name='product_category_name_idx'),
+            models.Index(fields=['is_available', 'stock_quantity'], name='product_availability_idx'),
+            models.Index(fields=['-created_at'], name='product_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -29,6 +38,7 @@ class Order(models.Model):
     """
     Represents both a student's order for an in-stock item and a reservation
     for an out-of-stock item (backorder).
+    Mirrors the Supabase orders table; user_id is the Supabase auth user's UUID.
     """
     class Status(models.TextChoices):
         PENDING = 'pending', 'Pending'
@@ -40,35 +50,128 @@ class Order(models.Model):
     class OrderType(models.TextChoices):
         ORDER = 'order', 'Order'
         RESERVATION = 'reservation', 'Reservation'
+        BACKORDER = 'backorder', 'Backorder'
 
     id = models.AutoField(primary_key=True)
-    user = models.ForeignKey(USER_MODEL, on_delete=models.CASCADE, related_name='orders')
-    product = models.ForeignKey(Product, on_delete=models.SET_NULL, null=True, related_name='orders')
+    user_id = models.UUIDField(db_index=True)
+    # No database constraint: mirrored orders may arrive before their product
+    product = models.ForeignKey(Product, on_delete=models.DO_NOTHING, null=True, db_constraint=False, related_name='orders')
     
     quantity = models.PositiveIntegerField()
-    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    total_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     order_type = models.CharField(max_length=20, choices=OrderType.choices, default=OrderType.ORDER)
-    payment_method = models.CharField(max_length=50, default='Cash')
+    payment_method = models.CharField(max_length=50, default='Cash', blank=True, null=True)
+    is_urgent = models.BooleanField(default=False)
+    expires_at = models.DateTimeField(null=True, blank=True)
     
-    # Timestamps
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Timestamps (copied from Supabase, so not auto-managed)
+    created_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'order_type'], name='order_status_type_idx'),
+            models.Index(fields=['product', 'status', 'order_type'], name='order_product_status_idx'),
+            models.Index(fields=['user_id', '-created_at'], name='order_user_created_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.order_type.title()} #{self.id} by {self.user.email}"
+        return f"{self.order_type.title()} #{self.id} by {self.user_id}"
+
+class Notification(models.Model):
+    """
+    Mirrors the Supabase notifications table: a message for one student,
+    optionally about a product.
+    """
+    id = models.AutoField(primary_key=True)
+    user_id = models.UUIDField()
+    product = models.ForeignKey(Product, on_delete=models.DO_NOTHING, null=True, blank=True, db_constraint=False, related_name='+')
+    message = models.TextField()
+    link_url = models.CharField(max_length=1024, blank=True, null=True)
+    is_read = models.BooleanField(default=False)
+
+    # Timestamps (copied from Supabase, so not auto-managed)
+    created_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user_id', 'is_read', '-created_at'], name='notification_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"Notification #{self.id} for {self.user_id}"
 
 class ActivityLog(models.Model):
     """
     Logs significant actions performed by admin users for auditing.
+    Mirrors the Supabase activity_log table; user_id is the admin's auth UUID.
     """
     id = models.AutoField(primary_key=True)
-    user = models.ForeignKey(USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    user_id = models.UUIDField(null=True, blank=True)
     action = models.CharField(max_length=255)
     details = models.JSONField(default=dict, blank=True)
     
-    # Timestamp
+    # Timestamp (copied from Supabase, so not auto-managed)
+    created_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at'], name='activitylog_created_idx'),
+            models.Index(fields=['action'], name='activitylog_action_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id or 'System'} - {self.action} at {self.created_at:%Y-%m-%d %H:%M}"
+
+class MirrorSyncState(models.Model):
+    """
+    Progress of the local mirror of one Supabase table.
+    `cursor` is the highest updated_at (or id) copied so far; the next
+    incremental sync only fetches rows at or after it. `generation` is the
+    table's cache invalidation generation when the last sync started.
+    """
+    table = models.CharField(max_length=64, unique=True)
+    cursor = models.CharField(max_length=64, blank=True, null=True)
+    generation = models.PositiveBigIntegerField(default=0)
+    row_count = models.PositiveIntegerField(default=0)
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+    last_full_sync_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.table} mirror (cursor {self.cursor})"
+
+class ImageJob(models.Model):
+    """
+    A queued product image upload, processed off the request path by dashboards.jobs.
+    The uploaded file waits in a local spool directory, with a staged copy in
+    Supabase Storage for other instances, until a worker thread stores it and
+    patches the product's image_url.
+    """
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        SUPERSEDED = 'superseded', 'Superseded'
+        FAILED = 'failed', 'Failed'
+
+    id = models.AutoField(primary_key=True)
+    product_id = models.IntegerField(db_index=True, help_text="Supabase products.id to patch")
+    spool_path = models.CharField(max_length=1024)
+    staging_path = models.CharField(max_length=1024, blank=True, help_text="Staged copy in the product images bucket")
+    original_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    replaces_url = models.URLField(max_length=1024, blank=True, null=True, help_text="Image to remove once the new one is live")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    image_url = models.URLField(max_length=1024, blank=True, null=True)
+
+    # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.user.email} - {self.action} at {self.created_at.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
+        return f"Image job #{self.id} for product {self.product_id} ({self.status})"
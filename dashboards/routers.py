@@ -0,0 +1,30 @@
+# Models that hold the local read mirror (see dashboards.mirror)
+MIRROR_DATABASE = 'mirror'
+MIRROR_MODELS = {'product', 'order', 'notification', 'activitylog', 'mirrorsyncstate'}
+
+
+class MirrorRouter:
+    """
+    Keeps the local read mirror in its own database (settings.DATABASES['mirror']).
+
+    The default database is the shared Supabase Postgres in production, so a
+    mirror stored there would cost the same network round trip it is meant to
+    save. The mirror models are read, written and migrated only on the mirror
+    alias, a SQLite file on the instance's own disk; everything else stays on
+    the default database.
+    """
+    @staticmethod
+    def _is_mirror(app_label, model_name):
+        return app_label == 'dashboards' and model_name in MIRROR_MODELS
+
+    def db_for_read(self, model, **hints):
+        return MIRROR_DATABASE if self._is_mirror(model._meta.app_label, model._meta.model_name) else None
+
+    db_for_write = db_for_read
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == MIRROR_DATABASE:
+            return self._is_mirror(app_label, model_name)
+        if self._is_mirror(app_label, model_name):
+            return False
+        return None
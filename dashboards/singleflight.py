@@ -0,0 +1,129 @@
+from django.conf import settings
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+import weakref
+
+
+class _Call:
+    """One upstream query in flight and the requests waiting for its result."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces identical PostgREST reads that are in flight at the same time.
+
+    Queries are keyed by HTTP method, path (table or RPC), query string, body
+    and every request header, so only requests that would get the same answer
+    share it: the role and RLS identity (Authorization) are part of the key,
+    and so are Prefer (count='exact') and Accept (.single()). The first
+    caller runs the query; callers arriving while it is in flight wait and get
+    a deep copy of its response (or its exception), so a burst of identical
+    reads costs one round trip. Nothing is kept after the query finishes;
+    caching is ViewDataCache's job. Sync callers coalesce across the worker's
+    threads and async callers across its event loop.
+
+    Only use it for reads: RPCs are POSTs, so callers decide which are safe.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = weakref.WeakKeyDictionary()
+        self._counters = {}
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'SINGLE_FLIGHT_ENABLED', True)
+
+    def key(self, query):
+        """Returns the coalescing key of a PostgREST request builder."""
+        headers = {name.lower(): value for name, value in query.session.headers.items()}
+        headers.update((name.lower(), value) for name, value in query.headers.items())
+        authorization = headers.pop('authorization', '')
+        parts = [
+            query.http_method,
+            query.path,
+            str(query.params),
+            json.dumps(query.json, sort_keys=True, default=str),
+            json.dumps(sorted(headers.items())),
+            hashlib.sha256(authorization.encode()).hexdigest(),
+        ]
+        return '\n'.join(parts)
+
+    def _count(self, name, coalesced):
+        with self._lock:
+            counters = self._counters.setdefault(name, {'calls': 0, 'coalesced': 0})
+            counters['calls'] += 1
+            if coalesced:
+                counters['coalesced'] += 1
+
+    def execute(self, query, name=None):
+        """Runs `query.execute()`, sharing the result with identical queries already in flight."""
+        if not self.enabled:
+            return query.execute()
+        key = self.key(query)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+        self._count(name or query.path, not leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = query.execute()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+        # Once others have a copy too, keep the original untouched
+        return copy.deepcopy(call.result) if shared else call.result
+
+    async def aexecute(self, query, name=None):
+        """Async execute() for the async PostgREST client."""
+        if not self.enabled:
+            return await query.execute()
+        key = self.key(query)
+        tasks = self._tasks.setdefault(asyncio.get_running_loop(), {})
+        task = tasks.get(key)
+        self._count(name or query.path, task is not None)
+        if task is None:
+            # A task of its own, so a cancelled first caller doesn't fail the others
+            task = tasks[key] = asyncio.ensure_future(query.execute())
+            task.add_done_callback(lambda _: tasks.pop(key, None))
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def metrics(self):
+        """Returns per-query call and coalesced counts for this process, plus the overall coalescing ratio."""
+        with self._lock:
+            queries = {name: dict(counters) for name, counters in self._counters.items()}
+        calls = sum(counters['calls'] for counters in queries.values())
+        coalesced = sum(counters['coalesced'] for counters in queries.values())
+        return {
+            'enabled': self.enabled,
+            'calls': calls,
+            'coalesced': coalesced,
+            'coalescing_ratio': round(coalesced / calls, 3) if calls else None,
+            'queries': queries,
+        }
+
+
+single_flight = SingleFlight()
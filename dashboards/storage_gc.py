@@ -0,0 +1,160 @@
+from supabase_client import supabase_service
+from datetime import datetime, timedelta, timezone
+from .images import (
+    BUCKET_REFERENCES, PRODUCT_IMAGES_BUCKET, AVATARS_BUCKET,
+    PRODUCT_IMAGE_VARIANTS, AVATAR_VARIANTS, derivative_paths,
+)
+import time
+
+BUCKET_VARIANTS = {
+    PRODUCT_IMAGES_BUCKET: PRODUCT_IMAGE_VARIANTS,
+    AVATARS_BUCKET: AVATAR_VARIANTS,
+}
+
+
+def iter_bucket_objects(bucket, page_size=1000):
+    """
+    Yields every file object at the root of a storage bucket, one page at a time.
+
+    Uses limit/offset paging so only one page of listing metadata is held in
+    memory. Folder placeholders (entries without an id) are skipped.
+    """
+    storage = supabase_service.storage.from_(bucket)
+    offset = 0
+    while True:
+        entries = storage.list('', {'limit': page_size, 'offset': offset, 'sortBy': {'column': 'name', 'order': 'asc'}})
+        if not entries:
+            return
+        for entry in entries:
+            if entry.get('id'):
+                yield entry
+        if len(entries) < page_size:
+            return
+        offset += page_size
+
+
+def iter_referenced_urls(bucket, page_size=1000):
+    """
+    Yields the non-empty URLs stored in the column that references `bucket`
+    (products.image_url or user_profiles.avatar_url), paging with range().
+    """
+    table, column = BUCKET_REFERENCES[bucket]
+    start = 0
+    while True:
+        response = supabase_service.table(table) \
+            .select(column) \
+            .not_.is_(column, 'null') \
+            .order(column) \
+            .range(start, start + page_size - 1) \
+            .execute()
+        rows = response.data or []
+        for row in rows:
+            if row.get(column):
+                yield row[column]
+        if len(rows) < page_size:
+            return
+        start += page_size
+
+
+def referenced_file_names(bucket, page_size=1000):
+    """
+    Builds the set of object names in `bucket` that must be kept: every
+    referenced original plus all of its WebP derivatives.
+    """
+    variants = BUCKET_VARIANTS.get(bucket, {})
+    keep = set()
+    for url in iter_referenced_urls(bucket, page_size):
+        path = url.split('?')[0]
+        if f'/{bucket}/' not in path:
+            continue  # External URL, not one of our objects
+        file_name = path.rsplit('/', 1)[-1]
+        keep.add(file_name)
+        keep.update(derivative_paths(file_name, variants))
+    return keep
+
+
+def _parse_timestamp(value):
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+
+
+def collect_orphaned_objects(bucket, dry_run=True, batch_size=100, min_age=timedelta(hours=1), page_size=1000):
+    """
+    Deletes storage objects in `bucket` that no table row references.
+
+    Loads the referenced names first (a set of short strings), then streams the
+    bucket listing page by page, noting unreferenced objects. Deletion runs in
+    batches of `batch_size` once the listing is done, because removing objects
+    mid-listing would shift the offset paging and skip files. Objects younger
+    than `min_age` are kept so an upload whose product or profile row hasn't
+    been saved yet is never collected. Since upload_image() reuses an existing
+    object for a repeated photo, an old orphan can become referenced again
+    during the run, so the references are re-read right before each batch is
+    removed and such objects are kept (counted as 'reused'). With
+    dry_run=True nothing is deleted and the summary reports what would be.
+    Returns a summary dictionary with counts, reclaimed bytes and throughput.
+    """
+    started = time.monotonic()
+    keep = referenced_file_names(bucket, page_size)
+    cutoff = datetime.now(timezone.utc) - min_age
+    storage = supabase_service.storage.from_(bucket)
+
+    summary = {
+        'bucket': bucket,
+        'dry_run': dry_run,
+        'scanned': 0,
+        'referenced': 0,
+        'too_recent': 0,
+        'orphaned': 0,
+        'reused': 0,
+        'deleted': 0,
+        'failed': 0,
+        'bytes': 0,
+        'orphan_names': [],
+    }
+    orphans = []
+
+    for entry in iter_bucket_objects(bucket, page_size):
+        summary['scanned'] += 1
+        name = entry['name']
+        if name in keep:
+            summary['referenced'] += 1
+            continue
+        created_at = _parse_timestamp(entry.get('created_at'))
+        if created_at is None or created_at > cutoff:
+            summary['too_recent'] += 1
+            continue
+
+        size = int((entry.get('metadata') or {}).get('size') or 0)
+        summary['orphaned'] += 1
+        summary['bytes'] += size
+        if len(summary['orphan_names']) < 50:
+            summary['orphan_names'].append(name)
+        orphans.append((name, size))
+
+    if not dry_run:
+        for i in range(0, len(orphans), batch_size):
+            batch = orphans[i:i + batch_size]
+            names = []
+            try:
+                keep = referenced_file_names(bucket, page_size)
+                for name, size in batch:
+                    if name in keep:
+                        summary['reused'] += 1
+                        summary['orphaned'] -= 1
+                        summary['bytes'] -= size
+                    else:
+                        names.append(name)
+                if names:
+                    storage.remove(names)
+                    summary['deleted'] += len(names)
+            except Exception as e:
+                print(f"Could not delete {len(names) or len(batch)} object(s) from '{bucket}': {e}")
+                summary['failed'] += len(names) or len(batch)
+
+    elapsed = time.monotonic() - started
+    summary['duration_s'] = round(elapsed, 2)
+    summary['objects_per_s'] = round(summary['scanned'] / elapsed, 1) if elapsed else summary['scanned']
+    return summary
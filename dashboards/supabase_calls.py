@@ -0,0 +1,206 @@
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject, empty
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+import hashlib
+import httpx
+import json
+import threading
+import time
+
+_current = ContextVar('supabase_calls', default=None)
+_install_lock = threading.Lock()
+_installed = False
+
+
+def _call_name(url):
+    """Names a Supabase call by service and table/function: 'rest:products', 'rpc:buy_product', 'auth:user', ..."""
+    parts = url.path.strip('/').split('/')
+    if parts[:3] == ['rest', 'v1', 'rpc'] and len(parts) > 3:
+        return f'rpc:{parts[3]}'
+    if len(parts) > 2:
+        return f'{parts[0]}:{parts[2]}'
+    return url.path
+
+
+class RequestCalls:
+    """The Supabase calls made while handling one request."""
+    def __init__(self, path):
+        self.path = path
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def record(self, request, status, seconds):
+        try:
+            body = request.content
+        except httpx.RequestNotRead:
+            body = b''  # A streamed upload
+        signature = hashlib.sha1(request.method.encode() + str(request.url).encode() + body).hexdigest()
+        with self._lock:
+            self.calls.append({
+                'name': _call_name(request.url),
+                'method': request.method,
+                'status': status,
+                'ms': round(seconds * 1000, 1),
+                'signature': signature,
+            })
+
+    def summary(self):
+        """Returns the call count, total time and per-name counts and times, plus repeated queries."""
+        with self._lock:
+            calls = list(self.calls)
+        by_name, seen = {}, {}
+        for call in calls:
+            entry = by_name.setdefault(call['name'], {'count': 0, 'ms': 0.0})
+            entry['count'] += 1
+            entry['ms'] = round(entry['ms'] + call['ms'], 1)
+            seen.setdefault(call['signature'], []).append(call['name'])
+        repeated = {}
+        for names in seen.values():
+            if len(names) > 1:
+                repeated[names[0]] = repeated.get(names[0], 0) + len(names)
+        return {
+            'path': self.path,
+            'calls': len(calls),
+            'ms': round(sum(call['ms'] for call in calls), 1),
+            'by_name': by_name,
+            'repeated': repeated,
+        }
+
+
+def _should_record(request):
+    calls = _current.get()
+    if calls is None:
+        return None
+    supabase_host = urlsplit(getattr(settings, 'SUPABASE_URL', '') or '').hostname
+    return calls if request.url.host == supabase_host else None
+
+
+def install():
+    """
+    Wraps httpx's Client.send and AsyncClient.send so calls to SUPABASE_URL
+    made inside a request are recorded. The supabase-py clients (PostgREST,
+    Auth, Storage) and our own async clients all send through httpx, and the
+    clients themselves get recreated (e.g. on auth changes), so the send
+    methods are the one place that sees every execute() and rpc().
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        sync_send, async_send = httpx.Client.send, httpx.AsyncClient.send
+
+        def send(self, request, *args, **kwargs):
+            calls = _should_record(request)
+            if calls is None:
+                return sync_send(self, request, *args, **kwargs)
+            started, status = time.perf_counter(), 'error'
+            try:
+                response = sync_send(self, request, *args, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                calls.record(request, status, time.perf_counter() - started)
+
+        async def asend(self, request, *args, **kwargs):
+            calls = _should_record(request)
+            if calls is None:
+                return await async_send(self, request, *args, **kwargs)
+            started, status = time.perf_counter(), 'error'
+            try:
+                response = await async_send(self, request, *args, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                calls.record(request, status, time.perf_counter() - started)
+
+        httpx.Client.send = send
+        httpx.AsyncClient.send = asend
+        _installed = True
+
+
+def _shows_timings(request):
+    """
+    Whether the Server-Timing breakdown may be sent: always under DEBUG,
+    otherwise only to admins. Only looks at a user the request already
+    resolved, so it never authenticates on its own.
+    """
+    if settings.DEBUG:
+        return True
+    user = request.__dict__.get('user')
+    if isinstance(user, SimpleLazyObject):
+        user = None if user._wrapped is empty else user._wrapped
+    return getattr(user, 'user_type', None) == 'admin'
+
+
+class SupabaseCallAccountingMiddleware:
+    """
+    Counts the Supabase calls each request makes.
+
+    Adds a Server-Timing header (total plus one entry per table, RPC or auth
+    endpoint) that browser dev tools show under Timing, under DEBUG or for
+    admins only since it reveals the backend's tables, and prints a JSON log
+    line per request when SUPABASE_CALL_LOG is on. Warns when a request makes
+    more than SUPABASE_CALL_BUDGET calls, or sends the exact same query more
+    than once (usually an N+1 loop). Calls made by thread pools a request
+    starts (e.g. bulk actions) are not attributed to it.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'SUPABASE_CALL_ACCOUNTING', True)
+        if self.enabled:
+            install()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        calls = RequestCalls(request.path)
+        token = _current.set(calls)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.report(request, calls, response)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        calls = RequestCalls(request.path)
+        token = _current.set(calls)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.report(request, calls, response)
+        return response
+
+    def report(self, request, calls, response):
+        summary = calls.summary()
+        if not summary['calls']:
+            return
+        if _shows_timings(request):
+            timings = [f'supabase;desc="{summary["calls"]} calls";dur={summary["ms"]}']
+            for name, entry in summary['by_name'].items():
+                metric = name.replace(':', '-').replace('/', '-')
+                timings.append(f'{metric};desc="{entry["count"]}x {name}";dur={entry["ms"]}')
+            existing = response.get('Server-Timing')
+            response['Server-Timing'] = ', '.join(([existing] if existing else []) + timings)
+
+        if getattr(settings, 'SUPABASE_CALL_LOG', False):
+            print(f"supabase_calls {json.dumps(summary)}")
+        budget = getattr(settings, 'SUPABASE_CALL_BUDGET', 10)
+        if budget and summary['calls'] > budget:
+            counts = ', '.join(f"{name} x{entry['count']}" for name, entry in summary['by_name'].items())
+            print(f"⚠️ {summary['path']} made {summary['calls']} Supabase calls (budget {budget}): {counts}")
+        if summary['repeated']:
+            counts = ', '.join(f"{name} x{count}" for name, count in summary['repeated'].items())
+            print(f"⚠️ {summary['path']} repeated the same Supabase query: {counts} (N+1?)")
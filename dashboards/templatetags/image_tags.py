@@ -0,0 +1,28 @@
+from django import template
+from django.templatetags.static import static
+from dashboards.images import variant_url
+
+register = template.Library()
+
+
+@register.filter
+def image_variant(url, variant):
+    """
+    Returns the URL of a resized WebP derivative of an uploaded image.
+
+    Usage: {{ product.image_url|image_variant:'thumb'|default:'...' }}. Images
+    uploaded before derivatives existed (and empty values) are returned as-is.
+    """
+    return variant_url(url, variant)
+
+
+@register.filter
+def or_placeholder(url, name='item'):
+    """
+    Returns `url`, or the URL of a local placeholder image when it is empty.
+
+    Usage: {{ product.image_url|image_variant:'sm'|or_placeholder:'item' }}. The
+    placeholders are static SVGs in static/images/placeholders, so missing
+    product images cost no third-party request.
+    """
+    return url or static(f'images/placeholders/{name}.svg')
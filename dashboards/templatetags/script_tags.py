@@ -0,0 +1,16 @@
+from django import template
+from django.utils.html import json_script
+
+register = template.Library()
+
+
+@register.simple_tag
+def js_config(element_id, **values):
+    """
+    Renders the values a page script needs from Django as a JSON data block.
+
+    Usage: {% url 'my_orders' as my_orders_url %}{% js_config 'page-config' myOrdersUrl=my_orders_url %}
+    The static script reads it with JSON.parse(document.getElementById('page-config').textContent),
+    so the script itself has no template tags and can be cached by the browser.
+    """
+    return json_script(values, element_id)
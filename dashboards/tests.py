@@ -1,3 +1,678 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.db import router
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from PIL import Image
+
+from dashboards import catalog, change_feed, invalidation, jobs, mirror, storage_gc
+from dashboards.admission import purchase_queue
+from dashboards.caching import invalidate_tags
+from dashboards.images import PRODUCT_IMAGES_BUCKET, upload_image
+from dashboards.models import ImageJob, Product
+from dashboards.singleflight import single_flight
+from supabase_client import supabase, supabase_service, with_access_token
+from supabase_fake import ANON_KEY, fake_supabase, user_id_for
+
+STUDENT = 'student@cit.edu'
+ADMIN = 'admin@cit.edu'
+AJAX = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+MB = 1024 * 1024
+
+
+class FakeSupabaseTestCase(TestCase):
+    """Starts every test from the demo data, with empty view caches and no remembered stock."""
+    databases = {'default', 'mirror'}
+
+    def setUp(self):
+        fake_supabase.reset()
+        for alias in settings.CACHES:
+            caches[alias].clear()
+        for product in fake_supabase.tables['products']:
+            purchase_queue.forget_stock(product['id'])
+        self.student_id = user_id_for(STUDENT)
+        self.admin_id = user_id_for(ADMIN)
+
+    def stock(self, product_id):
+        return next(p for p in fake_supabase.tables['products'] if p['id'] == product_id)['stock_quantity']
+
+    def orders(self, **match):
+        return [o for o in fake_supabase.tables['orders'] if all(o.get(k) == v for k, v in match.items())]
+
+    def add_order(self, user_id, product_id=1, **fields):
+        return fake_supabase.insert('orders', {'user_id': user_id, 'product_id': product_id, 'quantity': 1,
+                                               'total_price': 450.0, **fields})[0]
+
+    def add_notification(self, user_id, message, **fields):
+        return fake_supabase.insert('notifications', {'user_id': user_id, 'message': message, **fields})[0]
+
+
+# --- The fake itself -----------------------------------------------------------
+
+class FakeSupabaseQueryTests(FakeSupabaseTestCase):
+    def test_filters_order_and_range(self):
+        response = supabase_service.table('products').select('id, name') \
+            .gt('stock_quantity', 0).order('stock_quantity', desc=True).range(0, 1).execute()
+        self.assertEqual([row['id'] for row in response.data], [3, 1])
+
+    def test_in_ilike_or_and_is_filters(self):
+        self.assertEqual(
+            [row['id'] for row in supabase_service.table('products').select('id').in_('id', [2, 4, 9]).execute().data],
+            [2, 4],
+        )
+        self.assertEqual(
+            [row['id'] for row in supabase_service.table('products').select('id').ilike('name', '%uniform%').execute().data],
+            [1, 2],
+        )
+        response = supabase_service.table('products').select('id') \
+            .or_('stock_quantity.eq.0,price.gt.800').order('id').execute()
+        self.assertEqual([row['id'] for row in response.data], [2, 5, 6])
+        self.assertEqual(
+            [row['id'] for row in supabase_service.table('products').select('id').is_('size', 'null').execute().data],
+            [3, 4, 5, 6],
+        )
+
+    def test_exact_count(self):
+        response = supabase_service.table('products').select('id', count='exact').eq('category', 'Uniforms').limit(1).execute()
+        self.assertEqual(response.count, 2)
+        self.assertEqual(len(response.data), 1)
+
+    def test_single_and_maybe_single(self):
+        self.assertEqual(supabase_service.table('products').select('name').eq('id', 3).single().execute().data,
+                         {'name': 'School Lanyard'})
+        with self.assertRaises(Exception):
+            supabase_service.table('products').select('id').eq('id', 999).single().execute()
+        self.assertIsNone(supabase_service.table('products').select('id').eq('id', 999).maybe_single().execute())
+
+    def test_embedded_resources(self):
+        self.add_order(self.student_id, product_id=3)
+        row = supabase_service.table('orders').select('id, products(name), user_profiles(full_name)').single().execute().data
+        self.assertEqual(row['products'], {'name': 'School Lanyard'})
+        self.assertEqual(row['user_profiles'], {'full_name': 'Demo Student'})
+
+    def test_insert_update_upsert_and_delete(self):
+        created = supabase_service.table('products').insert({'name': 'Ballpen', 'price': 10, 'stock_quantity': 3}).execute().data[0]
+        self.assertEqual(created['id'], 7)
+        self.assertTrue(created['is_available'])
+
+        supabase_service.table('products').update({'stock_quantity': 9}).eq('id', 7).execute()
+        self.assertEqual(self.stock(7), 9)
+
+        supabase_service.table('products').upsert({'id': 7, 'name': 'Ballpen', 'price': 12}).execute()
+        product = next(p for p in fake_supabase.tables['products'] if p['id'] == 7)
+        self.assertEqual((product['price'], product['stock_quantity']), (12, 9))
+
+        supabase_service.table('products').delete().eq('id', 7).execute()
+        self.assertEqual(len(fake_supabase.tables['products']), 6)
+
+    def test_duplicate_primary_key_is_rejected(self):
+        with self.assertRaises(Exception):
+            supabase_service.table('products').insert({'id': 1, 'name': 'Duplicate', 'price': 1}).execute()
+
+    def test_unknown_rpc_is_an_error(self):
+        with self.assertRaises(Exception):
+            supabase_service.rpc('no_such_function', {}).execute()
+
+    def test_latency_is_added_to_every_call(self):
+        fake_supabase.latency = 0.05
+        try:
+            started = time.perf_counter()
+            supabase_service.table('products').select('id').execute()
+            self.assertGreaterEqual(time.perf_counter() - started, 0.05)
+        finally:
+            fake_supabase.latency = 0.0
+
+
+class FakeSupabaseRowLevelSecurityTests(FakeSupabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        other = fake_supabase.create_user('other@cit.edu', 'Other@1234', full_name='Other Student')
+        self.mine = self.add_order(self.student_id)
+        self.theirs = self.add_order(other['id'])
+        self.student_token = fake_supabase.session_for(STUDENT)['access_token']
+
+    def as_student(self, query):
+        return with_access_token(query, self.student_token).execute()
+
+    def test_students_only_see_their_own_rows(self):
+        rows = self.as_student(supabase_service.table('orders').select('id')).data
+        self.assertEqual([row['id'] for row in rows], [self.mine['id']])
+        profiles = self.as_student(supabase_service.table('user_profiles').select('user_id')).data
+        self.assertEqual(profiles, [{'user_id': self.student_id}])
+
+    def test_students_cannot_change_other_students_rows(self):
+        self.as_student(supabase_service.table('orders').update({'status': 'cancelled'}).in_('id', [self.mine['id'], self.theirs['id']]))
+        self.assertEqual(self.orders(id=self.theirs['id'])[0]['status'], 'pending')
+        self.assertEqual(self.orders(id=self.mine['id'])[0]['status'], 'cancelled')
+
+    def test_students_cannot_write_products(self):
+        with self.assertRaises(Exception):
+            self.as_student(supabase_service.table('products').insert({'name': 'Contraband', 'price': 1}))
+        self.as_student(supabase_service.table('products').update({'price': 1}).eq('id', 1))
+        self.assertEqual(fake_supabase.tables['products'][0]['price'], 450.0)
+
+    def test_admins_and_the_service_role_see_everything(self):
+        admin_token = fake_supabase.session_for(ADMIN)['access_token']
+        self.assertEqual(len(with_access_token(supabase_service.table('orders').select('id'), admin_token).execute().data), 2)
+        self.assertEqual(len(supabase_service.table('orders').select('id').execute().data), 2)
+
+    def test_anon_sees_products_only(self):
+        self.assertEqual(with_access_token(supabase_service.table('orders').select('id'), ANON_KEY).execute().data, [])
+        self.assertEqual(len(with_access_token(supabase_service.table('products').select('id'), ANON_KEY).execute().data), 6)
+
+    def test_signed_out_sessions_are_rejected(self):
+        supabase_service.auth.admin.sign_out(self.student_token)
+        with self.assertRaises(Exception):
+            self.as_student(supabase_service.table('orders').select('id'))
+
+
+class FakeSupabaseStorageTests(FakeSupabaseTestCase):
+    def test_upload_download_list_and_remove(self):
+        bucket = supabase_service.storage.from_('product_images')
+        bucket.upload('products/mug.png', b'\x89PNG fake', {'content-type': 'image/png'})
+
+        self.assertEqual(bucket.download('products/mug.png'), b'\x89PNG fake')
+        self.assertEqual([entry['name'] for entry in bucket.list('products')], ['mug.png'])
+        self.assertTrue(bucket.get_public_url('products/mug.png').startswith(settings.SUPABASE_URL))
+
+        bucket.remove(['products/mug.png'])
+        self.assertEqual(bucket.list('products'), [])
+
+
+class ImageUploadMemoryTests(FakeSupabaseTestCase):
+    """upload_image streams Django's temporary upload file, so its peak memory must not grow with the file size."""
+    def photo(self, size):
+        png = io.BytesIO()
+        Image.new('RGB', (32, 32), 'gold').save(png, 'PNG')
+        upload = TemporaryUploadedFile('photo.png', 'image/png', size, None)
+        self.addCleanup(upload.close)
+        upload.write(png.getvalue())
+        remaining = size - png.tell()  # Padding after IEND, which decoders never read
+        while remaining > 0:
+            remaining -= upload.write(os.urandom(min(remaining, MB)))
+        upload.seek(0)
+        return upload
+
+    def peak_memory(self, uploaded_file):
+        tracemalloc.start()
+        try:
+            upload_image(PRODUCT_IMAGES_BUCKET, uploaded_file, 'product')
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    @override_settings(IMAGE_UPLOAD_MAX_BYTES=64 * MB)
+    def test_peak_memory_does_not_grow_with_file_size(self):
+        self.peak_memory(self.photo(MB))  # Warm up lazy imports and clients
+        peaks = {size: self.peak_memory(self.photo(size)) for size in (2 * MB, 8 * MB, 32 * MB)}
+
+        self.assertLess(max(peaks.values()) - min(peaks.values()), MB, peaks)
+        self.assertLess(peaks[32 * MB], 4 * MB, peaks)
+        stored_sizes = sorted(entry['size'] for entry in fake_supabase.buckets[PRODUCT_IMAGES_BUCKET].values())
+        self.assertEqual(stored_sizes[-1], 32 * MB)
+
+
+class ImageJobTests(TransactionTestCase):
+    """Workers close their database connections, which a TestCase transaction wouldn't survive."""
+    databases = {'default', 'mirror'}
+
+    def setUp(self):
+        fake_supabase.reset()
+        spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(spool_dir.cleanup)
+        spool_settings = override_settings(IMAGE_JOB_SPOOL_DIR=spool_dir.name)
+        spool_settings.enable()
+        self.addCleanup(spool_settings.disable)
+
+    def queue_job(self):
+        png = io.BytesIO()
+        Image.new('RGB', (32, 32), 'gold').save(png, 'PNG')
+        with mock.patch.object(jobs, 'submit_image_job'):
+            return jobs.enqueue_image_job(1, SimpleUploadedFile('photo.png', png.getvalue(), 'image/png'))
+
+    def test_another_instance_runs_the_job_from_the_staged_copy(self):
+        job = self.queue_job()
+        os.remove(job.spool_path)  # A redeploy wiped the instance that queued it
+
+        jobs.run_image_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImageJob.Status.DONE)
+        self.assertEqual(fake_supabase.tables['products'][0]['image_url'], job.image_url)
+        self.assertNotIn(job.staging_path, fake_supabase.buckets[PRODUCT_IMAGES_BUCKET])
+
+    def test_job_without_any_copy_fails(self):
+        job = self.queue_job()
+        os.remove(job.spool_path)
+        supabase_service.storage.from_(PRODUCT_IMAGES_BUCKET).remove([job.staging_path])
+
+        jobs.run_image_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (ImageJob.Status.FAILED, "The staged upload is missing."))
+
+
+class MirrorSyncTests(FakeSupabaseTestCase):
+    def test_full_sync_pages_in_id_order(self):
+        product_ids = sorted(p['id'] for p in fake_supabase.tables['products'])
+        store_rows = mirror.store_rows
+
+        def store_then_edit(table, rows, **kwargs):
+            store_rows(table, rows, **kwargs)
+            if rows and rows[0]['id'] == product_ids[0]:
+                # An admin edits the first product while the sync is between pages
+                supabase_service.table('products').update({'price': 99}).eq('id', product_ids[0]).execute()
+
+        with mock.patch.object(mirror, 'store_rows', store_then_edit):
+            summary = mirror.sync_table('products', full=True, page_size=2)
+
+        self.assertNotIn('error', summary)
+        self.assertEqual(sorted(Product.objects.values_list('id', flat=True)), product_ids)
+
+    def test_mirror_lives_in_its_own_database(self):
+        self.assertEqual(router.db_for_read(Product), 'mirror')
+        self.assertEqual(router.db_for_write(ImageJob), 'default')
+
+    @override_settings(MIRROR_READS_ENABLED=True)
+    def test_app_write_is_resynced_in_full_before_the_mirror_is_read(self):
+        mirror.sync_mirror(tables=['products'])
+        self.assertTrue(mirror.mirror_ready('products'))
+
+        # An RPC sells the last units without touching updated_at
+        product = fake_supabase.tables['products'][0]
+        product['stock_quantity'] = 0
+        invalidate_tags('products')
+        self.assertFalse(mirror.mirror_ready('products'))
+
+        summary, = mirror.sync_mirror(tables=['products'])
+        self.assertEqual(summary['mode'], 'full')
+        self.assertEqual(Product.objects.get(id=product['id']).stock_quantity, 0)
+        self.assertTrue(mirror.mirror_ready('products'))
+
+    def test_full_sync_deletes_rows_gone_upstream(self):
+        mirror.sync_table('products', full=True)
+        removed = fake_supabase.tables['products'].pop()
+        summary = mirror.sync_table('products', full=True)
+        self.assertEqual(summary['deleted'], 1)
+        self.assertFalse(Product.objects.filter(id=removed['id']).exists())
+
+
+class SingleFlightTests(FakeSupabaseTestCase):
+    def test_reads_that_differ_only_in_headers_are_not_coalesced(self):
+        def products():
+            return supabase_service.table('products').select('*').eq('id', 1)
+
+        plain = single_flight.key(products())
+        self.assertEqual(single_flight.key(products()), plain)
+        self.assertNotEqual(single_flight.key(supabase_service.table('products').select('*', count='exact').eq('id', 1)), plain)
+        self.assertNotEqual(single_flight.key(products().single()), plain)
+
+
+class GenerationCountersWithoutFcntlTests(SimpleTestCase):
+    """Windows has no fcntl; the counters and the change feed must still work there."""
+    def setUp(self):
+        patcher = mock.patch.object(invalidation, 'fcntl', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_generations_are_counted_in_process(self):
+        counters = invalidation.GenerationCounters('/dev/null/cache_generations.bin')
+        counters.bump('orders', 'notifications')
+        counters.bump('orders')
+        self.assertEqual(counters.snapshot('orders', 'notifications', 'products'), (2, 1, 0))
+
+    def test_every_process_leads_the_change_feed(self):
+        with mock.patch.object(change_feed, 'fcntl', None):
+            self.assertIsNotNone(change_feed._acquire_leadership('/dev/null/leader.lock'))
+
+
+# --- Student views -------------------------------------------------------------
+
+class StudentOrderTests(FakeSupabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        fake_supabase.sign_in(self.client, STUDENT)
+
+    def buy(self, product_id, quantity):
+        return self.client.post(reverse('create_order'), {
+            'product_id': product_id, 'quantity': quantity,
+            'deal_method': 'meet-up', 'payment_method': 'Cash',
+        }, **AJAX)
+
+    def test_buying_decrements_stock(self):
+        response = self.buy(1, 2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['new_stock_quantity'], 23)
+        self.assertEqual(self.stock(1), 23)
+        self.assertEqual(len(self.orders(user_id=self.student_id, product_id=1, order_type='order')), 1)
+
+    def test_buying_more_than_the_stock_fails(self):
+        response = self.buy(5, 6)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+        self.assertEqual(self.stock(5), 5)
+        self.assertEqual(self.orders(), [])
+
+    def test_sold_out_items_are_turned_away_before_the_rpc(self):
+        self.assertEqual(self.buy(5, 5).json()['new_stock_quantity'], 0)
+        fake_supabase.tables['products'][4]['stock_quantity'] = 1  # Changed behind the app's back
+
+        response = self.buy(5, 1)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['reason'], 'sold_out')
+        self.assertEqual(self.stock(5), 1)
+
+    def test_other_product_changes_clear_the_remembered_stock(self):
+        self.buy(5, 5)
+        self.client.post(reverse('create_reservation'), {'product_id': 1, 'quantity': 1}, **AJAX)
+        fake_supabase.tables['products'][4]['stock_quantity'] = 1
+        self.assertEqual(self.buy(5, 1).status_code, 200)
+
+    def test_reserving_holds_stock(self):
+        response = self.client.post(reverse('create_reservation'), {'product_id': 4, 'quantity': 3}, **AJAX)
+        self.assertEqual(response.json()['new_stock_quantity'], 5)
+        [reservation] = self.orders(user_id=self.student_id)
+        self.assertEqual(reservation['order_type'], 'reservation')
+        self.assertIsNotNone(reservation['expires_at'])
+
+    def test_reserving_an_out_of_stock_item_makes_a_backorder(self):
+        self.client.post(reverse('create_reservation'), {'product_id': 2, 'quantity': 1}, **AJAX)
+        [backorder] = self.orders(user_id=self.student_id)
+        self.assertEqual(backorder['order_type'], 'backorder')
+        self.assertEqual(self.stock(2), 0)
+
+    def test_checking_out_a_reservation(self):
+        self.client.post(reverse('create_reservation'), {'product_id': 4, 'quantity': 1}, **AJAX)
+        [reservation] = self.orders(user_id=self.student_id)
+        response = self.client.post(reverse('checkout_reservation'), {'reservation_id': reservation['id']})
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(self.orders(id=reservation['id'])[0]['order_type'], 'order')
+
+    def test_cancelling_a_reservation_restores_stock(self):
+        self.client.post(reverse('create_reservation'), {'product_id': 4, 'quantity': 3}, **AJAX)
+        [reservation] = self.orders(user_id=self.student_id)
+        response = self.client.post(reverse('cancel_reservation', args=[reservation['id']]))
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(self.stock(4), 8)
+        self.assertEqual(self.orders(id=reservation['id'])[0]['status'], 'cancelled')
+
+    def test_cancelling_an_approved_order_restores_stock(self):
+        self.buy(1, 2)
+        [order] = self.orders(user_id=self.student_id)
+        order['status'] = 'approved'
+        response = self.client.post(reverse('cancel_order', args=[order['id']]), **AJAX)
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(self.stock(1), 25)
+
+    def test_student_pages_render(self):
+        self.add_order(self.student_id)
+        for name in ('student_dashboard', 'browse_products', 'my_orders', 'my_reservations',
+                     'student_profile', 'all_notifications'):
+            with self.subTest(page=name):
+                self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+
+    def test_changing_the_password(self):
+        response = self.client.post(reverse('student_profile'), {
+            'form_type': 'password', 'current_password': 'Student@123',
+            'new_password1': 'Changed@123', 'new_password2': 'Changed@123',
+        }, **AJAX)
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(fake_supabase.users[self.student_id]['password'], 'Changed@123')
+        self.assertEqual(fake_supabase.users[self.admin_id]['password'], 'Admin@123')
+
+    def test_students_are_kept_out_of_admin_pages(self):
+        response = self.client.get(reverse('manage_products'))
+        self.assertNotEqual(response.status_code, 200)
+
+    def test_signed_out_users_are_sent_to_login(self):
+        self.client.logout()
+        response = self.client.get(reverse('my_orders'))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('login'), response['Location'])
+
+
+class StudentBulkActionTests(FakeSupabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        fake_supabase.sign_in(self.client, STUDENT)
+        other = fake_supabase.create_user('other@cit.edu', 'Other@1234')
+        self.other_id = other['id']
+
+    def test_batch_delete_orders_only_deletes_own_orders(self):
+        mine = [self.add_order(self.student_id, status='cancelled')['id'] for _ in range(2)]
+        theirs = self.add_order(self.other_id, status='cancelled')['id']
+
+        response = self.client.post(reverse('batch_delete_orders'),
+                                    {'order_ids': ','.join(map(str, mine + [theirs]))}, **AJAX)
+        self.assertTrue(response.json()['success'])
+        self.assertEqual([o['id'] for o in self.orders()], [theirs])
+
+    def test_batch_update_notifications(self):
+        ids = [self.add_notification(self.student_id, f'Update {n}')['id'] for n in range(3)]
+
+        response = self.client.post(reverse('batch_update_notifications'),
+                                    {'notification_ids': f'{ids[0]},{ids[1]}', 'action': 'mark_read'}, **AJAX)
+        body = response.json()
+        self.assertEqual(sorted(body['notification_ids']), ids[:2])
+        self.assertEqual(body['failed_ids'], [])
+        self.assertEqual([n['is_read'] for n in fake_supabase.tables['notifications']], [True, True, False])
+
+    def test_batch_delete_notifications(self):
+        ids = [self.add_notification(self.student_id, f'Update {n}')['id'] for n in range(3)]
+        theirs = self.add_notification(self.other_id, 'Not yours')['id']
+
+        response = self.client.post(reverse('batch_delete_notifications'),
+                                    {'notification_ids': f'{ids[0]},{ids[2]},{theirs}'}, **AJAX)
+        self.assertTrue(response.json()['success'])
+        self.assertEqual([n['id'] for n in fake_supabase.tables['notifications']], [ids[1], theirs])
+
+    def test_bulk_actions_reject_malformed_ids(self):
+        response = self.client.post(reverse('batch_delete_orders'), {'order_ids': 'x,y'}, **AJAX)
+        self.assertEqual(response.status_code, 400)
+
+
+class AsgiUserScopeTests(FakeSupabaseTestCase):
+    """Over ASGI the middleware never calls set_session, so sync views must not read as the shared client's user."""
+    def setUp(self):
+        super().setUp()
+        other = fake_supabase.create_user('other@cit.edu', 'Other@1234')
+        self.add_notification(self.student_id, 'Your PE Uniform order was approved.')
+        self.add_notification(other['id'], 'Someone else\'s order was rejected.')
+        fake_supabase.sign_in(self.async_client, STUDENT)
+        # The shared client last held another student's session
+        other_session = fake_supabase.session_for('other@cit.edu')
+        supabase.auth.set_session(other_session['access_token'], other_session['refresh_token'])
+
+    def tearDown(self):
+        supabase.auth.sign_out({'scope': 'local'})
+
+    async def test_sync_view_reads_as_the_signed_in_user(self):
+        response = await self.async_client.get(reverse('browse_products'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Your PE Uniform order was approved.')
+        self.assertNotContains(response, 'order was rejected')
+
+
+class SupabaseCallAccountingTests(FakeSupabaseTestCase):
+    def test_authentication_verifies_the_session_once(self):
+        fake_supabase.sign_in(self.client, ADMIN)
+        response = self.client.get(reverse('manage_products'))
+        self.assertIn('desc="1x auth:user"', response['Server-Timing'])
+
+    def test_students_get_no_timing_breakdown(self):
+        fake_supabase.sign_in(self.client, STUDENT)
+        self.assertNotIn('Server-Timing', self.client.get(reverse('browse_products')))
+
+    @override_settings(DEBUG=True)
+    def test_everyone_gets_the_timing_breakdown_under_debug(self):
+        fake_supabase.sign_in(self.client, STUDENT)
+        self.assertIn('rest-products', self.client.get(reverse('browse_products'))['Server-Timing'])
+
+
+# --- Admin views -------------------------------------------------------------
+
+class CatalogImportTests(FakeSupabaseTestCase):
+    CSV = (b"name,size,category,price,stock\n"
+           b"PE Uniform,M,Uniforms,450,40\n"
+           b"School Lanyard,,Accessories,95,120\n")
+
+    def product(self, name):
+        return next(p for p in fake_supabase.tables['products'] if p['name'] == name)
+
+    def import_while_students_buy(self):
+        existing_products = catalog._existing_products
+
+        def read_then_buy(*args, **kwargs):
+            products = existing_products(*args, **kwargs)
+            # Students buy uniforms and lanyards after the import read the stock
+            self.product('PE Uniform')['stock_quantity'] -= 3
+            self.product('School Lanyard')['stock_quantity'] -= 2
+            return products
+
+        with mock.patch.object(catalog, '_existing_products', read_then_buy):
+            return catalog.import_products(io.BytesIO(self.CSV), 'catalog.csv')
+
+    def test_import_updates_and_restocks(self):
+        report = catalog.import_products(io.BytesIO(self.CSV), 'catalog.csv')
+        self.assertEqual((report['updated'], report['error_count']), (2, 0))
+        self.assertEqual(self.product('PE Uniform')['stock_quantity'], 40)
+        self.assertEqual(self.product('School Lanyard')['price'], 95)
+
+    def test_restock_does_not_overwrite_a_purchase_made_during_the_import(self):
+        report = self.import_while_students_buy()
+        self.assertEqual(report['updated'], 1)
+        self.assertEqual(report['errors'][0]['row'], 2)
+        self.assertEqual(self.product('PE Uniform')['stock_quantity'], 22)
+
+    def test_update_that_keeps_the_stock_leaves_it_untouched(self):
+        self.import_while_students_buy()
+        lanyard = self.product('School Lanyard')
+        self.assertEqual((lanyard['price'], lanyard['stock_quantity']), (95, 118))
+
+
+class StorageGarbageCollectionTests(FakeSupabaseTestCase):
+    def upload_old_object(self, name):
+        bucket = supabase_service.storage.from_(PRODUCT_IMAGES_BUCKET)
+        bucket.upload(name, b'\x89PNG fake', {'content-type': 'image/png'})
+        fake_supabase.buckets[PRODUCT_IMAGES_BUCKET][name]['created_at'] = '2020-01-01T00:00:00+00:00'
+        return bucket.get_public_url(name)
+
+    def test_orphan_reused_during_the_run_is_kept(self):
+        reused_url = self.upload_old_object('products_reused.png')
+        self.upload_old_object('products_orphan.png')
+        iter_bucket_objects = storage_gc.iter_bucket_objects
+
+        def list_then_reuse(*args, **kwargs):
+            yield from iter_bucket_objects(*args, **kwargs)
+            # An admin uploads the same photo for a product after the listing
+            supabase_service.table('products').update({'image_url': reused_url}).eq('name', 'Wildcats Mug').execute()
+
+        with mock.patch.object(storage_gc, 'iter_bucket_objects', list_then_reuse):
+            summary = storage_gc.collect_orphaned_objects(PRODUCT_IMAGES_BUCKET, dry_run=False)
+
+        self.assertEqual((summary['deleted'], summary['reused']), (1, 1))
+        self.assertEqual(sorted(fake_supabase.buckets[PRODUCT_IMAGES_BUCKET]), ['products_reused.png'])
+
+
+class AdminViewTests(FakeSupabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        fake_supabase.sign_in(self.client, ADMIN)
+
+    def test_admin_pages_render(self):
+        self.add_order(self.student_id)
+        for name in ('admin_dashboard', 'manage_products', 'order_management', 'reports',
+                     'manage_students', 'admin_profile'):
+            with self.subTest(page=name):
+                self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+
+    def test_approving_an_order(self):
+        order = self.add_order(self.student_id)
+        response = self.client.post(reverse('update_order_status', args=[order['id']]), {'status': 'approved'})
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(self.orders(id=order['id'])[0]['status'], 'approved')
+        self.assertIsNotNone(self.orders(id=order['id'])[0]['expires_at'])
+
+    def edit_product(self, product_id, **fields):
+        product = next(p for p in fake_supabase.tables['products'] if p['id'] == product_id)
+        data = {
+            'product-name': product['name'], 'product-description': product['description'],
+            'product-price': product['price'], 'stock-quantity': product['stock_quantity'],
+            'product-category': product['category'], 'product-size': product['size'] or '',
+            'original-stock': product['stock_quantity'], **fields,
+        }
+        return self.client.post(reverse('edit_product', args=[product_id]), data, **AJAX)
+
+    def test_editing_a_product(self):
+        response = self.edit_product(3, **{'product-name': '  School Lanyard (Blue) ', 'product-price': '85.5'})
+        self.assertTrue(response.json()['success'])
+        lanyard = next(p for p in fake_supabase.tables['products'] if p['id'] == 3)
+        self.assertEqual((lanyard['name'], lanyard['price']), ('School Lanyard (Blue)', 85.5))
+
+    def test_editing_a_product_uses_the_add_product_rules(self):
+        for fields, error in (
+            ({'product-price': '-5'}, 'Price cannot be negative.'),
+            ({'product-size': 'XXXL'}, 'Uniforms need a size'),
+            ({'product-category': 'Snacks'}, "Unknown category 'Snacks'."),
+        ):
+            with self.subTest(fields=fields):
+                response = self.edit_product(1, **fields)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(error, response.json()['error'])
+        self.assertEqual(self.stock(1), 25)
+
+    def test_status_change_refreshes_the_students_notification_bell(self):
+        # The database notifies the student, so the cached bell must go too
+        order = self.add_order(self.student_id)
+        before = invalidation.generations.get('notifications')
+        self.client.post(reverse('update_order_status', args=[order['id']]), {'status': 'approved'})
+        self.assertGreater(invalidation.generations.get('notifications'), before)
+
+    def test_rejecting_orders_in_a_batch_restores_stock(self):
+        fake_supabase.tables['products'][0]['stock_quantity'] = 20
+        first, second = self.add_order(self.student_id, quantity=2), self.add_order(self.student_id, quantity=3)
+        response = self.client.post(reverse('update_order_status', args=[0]),
+                                    {'status': 'rejected', 'order_ids': f"{first['id']},{second['id']}"})
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(self.stock(1), 25)
+
+    def test_batch_delete_orders(self):
+        ids = [self.add_order(self.student_id)['id'] for _ in range(3)]
+        response = self.client.post(reverse('admin_batch_delete_orders'), {'order_ids': f'{ids[0]},{ids[1]}'})
+        body = response.json()
+        self.assertEqual(sorted(body['order_ids']), ids[:2])
+        self.assertEqual([o['id'] for o in self.orders()], [ids[2]])
+
+    def test_batch_delete_products(self):
+        response = self.client.post(reverse('batch_update_products'),
+                                    {'action': 'delete-selected', 'product_ids': '5,6'}, **AJAX)
+        self.assertEqual(sorted(response.json()['product_ids']), [5, 6])
+        self.assertEqual([p['id'] for p in fake_supabase.tables['products']], [1, 2, 3, 4])
+
+    @override_settings(IMAGE_JOBS_ENABLED=True, IMAGE_JOB_SPOOL_DIR='/dev/null/image_jobs')
+    def test_adding_a_product_survives_a_failed_image_job(self):
+        image = SimpleUploadedFile('pen.png', b'\x89PNG\r\n\x1a\n' + b'\0' * 64, content_type='image/png')
+        response = self.client.post(reverse('add_product'), {
+            'product-name': 'Ballpen', 'product-description': 'Blue ink', 'product-price': '10',
+            'stock-quantity': '50', 'product-category': 'Office & School Supplies', 'product-image': image,
+        }, **AJAX)
+        body = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(body['success'])
+        self.assertIn('image_job_error', body)
+        self.assertNotIn('image_job_id', body)
+        self.assertEqual(fake_supabase.tables['products'][-1]['name'], 'Ballpen')
+
+    def test_blocking_a_student(self):
+        response = self.client.post(reverse('admin_block_student', args=[self.student_id]), {'is_blocked': 'true'}, **AJAX)
+        self.assertTrue(response.json()['success'])
+        self.assertTrue(fake_supabase.users[self.student_id]['user_metadata']['is_blocked'])
@@ -28,12 +28,16 @@ urlpatterns = [
     # --- Admin URLs ---
     path('admin/', views.admin_dashboard, name='admin_dashboard'),
     path('redirect/', views.dashboard_redirect, name='dashboard_redirect'),
+    path('admin/admission-metrics/', views.admission_metrics_view, name='admission_metrics'),
+    path('admin/cache-metrics/', views.cache_metrics_view, name='cache_metrics'),
     path('admin/manage-products/', views.manage_products_view, name='manage_products'),
     path('admin/batch-update-products/', views.batch_update_products, name='batch_update_products'),
     path('admin/profile/', views.admin_profile_view, name='admin_profile'), 
     path('admin/add_product/', views.add_product, name='add_product'),
+    path('admin/import-products/', views.import_products_view, name='import_products'),
     path('admin/edit-product/<int:product_id>/', views.edit_product, name='edit_product'),
     path('admin/delete-product/<int:product_id>/', views.delete_product, name='delete_product'),
+    path('admin/image-jobs/<int:job_id>/', views.image_job_status_view, name='image_job_status'),
     path('admin/order-management/', views.order_management_view, name='order_management'),
     path('admin/update-order-status/<int:order_id>/', views.update_order_status, name='update_order_status'),
     path('admin/delete-order/<int:order_id>/', views.delete_order_view, name='delete_order'),
@@ -1,4 +1,7 @@
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
 from supabase_client import supabase_service
+from .caching import invalidate_tags
 import pytz
 from datetime import datetime
 
@@ -25,6 +28,7 @@ def log_activity(user, action_type, details=None):
             'action': action_type,
             'details': details or {}
         }).execute()
+        invalidate_tags('activity_log')
     except Exception as e:
         # Fail silently (print to console) so we don't crash the main view
         print(f"Error logging activity for user {user.id}: {e}")
@@ -46,3 +50,46 @@ def get_greeting():
     if 5 <= current_hour < 12: return "Good morning"
     if 12 <= current_hour < 18: return "Good afternoon"
     return "Good evening"
+
+
+def notify_users(notifications):
+    """
+    Inserts many rows into the Supabase 'notifications' table in one request.
+
+    Accepts a list of dictionaries, each with at least 'user_id' and 'message'
+    and optionally 'link_url' and 'product_id'. Sending the whole list as a single
+    multi-row insert keeps background jobs from paying one round trip per student.
+    Uses the service role client because the recipients are not the caller.
+    Fails silently (prints to console) like log_activity, and returns the number
+    of notifications that were sent.
+    """
+    if not notifications:
+        return 0
+
+    try:
+        supabase_service.table('notifications').insert([
+            {
+                'user_id': str(item['user_id']),
+                'message': item['message'],
+                'link_url': item.get('link_url'),
+                'product_id': item.get('product_id'),
+                'is_read': False,
+            }
+            for item in notifications
+        ]).execute()
+        invalidate_tags('notifications')
+        return len(notifications)
+    except Exception as e:
+        print(f"Error sending {len(notifications)} notifications: {e}")
+        return 0
+
+
+async def arender(request, template_name, context=None):
+    """
+    Async counterpart of django.shortcuts.render() for async views.
+
+    Rendering is synchronous and can block: the context processors and the
+    page chrome may query Supabase with the sync client. It therefore runs in
+    a worker thread so the event loop keeps serving other requests meanwhile.
+    """
+    return await sync_to_async(render, thread_sensitive=False)(request, template_name, context)
@@ -2,23 +2,41 @@ from django.shortcuts import render, redirect
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.http import JsonResponse
 from django.contrib import messages
-from supabase_client import supabase, supabase_service
+from supabase_client import supabase, supabase_service, async_postgrest, with_access_token
 from supabase_client import supabase_service
 from .decorators import admin_required
 from django.views.decorators.http import require_POST
-from .utils import log_activity, get_greeting
-from .decorators import admin_required, student_required
+from .utils import log_activity, get_greeting, arender
+from .backorders import fulfil_backorders
+from .admission import purchase_queue, AdmissionRejected
+from .change_feed import change_feed_stats
+from .bulk import parse_id_list, run_logged_bulk_action
+from .images import upload_image, remove_image, validate_image_upload, PRODUCT_IMAGES_BUCKET, AVATARS_BUCKET, AVATAR_VARIANTS
+from .jobs import enqueue_image_job, image_jobs_enabled
+from .catalog import clean_product_fields, import_products
+from .models import ImageJob, Product, Order, ActivityLog
+from .mirror import mirror_ready, mirror_rows, forget_mirrored_rows, as_rows
+from .caching import view_cache, invalidate_tags
+from .singleflight import single_flight
+from django.db.models import Q
+from asgiref.sync import sync_to_async
+from .decorators import admin_required, student_required, invalidates
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 from .decorators import student_required
+import asyncio
 import json
 import pytz
 import uuid
 import math
 import requests
 
+def _as_user(request, query):
+    """Runs a PostgREST query (sync or async) as the request's signed-in user (see with_access_token)."""
+    return with_access_token(query, request.session.get('supa_access_token'))
+
 def dashboard_redirect(request):
     """
     Redirects an authenticated user to their appropriate dashboard (admin or student).
@@ -42,6 +60,7 @@ def dashboard_redirect(request):
 
 @student_required
 @require_http_methods(["POST"]) # Only allow POST requests
+@invalidates('notifications')
 def mark_notifications_as_read(request):
     """
     Marks all unread notifications for the current user as 'read'.
@@ -57,11 +76,11 @@ def mark_notifications_as_read(request):
     try:
         # Use the user's RLS-enabled client (supabase).
         # This will ONLY update their own notifications.
-        supabase.table('notifications') \
-            .update({'is_read': True}) \
-            .eq('user_id', request.user.id) \
-            .eq('is_read', False) \
-            .execute()
+        _as_user(request, supabase.table('notifications')
+            .update({'is_read': True})
+            .eq('user_id', request.user.id)
+            .eq('is_read', False)
+        ).execute()
 
         # Return success
         return JsonResponse({'success': True})
@@ -72,6 +91,7 @@ def mark_notifications_as_read(request):
     
 @student_required
 @require_http_methods(["POST"])
+@invalidates('notifications')
 def mark_all_as_read_header_view(request):
     """
     Marks all unread notifications for a user as 'read' via AJAX request.
@@ -83,11 +103,11 @@ def mark_all_as_read_header_view(request):
         return JsonResponse({'success': False, 'error': 'Invalid request'}, status=400)
     
     try:
-        supabase.table('notifications') \
-            .update({'is_read': True}) \
-            .eq('user_id', request.user.id) \
-            .eq('is_read', False) \
-            .execute()
+        _as_user(request, supabase.table('notifications')
+            .update({'is_read': True})
+            .eq('user_id', request.user.id)
+            .eq('is_read', False)
+        ).execute()
         
         # After updating, the new unread count is 0
         return JsonResponse({'success': True, 'new_unread_count': 0})
@@ -98,6 +118,7 @@ def mark_all_as_read_header_view(request):
 
 @student_required
 @require_http_methods(["POST"])
+@invalidates('notifications')
 def mark_notification_read_and_redirect(request, notification_id):
     """
     Marks a single notification as read and redirects user to the notification's link.
@@ -110,12 +131,12 @@ def mark_notification_read_and_redirect(request, notification_id):
     fallback_url = '/dashboard/student/my-orders/' 
     
     try:
-        response = supabase.table('notifications') \
-            .select('link_url') \
-            .eq('id', notification_id) \
-            .eq('user_id', request.user.id) \
-            .single() \
-            .execute()
+        response = _as_user(request, supabase.table('notifications')
+            .select('link_url')
+            .eq('id', notification_id)
+            .eq('user_id', request.user.id)
+            .single()
+        ).execute()
 
         if response.data and response.data.get('link_url'):
             link_url = response.data['link_url']
@@ -123,11 +144,11 @@ def mark_notification_read_and_redirect(request, notification_id):
             link_url = fallback_url
 
         # After getting the link, mark the notification as read
-        supabase.table('notifications') \
-            .update({'is_read': True}) \
-            .eq('id', notification_id) \
-            .eq('user_id', request.user.id) \
-            .execute()
+        _as_user(request, supabase.table('notifications')
+            .update({'is_read': True})
+            .eq('id', notification_id)
+            .eq('user_id', request.user.id)
+        ).execute()
 
         return JsonResponse({'success': True, 'redirect_url': link_url})
 
@@ -174,6 +195,7 @@ def all_notifications_view(request):
 
 @student_required
 @require_http_methods(["POST"])
+@invalidates('notifications')
 def batch_update_notifications(request):
     """
     Handles batch updates to notification read status via AJAX.
@@ -192,28 +214,39 @@ def batch_update_notifications(request):
         if not notification_ids_str or not action:
             raise ValueError("Missing 'notification_ids' or 'action'.")
 
-        notification_ids = [int(nid) for nid in notification_ids_str.split(',') if nid.isdigit()]
+        notification_ids = parse_id_list(notification_ids_str)
         
         if not notification_ids:
             raise ValueError("No valid notification IDs provided.")
 
         new_status = True if action == 'mark_read' else False
-        
-        supabase.table('notifications') \
-            .update({'is_read': new_status}) \
-            .in_('id', notification_ids) \
-            .eq('user_id', request.user.id) \
-            .execute()
+        user_id = request.user.id
+
+        def update_chunk(chunk):
+            _as_user(request, supabase.table('notifications')
+                .update({'is_read': new_status})
+                .in_('id', chunk)
+                .eq('user_id', user_id)
+            ).execute()
+
+        result = run_logged_bulk_action(
+            request.user, 'NOTIFICATION_BATCH_UPDATED', notification_ids, update_chunk,
+            details={'action_taken': action}, ids_key='notification_ids'
+        )
+        if not result.succeeded:
+            raise Exception(result.failures[0]['error'])
 
         # After updating, get the new total unread count (using RLS-enabled client)
-        count_response = supabase.table('notifications') \
-            .select('id', count='exact') \
-            .eq('is_read', False) \
-            .execute()
+        count_response = _as_user(request, supabase.table('notifications')
+            .select('id', count='exact')
+            .eq('is_read', False)
+        ).execute()
         
         return JsonResponse({
             'success': True, 
-            'message': f'{len(notification_ids)} notifications updated.',
+            'message': f'{len(result.succeeded)} notifications updated.',
+            'notification_ids': result.succeeded,
+            'failed_ids': result.failed_ids,
             'new_unread_count': count_response.count  
         })
 
@@ -223,6 +256,7 @@ def batch_update_notifications(request):
 
 @student_required
 @require_http_methods(["POST"])
+@invalidates('notifications')
 def batch_delete_notifications(request):
     """
     Permanently deletes a batch of notifications via AJAX request.
@@ -239,26 +273,38 @@ def batch_delete_notifications(request):
         if not notification_ids_str:
             raise ValueError("Missing 'notification_ids'.")
 
-        notification_ids = [int(nid) for nid in notification_ids_str.split(',') if nid.isdigit()]
+        notification_ids = parse_id_list(notification_ids_str)
         
         if not notification_ids:
             raise ValueError("No valid notification IDs provided.")
-        
-        supabase_service.table('notifications') \
-            .delete() \
-            .in_('id', notification_ids) \
-            .eq('user_id', request.user.id) \
-            .execute()
+
+        user_id = request.user.id
+
+        def delete_chunk(chunk):
+            supabase_service.table('notifications') \
+                .delete() \
+                .in_('id', chunk) \
+                .eq('user_id', user_id) \
+                .execute()
+
+        result = run_logged_bulk_action(
+            request.user, 'NOTIFICATION_BATCH_DELETED', notification_ids, delete_chunk,
+            ids_key='notification_ids'
+        )
+        if not result.succeeded:
+            raise Exception(result.failures[0]['error'])
         
         # After deleting, get the new total unread count (using RLS-enabled client)
-        count_response = supabase.table('notifications') \
-            .select('id', count='exact') \
-            .eq('is_read', False) \
-            .execute()
+        count_response = _as_user(request, supabase.table('notifications')
+            .select('id', count='exact')
+            .eq('is_read', False)
+        ).execute()
         
         return JsonResponse({
             'success': True, 
-            'message': f'{len(notification_ids)} notifications deleted.',
+            'message': f'{len(result.succeeded)} notifications deleted.',
+            'notification_ids': result.succeeded,
+            'failed_ids': result.failed_ids,
             'new_unread_count': count_response.count  
         })
 
@@ -267,6 +313,7 @@ def batch_delete_notifications(request):
 
 @student_required
 @require_http_methods(["POST"])
+@invalidates('notifications')
 def mark_all_as_read_view(request):
     """
     Marks ALL unread notifications as read via AJAX request.
@@ -279,11 +326,11 @@ def mark_all_as_read_view(request):
         return JsonResponse({'success': False, 'error': 'Invalid request'}, status=400)
     
     try:
-        supabase.table('notifications') \
-            .update({'is_read': True}) \
-            .eq('user_id', request.user.id) \
-            .eq('is_read', False) \
-            .execute()
+        _as_user(request, supabase.table('notifications')
+            .update({'is_read': True})
+            .eq('user_id', request.user.id)
+            .eq('is_read', False)
+        ).execute()
         
         # After marking all as read, the new unread count is 0.
         return JsonResponse({
@@ -296,12 +343,13 @@ def mark_all_as_read_view(request):
         return JsonResponse({'success': False, 'error': str(e)}, status=400)
 
 @student_required
-def student_dashboard(request):
+async def student_dashboard(request):
     """
     Renders the main student dashboard with personalized welcome and order summaries.
     
     Displays a greeting message, user display name, and summaries of the most recent
     reservation and order. Fetches data via RPC functions and handles date parsing.
+    Async: both summaries are requested concurrently with the async PostgREST client.
     Provides a welcoming interface with key information at a glance.
     """
     raw_name = getattr(request.user, 'get_full_name', lambda: 'Wildcat')()
@@ -334,9 +382,13 @@ def student_dashboard(request):
     
     try:
         user_id = request.user.id
+        client = async_postgrest()
         
-        # Fetch the most recent reservation
-        res_response = supabase.rpc('get_my_detailed_reservations', {'p_user_id': user_id}).limit(1).execute()
+        # Fetch the most recent reservation and order concurrently
+        res_response, order_response = await asyncio.gather(
+            _as_user(request, client.rpc('get_my_detailed_reservations', {'p_user_id': user_id}).limit(1)).execute(),
+            _as_user(request, client.rpc('get_my_orders', {'p_user_id': user_id}).limit(1)).execute(),
+        )
         if res_response.data:
             latest_reservation = res_response.data[0]
             if latest_reservation.get('created_at'):
@@ -344,8 +396,6 @@ def student_dashboard(request):
             if latest_reservation.get('expires_at'):
                 latest_reservation['expires_at'] = datetime.fromisoformat(latest_reservation['expires_at'])
 
-        # Fetch the most recent order
-        order_response = supabase.rpc('get_my_orders', {'p_user_id': user_id}).limit(1).execute()
         if order_response.data:
             latest_order = order_response.data[0]
             if latest_order.get('created_at'):
@@ -368,7 +418,7 @@ def student_dashboard(request):
         'active_page': 'dashboard',
         'page_title': 'Dashboard',
     }
-    return render(request, 'dashboards/student_dashboard.html', context)
+    return await arender(request, 'dashboards/student_dashboard.html', context)
 
 @student_required
 def browse_products_view(request):
@@ -376,22 +426,34 @@ def browse_products_view(request):
     Displays all available products organized by category with search functionality.
     
     Fetches products from the database, groups them by category, and supports
-    keyword search filtering. Returns categorized product data for template rendering.
+    keyword search filtering. Reads the local mirror when it is fresh, Supabase otherwise.
+    The product list is cached for all students per search term until products change.
+    Returns categorized product data for template rendering.
     Handles errors gracefully with user-friendly messages.
     """
     search_query = request.GET.get('search', '').strip()
     categorized_products = defaultdict(list)
-    
-    try:
+
+    def load_products():
+        if mirror_ready('products'):
+            queryset = Product.objects.order_by('-created_at')
+            if search_query:
+                queryset = queryset.filter(name__icontains=search_query)
+            return as_rows(queryset)
+
         # Start the base query
-        query = supabase.table('products').select('*').order('created_at', desc=True)
+        query = _as_user(request, supabase.table('products').select('*').order('created_at', desc=True))
 
         # If there's a search query, add the filter to the query
         if search_query:
             query = query.ilike('name', f'%{search_query}%')
         
-        response = query.execute() 
-        products = response.data
+        # Identical searches in flight at once share one query
+        response = single_flight.execute(query)
+        return response.data
+    
+    try:
+        products = view_cache.get_or_set(request, 'browse_products', load_products, tags=['products'], vary=[search_query])
 
         if products:
             for product in products:
@@ -417,15 +479,19 @@ def my_reservations_view(request):
     
     Fetches all pending reservations and backorders associated with the authenticated user.
     Separates them by order_type and handles date parsing for display.
-    Shows only items currently in pending status.
+    Shows only items currently in pending status. Cached per student until orders or products change.
     """
     reservations, backorders = [], []
     try:
         user_id = request.user.id
-        response = supabase.rpc('get_my_detailed_reservations', {'p_user_id': user_id}).execute()
+        rows = view_cache.get_or_set(
+            request, 'my_reservations',
+            lambda: single_flight.execute(_as_user(request, supabase.rpc('get_my_detailed_reservations', {'p_user_id': user_id}))).data,
+            tags=['orders', 'products'], per_user=True
+        )
         
-        if response.data:
-            for item in response.data:
+        if rows:
+            for item in [dict(row) for row in rows]:
                 # Only show items that are currently in a 'pending' state
                 if item.get('status') == 'pending':
                     if item.get('created_at'):
@@ -463,7 +529,7 @@ def my_orders_view(request):
     try:
         user_id = request.user.id
         # Call the detailed function to get product and user info
-        response = supabase.rpc('get_my_detailed_orders', {'p_user_id': user_id}).execute()
+        response = _as_user(request, supabase.rpc('get_my_detailed_orders', {'p_user_id': user_id})).execute()
         
         if response.data:
             all_orders = response.data
@@ -525,6 +591,7 @@ def my_orders_view(request):
     return render(request, 'dashboards/my_orders.html', context)
 
 @student_required
+@invalidates('orders')
 def batch_delete_orders_view(request):
     """ 
     Allows students to delete multiple completed or cancelled orders via AJAX.
@@ -536,20 +603,35 @@ def batch_delete_orders_view(request):
     if request.method == 'POST' and request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         order_ids_str = request.POST.get('order_ids')
         try:
-            order_ids = [int(oid) for oid in order_ids_str.split(',') if oid.isdigit()]
+            order_ids = parse_id_list(order_ids_str)
             if not order_ids:
                 raise ValueError("No valid order IDs provided.")
 
             user_id = request.user.id
 
             # Use service role but ensure the user owns the orders
-            supabase_service.table('orders') \
-                .delete() \
-                .in_('id', order_ids) \
-                .eq('user_id', user_id) \
-                .execute()
+            def delete_chunk(chunk):
+                supabase_service.table('orders') \
+                    .delete() \
+                    .in_('id', chunk) \
+                    .eq('user_id', user_id) \
+                    .execute()
+
+            result = run_logged_bulk_action(
+                request.user, 'ORDER_HISTORY_BATCH_DELETED', order_ids, delete_chunk, ids_key='order_ids'
+            )
+            if not result.succeeded:
+                raise Exception(result.failures[0]['error'])
 
-            return JsonResponse({'success': True, 'message': f"✅ {len(order_ids)} order(s) have been deleted."})
+            message = f"✅ {len(result.succeeded)} order(s) have been deleted."
+            if result.failures:
+                message += f" {len(result.failed_ids)} could not be deleted."
+            return JsonResponse({
+                'success': True,
+                'message': message,
+                'order_ids': result.succeeded,
+                'failed_ids': result.failed_ids
+            })
 
         except Exception as e:
             return JsonResponse({'success': False, 'error': f"An error occurred during batch deletion: {e}"}, status=400)
@@ -557,6 +639,7 @@ def batch_delete_orders_view(request):
     return JsonResponse({'success': False, 'error': 'Invalid request.'}, status=400)
 
 @student_required
+@invalidates('orders')
 def delete_single_order_view(request, order_id):
     """ 
     Allows students to delete a single completed or cancelled order via AJAX.
@@ -584,6 +667,7 @@ def delete_single_order_view(request, order_id):
     return JsonResponse({'success': False, 'error': 'Invalid request.'}, status=400)
 
 @student_required
+@invalidates('orders', 'products')
 def create_reservation_view(request):
     """
     Processes AJAX POST request to create a new reservation or backorder.
@@ -606,7 +690,7 @@ def create_reservation_view(request):
                 'p_is_urgent': 'is_urgent' in request.POST
             }
 
-            response = supabase.rpc('create_reservation', params).execute()
+            response = _as_user(request, supabase.rpc('create_reservation', params)).execute()
 
             if hasattr(response, 'error') and response.error:
                     raise Exception(str(response.error))
@@ -615,7 +699,7 @@ def create_reservation_view(request):
 
             # After success, fetch the product's current stock quantity
             new_stock_quantity = None
-            stock_response = supabase.table('products').select('stock_quantity').eq('id', product_id).single().execute()
+            stock_response = _as_user(request, supabase.table('products').select('stock_quantity').eq('id', product_id).single()).execute()
             if stock_response.data:
                 new_stock_quantity = stock_response.data.get('stock_quantity')
 
@@ -638,7 +722,7 @@ def create_reservation_view(request):
                 _product_id = int(request.POST.get('product_id', 0))
                 _new_stock = 0 # Default stock in this edge case
                 try: 
-                    stock_response = supabase.table('products').select('stock_quantity').eq('id', _product_id).single().execute()
+                    stock_response = _as_user(request, supabase.table('products').select('stock_quantity').eq('id', _product_id).single()).execute()
                     if stock_response.data: _new_stock = stock_response.data.get('stock_quantity', 0)
                 except: pass
                 return JsonResponse({
@@ -654,6 +738,7 @@ def create_reservation_view(request):
     return JsonResponse({'success': False, 'error': 'Invalid request.'}, status=400)
 
 @student_required
+@invalidates('orders')
 def create_order_view(request):
     """
     Processes AJAX POST request to create a new order (direct purchase).
@@ -677,7 +762,9 @@ def create_order_view(request):
                 'p_payment_transaction_id': request.POST.get('payment_transaction_id', None)
             }
 
-            response = supabase.rpc('buy_product', params).execute()
+            # Purchases of the same product wait their turn instead of contending on its stock row
+            with purchase_queue.admit(product_id, quantity_ordered):
+                response = _as_user(request, supabase.rpc('buy_product', params)).execute()
 
             if hasattr(response, 'error') and response.error:
                 raise Exception(str(response.error))
@@ -691,10 +778,15 @@ def create_order_view(request):
                 new_stock_quantity = response.data[0]['new_stock_quantity']
             # Option B: Fetch manually if RPC doesn't return it
             if new_stock_quantity is None:
-                stock_response = supabase.table('products').select('stock_quantity').eq('id', product_id).single().execute()
+                stock_response = _as_user(request, supabase.table('products').select('stock_quantity').eq('id', product_id).single()).execute()
                 if stock_response.data:
                     new_stock_quantity = stock_response.data.get('stock_quantity')
 
+            # Bump products ourselves *before* recording the stock: the admission
+            # check then only distrusts it once someone else changes products.
+            invalidate_tags('products')
+            purchase_queue.record_stock(product_id, new_stock_quantity)
+
             if new_stock_quantity is None:
                 new_stock_quantity = 0 # Default to 0 if fetch failed
 
@@ -705,14 +797,20 @@ def create_order_view(request):
                 'new_stock_quantity': new_stock_quantity
             })
 
+        except AdmissionRejected as e:
+            # Turned away by the waiting room before reaching the database
+            status = 409 if e.reason == 'sold_out' else 429
+            return JsonResponse({'success': False, 'error': str(e), 'reason': e.reason}, status=status)
+
         except Exception as e:
             error_str = str(e)
             # Handle edge case where RPC errors but operation may have succeeded
             if "'success': True" in error_str:
+                invalidate_tags('products')
                 _product_id = int(request.POST.get('product_id', 0)) 
                 _new_stock = 0
                 try:
-                    stock_response = supabase.table('products').select('stock_quantity').eq('id', _product_id).single().execute()
+                    stock_response = _as_user(request, supabase.table('products').select('stock_quantity').eq('id', _product_id).single()).execute()
                     if stock_response.data: _new_stock = stock_response.data.get('stock_quantity', 0)
                 except: pass 
                 return JsonResponse({
@@ -728,6 +826,7 @@ def create_order_view(request):
     return JsonResponse({'success': False, 'error': 'Invalid request.'}, status=400)
 
 @student_required
+@invalidates('orders', 'products', 'notifications')
 def checkout_reservation_view(request):
     """
     Converts a reservation into a pending order via AJAX POST request.
@@ -742,7 +841,7 @@ def checkout_reservation_view(request):
             user_id = request.user.id
             params = {'p_order_id': reservation_id, 'p_user_id': user_id}
 
-            response = supabase.rpc('checkout_reservation', params).execute()
+            response = _as_user(request, supabase.rpc('checkout_reservation', params)).execute()
             
             # You might add error checking here based on the 'response' object
             
@@ -755,6 +854,7 @@ def checkout_reservation_view(request):
 
 
 @student_required
+@invalidates('user_profiles')
 def student_profile_view(request):
     """
     Displays student profile page (GET) and handles profile/password updates (POST AJAX).
@@ -778,19 +878,8 @@ def student_profile_view(request):
                 avatar_file = request.FILES.get('avatar_image')
 
                 if avatar_file:
-                    # Create a unique file name
-                    file_ext = avatar_file.name.split('.')[-1]
-                    file_name = f'user_{user_id}_{uuid.uuid4()}.{file_ext}'
-
-                    # Upload to Supabase Storage
-                    supabase_service.storage.from_('avatars').upload(
-                        file=avatar_file.read(),
-                        path=file_name,
-                        file_options={"content-type": avatar_file.content_type}
-                    )
-
-                    # Get the public URL
-                    avatar_url = supabase_service.storage.from_('avatars').get_public_url(file_name)
+                    # Upload the original plus small WebP derivatives for the header
+                    avatar_url = upload_image(AVATARS_BUCKET, avatar_file, 'avatar', variants=AVATAR_VARIANTS)
 
                 # Prepare parameters for the RPC function
                 params = {
@@ -804,7 +893,7 @@ def student_profile_view(request):
                     params['p_avatar_url'] = avatar_url
 
                 # Call the RPC function
-                supabase.rpc('update_my_profile', params).execute()
+                _as_user(request, supabase.rpc('update_my_profile', params)).execute()
 
                 # Send back the new avatar_url in the success message
                 response_data = {
@@ -842,7 +931,7 @@ def student_profile_view(request):
                 })
 
                 # 2. UPDATE TO NEW PASSWORD
-                supabase.auth.update_user({'password': new_password1})
+                supabase_service.auth.admin.update_user_by_id(request.user.id, {'password': new_password1})
 
                 # 3. MANUALLY LOG THE USER OUT (Clear invalid tokens)
                 if 'supa_access_token' in request.session:
@@ -879,7 +968,7 @@ def student_profile_view(request):
     # --- Handle GET request to display the page ---
     profile_data = {}
     try:
-        response = supabase.table('user_profiles').select('*').eq('user_id', user_id).single().execute()
+        response = _as_user(request, supabase.table('user_profiles').select('*').eq('user_id', user_id).single()).execute()
         profile_data = response.data
     except Exception as e:
         messages.error(request, f'Could not load your profile: {e}')
@@ -892,6 +981,7 @@ def student_profile_view(request):
     return render(request, 'dashboards/student_profile.html', context)
 
 @student_required
+@invalidates('orders', 'products', 'notifications')
 def cancel_reservation_view(request, reservation_id):
     """
     Allows students to cancel their own reservation via AJAX POST request.
@@ -903,10 +993,10 @@ def cancel_reservation_view(request, reservation_id):
     if request.method == 'POST':
         try:
             # Re-use the admin's 'cancel' function for efficiency
-            supabase.rpc('cancel_or_reject_order', {
+            _as_user(request, supabase.rpc('cancel_or_reject_order', {
                 'p_order_id': reservation_id, 
                 'p_new_status': 'cancelled'
-            }).execute()
+            })).execute()
             
             return JsonResponse({'success': True, 'message': '✅ Your reservation has been successfully cancelled.'})
             
@@ -916,6 +1006,7 @@ def cancel_reservation_view(request, reservation_id):
     return JsonResponse({'success': False, 'error': 'Invalid request method.'}, status=400)
 
 @student_required
+@invalidates('orders', 'products', 'notifications')
 def cancel_order_view(request, order_id):
     """ 
     Allows students to cancel approved orders via AJAX POST request.
@@ -928,12 +1019,12 @@ def cancel_order_view(request, order_id):
         try:
             user_id = request.user.id
             # Ensure the order is 'approved' and belongs to the user
-            response = supabase.table('orders').select('id').eq('id', order_id).eq('user_id', user_id).eq('status', 'approved').single().execute()
+            response = _as_user(request, supabase.table('orders').select('id').eq('id', order_id).eq('user_id', user_id).eq('status', 'approved').single()).execute()
             if not response.data:
                 raise Exception("Order not found or cannot be cancelled.")
             
             # Call RPC to cancel and restore stock
-            supabase.rpc('cancel_or_reject_order', {'p_order_id': order_id, 'p_new_status': 'cancelled'}).execute()
+            _as_user(request, supabase.rpc('cancel_or_reject_order', {'p_order_id': order_id, 'p_new_status': 'cancelled'})).execute()
             return JsonResponse({'success': True, 'message': "✅ Your order has been successfully cancelled.", 'order_id': order_id})
         except Exception as e:
             return JsonResponse({'success': False, 'error': f"Could not cancel the order: {e}"}, status=400)
@@ -957,7 +1048,7 @@ def admin_dashboard(request):
     
     stats = {}
     try:
-        stats = supabase.rpc('get_dashboard_stats').execute().data
+        stats = single_flight.execute(_as_user(request, supabase.rpc('get_dashboard_stats'))).data
     except Exception as e:
         messages.error(request, f"Could not load dashboard stats: {e}")
         stats = {'total_products': 0, 'total_orders': 0, 'active_products': 0, 'pending_orders': 0}
@@ -968,13 +1059,42 @@ def admin_dashboard(request):
     }
     return render(request, 'dashboards/admin_dashboard.html', context)
 
+@admin_required
+def admission_metrics_view(request):
+    """
+    Returns the purchase waiting-room metrics for this worker process as JSON.
+    
+    Reports how many purchases were admitted, rejected as sold out, rejected as
+    busy, or timed out, plus the current queue depth and known stock per product.
+    Useful for watching the rush at the start of a semester. Also includes
+    the realtime change feed's status and the shared cache generations.
+    """
+    metrics = purchase_queue.metrics()
+    metrics['change_feed'] = change_feed_stats()
+    return JsonResponse(metrics)
+
+@admin_required
+def cache_metrics_view(request):
+    """
+    Returns the view data cache's hit/miss counters for this worker process as JSON.
+    
+    Counts L1 hits, L2 hits and misses per cached view, with totals and the
+    overall hit ratio, and says whether the shared L2 cache is configured.
+    Also reports how many Supabase reads were coalesced with an identical
+    read already in flight (see dashboards.singleflight).
+    """
+    metrics = view_cache.metrics()
+    metrics['single_flight'] = single_flight.metrics()
+    return JsonResponse(metrics)
+
 @admin_required
 def manage_products_view(request):
     """
     Displays product management interface for admins with search and filtering.
     
-    Fetches all products with optional keyword search across name and category.
-    Sorts products to highlight unavailable items and low-stock products first.
+    Fetches all products with optional keyword search across name and category,
+    from the local mirror when it is fresh. Sorts products to highlight unavailable
+    items and low-stock products first.
     Provides comprehensive product list for management operations.
     """
     search_query = request.GET.get('search', '').strip()
@@ -985,12 +1105,20 @@ def manage_products_view(request):
     total_products_count = 0
     pagination_context = {}
     
-    try:
-        query = supabase.table('products').select('*').order('created_at', desc=True)
+    def load_products():
+        if mirror_ready('products'):
+            queryset = Product.objects.order_by('-created_at')
+            if search_query:
+                queryset = queryset.filter(Q(name__icontains=search_query) | Q(category__icontains=search_query))
+            return as_rows(queryset)
+        query = _as_user(request, supabase.table('products').select('*').order('created_at', desc=True))
         if search_query:
             query = query.or_(f'name.ilike.%{search_query}%,category.ilike.%{search_query}%')
-        response = query.execute()
-        products = response.data if response.data else []
+        response = single_flight.execute(query)
+        return response.data if response.data else []
+
+    try:
+        products = view_cache.get_or_set(request, 'manage_products', load_products, tags=['products'], vary=[search_query])
 
         # Sort products to show unavailable and low stock items first
         products = sorted(
@@ -1015,44 +1143,37 @@ def manage_products_view(request):
     return render(request, 'dashboards/manage_products.html', context)
 
 @admin_required
+@invalidates('products')
 def add_product(request):
     """
     Handles AJAX POST request for admin to add a new product.
     
-    Processes product creation including image upload to Supabase storage,
-    and handles size field for Uniforms category. Validates all input data
-    and logs the activity. Returns JSON with new product details.
+    Validates the fields with the catalog rules (including size for Uniforms).
+    The image is validated here but uploaded by a background image job, so the
+    product is saved without one (the placeholder shows) until the job patches
+    image_url. Logs the activity. Returns JSON with new product details and the
+    image job id to poll.
     """
     if request.method == 'POST':
         try:
+            # Same rules as the catalog import (dashboards.catalog)
+            product_data = clean_product_fields(
+                request.POST.get('product-name'),
+                request.POST.get('product-description'),
+                request.POST.get('product-price'),
+                request.POST.get('stock-quantity'),
+                request.POST.get('product-category'),
+                request.POST.get('product-size'),
+            )
+
             image_url = None
             image_file = request.FILES.get('product-image')
             
             if image_file:
-                file_ext = image_file.name.split('.')[-1]
-                file_name = f'product_{uuid.uuid4()}.{file_ext}'
-                
-                supabase_service.storage.from_('product_images').upload(
-                    file=image_file.read(), 
-                    path=file_name, 
-                    file_options={"content-type": image_file.content_type}
-                )
-                image_url = supabase_service.storage.from_('product_images').get_public_url(file_name)
-            
-            stock = int(request.POST.get('stock-quantity', 0))
-
-            product_data = {
-                'name': request.POST.get('product-name'),
-                'description': request.POST.get('product-description'),
-                'price': float(request.POST.get('product-price')),
-                'stock_quantity': int(request.POST.get('stock-quantity')),
-                'category': request.POST.get('product-category'),
-                'image_url': image_url,
-                'is_available': stock > 0
-            }
-
-            if request.POST.get('product-category') == 'Uniforms':
-                product_data['size'] = request.POST.get('product-size')
+                validate_image_upload(image_file)
+                if not image_jobs_enabled():
+                    image_url = upload_image(PRODUCT_IMAGES_BUCKET, image_file, 'product')
+            product_data['image_url'] = image_url
 
             response = supabase_service.table('products').insert(product_data).execute()
             
@@ -1060,14 +1181,26 @@ def add_product(request):
                 raise Exception("Failed to create product, no data returned.")
 
             new_product = response.data[0]
+            mirror_rows('products', [new_product])
             
             log_activity(
                 request.user,
                 'PRODUCT_ADDED',
                 {'product_name': new_product['name'], 'product_id': new_product['id']}
             )
+
+            result = {'success': True, 'message': 'Product added successfully!', 'product': new_product}
+            if image_file and image_jobs_enabled():
+                # The product exists by now, so a failed enqueue is reported rather than turned into a 400
+                try:
+                    result['image_job_id'] = enqueue_image_job(new_product['id'], image_file).id
+                    result['message'] = 'Product added! The image is being processed and will appear shortly.'
+                except Exception as e:
+                    print(f"⚠️ Could not queue the image for product {new_product['id']}: {e}")
+                    result['image_job_error'] = str(e)
+                    result['message'] = 'Product added, but its image could not be processed. Edit the product to upload it again.'
             
-            return JsonResponse({'success': True, 'message': 'Product added successfully!', 'product': new_product})
+            return JsonResponse(result)
 
         except Exception as e:
             return JsonResponse({'success': False, 'error': f"Failed to add product: {e}"}, status=400)
@@ -1076,12 +1209,84 @@ def add_product(request):
 
 
 @admin_required
+@require_POST
+@invalidates('products', 'orders')
+def import_products_view(request):
+    """
+    Handles AJAX POST request for admin to import a product catalog file.
+    
+    Accepts a CSV or XLSX upload ('import-file'), validates every row with the
+    add product rules and writes the valid ones in chunked multi-row requests.
+    With 'dry-run' set only validation runs. Logs the import and returns the
+    report as JSON, including per-row errors.
+    """
+    import_file = request.FILES.get('import-file')
+    if not import_file:
+        return JsonResponse({'success': False, 'error': 'Please choose a CSV or XLSX file to import.'}, status=400)
+
+    dry_run = request.POST.get('dry-run') in ('1', 'true', 'on')
+    try:
+        report = import_products(import_file, import_file.name, dry_run=dry_run)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': f"Failed to import products: {e}"}, status=400)
+
+    if not dry_run and (report['created'] or report['updated']):
+        log_activity(
+            request.user,
+            'PRODUCTS_IMPORTED',
+            {
+                'file_name': import_file.name,
+                'created': report['created'],
+                'updated': report['updated'],
+                'error_count': report['error_count'],
+                'duration_ms': report['duration_ms']
+            }
+        )
+
+    if dry_run:
+        message = f"{report['valid']} of {report['rows']} row(s) are valid."
+    else:
+        message = f"Imported {report['created']} new and {report['updated']} updated product(s)."
+    if report['error_count']:
+        message += f" {report['error_count']} row(s) have errors."
+    return JsonResponse({'success': True, 'message': message, 'report': report})
+
+
+def _same_timestamp(first, second):
+    """
+    Compares two ISO timestamps by value, not by text.
+    The local mirror and PostgREST format the same instant differently (e.g. trailing zeros).
+    """
+    try:
+        return datetime.fromisoformat(first.replace('Z', '+00:00')) == datetime.fromisoformat(second.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return first == second
+
+
+def _product_conflict_response(current_product, message):
+    """
+    Builds the 409 response edit_product returns when an optimistic update loses a race.
+    
+    Includes the product's current values so the manage products page can refresh
+    the row and the open edit form, letting the admin re-apply their change.
+    """
+    return JsonResponse({
+        'success': False,
+        'conflict': True,
+        'error': message,
+        'product': current_product
+    }, status=409)
+
+
+@admin_required
+@invalidates('products', 'orders')
 def edit_product(request, product_id):
     """
     Handles AJAX POST request for admin to update an existing product.
     
-    Processes product updates including price, stock, category, and optional image replacement.
-    Tracks changes made for activity logging. Handles old image deletion when new image uploaded.
+    Processes product updates including price, stock, category, and optional image replacement,
+    validated with the same catalog rules as add_product. A new image is handed to a background image job, which swaps image_url and deletes the old
+    image once the upload is done. Tracks changes made for activity logging.
     Returns JSON with updated product details.
     """
     if request.method == 'POST':
@@ -1092,56 +1297,84 @@ def edit_product(request, product_id):
                 raise Exception("Product to edit not found.")
             old_product = old_product_response.data
 
-            category = request.POST.get('product-category')
-            stock = int(request.POST.get('stock-quantity'))
-            price = float(request.POST.get('product-price'))
-            name = request.POST.get('product-name')
-            description = request.POST.get('product-description')
-
-            update_data = {
-                'name': name,
-                'description': description,
-                'price': price,
-                'stock_quantity': stock,
-                'category': category, 
-                'is_available': stock > 0
-            }
+            # Same rules as add_product and the catalog import (dashboards.catalog)
+            product_data = clean_product_fields(
+                request.POST.get('product-name'),
+                request.POST.get('product-description'),
+                request.POST.get('product-price'),
+                request.POST.get('stock-quantity'),
+                request.POST.get('product-category'),
+                request.POST.get('product-size'),
+            )
+            name = product_data['name']
+            price = product_data['price']
+            category = product_data['category']
+
+            # Stock is either an absolute value or a +/- adjustment applied to the live value
+            stock_adjustment_str = (request.POST.get('stock-adjustment') or '').strip()
+            stock_adjustment = int(stock_adjustment_str) if stock_adjustment_str else 0
+            stock = product_data['stock_quantity']
+
+            # Optimistic concurrency: the form carries the version and stock the admin saw
+            expected_version = request.POST.get('product-version') or None
+            expected_stock_str = (request.POST.get('original-stock') or '').strip()
+            if expected_version and old_product.get('updated_at') and not _same_timestamp(expected_version, old_product['updated_at']):
+                return _product_conflict_response(old_product, "This product was changed by someone else while you were editing it.")
+            if not stock_adjustment and expected_stock_str and int(expected_stock_str) != int(old_product.get('stock_quantity', 0)):
+                return _product_conflict_response(old_product, f"Stock changed from {expected_stock_str} to {old_product.get('stock_quantity', 0)} while you were editing (orders were placed).")
+
+            update_data = {field: product_data[field] for field in ('name', 'description', 'price', 'category', 'size')}
 
-            if category == 'Uniforms':
-                update_data['size'] = request.POST.get('product-size')
-            else:
-                update_data['size'] = None 
-            
             new_image_file = request.FILES.get('product-image')
             if new_image_file:
-                # Upload new image
-                file_ext = new_image_file.name.split('.')[-1]
-                file_name = f'product_{uuid.uuid4()}.{file_ext}'
-                
-                supabase_service.storage.from_('product_images').upload(
-                    file=new_image_file.read(), 
-                    path=file_name, 
-                    file_options={"content-type": new_image_file.content_type}
-                )
-                
-                new_image_url = supabase_service.storage.from_('product_images').get_public_url(file_name)
-                update_data['image_url'] = new_image_url
-
-                # Delete old image
-                old_image_url = request.POST.get('current-image-url')
-                if old_image_url and old_image_url.strip():
-                    try:
-                        old_file_name = old_image_url.split('/')[-1]
-                        supabase_service.storage.from_('product_images').remove([old_file_name])
-                    except Exception as e:
-                        print(f"Could not remove old image '{old_file_name}': {e}")
-            
-            update_response = supabase_service.table('products').update(update_data).eq('id', product_id).execute()
+                validate_image_upload(new_image_file)
+                if not image_jobs_enabled():
+                    # Upload new image (original plus WebP derivatives) in the request
+                    update_data['image_url'] = upload_image(PRODUCT_IMAGES_BUCKET, new_image_file, 'product')
+
+            # Conditional write: only succeeds if stock (and version, when the table has one)
+            # still match what we read. Adjustments are re-applied to a fresh read on conflict.
+            current_product = old_product
+            update_response = None
+            for _ in range(3):
+                current_stock = int(current_product.get('stock_quantity', 0))
+                if stock_adjustment:
+                    stock = max(current_stock + stock_adjustment, 0)
+                update_data['stock_quantity'] = stock
+                update_data['is_available'] = stock > 0
+                if current_product.get('updated_at'):
+                    update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+
+                query = supabase_service.table('products').update(update_data) \
+                    .eq('id', product_id) \
+                    .eq('stock_quantity', current_stock)
+                if current_product.get('updated_at'):
+                    query = query.eq('updated_at', current_product['updated_at'])
+                update_response = query.execute()
+
+                if update_response.data or not stock_adjustment:
+                    break
+                current_product = supabase_service.table('products').select('*').eq('id', product_id).single().execute().data
 
             if not update_response.data or len(update_response.data) == 0:
-                raise Exception("Failed to update product, no data returned from update.")
+                latest = supabase_service.table('products').select('*').eq('id', product_id).single().execute().data
+                return _product_conflict_response(latest or old_product, "The product changed while saving. Please review the latest values and try again.")
+
+            # Delete old image only once the new one is actually referenced
+            image_job = None
+            image_job_error = None
+            if new_image_file and image_jobs_enabled():
+                # The update is saved by now, so a failed enqueue is reported rather than turned into a 400
+                try:
+                    image_job = enqueue_image_job(product_id, new_image_file, replaces_url=old_product.get('image_url'))
+                except Exception as e:
+                    print(f"⚠️ Could not queue the image for product {product_id}: {e}")
+                    image_job_error = str(e)
+            elif new_image_file:
+                remove_image(PRODUCT_IMAGES_BUCKET, request.POST.get('current-image-url'))
             
             updated_product = update_response.data[0]
+            purchase_queue.forget_stock(product_id)
             
             # Compare old and new values to build a list of changes for logging
             changes = []
@@ -1149,7 +1382,9 @@ def edit_product(request, product_id):
                 changes.append(f"Name changed to '{name}'")
             if float(old_product.get('price', 0)) != price:
                 changes.append(f"Price changed from ₱{old_product.get('price', 0)} to ₱{price}")
-            if int(old_product.get('stock_quantity', 0)) != stock:
+            if stock_adjustment:
+                changes.append(f"Stock adjusted by {stock_adjustment:+d} to {stock}")
+            elif int(old_product.get('stock_quantity', 0)) != stock:
                 changes.append(f"Stock changed from {old_product.get('stock_quantity', 0)} to {stock}")
             if old_product.get('category') != category:
                 changes.append(f"Category changed to '{category}'")
@@ -1168,8 +1403,41 @@ def edit_product(request, product_id):
                     'changes': ", ".join(changes) 
                 }
             )
+
+            # A restock hands the new units to queued backorders first
+            message = 'Product updated successfully!'
+            if image_job:
+                message = 'Product updated! The new image is being processed and will appear shortly.'
+            elif image_job_error:
+                message = 'Product updated, but the new image could not be processed. Please upload it again.'
+            if stock > int(old_product.get('stock_quantity', 0)):
+                try:
+                    fulfilment = fulfil_backorders(product_id)
+                    if fulfilment['fulfilled']:
+                        updated_product['stock_quantity'] = fulfilment['remaining_stock']
+                        updated_product['is_available'] = fulfilment['remaining_stock'] > 0
+                        message = f"Product updated! {fulfilment['fulfilled']} backorder(s) were reserved from the new stock."
+                        log_activity(
+                            request.user,
+                            'BACKORDERS_FULFILLED',
+                            {
+                                'product_name': updated_product['name'],
+                                'product_id': product_id,
+                                'count': fulfilment['fulfilled'],
+                                'quantity': fulfilment['quantity'],
+                                'order_ids': fulfilment['order_ids']
+                            }
+                        )
+                except Exception as e:
+                    print(f"Error fulfilling backorders for product {product_id}: {e}")
             
-            return JsonResponse({'success': True, 'message': 'Product updated successfully!', 'product': updated_product})
+            mirror_rows('products', [updated_product])
+            result = {'success': True, 'message': message, 'product': updated_product}
+            if image_job:
+                result['image_job_id'] = image_job.id
+            if image_job_error:
+                result['image_job_error'] = image_job_error
+            return JsonResponse(result)
 
         except Exception as e:
             return JsonResponse({'success': False, 'error': f"Failed to update product: {e}"}, status=400)
@@ -1177,6 +1445,35 @@ def edit_product(request, product_id):
     return JsonResponse({'success': False, 'error': 'Invalid request method.'}, status=405)
 
 @admin_required
+def image_job_status_view(request, job_id):
+    """
+    Returns the status of a background product image job as JSON.
+    
+    Polled by the manage products page after an add or edit with a new image.
+    Once the job is done the response includes the refreshed product so the row
+    can swap the placeholder for the real thumbnail.
+    """
+    job = ImageJob.objects.filter(id=job_id).first()
+    if job is None:
+        return JsonResponse({'success': False, 'error': 'Image job not found.'}, status=404)
+
+    result = {
+        'success': True,
+        'status': job.status,
+        'product_id': job.product_id,
+        'image_url': job.image_url,
+        'error': job.error if job.status == ImageJob.Status.FAILED else '',
+    }
+    if job.status == ImageJob.Status.DONE:
+        try:
+            product_res = supabase_service.table('products').select('*').eq('id', job.product_id).single().execute()
+            result['product'] = product_res.data
+        except Exception as e:
+            print(f"Error fetching product {job.product_id} for image job #{job.id}: {e}")
+    return JsonResponse(result)
+
+@admin_required
+@invalidates('products')
 def delete_product(request, product_id):
     """
     Handles AJAX POST request for admin to permanently delete a product.
@@ -1194,6 +1491,7 @@ def delete_product(request, product_id):
                 product_name = response.data[0]['name']
                 
             supabase_service.table('products').delete().eq('id', product_id).execute()
+            forget_mirrored_rows('products', [product_id])
             
             log_activity(request.user, 'PRODUCT_DELETED', {'product_id': product_id, 'product_name': product_name})
             
@@ -1209,13 +1507,14 @@ def delete_product(request, product_id):
 
 
 @admin_required
-def order_management_view(request):
+async def order_management_view(request):
     """
     Displays all orders organized by status for admin management.
     
     Fetches orders using RPC with optional search filtering. Categorizes into
     pending, approved, completed, and other (cancelled/rejected) statuses.
     Handles date parsing and provides comprehensive order overview.
+    Async, so the worker isn't blocked while the order RPC runs.
     """
     search_query = request.GET.get('search', '').strip()
     
@@ -1227,7 +1526,7 @@ def order_management_view(request):
     
     try:
         params = {'p_search_term': search_query}
-        response = supabase_service.rpc('get_all_orders_with_details', params).execute()
+        response = await single_flight.aexecute(async_postgrest(service=True).rpc('get_all_orders_with_details', params))
         
         if response.data:
             all_orders_empty = False
@@ -1273,9 +1572,10 @@ def order_management_view(request):
         'page_title': 'Order Management',
         'all_orders_empty': all_orders_empty
     }
-    return render(request, 'dashboards/order_management.html', context)
+    return await arender(request, 'dashboards/order_management.html', context)
 
 @admin_required
+@invalidates('orders')
 def admin_batch_delete_orders_view(request):
     """ 
     Allows admins to permanently delete multiple orders via AJAX.
@@ -1290,24 +1590,29 @@ def admin_batch_delete_orders_view(request):
         if not order_ids_str:
             return JsonResponse({'success': False, 'error': "No orders selected for deletion."}, status=400)
 
-        order_ids = [int(oid) for oid in order_ids_str.split(',') if oid.isdigit()]
+        order_ids = parse_id_list(order_ids_str)
         
         if not order_ids:
             return JsonResponse({'success': False, 'error': "Invalid order IDs provided."}, status=400)
 
         try:
-            log_activity(
-                request.user,
-                'ORDER_BATCH_DELETED',
-                {'count': len(order_ids), 'order_ids': order_ids}
+            def delete_chunk(chunk):
+                supabase_service.table('orders').delete().in_('id', chunk).execute()
+
+            result = run_logged_bulk_action(
+                request.user, 'ORDER_BATCH_DELETED', order_ids, delete_chunk, ids_key='order_ids'
             )
+            if not result.succeeded:
+                raise Exception(result.failures[0]['error'])
 
-            supabase_service.table('orders').delete().in_('id', order_ids).execute()
-            
+            message = f"{len(result.succeeded)} has been permanently deleted."
+            if result.failures:
+                message += f" {len(result.failed_ids)} could not be deleted."
             return JsonResponse({
                 'success': True, 
-                'message': f"{len(order_ids)} has been permanently deleted.",
-                'order_ids': order_ids 
+                'message': message,
+                'order_ids': result.succeeded,
+                'failed_ids': result.failed_ids
             })
             
         except Exception as e:
@@ -1316,6 +1621,7 @@ def admin_batch_delete_orders_view(request):
     return JsonResponse({'success': False, 'error': 'Invalid request.'}, status=400)
 
 @admin_required
+@invalidates('products')
 def batch_update_products(request):
     """
     Handles batch operations on multiple products via POST request.
@@ -1336,7 +1642,7 @@ def batch_update_products(request):
             return redirect('manage_products')
 
         try:
-            product_ids = [int(pid) for pid in product_ids_str.split(',') if pid.isdigit()]
+            product_ids = parse_id_list(product_ids_str)
             if not product_ids:
                 raise ValueError("No valid product IDs provided.")
             count = len(product_ids)
@@ -1349,29 +1655,46 @@ def batch_update_products(request):
 
         try:
             if action == 'mark-available':
-                supabase_service.table('products').update({'is_available': True}).in_('id', product_ids).execute()
-                messages.success(request, f"{count} product(s) marked as available.")
-                log_activity(
-                    request.user, 
+                updated_rows = []
+
+                def mark_available_chunk(chunk):
+                    response = supabase_service.table('products').update({'is_available': True}).in_('id', chunk).execute()
+                    updated_rows.extend(response.data or [])
+
+                result = run_logged_bulk_action(
+                    request.user,
                     f'PRODUCT_BATCH_{action.upper().replace("-", "_")}',
-                    {'count': count, 'product_ids': product_ids}
+                    product_ids, mark_available_chunk, ids_key='product_ids'
                 )
+                if not result.succeeded:
+                    raise Exception(result.failures[0]['error'])
+                mirror_rows('products', updated_rows)
+
+                messages.success(request, f"{len(result.succeeded)} product(s) marked as available.")
+                if result.failures:
+                    messages.warning(request, f"{len(result.failed_ids)} of {count} product(s) could not be updated.")
                 return redirect('manage_products')
 
             elif action == 'delete-selected':
-                supabase_service.table('products').delete().in_('id', product_ids).execute()
-                
-                log_activity(
-                    request.user, 
-                    'PRODUCT_BATCH_DELETE',
-                    {'count': count, 'product_ids': product_ids}
+                def delete_chunk(chunk):
+                    supabase_service.table('products').delete().in_('id', chunk).execute()
+
+                result = run_logged_bulk_action(
+                    request.user, 'PRODUCT_BATCH_DELETE', product_ids, delete_chunk, ids_key='product_ids'
                 )
+                if not result.succeeded:
+                    raise Exception(result.failures[0]['error'])
+                forget_mirrored_rows('products', result.succeeded)
                 
                 # This action expects an AJAX response
+                message = 'Product deleted successfully!'
+                if result.failures:
+                    message = f"{len(result.succeeded)} product(s) deleted, {len(result.failed_ids)} could not be deleted."
                 return JsonResponse({
                     'success': True, 
-                    'message': 'Product deleted successfully!',
-                    'product_ids': product_ids
+                    'message': message,
+                    'product_ids': result.succeeded,
+                    'failed_ids': result.failed_ids
                 })
                 
             else:
@@ -1385,6 +1708,8 @@ def batch_update_products(request):
     return redirect('manage_products')
 
 @admin_required
+# Status changes notify the student through database triggers, hence 'notifications'
+@invalidates('orders', 'products', 'notifications')
 def update_order_status(request, order_id):
     """
     Handles AJAX POST request for admin to update order status (single or batch).
@@ -1491,6 +1816,7 @@ def update_order_status(request, order_id):
     return JsonResponse({'success': False, 'error': 'Invalid request method.'}, status=405)
 
 @admin_required
+@invalidates('orders')
 def delete_order_view(request, order_id):
     """
     Handles AJAX POST request for admin to permanently delete a single order.
@@ -1538,13 +1864,15 @@ def delete_order_view(request, order_id):
 
 
 @admin_required
-def reports_view(request):
+async def reports_view(request):
     """
     Displays comprehensive system reports with KPIs, inventory, sales, and activity logs.
     
     Fetches advanced report statistics via RPC including dashboard KPIs, inventory overview,
     reservation statistics, and sales performance. Implements paginated activity log display
     with 10 entries per page. Identifies and highlights low-stock and unavailable products.
+    Counts and product lists come from the local mirror when it is fresh.
+    Async: the independent report queries run concurrently with the async PostgREST client.
     Provides multi-faceted reporting for business intelligence.
     """
     search_query = request.GET.get('search', '').strip()
@@ -1565,13 +1893,83 @@ def reports_view(request):
 
     log_pagination_context = {} 
     total_log_count = 0
+    use_mirror = await sync_to_async(mirror_ready)('products', 'orders', 'activity_log')
+    service = async_postgrest(service=True)
 
     try:
+        log_page_number = int(log_page_number)
+    except ValueError:
+        log_page_number = 1
+
+    log_start_index = (log_page_number - 1) * logs_per_page
+    log_end_index = log_start_index + logs_per_page - 1
+
+    async def fetch_advanced_stats():
         # Call the advanced RPC function
-        report_data_response = supabase_service.rpc('get_advanced_report_stats').execute()
+        return (await single_flight.aexecute(service.rpc('get_advanced_report_stats', {}))).data
 
-        if report_data_response.data:
-            report_data = report_data_response.data
+    async def fetch_pending_backorders_count():
+        try:
+            if use_mirror:
+                return await sync_to_async(Order.objects.filter(
+                    status=Order.Status.PENDING, order_type=Order.OrderType.BACKORDER
+                ).count)()
+            backorder_count_response = await single_flight.aexecute(
+                service.table('orders').select('id', count='exact').eq('status', 'pending').eq('order_type', 'backorder')
+            )
+            return backorder_count_response.count or 0
+        except Exception as e:
+            print(f"Error fetching backorder count: {e}")
+            return 0
+
+    async def fetch_product_lists():
+        if use_mirror:
+            return await sync_to_async(lambda: (
+                as_rows(Product.objects.filter(stock_quantity__gt=0, stock_quantity__lt=10).order_by('stock_quantity')),
+                as_rows(Product.objects.filter(is_available=False).order_by('name')),
+            ))()
+        low_stock_response, unavailable_response = await asyncio.gather(
+            single_flight.aexecute(service.table('products').select('*').gt('stock_quantity', 0).lt('stock_quantity', 10).order('stock_quantity', desc=False)),
+            single_flight.aexecute(service.table('products').select('*').eq('is_available', False).order('name')),
+        )
+        return low_stock_response.data or [], unavailable_response.data or []
+
+    async def fetch_log_count():
+        # Get the total count from the TABLE
+        if use_mirror:
+            return await sync_to_async(ActivityLog.objects.count)()
+        count_response = await single_flight.aexecute(service.table('activity_log').select('id', count='exact'))
+        return count_response.count if count_response.count is not None else 0
+
+    async def fetch_log_page():
+        # Fetch the paginated data using the RPC
+        log_response = await service.rpc(
+            'get_activity_log',
+            {'p_search_term': ''} # Keep search empty for client-side filtering
+        ).order('created_at', desc=True).range(log_start_index, log_end_index).execute()
+        return log_response.data
+
+    try:
+        (
+            advanced_stats,
+            pending_backorders_count,
+            (low_stock_products, unavailable_products),
+            total_log_count,
+            log_rows,
+        ) = await asyncio.gather(
+            # The aggregate is cached until products or orders change
+            view_cache.aget_or_set(request, 'report_stats', fetch_advanced_stats, tags=['products', 'orders']),
+            fetch_pending_backorders_count(),
+            fetch_product_lists(),
+            fetch_log_count(),
+            view_cache.aget_or_set(
+                request, 'report_log_page', fetch_log_page,
+                tags=['activity_log'], vary=[log_page_number]
+            ),
+        )
+
+        if advanced_stats:
+            report_data = advanced_stats
 
             # Extract data from the single JSON object response
             retrieved_status_counts = report_data.get('status_counts', {})
@@ -1586,54 +1984,8 @@ def reports_view(request):
             report_data = {'total_products': 0, 'total_orders_reservations': 0}
             kpi_data = {'total_sales': 0, 'inventory_value': 0, 'orders_today': 0, 'pending_reservations': 0}
 
-        # --- Add new query for pending backorders ---
-        try:
-            backorder_count_response = supabase_service.table('orders') \
-                .select('id', count='exact') \
-                .eq('status', 'pending') \
-                .eq('order_type', 'backorder') \
-                .execute()
-            if backorder_count_response.count is not None:
-                pending_backorders_count = backorder_count_response.count
-        except Exception as e:
-            print(f"Error fetching backorder count: {e}")
-            pending_backorders_count = 0
-        # --- End of new query ---
-
-        # --- Fetch supporting product lists ---
-        low_stock_response = supabase_service.table('products').select('*').gt('stock_quantity', 0).lt('stock_quantity', 10).order('stock_quantity', desc=False).execute()
-        if low_stock_response.data:
-            low_stock_products = low_stock_response.data
-
-        unavailable_response = supabase_service.table('products').select('*').eq('is_available', False).order('name').execute()
-        if unavailable_response.data:
-            unavailable_products = unavailable_response.data
-
-        # --- Fetch Paginated Log Data ---
-        try:
-            log_page_number = int(log_page_number)
-        except ValueError:
-            log_page_number = 1
-
-        log_start_index = (log_page_number - 1) * logs_per_page
-        log_end_index = log_start_index + logs_per_page - 1
-
-        # 1. Get the total count from the TABLE
-        count_response = supabase_service.table('activity_log').select(
-            'id', count='exact'
-        ).execute()
-        total_log_count = count_response.count if count_response.count is not None else 0
-
-        # 2. Fetch the paginated data using the RPC
-        log_query = supabase_service.rpc(
-            'get_activity_log',
-            {'p_search_term': ''} # Keep search empty for client-side filtering
-        ).order('created_at', desc=True).range(log_start_index, log_end_index) 
-
-        log_response = log_query.execute()
-
-        if log_response.data:
-            for entry in log_response.data:
+        if log_rows:
+            for entry in log_rows:
                 if entry.get('created_at'):
                         entry['created_at'] = datetime.fromisoformat(entry['created_at'])
                 if entry.get('action'):
@@ -1677,9 +2029,10 @@ def reports_view(request):
         'page_title': 'System Reports',
         'pending_backorders_count': pending_backorders_count
     }
-    return render(request, 'dashboards/reports.html', context)
+    return await arender(request, 'dashboards/reports.html', context)
 
 @admin_required
+@invalidates('activity_log')
 def batch_delete_logs_view(request):
     """
     Handles AJAX POST request for admin to batch delete activity log entries.
@@ -1693,16 +2046,27 @@ def batch_delete_logs_view(request):
             return JsonResponse({'success': False, 'error': 'No log IDs provided.'}, status=400)
             
         try:
-            log_ids = [int(lid) for lid in log_ids_str.split(',') if lid.isdigit()]
+            log_ids = parse_id_list(log_ids_str)
             if not log_ids:
                 raise ValueError("No valid log IDs provided.")
-            
-            supabase_service.table('activity_log').delete().in_('id', log_ids).execute()
-            
+
+            def delete_chunk(chunk):
+                supabase_service.table('activity_log').delete().in_('id', chunk).execute()
+
+            result = run_logged_bulk_action(
+                request.user, 'LOG_BATCH_DELETED', log_ids, delete_chunk, ids_key='log_ids'
+            )
+            if not result.succeeded:
+                raise Exception(result.failures[0]['error'])
+
+            message = f'{len(result.succeeded)} log entries have been deleted.'
+            if result.failures:
+                message += f' {len(result.failed_ids)} could not be deleted.'
             return JsonResponse({
                 'success': True,
-                'message': f'{len(log_ids)} log entries have been deleted.',
-                'deleted_ids': log_ids
+                'message': message,
+                'deleted_ids': result.succeeded,
+                'failed_ids': result.failed_ids
             })
             
         except Exception as e:
@@ -1712,6 +2076,7 @@ def batch_delete_logs_view(request):
 
 @require_POST
 @admin_required
+@invalidates('activity_log')
 def clear_all_logs_view(request):
     """
     Handles AJAX POST request for admin to delete ALL activity log entries.
@@ -1748,6 +2113,7 @@ def clear_all_logs_view(request):
 
 
 @admin_required
+@invalidates('user_profiles')
 def admin_profile_view(request):
     """
     Displays admin profile page (GET) and handles profile/password updates (POST AJAX).
@@ -1770,17 +2136,8 @@ def admin_profile_view(request):
                 avatar_file = request.FILES.get('avatar_image')
 
                 if avatar_file:
-                    file_ext = avatar_file.name.split('.')[-1]
-                    file_name = f'user_{user_id}_{uuid.uuid4()}.{file_ext}'
-
                     # Upload to Supabase Storage (using service client)
-                    supabase_service.storage.from_('avatars').upload(
-                        file=avatar_file.read(),
-                        path=file_name,
-                        file_options={"content-type": avatar_file.content_type}
-                    )
-
-                    avatar_url = supabase_service.storage.from_('avatars').get_public_url(file_name)
+                    avatar_url = upload_image(AVATARS_BUCKET, avatar_file, 'avatar', variants=AVATAR_VARIANTS)
 
                 params = {
                     'p_full_name': request.POST.get('full_name'),
@@ -1792,7 +2149,7 @@ def admin_profile_view(request):
                     params['p_avatar_url'] = avatar_url
 
                 # Call RPC (using user's auth)
-                supabase.rpc('update_my_profile', params).execute()
+                _as_user(request, supabase.rpc('update_my_profile', params)).execute()
 
                 response_data = {
                     'success': True, 
@@ -1829,7 +2186,7 @@ def admin_profile_view(request):
                 })
 
                 # 2. UPDATE TO NEW PASSWORD
-                supabase.auth.update_user({'password': new_password1})
+                supabase_service.auth.admin.update_user_by_id(request.user.id, {'password': new_password1})
 
                 # 3. MANUALLY LOG THE USER OUT (Clear invalid tokens)
                 if 'supa_access_token' in request.session:
@@ -1863,7 +2220,7 @@ def admin_profile_view(request):
     # --- Handle GET request ---
     profile_data = {}
     try:
-        response = supabase.table('user_profiles').select('*').eq('user_id', user_id).single().execute()
+        response = _as_user(request, supabase.table('user_profiles').select('*').eq('user_id', user_id).single()).execute()
         profile_data = response.data
     except Exception as e:
         messages.error(request, f'Could not load your profile: {e}')
@@ -1959,6 +2316,7 @@ def manage_students_view(request):
 
 
 @admin_required
+@invalidates('user_profiles')
 def admin_block_student_view(request, user_id):
     """
     Handles AJAX POST request for admin to block or unblock a student account.
@@ -2014,6 +2372,7 @@ def admin_block_student_view(request, user_id):
 
 @require_POST
 @admin_required
+@invalidates('user_profiles', 'orders', 'notifications')
 def admin_delete_student_view(request, user_id):
     """
     Handles AJAX POST request for admin to permanently delete a student account.
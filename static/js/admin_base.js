@@ -0,0 +1,67 @@
+    // --- Page Loader Logic ---
+    const loader = document.getElementById('page-loader');
+
+if (loader) {
+    // Hide loader on page "show" (handles back/forward button navigation)
+    window.addEventListener('pageshow', function() {
+        loader.classList.remove('visible');
+    });
+
+    // Show loader on link clicks
+    document.addEventListener('click', function(e) {
+        const link = e.target.closest('a');
+
+        if (link) {
+
+            // --- Filters: Don't show loader for... ---
+            if (link.classList.contains('active')) {
+                e.preventDefault(); // This stops the reload
+                return;
+            }
+
+            // (a) Links opening in a new tab
+            if (link.target === '_blank') return;
+
+            // (b) Simple hash/anchor links on the same page
+            if (link.href.startsWith(window.location.href + '#')) return;
+
+            // (c) Mail or Tel links
+            if (link.href.startsWith('mailto:') || link.href.startsWith('tel:')) return;
+
+            // (d) Links inside the pagination container
+            if (link.closest('.pagination-container')) return;
+
+            // If no filters match, show the loader
+            loader.classList.add('visible');
+        }
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+
+    // --- Hamburger Menu Logic ---
+    const hamburgerBtn = document.querySelector('.hamburger-btn');
+    const header = document.querySelector('.admin-header');
+    const body = document.body;
+
+    if (hamburgerBtn && header && body) {
+
+        hamburgerBtn.addEventListener('click', function() {
+
+            // Toggle the '.menu-is-open' class on the header
+            header.classList.toggle('menu-is-open');
+
+            // Update accessibility attribute
+            const isExpanded = header.classList.contains('menu-is-open');
+            hamburgerBtn.setAttribute('aria-expanded', isExpanded);
+
+            // Change hamburger icon to 'X' or '☰'
+            const icon = hamburgerBtn.querySelector('.hamburger-icon');
+            if (isExpanded) {
+                icon.innerHTML = '&times;'; // 'X' icon
+            } else {
+                icon.innerHTML = '&equiv;'; // '☰' icon
+            }
+        });
+    }
+});
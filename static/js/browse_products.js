@@ -0,0 +1,263 @@
+document.addEventListener('DOMContentLoaded', () => {
+    // --- Get All Modal Elements ---
+    const detailsModal = document.getElementById('product-details-modal');
+    const buyModal = document.getElementById('buy-now-modal');
+    const reserveModal = document.getElementById('reservation-modal');
+    const backorderModal = document.getElementById('backorder-modal');
+
+    // --- General Modal Controls ---
+    const openModal = (modal) => { if (modal) modal.style.display = 'flex'; };
+    const closeModal = (modal) => { if (modal) modal.style.display = 'none'; };
+    document.querySelectorAll('.close-btn, .cancel-btn').forEach(btn => btn.onclick = () => closeModal(btn.closest('.modal')));
+    window.onclick = (event) => { if (event.target.classList.contains('modal')) closeModal(event.target); };
+
+    // --- LIVE PRODUCT SEARCH/FILTER ---
+    const searchInput = document.getElementById('product-search-input');
+    const categoryFilter = document.getElementById('category-filter'); // Get the new dropdown
+    const productCards = document.querySelectorAll('.product-card');
+    const categorySections = document.querySelectorAll('.category-section');
+
+    function filterProducts() {
+        // Filter visible cards based on search text and category dropdown
+        const searchTerm = searchInput.value.toLowerCase().trim();
+        const selectedCategory = categoryFilter.value.toLowerCase(); // 'all' or a category name
+
+        // Loop through every product card
+        productCards.forEach(card => {
+            const productName = card.dataset.name.toLowerCase();
+            const cardCategory = card.dataset.category.toLowerCase();
+
+            const categoryMatch = (selectedCategory === 'all') || (cardCategory === selectedCategory);
+            const searchMatch = productName.includes(searchTerm);
+
+            const cardShouldBeVisible = categoryMatch && searchMatch;
+            card.style.display = cardShouldBeVisible ? 'flex' : 'none';
+        });
+
+        // Loop through category sections and hide them if they are now empty
+        categorySections.forEach(section => {
+            const visibleCards = section.querySelectorAll('.product-card[style*="display: flex"]');
+            section.style.display = visibleCards.length > 0 ? 'block' : 'none';
+        });
+    }
+
+    // Add event listeners to BOTH inputs
+    searchInput.addEventListener('input', filterProducts);
+    categoryFilter.addEventListener('change', filterProducts);
+
+    // Run the filter once on page load (to apply any initial search_query)
+    filterProducts();
+
+    document.querySelectorAll('.product-card').forEach(card => {
+        card.addEventListener('click', () => {
+            const data = card.dataset;
+            detailsModal.querySelector('#details-image').src = data.imageUrl;
+            const detailsNameEl = detailsModal.querySelector('#details-name');
+            if (data.size) {
+            detailsNameEl.textContent = `${data.name} - ${data.size}`;
+            } else {
+            detailsNameEl.textContent = data.name;
+            }
+            detailsModal.querySelector('#details-description').textContent = data.description;
+            detailsModal.querySelector('#details-price').textContent = `₱${data.price}`;
+            detailsModal.querySelector('#details-stock').textContent = `${data.stock} pcs available`;
+            const addToCartBtn = detailsModal.querySelector('#details-add-to-cart-btn');
+            const buyNowBtn = detailsModal.querySelector('#details-buy-now-btn');
+            Object.assign(addToCartBtn.dataset, data);
+            Object.assign(buyNowBtn.dataset, data);
+            if (parseInt(data.stock) === 0) {
+                addToCartBtn.textContent = 'Reserve (Out of Stock)';
+                buyNowBtn.style.display = 'none';
+            } else {
+                addToCartBtn.textContent = 'Reserve Now';
+                buyNowBtn.style.display = 'inline-block';
+            }
+            openModal(detailsModal);
+        });
+    });
+
+    // --- RE-ROUTE BUTTON CLICKS FROM DETAILS MODAL ---
+    document.getElementById('details-buy-now-btn').addEventListener('click', function() {
+        closeModal(detailsModal);
+        openBuyNowModal(this.dataset);
+    });
+
+    document.getElementById('details-add-to-cart-btn').addEventListener('click', function() {
+        closeModal(detailsModal);
+        const stock = parseInt(this.dataset.stock);
+        if (stock > 0) {
+            openReservationModal(this.dataset);
+        } else {
+            openBackorderModal(this.dataset);
+        }
+    });
+
+    function openBuyNowModal(data) {
+        buyModal.querySelector('#buy-product-id').value = data.id;
+        buyModal.querySelector('.modal-product-image').src = data.imageUrl;
+        buyModal.querySelector('#buy-product-name').textContent = data.name;
+        const quantityInput = buyModal.querySelector('#buy-quantity');
+        quantityInput.max = data.stock;
+        const price = parseFloat(data.price);
+        const totalPriceEl = buyModal.querySelector('#total-price');
+        const updateTotal = () => {
+            const quantity = parseInt(quantityInput.value) || 0;
+            totalPriceEl.textContent = `₱${(price * quantity).toFixed(2)}`;
+        };
+        quantityInput.value = 1;
+        quantityInput.oninput = updateTotal;
+        updateTotal();
+        openModal(buyModal);
+    }
+
+    function openReservationModal(data) {
+        reserveModal.querySelector('#reserve-product-id').value = data.id;
+        reserveModal.querySelector('.modal-product-image').src = data.imageUrl;
+        reserveModal.querySelector('#reserve-product-name').textContent = data.name;
+        const quantityInput = reserveModal.querySelector('#reserve-quantity');
+        quantityInput.max = data.stock;
+        const price = parseFloat(data.price);
+        const totalPriceEl = reserveModal.querySelector('#reserve-total-price');
+        const updateTotal = () => {
+            const quantity = parseInt(quantityInput.value) || 0;
+            totalPriceEl.textContent = `₱${(price * quantity).toFixed(2)}`;
+        };
+        quantityInput.value = 1;
+        quantityInput.oninput = updateTotal;
+        updateTotal();
+
+        const today = new Date();
+        const expiry = new Date();
+        expiry.setDate(today.getDate() + 3);
+        const options = { year: 'numeric', month: 'long', day: 'numeric' };
+        reserveModal.querySelector('#reserve-date').textContent = today.toLocaleDateString('en-US', options);
+        reserveModal.querySelector('#expiry-date').textContent = expiry.toLocaleDateString('en-US', options);
+        openModal(reserveModal);
+    }
+
+    function openBackorderModal(data) {
+        backorderModal.querySelector('#backorder-product-id').value = data.id;
+        backorderModal.querySelector('.modal-product-image').src = data.imageUrl;
+        backorderModal.querySelector('#backorder-product-name').textContent = data.name;
+        const quantityInput = backorderModal.querySelector('#backorder-quantity');
+        const price = parseFloat(data.price);
+        const totalPriceEl = backorderModal.querySelector('#backorder-total-price');
+        const updateTotal = () => {
+            const quantity = parseInt(quantityInput.value) || 0;
+            totalPriceEl.textContent = `₱${(price * quantity).toFixed(2)}`;
+        };
+        quantityInput.value = 1;
+        quantityInput.oninput = updateTotal;
+        updateTotal();
+        openModal(backorderModal);
+    }
+
+    //  ---  AJAX Form Handling --- 
+
+    function showDynamicMessage(message, className = 'success') {
+        const messagesContainer = document.getElementById('messages-container');
+        if (!messagesContainer) return;
+
+        const li = document.createElement('li');
+        li.className = className; // 'success' or 'error'
+        li.textContent = message;
+
+        messagesContainer.prepend(li);
+
+        window.scrollTo({ top: 0, behavior: 'smooth' });
+
+        setTimeout(() => {
+            li.style.opacity = '0';
+            li.style.transition = 'opacity 0.5s ease';
+            setTimeout(() => li.remove(), 500);
+        }, 5000);
+    }
+
+    // Main function to handle AJAX form submission
+    function handleAjaxFormSubmit(form) {
+        form.addEventListener('submit', async (event) => {
+            event.preventDefault();
+
+            const submitButton = form.querySelector('button[type="submit"]');
+            const originalButtonText = submitButton.textContent;
+            submitButton.disabled = true;
+            submitButton.textContent = 'Processing...';
+
+            const formData = new FormData(form);
+            const url = form.action;
+            const method = form.method;
+            const csrfToken = form.querySelector('[name=csrfmiddlewaretoken]').value;
+
+            try {
+                const response = await fetch(url, {
+                    method: method,
+                    body: formData,
+                    headers: {
+                        'X-CSRFToken': csrfToken,
+                        'X-Requested-With': 'XMLHttpRequest', 
+                    },
+                });
+
+                const data = await response.json();
+
+                if (!response.ok) {
+                    throw new Error(data.error || 'An unknown error occurred.');
+                }
+
+                closeModal(form.closest('.modal')); 
+                showDynamicMessage(data.message, 'success'); 
+            if (data.product_id !== undefined && data.new_stock_quantity !== undefined) {
+                const productId = data.product_id;
+                const newStock = parseInt(data.new_stock_quantity);
+                console.log(`Updating card ${productId} to new stock: ${newStock}`);
+
+                const card = document.querySelector(`.product-card[data-id="${productId}"]`);
+
+                if (card) {
+                    const stockSpan = card.querySelector('.product-stock');
+                    if (stockSpan) {
+                        stockSpan.textContent = `${newStock} pcs available`;
+                    }
+
+                    card.dataset.stock = newStock;
+
+                    const overlayContainer = card.querySelector('.product-image-container');
+                    let overlay = overlayContainer.querySelector('.stock-overlay');
+                    if (overlay) overlay.remove();
+
+                    if (newStock === 0) {
+                        overlay = document.createElement('div');
+                        overlay.className = 'stock-overlay out-of-stock';
+                        overlay.textContent = 'Out of Stock';
+                        overlayContainer.appendChild(overlay);
+                    } else if (newStock < 10) {
+                        overlay = document.createElement('div');
+                        overlay.className = 'stock-overlay low-stock';
+                        overlay.textContent = 'Low Stock';
+                        overlayContainer.appendChild(overlay);
+                    }
+                } else {
+                    console.warn(`Could not find product card with ID ${productId} to update.`);
+                }
+            } else {
+                 console.warn("Response missing product_id or new_stock_quantity.");
+            }
+
+            } catch (error) {
+                console.error('Form submission error:', error);
+                showDynamicMessage(`Error: ${error.message}`, 'error'); // Show error toast
+            } finally {
+                submitButton.disabled = false;
+                submitButton.textContent = originalButtonText;
+            }
+        });
+    }
+
+    const buyNowForm = document.getElementById('buy-now-form');
+    const reservationForm = document.getElementById('reservation-form');
+    const backorderForm = document.getElementById('backorder-form');
+
+    if (buyNowForm) handleAjaxFormSubmit(buyNowForm);
+    if (reservationForm) handleAjaxFormSubmit(reservationForm);
+    if (backorderForm) handleAjaxFormSubmit(backorderForm);
+});
@@ -0,0 +1,70 @@
+document.addEventListener('DOMContentLoaded', () => {
+    const forgotForm = document.getElementById('forgot-form');
+    const submitButton = document.getElementById('submit-button');
+    const messagesContainer = document.getElementById('form-messages');
+
+    // Helper function to show messages
+    function showFormMessage(messages, isError = false) {
+        messagesContainer.innerHTML = '';
+        const messageDiv = document.createElement('div');
+        messageDiv.className = isError ? 'error-message' : 'success-message';
+
+        if (Array.isArray(messages)) {
+            const ul = document.createElement('ul');
+            messages.forEach(msg => {
+                const li = document.createElement('li');
+                li.textContent = msg;
+                ul.appendChild(li);
+            });
+            messageDiv.appendChild(ul);
+        } else {
+            messageDiv.textContent = messages;
+        }
+        messagesContainer.appendChild(messageDiv);
+    }
+
+    forgotForm.addEventListener('submit', async (event) => {
+        event.preventDefault(); 
+
+        // Show loading state
+        submitButton.disabled = true;
+        submitButton.textContent = 'SENDING...';
+        messagesContainer.innerHTML = ''; 
+
+        const formData = new FormData(forgotForm);
+        const csrfToken = formData.get('csrfmiddlewaretoken');
+
+        try {
+            const response = await fetch(window.location.href, {
+                method: 'POST',
+                body: formData,
+                headers: {
+                    'X-CSRFToken': csrfToken,
+                    'X-Requested-With': 'XMLHttpRequest'
+                }
+            });
+
+            const data = await response.json();
+
+            if (!response.ok) {
+                throw new Error(data.errors ? data.errors.join(', ') : 'An unknown error occurred.');
+            }
+
+            // --- Handle Success ---
+            if (data.success && data.redirect_url) {
+                showFormMessage(data.message || 'Success!', false);
+
+                setTimeout(() => {
+                    window.location.href = data.redirect_url;
+                }, 2000);
+            }
+
+        } catch (error) {
+            // --- Handle Fetch/Validation Errors ---
+            showFormMessage([error.message], true);
+
+            submitButton.disabled = false;
+            submitButton.textContent = 'SEND OTP';
+        }
+    });
+});
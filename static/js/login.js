@@ -0,0 +1,136 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // --- Role Button Logic ---
+    const roleButtons = document.querySelectorAll('.role-btn');
+    const roleInput = document.getElementById('user_type_input');
+    roleButtons.forEach(button => {
+        button.addEventListener('click', () => {
+            document.querySelector('.role-btn.active')?.classList.remove('active');
+            button.classList.add('active');
+            roleInput.value = button.dataset.role;
+        });
+    });
+
+    // --- AJAX Error Handling ---
+    const ajaxErrorDiv = document.getElementById('ajax-error-message');
+    let errorTimeout = null; 
+
+    function showAjaxError(message) {
+        if (!ajaxErrorDiv) return;
+        ajaxErrorDiv.textContent = message;
+        ajaxErrorDiv.style.display = 'block';
+        ajaxErrorDiv.classList.remove('fade-out'); 
+        ajaxErrorDiv.style.opacity = '1';
+
+        if (errorTimeout) clearTimeout(errorTimeout);
+
+        errorTimeout = setTimeout(() => {
+            ajaxErrorDiv.classList.add('fade-out');
+            setTimeout(() => {
+                ajaxErrorDiv.style.display = 'none'; 
+            }, 500); 
+        }, 3000); 
+    }
+
+    // --- Check for Registration Success Message ---
+    const urlParams = new URLSearchParams(window.location.search);
+    const successMessage = urlParams.get('message');
+
+    if (successMessage) {
+        const messageContainer = document.querySelector('.form-container'); 
+        if (messageContainer) {
+            const successDiv = document.createElement('div');
+            successDiv.className = 'success-message'; 
+            successDiv.textContent = '✅ ' + successMessage; 
+            const roleSelector = messageContainer.querySelector('.role-selector');
+            if (roleSelector) {
+                messageContainer.insertBefore(successDiv, roleSelector);
+            } else {
+                messageContainer.prepend(successDiv);
+            }
+
+
+            // Auto-hide the success message after 3-5 seconds
+            setTimeout(() => {
+                successDiv.classList.add('fade-out');
+                setTimeout(() => {
+                    successDiv.remove();
+                }, 500);
+            }, 3000);
+
+            if (history.replaceState) {
+                const cleanUrl = window.location.pathname;
+                history.replaceState(null, '', cleanUrl);
+            }
+        }
+    }
+
+    // --- Auto-hide Initial Django Messages ---
+    const initialMessages = document.querySelectorAll('.error-message:not(#ajax-error-message), .success-message');
+    initialMessages.forEach(messageElement => {
+        setTimeout(() => {
+            messageElement.classList.add('fade-out');
+            setTimeout(() => {
+                messageElement.remove();
+            }, 500);
+        }, 3000);
+    });
+
+    // --- AJAX Form Submission Logic ---
+    const loginForm = document.getElementById('login-form');
+    const loginButton = document.getElementById('login-button');
+
+    if (loginForm && loginButton) {
+        loginForm.addEventListener('submit', async function(event) {
+            event.preventDefault(); 
+
+            // --- Show Loading State ---
+            const originalButtonText = loginButton.textContent;
+            loginButton.disabled = true;
+            loginButton.textContent = 'LOGGING IN...';
+            loginButton.style.opacity = '0.7';
+            loginButton.style.cursor = 'wait';
+
+            // --- Hide previous AJAX error ---
+            if (ajaxErrorDiv) ajaxErrorDiv.style.display = 'none';
+            if (errorTimeout) clearTimeout(errorTimeout);
+
+            const formData = new FormData(loginForm);
+            const url = loginForm.action; 
+
+            try {
+                const response = await fetch(url, {
+                    method: 'POST',
+                    body: formData,
+                    headers: {
+                        // Django needs CSRF token even for AJAX POST
+                        'X-CSRFToken': formData.get('csrfmiddlewaretoken'),
+                        'X-Requested-With': 'XMLHttpRequest'
+                    }
+                });
+
+                const data = await response.json();
+
+                if (!response.ok || !data.success) {
+                    // Throw an error if response status is bad OR if success:false
+                    throw new Error(data.error || `HTTP error! Status: ${response.status}`);
+                }
+
+                // --- SUCCESS ---
+                console.log("Login successful, redirecting to:", data.redirect_url);
+                window.location.href = data.redirect_url;
+
+            } catch (error) {
+                console.error("Login failed:", error);
+                showAjaxError(error.message || 'Login failed. Please try again.');
+
+                // --- Reset Button State on Error ---
+                loginButton.disabled = false;
+                loginButton.textContent = originalButtonText;
+                loginButton.style.opacity = '1';
+                loginButton.style.cursor = 'pointer';
+            }
+        });
+    } else {
+        console.error("Login form or button not found!");
+    }
+});
@@ -0,0 +1,396 @@
+const pageConfig = JSON.parse(document.getElementById('page-config').textContent);
+
+document.addEventListener('DOMContentLoaded', () => {
+
+    // --- Get All Static Elements ---
+    const profileModal = document.getElementById('student-profile-modal');
+    const searchInput = document.getElementById('student-search-input');
+    const tableBody = document.getElementById('student-table-body');
+    const noResultsRow = document.getElementById('no-results-row');
+    const initialEmptyRow = document.getElementById('initial-empty-row');
+    const paginationContainer = document.getElementById('pagination-container');
+    const loadingRow = document.getElementById('loading-row');
+
+    //Get the stat card elements
+    const blockedStudentsCountEl = document.getElementById('blocked-students-count');
+    const totalStudentsCountEl = document.getElementById('total-students-count');
+    const modalDeleteStudentBtn = document.getElementById('modal-delete-student-btn');
+    const deleteStudentModal = document.getElementById('delete-student-modal');
+    const deleteStudentForm = document.getElementById('delete-student-form');
+
+    // Global state
+    let searchTimer;
+    let currentSearchTerm = '';
+
+    // --- Helper: Show/Hide Modals ---
+    const openModal = (modal) => modal.style.display = 'flex';
+    const closeModal = (modal) => modal.style.display = 'none';
+    if (profileModal) {
+        const closeModalBtn = profileModal.querySelector('.close-btn');
+        const cancelModalBtn = profileModal.querySelector('.cancel-btn');
+        if (closeModalBtn) closeModalBtn.addEventListener('click', () => closeModal(profileModal));
+        if (cancelModalBtn) cancelModalBtn.addEventListener('click', () => closeModal(profileModal));
+        window.addEventListener('click', (e) => {
+            if (e.target == profileModal) closeModal(profileModal);
+        });
+    }
+
+    // --- Helper: Show Dynamic Message ---
+    function showDynamicMessage(message, className = 'success') {
+        const messagesContainer = document.getElementById('message-container');
+        if (!messagesContainer) return;
+        const li = document.createElement('li');
+        li.className = className;
+        li.textContent = message;
+        messagesContainer.prepend(li);
+        window.scrollTo({ top: 0, behavior: 'smooth' });
+        setTimeout(() => {
+            li.style.opacity = '0';
+            li.style.transition = 'opacity 0.5s ease';
+            setTimeout(() => li.remove(), 500);
+        }, 5000);
+    }
+
+    // --- Helper: Open Profile Modal ---
+    function openProfileModal(button) {
+        const data = button.dataset;
+        document.getElementById('modal-full-name').textContent = data.name;
+        document.getElementById('modal-student-id').textContent = data.studentId;
+        document.getElementById('modal-email').textContent = data.email;
+        document.getElementById('modal-phone').textContent = data.phone;
+        document.getElementById('modal-address').textContent = data.address;
+        const avatarContainer = document.getElementById('modal-avatar');
+        if (data.avatarUrl) {
+            avatarContainer.innerHTML = `<img src="${data.avatarUrl}" alt="Avatar">`;
+        } else {
+            const initial = data.name.charAt(0).toUpperCase() || 'S';
+            avatarContainer.innerHTML = `<span>${initial}</span>`;
+        }
+
+        if (modalDeleteStudentBtn) {
+            modalDeleteStudentBtn.dataset.userId = data.userId;
+            modalDeleteStudentBtn.dataset.name = data.name;
+            modalDeleteStudentBtn.dataset.email = data.email;
+        }
+        openModal(profileModal);
+    }
+
+    // --- Helper: Handle Block/Unblock Form Submit ---
+    async function handleBlockFormSubmit(e) {
+        e.preventDefault();
+        const form = e.currentTarget;
+        const submitButton = form.querySelector('button[type="submit"]');
+        const originalButtonText = submitButton.textContent;
+        submitButton.disabled = true;
+        submitButton.textContent = '...';
+
+        const formData = new FormData(form);
+        const userId = formData.get('user_id');
+        const isBlocked = formData.get('is_blocked');
+        const url = `/dashboard/admin/block-student/${userId}/`;
+        const csrfToken = form.querySelector('[name=csrfmiddlewaretoken]').value;
+
+        try {
+            const response = await fetch(url, {
+                method: 'POST',
+                body: formData,
+                headers: {
+                    'X-CSRFToken': csrfToken,
+                    'X-Requested-With': 'XMLHttpRequest'
+                }
+            });
+            const data = await response.json();
+            if (!response.ok) throw new Error(data.error || 'An unknown error occurred');
+
+            showDynamicMessage(data.message, 'success');
+
+            //Live Stat Card Update
+            if (blockedStudentsCountEl) {
+                let currentCount = parseInt(blockedStudentsCountEl.textContent);
+                if (isBlocked === 'true') {
+                    currentCount++;
+                } else {
+                    currentCount--;
+                }
+                blockedStudentsCountEl.textContent = currentCount;
+            }
+
+            const row = form.closest('tr');
+            const statusBadge = row.querySelector('.badge');
+            const isBlockedInput = form.querySelector('input[name="is_blocked"]');
+
+            if (isBlocked === 'true') {
+                statusBadge.textContent = 'Blocked';
+                statusBadge.className = 'badge badge-blocked';
+                submitButton.textContent = 'Unblock';
+                submitButton.className = 'btn btn-success';
+                isBlockedInput.value = 'false';
+            } else {
+                statusBadge.textContent = 'Active';
+                statusBadge.className = 'badge badge-active';
+                submitButton.textContent = 'Block';
+                submitButton.className = 'btn btn-danger';
+                isBlockedInput.value = 'true';
+            }
+            submitButton.disabled = false;
+
+        } catch (error) {
+            showDynamicMessage(error.message, 'error');
+            submitButton.disabled = false;
+            submitButton.textContent = originalButtonText;
+        }
+    }
+
+    // --- Helper: Re-attach Listeners to New Rows ---
+    function attachListenersToRows() {
+        tableBody.querySelectorAll('.btn-view-profile').forEach(button => {
+            button.addEventListener('click', () => openProfileModal(button));
+        });
+        tableBody.querySelectorAll('.block-unblock-form').forEach(form => {
+            form.removeEventListener('submit', handleBlockFormSubmit); 
+            form.addEventListener('submit', handleBlockFormSubmit);
+        });
+    }
+
+    // --- Helper: Render New Table Rows ---
+    function renderTableRows(students) {
+        tableBody.innerHTML = '';
+
+        if (students.length === 0) {
+            if (currentSearchTerm.length > 0) {
+                if (noResultsRow) noResultsRow.style.display = '';
+            } else if (initialEmptyRow) {
+                initialEmptyRow.style.display = '';
+            }
+            return;
+        }
+
+        if (noResultsRow) noResultsRow.style.display = 'none';
+        if (initialEmptyRow) initialEmptyRow.style.display = 'none';
+
+        students.forEach(student => {
+            const isBlocked = student.is_blocked || false;
+            const statusBadge = isBlocked ? `<span class="badge badge-blocked">Blocked</span>` : `<span class="badge badge-active">Active</span>`;
+            const blockButton = isBlocked ? `<input type="hidden" name="is_blocked" value="false"><button type="submit" class="btn btn-success">Unblock</button>` : `<input type="hidden" name="is_blocked" value="true"><button type="submit" class="btn btn-danger">Block</button>`;
+            let formattedDate = student.created_at ? new Date(student.created_at).toLocaleDateString('en-US', { month: 'short', day: '2-digit', year: 'numeric' }) : 'N/A';
+
+            const rowHtml = `
+                <tr class="student-row" data-name="${student.full_name?.toLowerCase() || ''}" data-email="${student.email?.toLowerCase() || ''}" data-student-id="${student.student_id?.toLowerCase() || ''}">
+                    <td>${student.full_name || 'N/A'}</td>
+                    <td>${student.email || 'N/A'}</td>
+                    <td>${student.phone_number || 'N/A'}</td>
+                    <td>${statusBadge}</td>
+                    <td>${formattedDate}</td>
+                    <td><div class="action-buttons">
+                        <button type="button" class="btn btn-primary btn-view-profile"
+                                data-user-id="${student.user_id}"
+                                data-name="${student.full_name || 'N/A'}"
+                                data-email="${student.email || 'N/A'}"
+                                data-student-id="${student.student_id || 'N/A'}"
+                                data-phone="${student.phone_number || 'N/A'}"
+                                data-address="${student.address || 'N/A'}"
+                                data-avatar-url="${student.avatar_url || ''}">
+                            View
+                        </button>
+                        <form class="block-unblock-form">
+                            <input type="hidden" name="csrfmiddlewaretoken" value="${pageConfig.csrfToken}">
+                            <input type="hidden" name="user_id" value="${student.user_id}">
+                            ${blockButton}
+                        </form>
+                    </div></td>
+                </tr>`;
+            tableBody.insertAdjacentHTML('beforeend', rowHtml);
+        });
+
+        attachListenersToRows();
+    }
+
+    // --- Helper to render pagination links ---
+    function renderPagination(data) {
+        if (!paginationContainer) return;
+        paginationContainer.innerHTML = '';
+
+        if (data.total_pages <= 1) return;
+
+        const infoHtml = `<div class="pagination-info">Showing page ${data.current_page} of ${data.total_pages} (${data.total_count} total students)</div>`;
+        let linksHtml = '<div class="pagination-links">';
+
+        data.page_range.forEach(page_num => {
+            if (page_num == data.current_page) {
+                linksHtml += `<strong>${page_num}</strong>`;
+            } else {
+                linksHtml += `<a href="?page=${page_num}" class="pagination-link" data-page="${page_num}">${page_num}</a>`;
+            }
+        });
+        linksHtml += '</div>';
+
+        paginationContainer.innerHTML = infoHtml + linksHtml;
+
+        // Re-attach listeners to the new links
+        attachPaginationListeners();
+    }
+
+    // --- Helper to attach listeners to pagination ---
+    function attachPaginationListeners() {
+        paginationContainer.querySelectorAll('.pagination-link').forEach(link => {
+            link.addEventListener('click', (e) => {
+                e.preventDefault();
+                const pageNum = e.currentTarget.dataset.page;
+                fetchStudents(pageNum, currentSearchTerm);
+            });
+        });
+    }
+
+    // --- Main function to fetch data ---
+    async function fetchStudents(page = 1, search = '') {
+        if (loadingRow) loadingRow.style.display = '';
+        if (noResultsRow) noResultsRow.style.display = 'none';
+        if (initialEmptyRow) initialEmptyRow.style.display = 'none';
+        tableBody.querySelectorAll('.student-row').forEach(row => row.remove());
+
+        try {
+            const url = `${pageConfig.manageStudentsUrl}?page=${page}&search=${encodeURIComponent(search)}&format=json`;
+            const response = await fetch(url, {
+                headers: { 'X-Requested-With': 'XMLHttpRequest' }
+            });
+            if (!response.ok) throw new Error('Failed to fetch students.');
+
+            const data = await response.json();
+            if (data.error) throw new Error(data.error);
+
+            if (loadingRow) loadingRow.style.display = 'none';
+
+            renderTableRows(data.students);
+            renderPagination(data);
+
+        } catch (error) {
+            console.error("Fetch error:", error);
+            if (loadingRow) loadingRow.style.display = 'none';
+            showDynamicMessage(error.message, 'error');
+        }
+    }
+
+    // --- Attach Initial Event Listeners ---
+    if (searchInput) {
+        searchInput.addEventListener('input', () => {
+            currentSearchTerm = searchInput.value;
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                fetchStudents(1, currentSearchTerm);
+            }, 300);
+        });
+    }
+
+    // Attach listeners to the rows and pagination that loaded with the page
+    attachListenersToRows();
+    attachPaginationListeners();
+
+    // ==================================================================
+    // DELETE STUDENT LOGIC
+    // ==================================================================
+
+    if (deleteStudentModal) {
+        const closeModalBtn = deleteStudentModal.querySelector('.close-btn');
+        const cancelModalBtn = deleteStudentModal.querySelector('.cancel-btn');
+        if (closeModalBtn) closeModalBtn.addEventListener('click', () => closeModal(deleteStudentModal));
+        if (cancelModalBtn) cancelModalBtn.addEventListener('click', (e) => {
+            e.preventDefault();
+            closeModal(deleteStudentModal);
+        });
+        window.addEventListener('click', (e) => {
+            if (e.target == deleteStudentModal) closeModal(deleteStudentModal);
+        });
+    }
+
+    if (modalDeleteStudentBtn) {
+        modalDeleteStudentBtn.addEventListener('click', (e) => {
+            const data = e.currentTarget.dataset;
+
+            if (deleteStudentModal) {
+                deleteStudentModal.querySelector('#delete-student-name').textContent = data.name;
+                deleteStudentModal.querySelector('#delete-student-email').textContent = data.email;
+            }
+
+            if (deleteStudentForm) {
+                deleteStudentForm.action = `/dashboard/admin/delete-student/${data.userId}/`;
+            }
+
+            closeModal(profileModal);
+            openModal(deleteStudentModal);
+        });
+    }
+
+    if (deleteStudentForm) {
+        deleteStudentForm.addEventListener('submit', async (e) => {
+            e.preventDefault();
+            const form = e.currentTarget;
+            const submitButton = form.querySelector('button[type="submit"]');
+            const originalButtonText = submitButton.textContent;
+
+            submitButton.disabled = true;
+            submitButton.textContent = 'Deleting...';
+
+            const url = form.action;
+            const csrfToken = form.querySelector('[name=csrfmiddlewaretoken]').value;
+
+            try {
+                const response = await fetch(url, {
+                    method: 'POST',
+                    headers: {
+                        'X-CSRFToken': csrfToken,
+                        'X-Requested-With': 'XMLHttpRequest'
+                    }
+                });
+
+                const data = await response.json();
+
+                if (!response.ok) {
+                    throw new Error(data.error || 'An unknown error occurred.');
+                }
+
+                closeModal(deleteStudentModal);
+                showDynamicMessage(data.message, 'success');
+
+                const rowToRemove = document.querySelector(`.btn-view-profile[data-user-id="${data.user_id}"]`).closest('tr');
+                if (rowToRemove) {
+                    rowToRemove.remove();
+                }
+
+                if (totalStudentsCountEl) {
+                    let currentCount = parseInt(totalStudentsCountEl.textContent);
+                    if (currentCount > 0) {
+                        totalStudentsCountEl.textContent = currentCount - 1;
+                    }
+                }
+
+                if (blockedStudentsCountEl) {
+                    const rowBadge = rowToRemove.querySelector('.badge');
+                    if (rowBadge && rowBadge.classList.contains('badge-blocked')) {
+                        let currentBlockedCount = parseInt(blockedStudentsCountEl.textContent);
+                        if (currentBlockedCount > 0) {
+                            blockedStudentsCountEl.textContent = currentBlockedCount - 1;
+                        }
+                    }
+                }
+
+            } catch (error) {
+                closeModal(deleteStudentModal);
+
+                let errorMessage = error.message; 
+                try {
+                    const match = errorMessage.match(/message': '([^']*)'/);
+                    if (match && match[1]) {
+                        errorMessage = match[1];
+                    }
+                } catch (parseError) {
+                }
+
+                showDynamicMessage(errorMessage, 'error');
+
+            } finally {
+                submitButton.disabled = false;
+                submitButton.textContent = originalButtonText;
+            }
+        });
+    }
+});
@@ -0,0 +1,436 @@
+const pageConfig = JSON.parse(document.getElementById('page-config').textContent);
+
+document.addEventListener('DOMContentLoaded', () => {
+    // --- Get Modals & Elements ---
+    const detailsModal = document.getElementById('order-details-modal');
+
+    // --- modal elements for Order Type ---
+    const detailsOrderTypeLabel = detailsModal.querySelector('#details-order-type-label');
+    const detailsOrderTypeVal = detailsModal.querySelector('#details-order-type');
+
+    const deleteConfirmModal = document.getElementById('delete-confirm-modal');
+    const batchDeleteConfirmModal = document.getElementById('batch-delete-confirm-modal');
+    const batchActionBar = document.getElementById('batch-action-bar');
+    const selectedCountSpan = document.getElementById('selected-count');
+    const batchDeleteBtn = document.getElementById('batch-delete-btn');
+    const batchForm = document.getElementById('batch-order-form');
+    const batchOrderIdsInput = document.getElementById('batch-order-ids');
+    const allOrderCards = document.querySelectorAll('.order-card');
+
+    // Checkboxes
+    const allOrderCheckboxes = document.querySelectorAll('.order-checkbox');
+    const selectAllCompletedCheckbox = document.getElementById('select-all-completed');
+    const completedCheckboxes = document.querySelectorAll('.completed-checkbox');
+    const selectAllOtherCheckbox = document.getElementById('select-all-other');
+    const otherCheckboxes = document.querySelectorAll('.other-checkbox');
+
+    // --- General Modal Controls ---
+    const openModal = (modal) => modal.style.display = 'flex';
+    const closeModal = (modal) => modal.style.display = 'none';
+    document.querySelectorAll('.close-btn, .cancel-modal-btn').forEach(btn => {
+        btn.addEventListener('click', (e) => {
+            e.stopPropagation();
+            closeModal(btn.closest('.modal'));
+        });
+    });
+    window.addEventListener('click', (e) => {
+        if (e.target.classList.contains('modal') && e.target) { 
+             closeModal(e.target);
+        }
+    });
+
+    // --- Search Functionality ---
+    const searchInput = document.getElementById('order-search-input');
+    const orderSections = document.querySelectorAll('.order-section');
+    function filterOrders() {
+        const searchTerm = searchInput.value.toLowerCase().trim();
+        let anyCardVisibleOverall = false;
+        orderSections.forEach(section => {
+            let sectionHasVisibleCards = false;
+            const sectionStatus = section.dataset.sectionStatus.toLowerCase();
+            section.querySelectorAll('.order-card').forEach(card => {
+                const productName = card.dataset.name.toLowerCase();
+                const category = card.dataset.category.toLowerCase();
+                const status = card.dataset.status.toLowerCase();
+                const cardMatches = productName.includes(searchTerm) || category.includes(searchTerm) || status.includes(searchTerm) || sectionStatus.split(' ').some(s => s.includes(searchTerm));
+                card.style.display = cardMatches ? 'flex' : 'none';
+                if (cardMatches) { sectionHasVisibleCards = true; anyCardVisibleOverall = true; }
+            });
+            section.style.display = sectionHasVisibleCards ? 'block' : 'none';
+        });
+    }
+    searchInput.addEventListener('input', filterOrders);
+    if (searchInput.value) filterOrders();
+
+    // --- Order Details Modal Logic ---
+    allOrderCards.forEach(card => {
+        const checkbox = card.querySelector('.order-checkbox');
+
+        if (checkbox) {
+            checkbox.addEventListener('click', (e) => {
+                e.stopPropagation();
+                handleExclusiveSelection(checkbox);
+                updateBatchActionBar();
+            });
+        }
+
+        card.addEventListener('click', (e) => {
+            if (e.target.classList.contains('order-checkbox')) return;
+
+            if (checkbox) {
+                checkbox.checked = !checkbox.checked;
+                handleExclusiveSelection(checkbox);
+                updateBatchActionBar();
+            }
+
+            if (!detailsModal) { console.error("Details modal not found!"); return; }
+
+            const status = card.dataset.status;
+            if (status !== 'cancelled' && status !== 'rejected') {
+
+                const data = card.dataset;
+                detailsModal.querySelector('#details-image').src = data.imageUrl;
+                const nameEl = detailsModal.querySelector('#details-name');
+                nameEl.textContent = data.size ? `${data.name} - ${data.size}` : data.name;
+                detailsModal.querySelector('#details-category').textContent = data.category;
+                detailsModal.querySelector('#details-description').textContent = data.description;
+                detailsModal.querySelector('#details-created-at').textContent = data.createdAt;
+                detailsModal.querySelector('#details-quantity').textContent = `${data.quantity} pc(s)`;
+                detailsModal.querySelector('#details-total-price').textContent = `₱${data.totalPrice}`;
+                detailsModal.querySelector('#details-payment-method').textContent = data.paymentMethod;
+
+                const statusTextEl = detailsModal.querySelector('#details-status-text');
+                statusTextEl.textContent = data.status.charAt(0).toUpperCase() + data.status.slice(1);
+                statusTextEl.innerHTML = `<span class="status-badge status-${data.status}">${statusTextEl.textContent}</span>`;
+
+                const claimNote = detailsModal.querySelector('#details-claim-note');
+                claimNote.style.display = (data.status === 'approved') ? 'block' : 'none';
+
+                const expiresLabelEl = detailsModal.querySelector('#details-expires-label');
+                const expiresValueEl = detailsModal.querySelector('#details-expires-at');
+
+                if (data.expiresAt) {
+                    expiresValueEl.textContent = data.expiresAt;
+                    expiresLabelEl.style.display = ''; 
+                    expiresValueEl.style.display = '';
+                } else {
+                    expiresValueEl.textContent = '';
+                    expiresLabelEl.style.display = 'none';
+                    expiresValueEl.style.display = 'none';
+                }
+
+                if (detailsOrderTypeLabel && detailsOrderTypeVal) {
+                    if (data.status === 'pending' && data.orderType) {
+                        detailsOrderTypeVal.textContent = data.orderType;
+                        detailsOrderTypeLabel.style.display = '';
+                        detailsOrderTypeVal.style.display = '';
+                    } else {
+                        detailsOrderTypeVal.textContent = '';
+                        detailsOrderTypeLabel.style.display = 'none';
+                        detailsOrderTypeVal.style.display = 'none';
+                    }
+                }
+
+                const deleteBtn = detailsModal.querySelector('#details-delete-btn');
+                const cancelBtn = detailsModal.querySelector('#details-cancel-btn');
+
+                if (deleteBtn) {
+                    if (['cancelled', 'rejected'].includes(data.status)) {
+                        deleteBtn.style.display = 'inline-block';
+                        deleteBtn.dataset.orderId = data.id;
+                        deleteBtn.dataset.name = data.name;
+                        deleteBtn.dataset.size = data.size;
+                    } else {
+                        deleteBtn.style.display = 'none';
+                    }
+                }
+
+                if (cancelBtn) {
+                    if (data.status === 'approved') {
+                        cancelBtn.style.display = 'inline-block';
+                        cancelBtn.dataset.orderId = data.id;
+                        cancelBtn.dataset.productName = data.size ? `${data.name} - ${data.size}` : data.name;
+                    } else {
+                        cancelBtn.style.display = 'none';
+                    }
+                }
+
+                openModal(detailsModal);
+            }
+        });
+    });
+
+    function updateBatchActionBar() {
+        const otherChecked = document.querySelectorAll('.other-checkbox:checked').length;
+        const count = otherChecked;
+
+        if (batchActionBar) {
+            if (count > 0) {
+                batchActionBar.style.display = 'flex';
+                selectedCountSpan.textContent = `${count} item${count > 1 ? 's' : ''} selected`;
+            } else {
+                batchActionBar.style.display = 'none';
+            }
+        }
+        allOrderCheckboxes.forEach(cb => {
+            cb.closest('.order-card').classList.toggle('selected', cb.checked);
+        });
+    }
+
+
+    if (selectAllOtherCheckbox) {
+        selectAllOtherCheckbox.addEventListener('change', () => {
+            otherCheckboxes.forEach(cb => cb.checked = selectAllOtherCheckbox.checked);
+            handleExclusiveSelection(selectAllOtherCheckbox, 'other-checkbox');
+            updateBatchActionBar();
+        });
+    }
+
+    allOrderCheckboxes.forEach(checkbox => {
+        checkbox.addEventListener('change', () => {
+            if (!checkbox.checked) {
+                if (checkbox.classList.contains('other-checkbox') && selectAllOtherCheckbox) selectAllOtherCheckbox.checked = false;
+            }
+            updateBatchActionBar();
+        });
+    });
+
+    // Helper function to manage exclusive selection
+    function handleExclusiveSelection(clickedCheckbox, groupClass = null) {
+        if (!clickedCheckbox.checked) return;
+
+        const clickedGroupClass = groupClass || (clickedCheckbox.classList.contains('completed-checkbox') ? 'completed-checkbox' : 'other-checkbox');
+
+        allOrderCheckboxes.forEach(cb => {
+            if (clickedGroupClass === 'completed-checkbox' && cb.classList.contains('other-checkbox')) {
+                cb.checked = false;
+            } else if (clickedGroupClass === 'other-checkbox' && cb.classList.contains('completed-checkbox')) {
+                cb.checked = false;
+            }
+        });
+
+        if (clickedGroupClass === 'completed-checkbox' && selectAllOtherCheckbox) {
+            selectAllOtherCheckbox.checked = false;
+        } else if (clickedGroupClass === 'other-checkbox' && selectAllCompletedCheckbox) {
+            selectAllCompletedCheckbox.checked = false;
+        }
+    }
+
+    let csrfToken = null;
+    if (batchForm) {
+        const tokenInput = batchForm.querySelector('[name=csrfmiddlewaretoken]');
+        if (tokenInput) {
+            csrfToken = tokenInput.value;
+        }
+    }
+
+    if (!csrfToken) {
+        const anyTokenInput = document.querySelector('[name=csrfmiddlewaretoken]');
+        if (anyTokenInput) {
+            csrfToken = anyTokenInput.value;
+        }
+    }
+
+    if (!csrfToken) {
+        console.error('CSRF TOKEN NOT FOUND. AJAX requests will fail.');
+    }
+
+    function showDynamicMessage(message, className = 'success') {
+        const messagesContainer = document.getElementById('messages-container');
+        if (!messagesContainer) return;
+        const li = document.createElement('li');
+        li.className = className;
+        li.textContent = message;
+        messagesContainer.prepend(li);
+        window.scrollTo({ top: 0, behavior: 'smooth' });
+        setTimeout(() => {
+            li.style.opacity = '0';
+            li.style.transition = 'opacity 0.5s ease';
+            setTimeout(() => li.remove(), 500);
+        }, 5000);
+    }
+
+    function removeCardsFromUI(orderIds) {
+        orderIds.forEach(id => {
+            const card = document.querySelector(`.order-card[data-id="${id}"]`);
+            if (card) {
+                card.style.transition = 'opacity 0.5s ease, transform 0.5s ease';
+                card.style.opacity = '0';
+                card.style.transform = 'scale(0.95)';
+                setTimeout(() => card.remove(), 500);
+            }
+        });
+
+         updateBatchActionBar();
+    }
+
+    // --- AJAX for BATCH Delete ---
+    const batchDeleteConfirmBtn = document.getElementById('confirm-batch-delete-btn');
+    if (batchDeleteBtn) {
+        batchDeleteBtn.addEventListener('click', () => {
+            const selectedIds = Array.from(document.querySelectorAll('.order-checkbox:checked')).map(cb => cb.value);
+            const count = selectedIds.length;
+            if (count === 0) { alert('Please select at least one order to delete.'); return; }
+            if (batchDeleteConfirmModal) {
+                 batchDeleteConfirmModal.querySelector('#batch-delete-count').textContent = count;
+                 if(batchDeleteConfirmBtn) batchDeleteConfirmBtn.dataset.ids = selectedIds.join(',');
+                 openModal(batchDeleteConfirmModal);
+            }
+        });
+    }
+    if (batchDeleteConfirmBtn) {
+        batchDeleteConfirmBtn.addEventListener('click', async function() {
+            const idsToSubmit = this.dataset.ids;
+            if (!idsToSubmit) return;
+            this.disabled = true;
+            this.textContent = 'Deleting...';
+            const formData = new FormData();
+            formData.append('order_ids', idsToSubmit);
+            try {
+                const response = await fetch(pageConfig.batchDeleteUrl, {
+                    method: 'POST',
+                    body: formData,
+                    headers: { 'X-CSRFToken': csrfToken, 'X-Requested-With': 'XMLHttpRequest' },
+                });
+                const data = await response.json();
+                if (!response.ok) throw new Error(data.error);
+                closeModal(batchDeleteConfirmModal);
+                showDynamicMessage(data.message, 'success');
+                removeCardsFromUI(data.order_ids); // Only the ones the server deleted; failed_ids stay
+                batchActionBar.style.display = 'none';
+
+            } catch (error) {
+                closeModal(batchDeleteConfirmModal); 
+                updateBatchActionBar();
+            } finally {
+                this.disabled = false;
+                this.textContent = 'Yes, Delete Selected';
+            }
+        });
+    }
+
+    // --- AJAX for SINGLE Delete ---
+    const detailsDeleteBtn = document.getElementById('details-delete-btn');
+    if (detailsDeleteBtn) {
+        detailsDeleteBtn.addEventListener('click', function(e) {
+            e.stopPropagation();
+            if (deleteConfirmModal) {
+                 closeModal(detailsModal);
+                 openDeleteConfirmModal(this.dataset);
+            }
+        });
+    }
+
+    const singleDeleteForm = document.getElementById('delete-single-order-form');
+    if (singleDeleteForm) {
+        singleDeleteForm.addEventListener('submit', async function(event) {
+            event.preventDefault(); 
+            const submitButton = this.querySelector('button[type="submit"]');
+            const originalButtonText = submitButton.textContent;
+            submitButton.disabled = true;
+            submitButton.textContent = 'Deleting...';
+
+            const url = this.action;
+            const orderId = url.split('/').filter(Boolean).pop();
+
+            try {
+                const response = await fetch(url, {
+                    method: 'POST',
+                    headers: { 'X-CSRFToken': csrfToken, 'X-Requested-With': 'XMLHttpRequest' },
+                });
+                const data = await response.json();
+                if (!response.ok) throw new Error(data.error);
+
+                closeModal(deleteConfirmModal);
+                showDynamicMessage(data.message, 'success');
+                removeCardsFromUI([orderId]);
+                batchActionBar.style.display = 'none';
+            } catch (error) {
+                closeModal(deleteConfirmModal); 
+                showDynamicMessage(`Error: ${error.message}`, 'error');
+            } finally {
+                 submitButton.disabled = false;
+                 submitButton.textContent = originalButtonText;
+            }
+        });
+    }
+
+    // Helper function to populate and open the single delete modal
+    function openDeleteConfirmModal(data) {
+      if (!deleteConfirmModal) { console.error("Cannot open delete confirmation modal - not found."); return; }
+      const form = deleteConfirmModal.querySelector('#delete-single-order-form');
+      form.action = `/dashboard/student/delete-order/${data.orderId}/`; // Use data.orderId
+      const confirmNameEl = deleteConfirmModal.querySelector('#delete-confirm-product-name');
+      confirmNameEl.textContent = data.size ? `${data.name} - ${data.size}` : data.name; 
+      openModal(deleteConfirmModal);
+    }
+
+    // --- Logic for Student Order Cancellation ---
+    const cancelConfirmModal = document.getElementById('cancel-confirm-modal');
+    const cancelOrderForm = document.getElementById('cancel-order-form');
+    const detailsCancelBtn = document.getElementById('details-cancel-btn');
+
+    if (detailsCancelBtn) {
+        detailsCancelBtn.addEventListener('click', function(e) {
+            e.stopPropagation();
+
+            const orderId = this.dataset.orderId;
+            const productName = this.dataset.productName;
+
+            if (cancelConfirmModal && cancelOrderForm) {
+                cancelOrderForm.action = `/dashboard/student/cancel-order/${orderId}/`; 
+
+                cancelConfirmModal.querySelector('#cancel-confirm-product-name').textContent = productName;
+
+                closeModal(detailsModal);
+
+                openModal(cancelConfirmModal);
+            } else {
+                console.error('Cancel confirmation modal or form not found!');
+            }
+        });
+    }
+
+    // Add submit listener for the new cancel form
+    if (cancelOrderForm) {
+        cancelOrderForm.addEventListener('submit', async function(event) {
+            event.preventDefault();
+            const submitButton = this.querySelector('button[type="submit"]');
+            const originalButtonText = submitButton.textContent;
+            submitButton.disabled = true;
+            submitButton.textContent = 'Cancelling...';
+
+            const url = this.action;
+
+            try {
+                const response = await fetch(url, {
+                    method: 'POST',
+                    headers: { 
+                        'X-CSRFToken': csrfToken,
+                        'X-Requested-With': 'XMLHttpRequest' 
+                    },
+                });
+
+                const data = await response.json();
+                if (!response.ok) throw new Error(data.error);
+
+                closeModal(cancelConfirmModal);
+
+                showDynamicMessage(data.message, 'success');
+
+                const orderId = url.split('/').filter(Boolean).pop();
+
+                removeCardsFromUI([orderId]);
+
+            } catch (error) {
+                closeModal(cancelConfirmModal);
+                showDynamicMessage(`Error: ${error.message}`, 'error');
+            } finally {
+                submitButton.disabled = false;
+                submitButton.textContent = originalButtonText;
+            }
+        });
+    }
+
+    updateBatchActionBar();
+});
@@ -0,0 +1,225 @@
+document.addEventListener('DOMContentLoaded', () => {
+    // --- Get All Modals ---
+    const detailsModal = document.getElementById('reservation-details-modal');
+    const backorderModal = document.getElementById('backorder-details-modal');
+    const checkoutModal = document.getElementById('checkout-modal');
+    const cancelModal = document.getElementById('cancel-modal');
+
+    // --- General Modal Controls ---
+    const openModal = (modal) => modal.style.display = 'flex';
+    const closeModal = (modal) => modal.style.display = 'none';
+    document.querySelectorAll('.close-btn, .cancel-modal-btn').forEach(btn => {
+        btn.addEventListener('click', (e) => {
+            e.stopPropagation();
+            closeModal(btn.closest('.modal'));
+        });
+    });
+    window.addEventListener('click', (e) => {
+        if (e.target.classList.contains('modal')) closeModal(e.target);
+    });
+
+    // --- Logic for "Available for Pickup" cards ---
+    document.querySelectorAll('.reservation-card:not(.backorder)').forEach(card => {
+        card.addEventListener('click', () => {
+            const data = card.dataset;
+            const resNameEl = detailsModal.querySelector('#res-details-name');
+
+            detailsModal.querySelector('#res-details-image').src = data.imageUrl;
+            resNameEl.textContent = data.size ? `${data.name} - ${data.size}` : data.name;
+            detailsModal.querySelector('#res-details-description').textContent = data.description;
+            detailsModal.querySelector('#res-details-quantity').textContent = data.quantity;
+            detailsModal.querySelector('#res-details-total-price').textContent = `₱${data.totalPrice}`;
+            detailsModal.querySelector('#res-details-created-at').textContent = data.createdAt;
+            detailsModal.querySelector('#res-details-expires-at').textContent = data.expiresAt;
+
+            const checkoutBtn = detailsModal.querySelector('#res-checkout-btn');
+            const cancelBtn = detailsModal.querySelector('#res-cancel-btn');
+            Object.assign(checkoutBtn.dataset, data);
+            Object.assign(cancelBtn.dataset, data);
+
+            openModal(detailsModal);
+        });
+    });
+
+    // --- Logic for "Pending Backorders" cards ---
+    document.querySelectorAll('.reservation-card.backorder').forEach(card => {
+        card.addEventListener('click', () => {
+            const data = card.dataset;
+            const boNameEl = backorderModal.querySelector('#bo-details-name');
+
+            backorderModal.querySelector('#bo-details-image').src = data.imageUrl;
+            boNameEl.textContent = data.size ? `${data.name} - ${data.size}` : data.name;
+            backorderModal.querySelector('#bo-details-description').textContent = data.description;
+            backorderModal.querySelector('#bo-details-quantity').textContent = data.quantity;
+            backorderModal.querySelector('#bo-details-total-price').textContent = `₱${data.totalPrice}`;
+            backorderModal.querySelector('#bo-details-created-at').textContent = data.createdAt;
+
+            const statusEl = backorderModal.querySelector('#bo-details-status');
+            const checkoutBtn = backorderModal.querySelector('#bo-checkout-btn');
+            const cancelBtn = backorderModal.querySelector('#bo-cancel-btn');
+
+            if (data.status === 'available') {
+                statusEl.textContent = 'Now Available!';
+                statusEl.className = 'status-available';
+                checkoutBtn.style.display = 'inline-block';
+            } else {
+                statusEl.textContent = 'Out of Stock';
+                statusEl.className = 'status-unavailable';
+                checkoutBtn.style.display = 'none';
+            }
+
+            Object.assign(checkoutBtn.dataset, data);
+            Object.assign(cancelBtn.dataset, data);
+
+            openModal(backorderModal);
+        });
+    });
+
+    // --- Reroute clicks from details modals to confirmation modals ---
+    document.getElementById('res-checkout-btn').addEventListener('click', function(e) {
+        e.stopPropagation();
+        closeModal(detailsModal);
+        openCheckoutModal(this.dataset);
+    });
+    document.getElementById('res-cancel-btn').addEventListener('click', function(e) {
+        e.stopPropagation();
+        closeModal(detailsModal);
+        openCancelModal(this.dataset);
+    });
+
+    document.getElementById('bo-checkout-btn').addEventListener('click', function(e) {
+        e.stopPropagation();
+        closeModal(backorderModal);
+        openCheckoutModal(this.dataset);
+    });
+    document.getElementById('bo-cancel-btn').addEventListener('click', function(e) {
+        e.stopPropagation();
+        closeModal(backorderModal);
+        openCancelModal(this.dataset);
+    });
+
+    // --- Helper functions to open confirmation modals ---
+    function openCheckoutModal(data) {
+        const checkoutNameEl = checkoutModal.querySelector('#checkout-product-name');
+        checkoutNameEl.textContent = data.size ? `${data.name} - ${data.size}` : data.name;
+
+        checkoutModal.querySelector('#checkout-reservation-id').value = data.id;
+        checkoutModal.querySelector('#checkout-quantity').textContent = data.quantity;
+        checkoutModal.querySelector('#checkout-price').textContent = `₱${parseFloat(data.totalPrice).toFixed(2)}`;
+        openModal(checkoutModal);
+    }
+
+    function openCancelModal(data) {
+        const form = cancelModal.querySelector('#cancel-form');
+        form.action = `/dashboard/student/cancel-reservation/${data.id}/`; 
+
+        const cancelNameEl = cancelModal.querySelector('#cancel-product-name');
+        cancelNameEl.textContent = data.size ? `${data.name} - ${data.size}` : data.name;
+
+        openModal(cancelModal);
+    }
+
+
+// Helper function to show dynamic success/error messages
+function showDynamicMessage(message, className = 'success') {
+    const messagesContainer = document.getElementById('messages-container');
+    if (!messagesContainer) {
+        console.error("Message container not found!");
+        return;
+    }
+    const li = document.createElement('li');
+    li.className = className;
+    li.textContent = message;
+    messagesContainer.prepend(li);
+    window.scrollTo({ top: 0, behavior: 'smooth' });
+    setTimeout(() => {
+        li.style.opacity = '0';
+        li.style.transition = 'opacity 0.5s ease';
+        setTimeout(() => li.remove(), 500);
+    }, 5000);
+}
+
+// Main function to handle AJAX form submission
+function handleAjaxFormSubmit(form) {
+    form.addEventListener('submit', async (event) => {
+        event.preventDefault();
+
+        const submitButton = form.querySelector('button[type="submit"]');
+        const originalButtonText = submitButton.textContent;
+        submitButton.disabled = true;
+        submitButton.textContent = 'Processing...';
+
+        const formData = new FormData(form);
+        const url = form.action;
+        const method = form.method;
+        const csrfToken = form.querySelector('[name=csrfmiddlewaretoken]').value;
+
+        try {
+            const response = await fetch(url, {
+                method: method,
+                body: formData,
+                headers: {
+                    'X-CSRFToken': csrfToken,
+                    'X-Requested-With': 'XMLHttpRequest',
+                },
+            });
+            const data = await response.json();
+            if (!response.ok) {
+                throw new Error(data.error || 'An unknown error occurred.');
+            }
+
+            closeModal(form.closest('.modal'));
+            showDynamicMessage(data.message, 'success');
+
+            let reservationId = null;
+            if (form.id === 'checkout-form') {
+                reservationId = form.querySelector('#checkout-reservation-id')?.value;
+            } else if (form.id === 'cancel-form') {
+                const match = form.action.match(/cancel-reservation\/(\d+)\/?$/);
+                if (match && match[1]) {
+                    reservationId = match[1];
+                }
+            }
+            console.log("Attempting to remove card with ID:", reservationId);
+            if (reservationId) {
+                const cardToRemove = document.querySelector(`.reservation-card[data-id="${reservationId}"]`);
+                if (cardToRemove) {
+                    cardToRemove.classList.add('removing');
+                    setTimeout(() => {
+                        const parentGrid = cardToRemove.parentElement;
+                        cardToRemove.remove();
+                        if (parentGrid && parentGrid.querySelectorAll('.reservation-card').length === 0) {
+                             const noItemsMsg = parentGrid.nextElementSibling;
+                             if (noItemsMsg && noItemsMsg.classList.contains('no-items-message')) {
+                                 noItemsMsg.style.display = 'block';
+                             } else {
+                                 const p = document.createElement('p');
+                                 p.className = 'no-items-message';
+                                 p.textContent = parentGrid.previousElementSibling?.textContent.includes('Backorders')
+                                     ? 'You have no pending backorders.'
+                                     : 'You have no items reserved for pickup.';
+                                 parentGrid.after(p);
+                             }
+                        }
+                    }, 400);
+                } else { console.warn("Card to remove not found in DOM for ID:", reservationId); }
+            } else { console.error("Could not determine reservation ID to remove card."); }
+
+        } catch (error) {
+            console.error('Form submission error:', error);
+            showDynamicMessage(`Error: ${error.message}`, 'error');
+        } finally {
+            console.log("Resetting button state.");
+            submitButton.disabled = false;
+            submitButton.textContent = originalButtonText;
+        }
+    });
+}
+
+// Attach the AJAX handler to your two confirmation forms
+const checkoutForm = document.getElementById('checkout-form');
+const cancelForm = document.getElementById('cancel-form');
+if (checkoutForm) handleAjaxFormSubmit(checkoutForm);
+if (cancelForm) handleAjaxFormSubmit(cancelForm);
+
+});
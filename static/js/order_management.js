@@ -0,0 +1,624 @@
+document.addEventListener('DOMContentLoaded', () => {
+
+    // ==================================================================
+    // GET ALL ELEMENTS
+    // ==================================================================
+    const detailsModal = document.getElementById('order-details-modal');
+    const batchDeleteConfirmModal = document.getElementById('batch-delete-confirm-modal');
+    const singleDeleteConfirmModal = document.getElementById('single-delete-confirm-modal');
+
+    // --- Forms ---
+    const batchStatusForm = document.getElementById('batch-status-form');
+    const batchPendingStatusForm = document.getElementById('batch-pending-status-form');
+    const batchDeleteForm = document.getElementById('batch-delete-form');
+    const singleStatusForm = document.getElementById('single-status-form');
+    const singlePendingStatusForm = document.getElementById('single-pending-status-form');
+    const singleDeleteForm = document.getElementById('single-delete-form');
+
+    // --- Action Bars ---
+    const batchStatusBar = document.getElementById('batch-status-bar');
+    const batchPendingStatusBar = document.getElementById('batch-pending-status-bar');
+    const batchDeleteBar = document.getElementById('batch-delete-bar');
+
+    // --- Buttons ---
+    const batchStatusUpdateBtn = document.getElementById('batch-status-update-btn');
+    const batchPendingStatusUpdateBtn = document.getElementById('batch-pending-status-update-btn');
+    const batchDeleteBtn = document.getElementById('batch-delete-btn');
+    const confirmBatchDeleteBtn = document.getElementById('confirm-batch-delete-btn');
+    const openSingleDeleteModalBtn = document.getElementById('open-single-delete-modal-btn');
+    const confirmSingleDeleteBtn = document.getElementById('confirm-single-delete-btn');
+
+    // --- Search & Content ---
+    const globalSearchInput = document.getElementById('global-order-search'); // ADDED
+    const allSearchableSections = document.querySelectorAll('.searchable-section'); // ADDED
+    const globalNoResults = document.getElementById('global-no-results'); // ADDED
+
+    const orderSections = document.querySelectorAll('.order-section');
+    const allCheckboxes = document.querySelectorAll('.order-checkbox');
+    const selectAllCheckboxes = document.querySelectorAll('.select-all-checkbox');
+
+    // ==================================================================
+    // DEFINE ALL HELPER FUNCTIONS
+    // ==================================================================
+    function showMessage(message, type = 'success') {
+        const container = document.getElementById('message-container');
+        if (!container) return;
+        const li = document.createElement('li');
+        li.className = type;
+        li.textContent = ` ${message}`;
+        const iconSpan = document.createElement('span');
+        iconSpan.textContent = (type === 'success') ? '✅' : '❌';
+        li.prepend(iconSpan);
+        container.appendChild(li);
+        setTimeout(() => {
+            li.style.opacity = '0';
+            setTimeout(() => { li.remove(); }, 500);
+        }, 4000);
+    }
+
+    /**
+     * Gets the CSRF token from any of the forms.
+     */
+    function getCsrfToken() {
+        let tokenInput = document.querySelector('form [name=csrfmiddlewaretoken]');
+        return tokenInput ? tokenInput.value : '';
+    }
+
+    /**
+     * Finds and removes an order card from the DOM.
+     */
+    function removeOrderCard(orderId) {
+        const card = document.querySelector(`.order-card[data-id="${orderId}"]`);
+        if (card) {
+            card.classList.add('moving');
+            setTimeout(() => {
+                card.remove();
+                filterGlobalOrders();
+                updateActionBars();
+            }, 300);
+        }
+    }
+
+    /**
+     * Moves an order card to the correct section based on its new status.
+     */
+    function moveOrderCard(orderId, newStatus) {
+        const card = document.querySelector(`.order-card[data-id="${orderId}"]`);
+        if (!card) return;
+
+        let targetGrid, newCheckboxClass, targetSectionSelector;
+
+        if (newStatus === 'approved') {
+            targetSectionSelector = '.order-section[data-section-status="approved"]';
+            newCheckboxClass = 'order-checkbox approved-checkbox';
+        } else if (newStatus === 'pending') {
+            targetSectionSelector = '.order-section[data-section-status="pending"]';
+            newCheckboxClass = 'order-checkbox pending-checkbox';
+        } else if (newStatus === 'completed') {
+            targetSectionSelector = '.order-section[data-section-status="completed"]';
+            newCheckboxClass = 'order-checkbox completed-checkbox';
+        } else if (newStatus === 'cancelled' || newStatus === 'rejected') {
+            targetSectionSelector = '.order-section[data-section-status*="cancelled"]'; // Matches "cancelled rejected"
+            newCheckboxClass = 'order-checkbox other-checkbox';
+        }
+
+        const targetSection = document.querySelector(targetSectionSelector);
+        if (targetSection) {
+             targetGrid = targetSection.querySelector('.orders-grid');
+        }
+
+
+        if (targetGrid) {
+            card.classList.add('moving');
+
+            setTimeout(() => {
+                card.dataset.status = newStatus;
+
+                const statusBadge = card.querySelector('.status-badge');
+                if (statusBadge) {
+                    statusBadge.textContent = newStatus.charAt(0).toUpperCase() + newStatus.slice(1);
+                    statusBadge.className = `status-badge status-${newStatus}`;
+                }
+
+                const checkbox = card.querySelector('.order-checkbox');
+                if (checkbox) {
+                    checkbox.className = newCheckboxClass;
+                    checkbox.checked = false;
+                }
+
+                targetGrid.prepend(card);
+
+                card.classList.remove('moving');
+
+                filterGlobalOrders();
+                updateActionBars();
+            }, 300);
+        } else {
+             console.error(`Could not find target grid for status "${newStatus}" using selector "${targetSectionSelector}"`);
+        }
+    }
+
+    // --- Modal Logic ---
+    const openModal = (modal) => { if (modal) modal.style.display = 'flex'; };
+    const closeModal = (modal) => { if (modal) modal.style.display = 'none'; };
+    document.querySelectorAll('.close-btn, .cancel-modal-btn').forEach(btn => {
+        btn.addEventListener('click', () => closeModal(btn.closest('.modal')));
+    });
+    window.addEventListener('click', (e) => { if (e.target.classList.contains('modal')) closeModal(e.target); });
+
+    // --- Card Click Logic (Opens Modal) ---
+    document.querySelectorAll('.order-card').forEach(card => {
+        card.addEventListener('click', (e) => {
+            if (e.target.tagName === 'INPUT' || e.target.tagName === 'BUTTON' || e.target.closest('button')) {
+                 if (!e.target.classList.contains('order-checkbox')) {
+                     e.stopPropagation();
+                 }
+                return;
+            }
+
+            // --- Toggle Checkbox when clicking card body (but not checkbox itself) ---
+             const checkbox = card.querySelector('.order-checkbox');
+             if (checkbox && !e.target.classList.contains('order-checkbox')) {
+                 checkbox.checked = !checkbox.checked;
+                 checkbox.dispatchEvent(new Event('change'));
+                 e.stopPropagation();
+             }
+
+
+            const data = card.dataset;
+            detailsModal.querySelector('#details-image').src = data.imageUrl;
+            detailsModal.querySelector('#details-name').textContent = data.size ? `${data.name} - ${data.size}` : data.name;
+            detailsModal.querySelector('#details-order-id').textContent = `#${data.id}`;
+            detailsModal.querySelector('#details-student').textContent = `${data.studentName} (${data.studentId})`;
+            detailsModal.querySelector('#details-category').textContent = data.category;
+            detailsModal.querySelector('#details-description').textContent = data.description;
+            detailsModal.querySelector('#details-created-at').textContent = data.createdAt;
+            detailsModal.querySelector('#details-quantity').textContent = `${data.quantity} pc(s)`;
+            detailsModal.querySelector('#details-total-price').textContent = `₱${data.totalPrice}`;
+            detailsModal.querySelector('#details-payment-method').textContent = data.paymentMethod;
+            detailsModal.querySelector('#details-order-type').textContent = data.orderType;
+            const statusBadge = detailsModal.querySelector('#details-status-badge');
+            const status = data.status;
+            statusBadge.textContent = status.charAt(0).toUpperCase() + status.slice(1);
+            statusBadge.className = 'status-badge';
+            statusBadge.classList.add(`status-${status}`);
+
+            const expiresLabelEl = detailsModal.querySelector('#details-expires-label');
+            const expiresValueEl = detailsModal.querySelector('#details-expires-at');
+
+            if (data.expiresAt) {
+                expiresValueEl.textContent = data.expiresAt;
+                expiresLabelEl.style.display = '';
+                expiresValueEl.style.display = '';
+            } else {
+                expiresValueEl.textContent = '';
+                expiresLabelEl.style.display = 'none';
+                expiresValueEl.style.display = 'none';
+            }
+
+            // Set action URLs for all forms
+            singleStatusForm.action = `/dashboard/admin/update-order-status/${data.id}/`;
+            singlePendingStatusForm.action = `/dashboard/admin/update-order-status/${data.id}/`;
+            singleDeleteForm.action = `/dashboard/admin/delete-order/${data.id}/`;
+
+             // --- Show/Hide Footer Forms based on Status ---
+             singleStatusForm.style.display = 'none';
+             singlePendingStatusForm.style.display = 'none';
+             singleDeleteForm.style.display = 'none';
+
+             if (status === 'approved') {
+                 singleStatusForm.style.display = 'flex';
+                 singleStatusForm.querySelector('#single-status-select').value = status;
+             } else if (status === 'pending') {
+                 singlePendingStatusForm.style.display = 'flex';
+             } else {
+                 singleDeleteForm.style.display = 'flex';
+             }
+
+            openModal(detailsModal);
+        });
+    });
+
+    // ==================================================================
+    // GLOBAL SEARCH FILTER
+    // ==================================================================
+    function filterGlobalOrders() {
+        if (!globalSearchInput || !allSearchableSections.length || !globalNoResults) {
+            console.warn("Global search elements missing.");
+            return;
+        }
+
+        const searchTerm = globalSearchInput.value.toLowerCase().trim();
+        let visibleSectionsCount = 0;
+
+        allSearchableSections.forEach(sectionWrapper => {
+            const section = sectionWrapper.querySelector('.order-section'); // Get the actual section inside
+            if (!section) return;
+
+            const cards = sectionWrapper.querySelectorAll('.order-card');
+            let sectionHasVisibleCard = false;
+
+            cards.forEach(card => {
+                const id = card.dataset.id || '';
+                const name = card.dataset.name.toLowerCase() || '';
+                const category = card.dataset.category.toLowerCase() || '';
+                const status = card.dataset.status.toLowerCase() || '';
+                const studentName = card.dataset.studentName.toLowerCase() || '';
+                const studentId = card.dataset.studentId.toLowerCase() || '';
+                const searchableText = `${id} ${name} ${category} ${status} ${studentName} ${studentId}`;
+
+                const isMatch = searchTerm === '' || searchableText.includes(searchTerm);
+                card.style.display = isMatch ? 'flex' : 'none';
+                if (isMatch) {
+                    sectionHasVisibleCard = true;
+                } else {
+                    const cb = card.querySelector('.order-checkbox');
+                    if (cb) cb.checked = false;
+                }
+            });
+
+             // Show/hide the section's "no data" message based on card visibility
+             const noDataCell = section.querySelector('.no-data-cell');
+             if (noDataCell) {
+                 noDataCell.style.display = sectionHasVisibleCard ? 'none' : 'block';
+             }
+
+            // Show/hide the entire section wrapper
+            const shouldShowSection = (searchTerm === '' || sectionHasVisibleCard);
+            sectionWrapper.style.display = sectionHasVisibleCard ? '' : 'none';
+            if(sectionHasVisibleCard) {
+                visibleSectionsCount++;
+            }
+        });
+
+        // Show/hide the global "no results" message
+        globalNoResults.style.display = (visibleSectionsCount === 0 && searchTerm !== '') ? 'block' : 'none';
+
+        updateActionBars();
+    }
+
+    if (globalSearchInput) {
+        globalSearchInput.addEventListener('input', filterGlobalOrders);
+        filterGlobalOrders();
+    } else {
+        console.warn("Global order search input not found.");
+    }
+
+
+    // ==================================================================
+    // BATCH ACTION / CHECKBOX LOGIC
+    // ==================================================================
+
+    function updateActionBars() {
+        // Count checked checkboxes *only within visible cards*
+        const approvedChecked = document.querySelectorAll('.searchable-section:not([style*="display: none"]) .approved-checkbox:checked').length;
+        const completedChecked = document.querySelectorAll('.searchable-section:not([style*="display: none"]) .completed-checkbox:checked').length;
+        const otherChecked = document.querySelectorAll('.searchable-section:not([style*="display: none"]) .other-checkbox:checked').length;
+        const pendingChecked = document.querySelectorAll('.searchable-section:not([style*="display: none"]) .pending-checkbox:checked').length;
+
+        // --- Update visibility and counts for each bar ---
+        if (batchStatusBar) {
+             batchStatusBar.style.display = approvedChecked > 0 ? 'flex' : 'none';
+             if (approvedChecked > 0) batchStatusBar.querySelector('#status-selected-count').textContent = `${approvedChecked} item(s) selected`;
+        }
+        if (batchPendingStatusBar) {
+            batchPendingStatusBar.style.display = pendingChecked > 0 ? 'flex' : 'none';
+            if (pendingChecked > 0) batchPendingStatusBar.querySelector('#pending-status-selected-count').textContent = `${pendingChecked} item(s) selected`;
+        }
+        const deleteCount = completedChecked + otherChecked;
+         if (batchDeleteBar) {
+             batchDeleteBar.style.display = deleteCount > 0 ? 'flex' : 'none';
+             if (deleteCount > 0) batchDeleteBar.querySelector('#delete-selected-count').textContent = `${deleteCount} item(s) selected`;
+         }
+
+        // --- Update visual selection state for cards ---
+        allCheckboxes.forEach(cb => {
+            const card = cb.closest('.order-card');
+            if (card) {
+                card.classList.toggle('selected', cb.checked && card.style.display !== 'none');
+                if (card.style.display === 'none') {
+                    card.classList.remove('selected');
+                }
+            }
+        });
+
+         // --- Update "Select All" Checkboxes ---
+         selectAllCheckboxes.forEach(sa => {
+             const section = sa.dataset.section;
+             const visibleCheckboxesInGroup = document.querySelectorAll(`.searchable-section:not([style*="display: none"]) .${section}-checkbox`);
+             const checkedVisibleInGroup = document.querySelectorAll(`.searchable-section:not([style*="display: none"]) .${section}-checkbox:checked`);
+
+             const totalVisible = visibleCheckboxesInGroup.length;
+             const checkedCount = checkedVisibleInGroup.length;
+
+             sa.checked = (checkedCount > 0 && checkedCount === totalVisible);
+             sa.indeterminate = (checkedCount > 0 && checkedCount < totalVisible);
+         });
+    }
+
+    // --- Select All Logic ---
+    selectAllCheckboxes.forEach(sa => {
+        sa.addEventListener('change', () => {
+            const clickedSection = sa.dataset.section;
+            const clickedGroupClass = `${clickedSection}-checkbox`;
+            const isChecked = sa.checked;
+
+            document.querySelectorAll(`.searchable-section:not([style*="display: none"]) .${clickedGroupClass}`).forEach(cb => {
+                 cb.checked = isChecked;
+            });
+
+            // If checking a group, uncheck all other groups (visible or not)
+            if (isChecked) {
+                allCheckboxes.forEach(cb => {
+                    if (!cb.classList.contains(clickedGroupClass)) {
+                        cb.checked = false;
+                    }
+                });
+                selectAllCheckboxes.forEach(otherSA => {
+                    if (otherSA !== sa) {
+                        otherSA.checked = false;
+                        otherSA.indeterminate = false;
+                    }
+                });
+            }
+            updateActionBars();
+        });
+    });
+
+    // --- Individual Checkbox Logic (Handles Exclusive Selection) ---
+    function handleExclusiveSelection(e) {
+        const clickedCheckbox = e.currentTarget;
+        let clickedGroup = null;
+        if (clickedCheckbox.classList.contains('approved-checkbox')) clickedGroup = 'approved-checkbox';
+        else if (clickedCheckbox.classList.contains('pending-checkbox')) clickedGroup = 'pending-checkbox';
+        else if (clickedCheckbox.classList.contains('completed-checkbox')) clickedGroup = 'completed-checkbox';
+        else if (clickedCheckbox.classList.contains('other-checkbox')) clickedGroup = 'other-checkbox';
+
+        // If checking a box, uncheck all boxes from other groups
+        if (clickedCheckbox.checked && clickedGroup) {
+            allCheckboxes.forEach(cb => {
+                if (cb === clickedCheckbox) return; 
+                let cbGroup = null;
+                if (cb.classList.contains('approved-checkbox')) cbGroup = 'approved-checkbox';
+                else if (cb.classList.contains('pending-checkbox')) cbGroup = 'pending-checkbox';
+                else if (cb.classList.contains('completed-checkbox')) cbGroup = 'completed-checkbox';
+                else if (cb.classList.contains('other-checkbox')) cbGroup = 'other-checkbox';
+
+                // If checkbox belongs to a DIFFERENT group, uncheck it
+                if (cbGroup && cbGroup !== clickedGroup) {
+                    cb.checked = false;
+                }
+            });
+
+            // Uncheck other "Select All" boxes
+            selectAllCheckboxes.forEach(sa => {
+                const sectionGroup = `${sa.dataset.section}-checkbox`;
+                if (sectionGroup !== clickedGroup) {
+                    sa.checked = false;
+                    sa.indeterminate = false;
+                }
+            });
+        }
+        updateActionBars();
+    }
+    allCheckboxes.forEach(cb => cb.addEventListener('change', handleExclusiveSelection));
+
+    // Initial check on load
+    updateActionBars();
+
+
+    // ==================================================================
+    // ATTACH AJAX SUBMIT LISTENERS
+    // ==================================================================
+    function handleFetch(url, formData, button) {
+        const originalText = button.textContent;
+        button.disabled = true;
+        button.textContent = 'Processing...';
+
+        return fetch(url, {
+            method: 'POST',
+            body: formData,
+            headers: {
+                'X-CSRFToken': getCsrfToken(),
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        })
+        .then(response => {
+            if (!response.ok) throw new Error(`HTTP error! Status: ${response.status}`);
+            return response.json();
+        })
+        .catch(error => {
+            console.error('Fetch error:', error);
+            showMessage(`A network or server error occurred: ${error.message}`, 'error');
+            return null;
+        })
+        .finally(() => {
+            button.disabled = false;
+            button.textContent = originalText;
+        });
+    }
+
+    // --- BATCH STATUS UPDATE (Approved Section) ---
+    if (batchStatusUpdateBtn) {
+        batchStatusUpdateBtn.addEventListener('click', () => {
+             // Get IDs only from VISIBLE checked boxes in this group
+            const selectedIds = Array.from(document.querySelectorAll('.searchable-section:not([style*="display: none"]) .approved-checkbox:checked')).map(cb => cb.value);
+            if (selectedIds.length === 0) return;
+
+            const formData = new FormData(batchStatusForm);
+            formData.set('order_ids', selectedIds.join(','));
+            formData.set('status', document.getElementById('batch-status-select').value);
+            const url = batchStatusForm.getAttribute('action');
+
+            handleFetch(url, formData, batchStatusUpdateBtn).then(data => {
+                if (data && data.success) {
+                    showMessage(data.message, 'success');
+                    data.orders.forEach(order => {
+                        moveOrderCard(order.id, order.status);
+                    });
+                } else if (data) {
+                    showMessage(data.error || 'An unknown error occurred.', 'error');
+                }
+            });
+        });
+    }
+
+    // --- BATCH STATUS UPDATE (Pending Section) ---
+     if (batchPendingStatusUpdateBtn) {
+         batchPendingStatusUpdateBtn.addEventListener('click', () => {
+              // Get IDs only from VISIBLE checked boxes in this group
+            const selectedIds = Array.from(document.querySelectorAll('.searchable-section:not([style*="display: none"]) .pending-checkbox:checked')).map(cb => cb.value);
+            if (selectedIds.length === 0) return;
+
+            const formData = new FormData(batchPendingStatusForm);
+            formData.set('order_ids', selectedIds.join(','));
+            formData.set('status', document.getElementById('batch-pending-status-select').value);
+            const url = batchPendingStatusForm.getAttribute('action');
+
+            handleFetch(url, formData, batchPendingStatusUpdateBtn).then(data => {
+                if (data && data.success) {
+                    showMessage(data.message, 'success');
+                    data.orders.forEach(order => {
+                        moveOrderCard(order.id, order.status);
+                    });
+                } else if (data) {
+                    showMessage(data.error || 'An unknown error occurred.', 'error');
+                }
+            });
+         });
+     }
+
+    // --- BATCH DELETE (Trigger Modal) ---
+    if (batchDeleteBtn) {
+        batchDeleteBtn.addEventListener('click', () => {
+             // Get IDs only from VISIBLE checked boxes in relevant groups
+            const selectedIds = Array.from(document.querySelectorAll('.searchable-section:not([style*="display: none"]) .completed-checkbox:checked, .searchable-section:not([style*="display: none"]) .other-checkbox:checked')).map(cb => cb.value);
+            const count = selectedIds.length;
+            if (count > 0 && batchDeleteConfirmModal) {
+                batchDeleteConfirmModal.querySelector('#batch-delete-count').textContent = count;
+                confirmBatchDeleteBtn.dataset.ids = selectedIds.join(',');
+                openModal(batchDeleteConfirmModal);
+            }
+        });
+    }
+
+    // --- BATCH DELETE (Confirm & Fetch) ---
+     if (confirmBatchDeleteBtn) {
+         confirmBatchDeleteBtn.addEventListener('click', function() {
+             const idsToSubmit = this.dataset.ids;
+             if (!idsToSubmit) return;
+
+             const formData = new FormData(batchDeleteForm);
+             formData.set('order_ids', idsToSubmit);
+             const url = batchDeleteForm.getAttribute('action');
+
+             handleFetch(url, formData, this).then(data => {
+                 if (data && data.success) {
+                     showMessage(data.message, 'success');
+                     closeModal(batchDeleteConfirmModal);
+                     data.order_ids.forEach(id => {
+                         removeOrderCard(id);
+                     });
+                 } else if (data) {
+                     showMessage(data.error || 'An unknown error occurred.', 'error');
+                 }
+             });
+         });
+     }
+
+    // --- SINGLE STATUS UPDATE (Full Form - Approved) ---
+    if (singleStatusForm) {
+        singleStatusForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+            const formData = new FormData(this);
+            const url = this.action;
+            const button = this.querySelector('button[type="submit"]');
+
+            handleFetch(url, formData, button).then(data => {
+                if (data && data.success) {
+                    showMessage(data.message, 'success');
+                    closeModal(detailsModal);
+                    data.orders.forEach(order => {
+                        moveOrderCard(order.id, order.status);
+                    });
+                } else if (data) {
+                    showMessage(data.error || 'An unknown error occurred.', 'error');
+                }
+            });
+        });
+    }
+
+    // --- SINGLE STATUS UPDATE (Pending Form) ---
+     if (singlePendingStatusForm) {
+         singlePendingStatusForm.addEventListener('submit', function(e) {
+             e.preventDefault();
+             const formData = new FormData(this);
+             const url = this.action;
+             const button = this.querySelector('button[type="submit"]');
+
+             handleFetch(url, formData, button).then(data => {
+                 if (data && data.success) {
+                     showMessage(data.message, 'success');
+                     closeModal(detailsModal);
+                     data.orders.forEach(order => {
+                         moveOrderCard(order.id, order.status);
+                     });
+                 } else if (data) {
+                     showMessage(data.error || 'An unknown error occurred.', 'error');
+                 }
+             });
+         });
+     }
+
+    // --- SINGLE DELETE (Trigger Modal) ---
+    if (openSingleDeleteModalBtn) {
+        openSingleDeleteModalBtn.addEventListener('click', (e) => {
+            e.preventDefault();
+            e.stopPropagation();
+            const actionUrl = singleDeleteForm.action;
+            if (!actionUrl) return;
+
+            const orderIdMatch = actionUrl.match(/\/delete-order\/(\d+)\/?$/);
+            const orderId = orderIdMatch ? orderIdMatch[1] : null;
+
+            if (orderId && singleDeleteConfirmModal) {
+                singleDeleteConfirmModal.querySelector('#single-delete-order-id').textContent = `#${orderId}`;
+                confirmSingleDeleteBtn.dataset.url = actionUrl;
+                openModal(singleDeleteConfirmModal);
+            } else {
+                 console.error("Could not extract order ID or find single delete confirmation modal.");
+            }
+        });
+    }
+
+
+    // --- SINGLE DELETE (Confirm & Fetch) ---
+     if (confirmSingleDeleteBtn) {
+         confirmSingleDeleteBtn.addEventListener('click', function() {
+             const url = this.dataset.url;
+             if (!url) return;
+
+              const orderIdMatch = url.match(/\/delete-order\/(\d+)\/?$/);
+              const orderId = orderIdMatch ? orderIdMatch[1] : null;
+              if (!orderId) {
+                   console.error("Could not extract order ID from URL:", url);
+                   return;
+              }
+
+             // Create empty FormData just to work with our handleFetch helper for POST
+             const formData = new FormData();
+
+             handleFetch(url, formData, this).then(data => {
+                 if (data && data.success) {
+                     showMessage(data.message, 'success');
+                     closeModal(singleDeleteConfirmModal);
+                     closeModal(detailsModal); 
+                     removeOrderCard(data.order_id || orderId);
+                 } else if (data) {
+                     showMessage(data.error || 'An unknown error occurred.', 'error');
+                 }
+             });
+         });
+     }
+
+});
@@ -0,0 +1,111 @@
+document.addEventListener('DOMContentLoaded', function () {
+    // --- Input Formatting ---
+    const studentIdInput = document.getElementById('student_id');
+    if (studentIdInput) {
+        studentIdInput.addEventListener('input', function (e) { /* ... keep formatting ... */ });
+    }
+    const phoneInput = document.getElementById('phone_number');
+    if (phoneInput) {
+        phoneInput.addEventListener('input', function (e) { /* ... keep formatting ... */ });
+    }
+     if (studentIdInput) { studentIdInput.addEventListener('input', function (e) { let v = e.target.value.replace(/\D/g, ''), f = ''; if (v.length > 0) f = v.substring(0, 2); if (v.length > 2) f += '-' + v.substring(2, 6); if (v.length > 6) f += '-' + v.substring(6, 9); e.target.value = f; }); }
+     if (phoneInput) { phoneInput.addEventListener('input', function (e) { let v = e.target.value.replace(/\D/g, ''); if (v.startsWith('09')) { v = '639' + v.substring(2); } let f = ''; if (v.length > 0) f = '+' + v.substring(0, 2); if (v.length > 2) f += ' ' + v.substring(2, 5); if (v.length > 5) f += ' ' + v.substring(5, 8); if (v.length > 8) f += ' ' + v.substring(8, 12); e.target.value = f; }); }
+
+
+    // --- AJAX Error Handling ---
+    const ajaxErrorContainer = document.getElementById('ajax-error-container');
+    const messageTimeouts = [];
+
+    function clearAjaxErrors() {
+         if (!ajaxErrorContainer) return;
+         messageTimeouts.forEach(clearTimeout);
+         messageTimeouts.length = 0;
+         ajaxErrorContainer.innerHTML = '';
+    }
+
+    function showAjaxErrors(errors) {
+         if (!ajaxErrorContainer) return;
+         clearAjaxErrors();
+
+         const errorList = Array.isArray(errors) ? errors : [errors];
+
+         errorList.forEach(message => {
+             const errorDiv = document.createElement('div');
+             errorDiv.className = 'error-message'; 
+             errorDiv.textContent = message;
+             ajaxErrorContainer.appendChild(errorDiv);
+
+             const timeoutId = setTimeout(() => {
+                 errorDiv.classList.add('fade-out');
+                 setTimeout(() => {
+                     errorDiv.remove();
+                 }, 500);
+             }, 3000); 
+             messageTimeouts.push(timeoutId); 
+         });
+    }
+
+    // --- Auto-hide Initial Django Messages ---
+    const initialMessages = document.querySelectorAll('.form-container > .error-message, .form-container > .success-message'); // Target direct children
+    initialMessages.forEach(messageElement => {
+        setTimeout(() => {
+            messageElement.classList.add('fade-out');
+            setTimeout(() => {
+                messageElement.remove();
+            }, 500);
+        }, 3000); 
+    });
+
+
+    // --- AJAX Form Submission ---
+    const registerForm = document.getElementById('register-form');
+    const registerButton = registerForm ? registerForm.querySelector('button[type="submit"]') : null;
+
+    if (registerForm && registerButton) {
+        registerForm.addEventListener('submit', async function(event) {
+            event.preventDefault();
+
+            // --- Loading State ---
+            const originalButtonText = registerButton.textContent;
+            registerButton.disabled = true;
+            registerButton.textContent = 'REGISTERING...';
+
+            clearAjaxErrors();
+
+            const formData = new FormData(registerForm);
+            const url = registerForm.action || window.location.href;
+
+            try {
+                const response = await fetch(url, {
+                    method: 'POST',
+                    body: formData,
+                    headers: {
+                        'X-CSRFToken': formData.get('csrfmiddlewaretoken'),
+                        'X-Requested-With': 'XMLHttpRequest'
+                    }
+                });
+
+                const data = await response.json();
+
+                if (!response.ok || !data.success) {
+                    throw new Error(data.errors ? data.errors.join('; ') : (data.error || `HTTP error! Status: ${response.status}`));
+                }
+                // --- SUCCESS ---
+                console.log("Registration successful:", data.message);
+                window.location.href = data.redirect_url;
+
+            } catch (error) {
+                // --- ERROR ---
+                console.error("Registration failed:", error);
+                const errorMessages = error.message.includes('; ') ? error.message.split('; ') : [error.message];
+                showAjaxErrors(errorMessages);
+
+                // --- Reset Button ---
+                registerButton.disabled = false;
+                registerButton.textContent = originalButtonText;
+            }
+        });
+    } else {
+        console.error("Register form or button not found!");
+    }
+});
@@ -0,0 +1,451 @@
+const pageConfig = JSON.parse(document.getElementById('page-config').textContent);
+
+// ==================================================================
+// HELPER FUNCTIONS
+// ==================================================================
+function showMessage(message, type = 'success') {
+    const container = document.getElementById('message-container');
+    if (!container) return;
+    const li = document.createElement('li');
+    li.className = type;
+    li.textContent = ` ${message}`;
+    const iconSpan = document.createElement('span');
+    iconSpan.textContent = (type === 'success') ? '✅' : '❌';
+    li.prepend(iconSpan);
+    container.appendChild(li);
+    setTimeout(() => {
+        li.style.opacity = '0';
+        setTimeout(() => { li.remove(); }, 500);
+    }, 4000);
+}
+
+function getCsrfToken() {
+    let form = document.getElementById('batch-log-delete-form');
+    let tokenInput = form ? form.querySelector('[name=csrfmiddlewaretoken]') : null;
+
+    return tokenInput ? tokenInput.value : '';
+}
+
+function openModal(modal) {
+    if (modal) modal.style.display = 'flex';
+}
+
+function closeModal(modal) {
+    if (modal) modal.style.display = 'none';
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+
+    // ==================================================================
+    // CHART LOGIC
+    // ==================================================================
+    const dataElement = document.getElementById('chart-data');
+    const chartCanvas = document.getElementById('orderStatusChart');
+    if (dataElement && chartCanvas) {
+        try {
+            const statusData = JSON.parse(dataElement.textContent);
+            const hasData = Object.values(statusData).some(count => count > 0);
+            if (hasData) { 
+                const ctx = chartCanvas.getContext('2d');
+                if (ctx) {
+                    new Chart(ctx, {
+                        type: 'doughnut',
+                        data: {
+                            labels: ['Pending', 'Approved', 'Completed', 'Rejected', 'Cancelled'],
+                            datasets: [{
+                                label: 'Order Statuses',
+                                data: [
+                                    statusData.pending || 0,
+                                    statusData.approved || 0,
+                                    statusData.completed || 0,
+                                    statusData.rejected || 0,
+                                    statusData.cancelled || 0
+                                ],
+                                backgroundColor: ['#f59e0b', '#22c55e', '#3b82f6', '#ef4444', '#6b7280'],
+                                borderColor: '#ffffff',
+                                borderWidth: 2
+                            }]
+                        },
+                        options: {
+                            responsive: true,
+                            maintainAspectRatio: true, 
+                            layout: { padding: { left: 5, right: 5, top: 5, bottom: 5 } },
+                            plugins: {
+                                legend: {
+                                    position: 'right', 
+                                    labels: { boxWidth: 15, padding: 10, font: { size: 12 } }
+                                }
+                            }
+                        }
+                    });
+                }
+            } else {
+                 const container = chartCanvas.parentElement;
+                 if (container) {
+                     container.innerHTML = '<p style="text-align: center; color: #64748b; margin-top: 50px;">No order data available to display chart.</p>';
+                 }
+            }
+        } catch (e) {
+            console.error("ERROR during chart initialization:", e);
+        }
+    }
+
+    // ==================================================================
+    // LOG DELETION LOGIC
+    // ==================================================================
+    const logDeleteForm = document.getElementById('batch-log-delete-form');
+    const logDeleteBar = document.getElementById('log-delete-bar');
+    const logSelectedCount = document.getElementById('log-selected-count');
+    const selectAllLogsCheckbox = document.getElementById('select-all-logs-checkbox');
+    const batchLogDeleteBtn = document.getElementById('batch-log-delete-btn');
+    const logDeleteModal = document.getElementById('log-delete-confirm-modal');
+    const confirmLogDeleteBtn = document.getElementById('confirm-log-delete-btn');
+    const logTableBody = document.getElementById('log-table-body');
+    let noLogsRow = document.getElementById('no-logs-row'); // Use let
+    const noLogResultsRow = document.getElementById('no-log-results-row');
+
+    const clearAllLogsBtn = document.getElementById('clear-all-logs-btn');
+    const clearAllLogsModal = document.getElementById('clear-all-logs-confirm-modal');
+    const confirmClearAllLogsBtn = document.getElementById('confirm-clear-all-logs-btn');
+
+    function updateLogDeleteBar() {
+        if (!logDeleteBar || !logSelectedCount) return;
+        const selectedVisible = document.querySelectorAll('#log-table-body tr:not([style*="display: none"]) .log-checkbox:checked');
+        const totalVisibleCheckboxes = document.querySelectorAll('#log-table-body tr:not([style*="display: none"]) .log-checkbox');
+        const count = selectedVisible.length;
+
+        if (count > 0) {
+            logDeleteBar.style.display = 'flex';
+            logSelectedCount.textContent = `${count} item${count > 1 ? 's' : ''} selected`;
+        } else {
+            logDeleteBar.style.display = 'none';
+        }
+
+        if (selectAllLogsCheckbox) {
+            const allVisibleCount = totalVisibleCheckboxes.length;
+             selectAllLogsCheckbox.checked = (count > 0 && count === allVisibleCount && allVisibleCount > 0);
+             selectAllLogsCheckbox.indeterminate = (count > 0 && count < allVisibleCount);
+        }
+
+        document.querySelectorAll('#log-table-body tr').forEach(row => {
+            const cb = row.querySelector('.log-checkbox');
+            const isVisible = row.style.display !== 'none';
+            if (cb) {
+                 row.classList.toggle('row-selected', cb.checked && isVisible);
+            }
+        });
+    }
+
+    if (selectAllLogsCheckbox) {
+        selectAllLogsCheckbox.addEventListener('change', () => {
+            const isChecked = selectAllLogsCheckbox.checked;
+            document.querySelectorAll('#log-table-body tr:not([style*="display: none"]) .log-checkbox').forEach(cb => {
+                cb.checked = isChecked;
+            });
+            updateLogDeleteBar();
+        });
+    } 
+
+    const logCheckboxesInitial = document.querySelectorAll('.log-checkbox');
+    logCheckboxesInitial.forEach(cb => {
+        cb.addEventListener('change', (event) => {
+            updateLogDeleteBar();
+        });
+    });
+
+    if (batchLogDeleteBtn) {
+        batchLogDeleteBtn.addEventListener('click', () => {
+            const selectedVisible = document.querySelectorAll('#log-table-body tr:not([style*="display: none"]) .log-checkbox:checked');
+            const count = selectedVisible.length;
+            if (count > 0 && logDeleteModal) {
+                const countSpan = logDeleteModal.querySelector('#log-delete-count');
+                if (countSpan) { countSpan.textContent = count; }
+                openModal(logDeleteModal);
+            }
+        });
+    } 
+
+    document.querySelectorAll('.cancel-modal-btn, .close-btn').forEach(btn => {
+        btn.addEventListener('click', () => closeModal(btn.closest('.modal')));
+    });
+     window.addEventListener('click', (e) => {
+         if (e.target.classList.contains('modal')) closeModal(e.target);
+     });
+
+    if (confirmLogDeleteBtn && logDeleteForm) {
+        confirmLogDeleteBtn.addEventListener('click', () => {
+            const selectedVisibleCheckboxes = document.querySelectorAll('#log-table-body tr:not([style*="display: none"]) .log-checkbox:checked');
+            const ids = Array.from(selectedVisibleCheckboxes).map(cb => cb.value);
+            if (ids.length === 0) { closeModal(logDeleteModal); return; }
+
+            const formData = new FormData(logDeleteForm);
+            formData.set('log_ids', ids.join(','));
+
+            const button = confirmLogDeleteBtn;
+            const originalText = button.textContent;
+            button.disabled = true;
+            button.textContent = 'Deleting...';
+
+            fetch(logDeleteForm.action, {
+                method: 'POST',
+                body: formData,
+                headers: { 'X-CSRFToken': getCsrfToken(), 'X-Requested-With': 'XMLHttpRequest' }
+            })
+            .then(response => {
+                 if (!response.ok) { throw new Error(`HTTP error! status: ${response.status}`); }
+                 return response.json();
+            })
+            .then(data => {
+                if (data.success) {
+                    showMessage(data.message, 'success');
+                    closeModal(logDeleteModal);
+                    data.deleted_ids.forEach(id => {
+                        document.querySelector(`tr[data-log-id="${id}"]`)?.remove();
+                    });
+                    filterLogs();
+                } else {
+                    showMessage(data.error || 'An unknown error occurred.', 'error');
+                }
+            })
+            .catch(error => {
+                showMessage(`A network error occurred: ${error.message}`, 'error');
+            })
+            .finally(() => {
+                button.disabled = false;
+                button.textContent = originalText;
+            });
+        });
+    }
+
+    // ---"CLEAR ALL LOGS" LOGIC ---
+    if (clearAllLogsBtn && confirmClearAllLogsBtn && clearAllLogsModal) {
+        clearAllLogsBtn.addEventListener('click', () => {
+            openModal(clearAllLogsModal);
+        });
+
+        confirmClearAllLogsBtn.addEventListener('click', () => {
+            const button = confirmClearAllLogsBtn;
+            const originalText = button.textContent;
+            button.disabled = true;
+            button.textContent = 'Clearing...';
+
+            fetch(pageConfig.clearAllLogsUrl, {
+                method: 'POST',
+                headers: {
+                    'X-CSRFToken': getCsrfToken(),
+                    'X-Requested-With': 'XMLHttpRequest'
+                }
+            })
+            .then(response => {
+                if (!response.ok) { throw new Error(`HTTP error! status: ${response.status}`); }
+                return response.json();
+            })
+            .then(data => {
+                if (data.success) {
+                    showMessage(data.message, 'success');
+                    closeModal(clearAllLogsModal);
+
+                    logTableBody.innerHTML = '';
+
+                    if (!noLogsRow) {
+                        noLogsRow = document.createElement('tr');
+                        noLogsRow.id = 'no-logs-row';
+                        noLogsRow.innerHTML = '<td colspan="5" class="no-data-cell"><p></p></td>';
+                        logTableBody.appendChild(noLogsRow);
+                    }
+
+                    noLogsRow.querySelector('p').textContent = "Log cleared. New log for this action will appear on next refresh.";
+                    noLogsRow.style.display = ''; 
+
+                    if (noLogResultsRow) noLogResultsRow.style.display = 'none';
+                    if (selectAllLogsCheckbox) selectAllLogsCheckbox.checked = false;
+                    updateLogDeleteBar();
+                } else {
+                    showMessage(data.error || 'An unknown error occurred.', 'error');
+                }
+            })
+            .catch(error => {
+                showMessage(`A network error occurred: ${error.message}`, 'error');
+            })
+            .finally(() => {
+                button.disabled = false;
+                button.textContent = originalText;
+            });
+        });
+    }
+
+
+    // ==================================================================
+    // LIVE SEARCH FILTER FOR LOGS
+    // ==================================================================
+    const logSearchInput = document.getElementById('log-search-input');
+
+    function filterLogs() {
+        if (!logSearchInput || !logTableBody) return;
+
+        const searchTerm = logSearchInput.value.toLowerCase().trim();
+        const logRows = logTableBody.querySelectorAll('tr[data-log-id]');
+        let visibleRowCount = 0;
+
+        logRows.forEach(row => {
+            const user = row.dataset.user || '';
+            const action = row.dataset.action || '';
+            const rowMatches = (user.includes(searchTerm) || action.includes(searchTerm));
+
+            row.style.display = rowMatches ? '' : 'none';
+            if (rowMatches) {
+                 visibleRowCount++;
+            } else {
+                 const cb = row.querySelector('.log-checkbox');
+                 if (cb) cb.checked = false;
+            }
+        });
+
+        const hasLogsNow = logTableBody.querySelectorAll('tr[data-log-id]').length > 0;
+
+        if (noLogResultsRow) {
+            noLogResultsRow.style.display = (visibleRowCount === 0 && hasLogsNow && searchTerm) ? '' : 'none';
+        }
+        if (noLogsRow) {
+            noLogsRow.style.display = (!hasLogsNow && !searchTerm) ? '' : 'none';
+        }
+
+         updateLogDeleteBar();
+    }
+
+    if (logSearchInput) {
+        logSearchInput.addEventListener('input', filterLogs);
+        filterLogs(); 
+    } 
+
+    // ==================================================================
+    // GLOBAL REPORT SEARCH
+    // ==================================================================
+    const globalSearchInput = document.getElementById('global-report-search');
+    const allSearchableSections = document.querySelectorAll('.searchable-section'); 
+    const globalNoResults = document.getElementById('global-no-results');
+
+    function filterGlobalReports() {
+        if (!globalSearchInput || !allSearchableSections.length || !globalNoResults) {
+            console.warn("Global search elements missing. Search will not work.");
+            return;
+        }
+        const searchTerm = globalSearchInput.value.toLowerCase().trim();
+        let visibleSections = 0;
+
+        allSearchableSections.forEach(section => {
+            const sectionText = section.textContent.toLowerCase();
+            const isMatch = sectionText.includes(searchTerm);
+            section.style.display = isMatch ? '' : 'none';
+
+            if (isMatch) {
+                visibleSections++;
+                if (section.classList.contains('activity-log-section') && typeof filterLogs === 'function') {
+                    filterLogs();
+                }
+            }
+        });
+        globalNoResults.style.display = (visibleSections === 0 && searchTerm) ? 'block' : 'none';
+    }
+
+    if (globalSearchInput) {
+        globalSearchInput.addEventListener('input', filterGlobalReports);
+        filterGlobalReports(); 
+    }
+
+    // ==================================================================
+    // AJAX PAGINATION FOR LOGS
+    // ==================================================================
+    const logSectionContent = document.getElementById('log-section-content');
+
+    function handleAjaxPagination(event) {
+        const targetLink = event.target.closest('a.page-link');
+        if (!targetLink || !logSectionContent) {
+            return;
+        }
+        event.preventDefault();
+
+        const url = targetLink.href;
+        if (!url) return;
+
+        logSectionContent.style.opacity = '0.5'; 
+
+        fetch(url, {
+            method: 'GET',
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest' 
+            }
+        })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            return response.text(); 
+        })
+        .then(html => {
+            const parser = new DOMParser();
+            const doc = parser.parseFromString(html, 'text/html');
+            const newLogContent = doc.getElementById('log-section-content');
+
+            if (newLogContent) {
+                logSectionContent.innerHTML = newLogContent.innerHTML;
+                history.pushState({}, '', url);
+
+                const newLogSearchInput = logSectionContent.querySelector('#log-search-input');
+                const newSelectAllCheckbox = logSectionContent.querySelector('#select-all-logs-checkbox');
+                const newLogCheckboxes = logSectionContent.querySelectorAll('.log-checkbox');
+                const newPaginationContainer = logSectionContent.querySelector('.pagination-container'); 
+
+                if (newLogSearchInput) {
+                    newLogSearchInput.addEventListener('input', filterLogs);
+                }
+                if (newSelectAllCheckbox) {
+                    newSelectAllCheckbox.addEventListener('change', handleSelectAllChange); 
+                }
+                newLogCheckboxes.forEach(cb => {
+                    cb.addEventListener('change', updateLogDeleteBar); 
+                });
+                 if (newPaginationContainer) {
+                      newPaginationContainer.addEventListener('click', handleAjaxPagination);
+                 }
+                filterLogs(); 
+                updateLogDeleteBar(); 
+            } else {
+                console.error("AJAX Pagination: Could not find '#log-section-content' in fetched HTML.");
+                throw new Error("Invalid response content.");
+            }
+        })
+        .catch(error => {
+            console.error('AJAX Pagination Error:', error);
+            showMessage(`Failed to load page: ${error.message}`, 'error');
+        })
+        .finally(() => {
+            logSectionContent.style.opacity = '1'; 
+        });
+    }
+
+    const initialPaginationContainer = logSectionContent?.querySelector('.pagination-container');
+    if (initialPaginationContainer) {
+        initialPaginationContainer.addEventListener('click', handleAjaxPagination);
+        console.log("Attached initial AJAX pagination listener.");
+    } else if (logSectionContent){ 
+         console.log("Log pagination container not found initially (likely only one page).");
+    } else {
+         console.warn("Log section content container ('#log-section-content') not found.");
+    }
+
+    function handleSelectAllChange() {
+       const selectAllCheckbox = logSectionContent.querySelector('#select-all-logs-checkbox'); 
+       if (!selectAllCheckbox) return;
+        const isChecked = selectAllCheckbox.checked;
+        logSectionContent.querySelectorAll('#log-table-body tr:not([style*="display: none"]) .log-checkbox').forEach(cb => {
+            cb.checked = isChecked;
+        });
+        updateLogDeleteBar();
+    }
+     const initialSelectAll = logSectionContent?.querySelector('#select-all-logs-checkbox');
+     if (initialSelectAll) {
+         initialSelectAll.addEventListener('change', handleSelectAllChange);
+     }
+
+});
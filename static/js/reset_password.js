@@ -0,0 +1,66 @@
+document.addEventListener('DOMContentLoaded', () => {
+    const resetForm = document.getElementById('reset-form');
+    const submitButton = document.getElementById('submit-button');
+    const messagesContainer = document.getElementById('form-messages');
+
+    // Helper function to show messages
+    function showFormMessage(messages, isError = false) {
+        messagesContainer.innerHTML = '';
+        const messageDiv = document.createElement('div');
+        messageDiv.className = isError ? 'error-message' : 'success-message';
+
+        if (Array.isArray(messages)) {
+            const ul = document.createElement('ul');
+            messages.forEach(msg => {
+                const li = document.createElement('li');
+                li.textContent = msg;
+                ul.appendChild(li);
+            });
+            messageDiv.appendChild(ul);
+        } else {
+            messageDiv.textContent = messages;
+        }
+        messagesContainer.appendChild(messageDiv);
+    }
+
+    resetForm.addEventListener('submit', async (event) => {
+        event.preventDefault();
+
+        // Show loading state
+        submitButton.disabled = true;
+        submitButton.textContent = 'RESETTING...';
+        messagesContainer.innerHTML = '';
+
+        const formData = new FormData(resetForm);
+        const csrfToken = formData.get('csrfmiddlewaretoken');
+
+        try {
+            const response = await fetch(window.location.href, {
+                method: 'POST',
+                body: formData,
+                headers: {
+                    'X-CSRFToken': csrfToken,
+                    'X-Requested-With': 'XMLHttpRequest'
+                }
+            });
+
+            const data = await response.json();
+
+            if (!response.ok) {
+                throw new Error(data.errors ? data.errors.join('\n') : 'An unknown error occurred.');
+            }
+
+            // --- Handle Success ---
+            if (data.success && data.redirect_url) {
+                window.location.href = data.redirect_url;
+            }
+
+        } catch (error) {
+            const errorList = error.message.split('\n');
+            showFormMessage(errorList, true);
+        } finally {
+            submitButton.disabled = false;
+            submitButton.textContent = 'RESET PASSWORD';
+        }
+    });
+});
@@ -0,0 +1,277 @@
+const baseConfig = JSON.parse(document.getElementById('student-base-config').textContent);
+
+// Helper function to get the CSRF token from cookies
+function getCsrfToken() {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, 10) === 'csrftoken=') {
+                cookieValue = decodeURIComponent(cookie.substring(10));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+// Helper function to update the bell count
+function updateHeaderCount(newCount) {
+    const bellButton = document.getElementById('notification-bell-btn');
+    if (!bellButton) return;
+    let countElement = bellButton.querySelector('.notification-count');
+
+    if (newCount > 0) {
+        if (!countElement) {
+            countElement = document.createElement('span');
+            countElement.className = 'notification-count';
+            bellButton.appendChild(countElement);
+        }
+        countElement.textContent = newCount;
+    } else {
+        if (countElement) {
+            countElement.style.transition = 'opacity 0.3s ease';
+            countElement.style.opacity = '0';
+            setTimeout(() => countElement.remove(), 300);
+        }
+    }
+}
+
+// ===== Page Loader Logic =====
+const loader = document.getElementById('page-loader');
+if (loader) {
+    window.addEventListener('pageshow', function() {
+        loader.classList.remove('visible');
+    });
+
+    document.addEventListener('click', function(e) {
+        const link = e.target.closest('a');
+        if (link) {
+            if (link.classList.contains('active')) {
+                e.preventDefault();
+                return;
+            }
+            if (link.target === '_blank') return;
+            if (link.href.startsWith(window.location.href + '#')) return;
+            if (link.href.startsWith('mailto:') || link.href.startsWith('tel:')) return;
+            if (link.closest('.pagination-container')) return;
+
+            if (link.closest('.notification-dropdown')) {
+                loader.classList.add('visible');
+                return; 
+            }
+            if (e.target.closest('#notification-bell-btn')) return;
+
+            if (e.target.closest('#notification-tabs')) return; 
+
+            if (e.ctrlKey || e.metaKey) return;
+            loader.classList.add('visible');
+        }
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+
+    // --- Hamburger Menu Logic ---
+    const hamburgerBtn = document.querySelector('.hamburger-btn');
+    const header = document.querySelector('.dashboard-header');
+    const body = document.body;
+    if (hamburgerBtn && header && body) {
+        hamburgerBtn.addEventListener('click', function() {
+            header.classList.toggle('menu-is-open');
+            body.classList.toggle('menu-is-open');
+            const isExpanded = header.classList.contains('menu-is-open');
+            hamburgerBtn.setAttribute('aria-expanded', isExpanded);
+            const icon = hamburgerBtn.querySelector('.hamburger-icon');
+            if (isExpanded) {
+                icon.innerHTML = '&times;'; // 'X' icon
+            } else {
+                icon.innerHTML = '&equiv;'; // '☰' icon
+            }
+        });
+    }
+
+    // --- Notification Logic ---
+    const bellBtn = document.getElementById('notification-bell-btn');
+    const dropdown = document.getElementById('notification-dropdown');
+
+    if (bellBtn && dropdown) {
+        bellBtn.addEventListener('click', function(e) {
+            if (bellBtn.classList.contains('active')) {
+                return;
+            }
+            e.stopPropagation(); 
+
+            const isOpening = !dropdown.classList.contains('visible');
+            dropdown.classList.toggle('visible');
+
+            if (isOpening && header.classList.contains('menu-is-open')) {
+                    header.classList.remove('menu-is-open');
+                    body.classList.remove('menu-is-open');
+                    hamburgerBtn.setAttribute('aria-expanded', 'false');
+                    hamburgerBtn.querySelector('.hamburger-icon').innerHTML = '&equiv;';
+                }
+            });
+
+        document.addEventListener('click', function(e) {
+            if (dropdown.classList.contains('visible') && 
+                !dropdown.contains(e.target) && 
+                !bellBtn.contains(e.target)) {
+                dropdown.classList.remove('visible');
+            }
+        });
+
+        window.addEventListener('resize', function() {
+            if (window.innerWidth <= 992 && dropdown.classList.contains('visible')) {
+                dropdown.classList.remove('visible');
+            }
+        });
+    }
+
+    // --- Click-to-Redirect Logic for notification buttons ---
+    const notificationList = document.getElementById('notification-list');
+    if (notificationList) {
+        notificationList.addEventListener('click', function(e) {
+            const notificationItem = e.target.closest('.notification-item');
+
+            if (notificationItem) {
+                const url = notificationItem.dataset.url;
+                if (!url) return;
+
+                if (loader) loader.classList.add('visible');
+
+                fetch(url, {
+                    method: 'POST',
+                    headers: {
+                        'X-CSRFToken': getCsrfToken(),
+                        'X-Requested-With': 'XMLHttpRequest'
+                    }
+                })
+                .then(response => response.json())
+                .then(data => {
+                    if (data.redirect_url) {
+                        window.location.href = data.redirect_url;
+                    } else {
+                        window.location.href = baseConfig.myOrdersUrl;
+                    }
+                })
+                .catch(error => {
+                    console.error('Error marking notification as read:', error);
+                    window.location.href = baseConfig.myOrdersUrl;
+                });
+            }
+        });
+    }
+
+    // --- Tab switching logic for dropdown ---
+    const notificationTabs = document.getElementById('notification-tabs');
+    if (notificationList && notificationTabs) {
+        notificationTabs.addEventListener('click', function(e) {
+            if (e.target.classList.contains('tab-btn')) {
+                e.stopPropagation();
+
+                // Update active tab button
+                notificationTabs.querySelectorAll('.tab-btn').forEach(btn => btn.classList.remove('active'));
+                e.target.classList.add('active');
+
+                const currentTab = e.target.dataset.tab;
+
+                // Filter the list
+                notificationList.querySelectorAll('.notification-item, .empty-state').forEach(item => {
+                    if (item.classList.contains('empty-state')) return;
+
+                    const isRead = item.dataset.read === 'true';
+                    if (currentTab === 'all' || (currentTab === 'unread' && !isRead)) {
+                        item.style.display = 'flex';
+                    } else {
+                        item.style.display = 'none';
+                    }
+                });
+                checkDropdownEmptyState();
+            }
+        });
+    }
+
+    // --- Mark All as Read Logic ---
+    const markAllReadBtn = document.getElementById('dropdown-mark-all-read-btn');
+    if (markAllReadBtn) {
+        markAllReadBtn.addEventListener('click', function(e) {
+            e.stopPropagation();
+
+            // We check inside notificationList directly
+            const unreadItems = notificationList.querySelectorAll('.notification-item.notification-unread');
+            if (unreadItems.length === 0) {
+                return;
+            }
+
+            markAllReadBtn.disabled = true;
+            markAllReadBtn.textContent = 'Processing...';
+
+            fetch(baseConfig.markAllReadUrl, {
+                method: 'POST',
+                headers: {
+                    'X-CSRFToken': getCsrfToken(),
+                    'X-Requested-With': 'XMLHttpRequest'
+                }
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    updateHeaderCount(data.new_unread_count);
+
+                    const currentTab = notificationTabs.querySelector('.tab-btn.active').dataset.tab;
+
+                    dropdown.querySelectorAll('.notification-item.notification-unread').forEach(item => {
+                        item.classList.remove('notification-unread');
+                        item.dataset.read = 'true';
+
+                        if (currentTab === 'unread') {
+                            item.style.display = 'none';
+                        }
+                    });
+
+                    checkDropdownEmptyState();
+
+                    markAllReadBtn.textContent = 'Mark all as read';
+                    markAllReadBtn.disabled = false;
+
+                } else {
+                    console.error('Failed to mark all as read:', data.error);
+                    markAllReadBtn.textContent = 'Error!';
+                    markAllReadBtn.disabled = false;
+                }
+            })
+            .catch(error => {
+                console.error('Fetch error:', error);
+                markAllReadBtn.textContent = 'Error!';
+                markAllReadBtn.disabled = false;
+            });
+        });
+    }
+
+// --- HELPER FUNCTION TO CHECK DROPDOWN EMPTY STATE ---
+const dynamicEmptyState = document.getElementById('dynamic-empty-state');
+const staticEmptyState = notificationList.querySelector('.empty-state:not(#dynamic-empty-state)');
+
+function checkDropdownEmptyState() {
+    if (!notificationList || !dynamicEmptyState) return;
+
+    if (staticEmptyState && staticEmptyState.offsetParent !== null) {
+        dynamicEmptyState.style.display = 'none';
+        return;
+    }
+
+    // Count how many items are visible
+    const visibleItems = notificationList.querySelectorAll('.notification-item:not([style*="display: none"])').length;
+
+    if (visibleItems === 0) {
+        // No items are visible, so show the dynamic "No notifications match" message
+        dynamicEmptyState.style.display = 'block';
+    } else {
+        // Items are visible, so hide the dynamic message
+        dynamicEmptyState.style.display = 'none';
+    }
+}
+
+});
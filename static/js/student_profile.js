@@ -0,0 +1,306 @@
+const pageConfig = JSON.parse(document.getElementById('page-config').textContent);
+
+document.addEventListener('DOMContentLoaded', () => {
+
+    // --- Helper function to show dynamic success/error messages ---
+    function showDynamicMessage(message, className = 'success') {
+        const messagesContainer = document.getElementById('messages-container');
+        if (!messagesContainer) return;
+        const li = document.createElement('li');
+        li.className = className;
+        li.textContent = message;
+        messagesContainer.prepend(li);
+        window.scrollTo({ top: 0, behavior: 'smooth' });
+        setTimeout(() => {
+            li.style.opacity = '0';
+            li.style.transition = 'opacity 0.5s ease';
+            setTimeout(() => li.remove(), 500);
+        }, 5000);
+    }
+
+    // --- Helpers for DETAILS server errors (not validation) ---
+    const detailsServerErrorContainer = document.getElementById('details-server-errors');
+    function showDetailsServerError(error) {
+        if (!detailsServerErrorContainer) return;
+        detailsServerErrorContainer.innerHTML = `<ul><li>${error}</li></ul>`;
+        detailsServerErrorContainer.style.display = 'block';
+    }
+    function clearDetailsServerError() {
+        if (detailsServerErrorContainer) {
+            detailsServerErrorContainer.innerHTML = '';
+            detailsServerErrorContainer.style.display = 'none';
+        }
+    }
+
+    // --- Helper to clear all individual field errors ---
+    function clearAllFieldErrors() {
+        document.querySelectorAll('#details-form .form-error-message').forEach(el => {
+            el.textContent = '';
+        });
+    }
+
+    // --- Helper function for PASSWORD validation errors ---
+    const passwordErrorContainer = document.getElementById('password-errors');
+    function showPasswordErrors(errors) {
+        if (!passwordErrorContainer) return;
+        passwordErrorContainer.innerHTML = '';
+        const ul = document.createElement('ul');
+        errors.forEach(error => {
+            const li = document.createElement('li');
+            li.textContent = error;
+            ul.appendChild(li);
+        });
+        passwordErrorContainer.appendChild(ul);
+        passwordErrorContainer.style.display = 'block';
+    }
+    function clearPasswordErrors() {
+        if (passwordErrorContainer) passwordErrorContainer.style.display = 'none';
+    }
+
+    // --- Phone Number Formatter ---
+    function formatPhoneNumber(value) {
+        const unformattedRegex = /^09\d{9}$/; 
+        if (unformattedRegex.test(value)) {
+            const group1 = value.substring(1, 4); 
+            const group2 = value.substring(4, 7); 
+            const group3 = value.substring(7, 11);
+            return `+63 ${group1} ${group2} ${group3}`;
+        }
+        return value; 
+    }
+
+    //  --- Individual Validation Functions ---
+    const fullNameInput = document.getElementById('full_name');
+    const phoneInput = document.getElementById('phone_number');
+    const addressInput = document.getElementById('address');
+
+    function validateFullName() {
+        const fullName = fullNameInput.value;
+        const errorEl = document.getElementById('full_name-error');
+        const fullNameRegex = /^[a-zA-ZñÑ. ]+$/;
+
+        if (fullName && !fullNameRegex.test(fullName)) {
+            errorEl.textContent = 'Full name can only contain letters, spaces, and periods.';
+            return false;
+        }
+        errorEl.textContent = '';
+        return true;
+    }
+
+    function validatePhoneNumber() {
+        phoneInput.value = formatPhoneNumber(phoneInput.value.trim());
+        const phoneNumber = phoneInput.value;
+        const errorEl = document.getElementById('phone_number-error');
+        const phoneRegex = /^\+63 9\d{2} \d{3} \d{4}$/;
+
+        if (phoneNumber && !phoneRegex.test(phoneNumber)) {
+            errorEl.textContent = 'Please enter a valid Philippine mobile number format: +63 912 345 6789.';
+            return false;
+        }
+        errorEl.textContent = '';
+        return true;
+    }
+
+    function validateAddress() {
+        const address = addressInput.value;
+        const errorEl = document.getElementById('address-error');
+
+        if (address && (address.match(/,/g) || []).length < 3) {
+            errorEl.textContent = 'Address format: Street, Barangay, City, Province.';
+            return false;
+        }
+        errorEl.textContent = '';
+        return true;
+    }
+
+    // --- Main function to handle AJAX form submission ---
+    function handleAjaxFormSubmit(form) {
+        form.addEventListener('submit', async (event) => {
+            event.preventDefault();
+
+            // --- Password Validation Logic ---
+            if (form.id === 'password-form') {
+                clearPasswordErrors();
+                let errors = [];
+                const current = form.querySelector('#current_password').value;
+                const password = form.querySelector('#new_password1').value;
+                const confirm = form.querySelector('#new_password2').value;
+
+                if (!current) { errors.push('Please enter your current password.'); } 
+                if (password !== confirm) { errors.push('Passwords do not match.'); }
+                if (password.length < 8) { errors.push('Password must be at least 8 characters long.'); }
+                if (!/[A-Z]/.test(password)) { errors.push('Password needs an uppercase letter.'); }
+                if (!/[a-z]/.test(password)) { errors.push('Password needs a lowercase letter.'); }
+                if (!/[0-9]/.test(password)) { errors.push('Password needs a number.'); }
+                if (!/[@$!%*?&]/.test(password)) { errors.push('Password needs a special character (@$!%*?&).'); }
+                if (current && current === password) { errors.push('New password cannot be the same as the current password.'); }
+
+                if (errors.length > 0) {
+                    showPasswordErrors(errors);
+                    return; 
+                }
+            } 
+
+            //  --- Details Validation Logic ---
+            else if (form.id === 'details-form') {
+                clearDetailsServerError();
+
+                // Run all validations and check
+                const isNameValid = validateFullName();
+                const isPhoneValid = validatePhoneNumber();
+                const isAddressValid = validateAddress();
+
+                // Stop submission if any validation failed
+                if (!isNameValid || !isPhoneValid || !isAddressValid) {
+                    return;
+                }
+            }
+
+            // --- This part runs if validation passes ---
+            const submitButton = form.querySelector('button[type="submit"]');
+            const originalButtonText = submitButton.textContent;
+            submitButton.disabled = true;
+            submitButton.textContent = 'Saving...';
+            const formData = new FormData(form);
+            const url = form.action;
+            const method = form.method;
+            const csrfToken = form.querySelector('[name=csrfmiddlewaretoken]').value;
+
+            try {
+                const response = await fetch(url, {
+                    method: method,
+                    body: formData,
+                    headers: { 'X-CSRFToken': csrfToken, 'X-Requested-With': 'XMLHttpRequest' },
+                });
+                const data = await response.json();
+                if (!response.ok) { 
+                    if (form.id === 'details-form') {
+                        showDetailsServerError(data.error || 'An unknown error occurred.');
+                        throw new Error(data.error); 
+                    } else {
+                        throw new Error(data.error || 'An unknown error occurred.'); 
+                    }
+                }
+
+                showDynamicMessage(data.message, 'success');
+
+                if (form.id === 'password-form') {
+                    if (data.redirect_url) {
+                        setTimeout(() => {
+                            window.location.href = data.redirect_url;
+                        }, 1500); 
+                    } else {
+                        form.reset();
+                        clearPasswordErrors();
+                    }
+
+                } else if (form.id === 'details-form') {
+                    // logic for the details form
+                    form.querySelector('.form-view-text[data-field="full_name"]').textContent = formData.get('full_name') || 'Not set';
+                    form.querySelector('.form-view-text[data-field="phone_number"]').textContent = formData.get('phone_number') || 'Not set';
+                    form.querySelector('.form-view-text[data-field="address"]').textContent = formData.get('address') || 'Not set';
+                    if (data.avatar_url) {
+                        const previewEl = document.getElementById('avatar-preview');
+                        previewEl.innerHTML = `<img src="${data.avatar_url}" alt="Profile Picture">`;
+                    }
+                    document.getElementById('personal-info-card').classList.add('view-mode');
+                    clearAllFieldErrors(); 
+                    clearDetailsServerError();
+                }
+
+            } catch (error) {
+                console.error('Form submission error:', error);
+                if (form.id === 'password-form') {
+                    showPasswordErrors([error.message]); 
+                } else if (form.id !== 'details-form') { 
+                    showDynamicMessage(`Error: ${error.message}`, 'error');
+                }
+            } finally {
+                submitButton.disabled = false;
+                submitButton.textContent = originalButtonText;
+            }
+        });
+    }
+
+    // Attach the AJAX handler to both forms
+    const detailsForm = document.getElementById('details-form');
+    const passwordForm = document.getElementById('password-form');
+    if (detailsForm) handleAjaxFormSubmit(detailsForm);
+    if (passwordForm) handleAjaxFormSubmit(passwordForm);
+
+    if (fullNameInput) {
+        fullNameInput.addEventListener('blur', validateFullName);
+    }
+    if (phoneInput) {
+        phoneInput.addEventListener('blur', validatePhoneNumber);
+    }
+    if (addressInput) {
+        addressInput.addEventListener('blur', validateAddress);
+    }
+
+
+    // --- View/Edit Mode Toggle Logic ---
+    const infoCard = document.getElementById('personal-info-card');
+    const editBtn = document.getElementById('edit-profile-btn');
+    const cancelBtn = document.getElementById('cancel-edit-btn');
+    if (infoCard && editBtn && cancelBtn) {
+        editBtn.addEventListener('click', () => { infoCard.classList.remove('view-mode'); });
+
+        // 'Cancel' button logic
+        cancelBtn.addEventListener('click', () => {
+            infoCard.classList.add('view-mode');
+            clearAllFieldErrors(); 
+            clearDetailsServerError(); 
+            if (detailsForm) {
+                detailsForm.reset();
+                const avatarInput = document.getElementById('avatar_image');
+                if (avatarInput) avatarInput.value = ''; 
+                const previewEl = document.getElementById('avatar-preview');
+                const originalImage = pageConfig.avatarUrl;
+                const originalInitials = pageConfig.initials;
+                if (originalImage) {
+                    previewEl.innerHTML = `<img src="${originalImage}" alt="Profile Picture">`;
+                } else {
+                    previewEl.innerHTML = `<span>${originalInitials}</span>`;
+                }
+            }
+        });
+    }
+
+    // --- Avatar Image Preview ---
+    const avatarInput = document.getElementById('avatar_image');
+    const avatarPreview = document.getElementById('avatar-preview');
+    if (avatarInput && avatarPreview) {
+        avatarInput.addEventListener('change', function() {
+            const file = this.files[0];
+            if (file) {
+                const reader = new FileReader();
+                reader.onload = function(e) {
+                    avatarPreview.innerHTML = `<img src="${e.target.result}" alt="Image Preview">`;
+                }
+                reader.readAsDataURL(file);
+            }
+        });
+    }
+
+    // --- Tabbed Navigation Logic ---
+    const navLinks = document.querySelectorAll('.profile-nav-link');
+    const contentCards = document.querySelectorAll('.profile-content .profile-card');
+    navLinks.forEach(link => {
+        link.addEventListener('click', (e) => {
+            e.preventDefault(); 
+            const targetId = link.dataset.tabTarget;
+            const targetCard = document.querySelector(targetId);
+            if (targetCard) {
+                navLinks.forEach(nav => nav.classList.remove('active'));
+                contentCards.forEach(card => card.classList.remove('active'));
+                link.classList.add('active');
+                targetCard.classList.add('active');
+
+                clearPasswordErrors();
+                clearAllFieldErrors();
+                clearDetailsServerError();
+            }
+        });
+    });
+});
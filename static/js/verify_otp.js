@@ -0,0 +1,69 @@
+document.addEventListener('DOMContentLoaded', () => {
+    const otpForm = document.getElementById('otp-form');
+    const submitButton = document.getElementById('submit-button');
+    const messagesContainer = document.getElementById('form-messages');
+
+    // Helper function to show messages
+    function showFormMessage(messages, isError = false) {
+        messagesContainer.innerHTML = ''; // Clear old messages
+        const messageDiv = document.createElement('div');
+        messageDiv.className = isError ? 'error-message' : 'success-message';
+
+        if (Array.isArray(messages)) {
+            const ul = document.createElement('ul');
+            messages.forEach(msg => {
+                const li = document.createElement('li');
+                li.textContent = msg;
+                ul.appendChild(li);
+            });
+            messageDiv.appendChild(ul);
+        } else {
+            messageDiv.textContent = messages;
+        }
+        messagesContainer.appendChild(messageDiv);
+    }
+
+    otpForm.addEventListener('submit', async (event) => {
+        event.preventDefault();
+
+        // Show loading state
+        submitButton.disabled = true;
+        submitButton.textContent = 'VERIFYING...';
+        messagesContainer.innerHTML = '';
+
+        const formData = new FormData(otpForm);
+        const csrfToken = formData.get('csrfmiddlewaretoken');
+
+        try {
+            const response = await fetch(window.location.href, {
+                method: 'POST',
+                body: formData,
+                headers: {
+                    'X-CSRFToken': csrfToken,
+                    'X-Requested-With': 'XMLHttpRequest'
+                }
+            });
+
+            const data = await response.json();
+
+            if (!response.ok) {
+                throw new Error(data.errors ? data.errors.join(', ') : 'An unknown error occurred.');
+            }
+
+            // --- Handle Success ---
+            if (data.success && data.redirect_url) {
+                showFormMessage(data.message || 'Success!', false);
+                setTimeout(() => {
+                    window.location.href = data.redirect_url;
+                }, 1000);
+            }
+
+        } catch (error) {
+            // --- Handle Fetch/Validation Errors ---
+            showFormMessage([error.message], true);
+        } finally {
+            submitButton.disabled = false;
+            submitButton.textContent = 'VERIFY OTP';
+        }
+    });
+});
@@ -1,10 +1,15 @@
 # supabase_auth_middleware.py
 
 import os
+import re
 import requests
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
 from django.contrib.auth.models import AnonymousUser
-from supabase_client import supabase, supabase_service
+from supabase_client import supabase, supabase_service, async_http, async_postgrest
+from accounts.session_refresh import session_refresher
 
 class SupabaseUser:
     """Custom user object for Supabase authenticated users"""
@@ -38,11 +43,169 @@ class SupabaseUser:
         return self.user_type == 'admin'
 
 
+PROFILE_COLUMNS = 'full_name, user_type, avatar_url'
+
+
+def _attach_profile(user_data, profile):
+    """Copies the user_profiles row onto user_data, so SupabaseUser reads the fresh name and role."""
+    if 'user_metadata' not in user_data:
+        user_data['user_metadata'] = {}
+    user_data['user_metadata']['full_name'] = profile.get('full_name')
+    user_data['user_metadata']['user_type'] = profile.get('user_type')
+
+    # Attach the full profile data to user_data
+    user_data['profile_data'] = profile
+
+
+def _new_profile(user_data):
+    """Builds the user_profiles row for a user who has none yet, from their auth metadata."""
+    print(f"🛠️ No profile found for {user_data.get('email')}. Creating one now.")
+    initial_metadata = user_data.get('user_metadata', {})
+    return {
+        'user_id': user_data.get('id'),
+        'email': user_data.get('email'),
+        'full_name': initial_metadata.get('full_name', ''),
+        'user_type': initial_metadata.get('user_type', 'student')
+    }
+
+
+def _created_profile(user_data, new_profile_data):
+    # Attach this new profile data (with avatar_url=None by default)
+    new_profile_data['avatar_url'] = None # Add this since it wasn't in the insert
+    user_data['profile_data'] = new_profile_data
+
+
+async def _anonymous():
+    return AnonymousUser()
+
+
+class _LazyUser:
+    """
+    Resolves the Supabase user of one request on first use, for the async path.
+
+    request.auser() awaits the resolution, like Django's own; request.user
+    resolves through async_to_sync for sync code (views run in a worker thread).
+    Either way the Supabase calls run once per request.
+    """
+    def __init__(self, middleware, request):
+        self.middleware = middleware
+        self.request = request
+        self.user = None
+
+    async def aget(self):
+        if self.user is None:
+            self.user = await self.middleware.aauthenticate(self.request)
+            self.request.user = self.user  # Later reads skip the lazy wrapper
+        return self.user
+
+    def get(self):
+        if self.user is None:
+            return async_to_sync(self.aget)()
+        return self.user
+
+
 class SupabaseAuthMiddleware(MiddlewareMixin):
     """
     Middleware that validates Supabase JWT and ensures the user profile is fresh.
     This middleware now handles automatic token refreshing.
+
+    It works under both WSGI and ASGI. Under ASGI it authenticates with
+    non-blocking calls to Supabase Auth and PostgREST instead of being run in a
+    thread, and only when the view (or its decorator) awaits request.auser().
+    Under WSGI request.user is lazy too, so Supabase is only contacted when a
+    view, decorator or template reads it. Paths matching
+    SUPABASE_AUTH_PUBLIC_PATHS (login, register, the OTP flow, ...) skip
+    authentication and always get AnonymousUser.
     """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.public_paths = [re.compile(pattern) for pattern in getattr(settings, 'SUPABASE_AUTH_PUBLIC_PATHS', [])]
+
+    def is_public(self, request):
+        """True if the path matches SUPABASE_AUTH_PUBLIC_PATHS (regexes against the path without its leading slash)."""
+        path = request.path_info.lstrip('/')
+        return any(pattern.search(path) for pattern in self.public_paths)
+
+    async def __acall__(self, request):
+        # --- This admin check is good, keep it ---
+        if request.path.startswith('/admin'):
+            if hasattr(request, 'auser') and (await request.auser()).is_authenticated:
+                return await self.get_response(request)
+        # --- End of admin check ---
+
+        if self.is_public(request):
+            request.user = AnonymousUser()
+            request.auser = _anonymous
+            return await self.get_response(request)
+
+        resolver = _LazyUser(self, request)
+        request.auser = resolver.aget
+        request.user = SimpleLazyObject(resolver.get)
+        response = await self.get_response(request)
+        if not getattr(request, 'supabase_session_refreshed', False):
+            await sync_to_async(session_refresher.keep_refreshed_tokens)(request.session)
+        return response
+
+    async def aauthenticate(self, request):
+        """Async counterpart of authenticate(); returns the SupabaseUser or AnonymousUser."""
+        # Get both tokens from the session
+        access_token = await request.session.aget('supa_access_token')
+        refresh_token = await request.session.aget('supa_refresh_token')
+
+        if not access_token or not refresh_token:
+            return AnonymousUser()
+
+        if session_refresher.due(access_token):
+            session_refresher.schedule(request.session.session_key, refresh_token)
+
+        http = async_http()
+        try:
+            response = await http.get('/auth/v1/user', headers={'Authorization': f"Bearer {access_token}"})
+            if response.status_code in (401, 403):
+                # The access token expired: trade the refresh token for a new session
+                response = await http.post('/auth/v1/token', params={'grant_type': 'refresh_token'},
+                                           json={'refresh_token': refresh_token})
+                response.raise_for_status()
+                session = response.json()
+                print("🛠️ Supabase session was refreshed. Updating Django session.")
+                # Saved by SessionMiddleware with the response
+                await request.session.aset('supa_access_token', session['access_token'])
+                await request.session.aset('supa_refresh_token', session['refresh_token'])
+                request.supabase_session_refreshed = True
+                user_data = session['user']
+            else:
+                response.raise_for_status()
+                user_data = response.json()
+
+            try:
+                profile_res = await async_postgrest(service=True).table('user_profiles') \
+                    .select(PROFILE_COLUMNS).eq('user_id', user_data.get('id')).maybe_single().execute()
+
+                if profile_res and profile_res.data:
+                    _attach_profile(user_data, profile_res.data)
+                else:
+                    new_profile_data = _new_profile(user_data)
+                    await async_postgrest(service=True).table('user_profiles').insert(new_profile_data).execute()
+                    _created_profile(user_data, new_profile_data)
+
+            except Exception as profile_e:
+                print(f"--- FAILED TO SYNC PROFILE: {profile_e} ---")
+                # Set an empty profile so request.user.profile doesn't fail
+                user_data['profile_data'] = {}
+
+            return SupabaseUser(user_data)
+
+        except Exception as e:
+            # This will catch errors if the refresh_token is also invalid
+            print(f"--- Supabase Auth Middleware Error: {e} ---")
+            # Clear the invalid tokens from the Django session
+            await request.session.apop('supa_access_token', None)
+            await request.session.apop('supa_refresh_token', None)
+            return AnonymousUser()
+
     def process_request(self, request):
         
         # --- This admin check is good, keep it ---
@@ -51,28 +214,46 @@ class SupabaseAuthMiddleware(MiddlewareMixin):
                 return
         # --- End of admin check ---
 
+        if self.is_public(request):
+            request.user = AnonymousUser()
+            return
+
+        request.user = SimpleLazyObject(lambda: self.authenticate(request))
+
+    def process_response(self, request, response):
+        # Public paths (login, the OTP flow) set the tokens themselves
+        if not self.is_public(request) and not getattr(request, 'supabase_session_refreshed', False):
+            session_refresher.keep_refreshed_tokens(request.session)
+        return response
+
+    def authenticate(self, request):
+        """Verifies the session's Supabase tokens and returns the SupabaseUser, or AnonymousUser."""
         # Get both tokens from the session
         access_token = request.session.get('supa_access_token')
         refresh_token = request.session.get('supa_refresh_token')
 
         if not access_token or not refresh_token:
-            request.user = AnonymousUser()
-            return
+            return AnonymousUser()
+
+        if session_refresher.due(access_token):
+            # Renewed in the background before it expires; this request still uses the current token
+            session_refresher.schedule(request.session.session_key, refresh_token)
         
         try:
-            # Set the session on the client.
-            supabase.auth.set_session(access_token, refresh_token)
-            
-            # Use the client's get_user() method.
-            user_response = supabase.auth.get_user()
+            # set_session verifies the token with Supabase (or refreshes an expired one)
+            # and returns the user and session, so no second get_user() round trip
+            user_response = supabase.auth.set_session(access_token, refresh_token)
+            if not user_response.user:
+                raise Exception("Supabase session could not be restored.")
             
             # Check if the session was refreshed and update it in Django
-            current_session = supabase.auth.get_session()
+            current_session = user_response.session
             if current_session and current_session.access_token != access_token:
                 print("🛠️ Supabase session was refreshed. Updating Django session.")
                 request.session['supa_access_token'] = current_session.access_token
                 request.session['supa_refresh_token'] = current_session.refresh_token
-                request.session.save()
+                request.supabase_session_refreshed = True
+                # Saved by SessionMiddleware with the response
 
             # Get user data in the new format
             user_data = user_response.user.model_dump() 
@@ -80,32 +261,14 @@ class SupabaseAuthMiddleware(MiddlewareMixin):
 
             try:
                 # Select avatar_url here since we need it in the context
-                profile_res = supabase_service.table('user_profiles').select('full_name, user_type, avatar_url').eq('user_id', user_id).single().execute()
+                profile_res = supabase_service.table('user_profiles').select(PROFILE_COLUMNS).eq('user_id', user_id).single().execute()
                 
                 if profile_res.data:
-                    if 'user_metadata' not in user_data:
-                        user_data['user_metadata'] = {}
-                    user_data['user_metadata']['full_name'] = profile_res.data.get('full_name')
-                    user_data['user_metadata']['user_type'] = profile_res.data.get('user_type')
-                    
-                    # Attach the full profile data to user_data
-                    user_data['profile_data'] = profile_res.data 
+                    _attach_profile(user_data, profile_res.data)
                 else:
-                    print(f"🛠️ No profile found for {user_data.get('email')}. Creating one now.")
-                    initial_metadata = user_data.get('user_metadata', {})
-                    
-                    # Create the profile in the DB
-                    new_profile_data = {
-                        'user_id': user_id,
-                        'email': user_data.get('email'),
-                        'full_name': initial_metadata.get('full_name', ''),
-                        'user_type': initial_metadata.get('user_type', 'student')
-                    }
+                    new_profile_data = _new_profile(user_data)
                     supabase_service.table('user_profiles').insert(new_profile_data).execute()
-                    
-                    # Attach this new profile data (with avatar_url=None by default)
-                    new_profile_data['avatar_url'] = None # Add this since it wasn't in the insert
-                    user_data['profile_data'] = new_profile_data
+                    _created_profile(user_data, new_profile_data)
 
             except Exception as profile_e:
                 print(f"--- FAILED TO SYNC PROFILE: {profile_e} ---")
@@ -113,14 +276,14 @@ class SupabaseAuthMiddleware(MiddlewareMixin):
                 user_data['profile_data'] = {} 
             # --- End of profile-syncing logic ---
 
-            request.user = SupabaseUser(user_data)
+            return SupabaseUser(user_data)
 
         except Exception as e:
             # This will catch errors if the refresh_token is also invalid
             print(f"--- Supabase Auth Middleware Error: {e} ---")
-            request.user = AnonymousUser()
             # Clear the invalid tokens from the Django session
             if 'supa_access_token' in request.session:
                 del request.session['supa_access_token']
             if 'supa_refresh_token' in request.session:
-                del request.session['supa_refresh_token']
\ No newline at end of file
+                del request.session['supa_refresh_token']
+            return AnonymousUser()
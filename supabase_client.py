@@ -1,5 +1,16 @@
+import asyncio
 import os
-from supabase import create_client, Client
+import weakref
+
+import httpx
+from postgrest import AsyncPostgrestClient
+from supabase import create_client, Client, ClientOptions
+
+# --- In-memory fake (tests and benchmarks) ---
+# SUPABASE_FAKE=True answers every Supabase call in-process; see supabase_fake.py.
+if os.environ.get("SUPABASE_FAKE") == "True":
+    import supabase_fake
+    supabase_fake.install()
 
 # --- Standard Client (for user-facing actions) ---
 # This is the normal client, subject to Row-Level Security (RLS) policies.
@@ -10,7 +21,11 @@ SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY")
 if not SUPABASE_URL or not SUPABASE_ANON_KEY:
     raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in .env file")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
+# Sessions live in Django's session and are renewed by the auth middleware and
+# accounts.session_refresh. gotrue's own refresh timer would instead rotate the
+# tokens of whichever user this shared client last held (and its non-daemon
+# thread keeps the process alive), so it is off for both clients.
+supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY, options=ClientOptions(auto_refresh_token=False))
 
 
 # --- Service Role Client (for trusted backend actions) ---
@@ -22,6 +37,51 @@ if not SUPABASE_SERVICE_KEY:
     raise ValueError("SUPABASE_SERVICE_ROLE must be set in .env file")
 
 supabase_service: Client = create_client(
-  SUPABASE_URL, SUPABASE_SERVICE_KEY
+  SUPABASE_URL, SUPABASE_SERVICE_KEY, options=ClientOptions(auto_refresh_token=False)
 )
 
+
+
+# --- Async PostgREST Clients (for async views under ASGI) ---
+# httpx connections belong to the event loop that opened them, so each running
+# loop gets its own pair of clients, created on first use and kept for reuse.
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def async_postgrest(service=False):
+    """
+    Returns the async PostgREST client for the running event loop.
+
+    With service=True it uses the service role key and bypasses RLS, like
+    supabase_service. Otherwise it uses the anon key; pass each query through
+    with_access_token() to run it as the signed-in user, like supabase.
+    """
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    if service not in clients:
+        key = SUPABASE_SERVICE_KEY if service else SUPABASE_ANON_KEY
+        clients[service] = AsyncPostgrestClient(
+            f"{SUPABASE_URL}/rest/v1",
+            headers={'apikey': key, 'Authorization': f"Bearer {key}"},
+        )
+    return clients[service]
+
+
+def async_http():
+    """
+    Returns a shared httpx.AsyncClient for the running event loop, for raw
+    calls to Supabase services without an async client here (e.g. GoTrue auth).
+    """
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    if 'http' not in clients:
+        clients['http'] = httpx.AsyncClient(base_url=SUPABASE_URL, headers={'apikey': SUPABASE_ANON_KEY}, timeout=10)
+    return clients['http']
+
+
+def with_access_token(query, access_token):
+    """
+    Sends a query (sync or async) with a user's access token, so RLS sees
+    that user; without one it runs as anon. Set on the query itself, so it
+    never depends on which session the shared `supabase` client last held.
+    """
+    query.headers['Authorization'] = f"Bearer {access_token or SUPABASE_ANON_KEY}"
+    return query
@@ -0,0 +1,1081 @@
+"""
+In-memory stand-in for the Supabase services this app uses, for tests and benchmarks.
+
+Run with SUPABASE_FAKE=True and supabase_client.py calls install(): every
+request to FAKE_URL, from supabase-py, the async PostgREST clients or plain
+httpx calls to GoTrue, is answered in-process by `fake_supabase` instead of
+going over the network. It works at the httpx transport level, so the code
+under test and the per-request call accounting run unchanged.
+
+Covers what the app uses:
+- PostgREST tables: select (columns, embedded products(...)/user_profiles(...),
+  count=exact), eq/neq/gt/gte/lt/lte/like/ilike/is/in filters, not., or/and,
+  order, limit/offset, single/maybe_single, insert, upsert, update, delete,
+  and a small row-level security model (students see their own orders,
+  notifications and profile; admins and the service role see everything).
+- The RPCs the views call (buy_product, create_reservation,
+  get_my_detailed_orders, get_all_orders_with_details,
+  get_advanced_report_stats, ...), written against these tables.
+- GoTrue: sign up, password and refresh token grants, get/update user
+  (also by id via the admin API), logout, email OTP (every code is
+  `otp_code`). Tokens are HS256 JWTs signed with JWT_SECRET and the seeded
+  users have fixed ids, so a session made in one process is valid in the
+  others (e.g. load_test's gunicorn workers).
+- Storage: upload, list, remove, public URLs and downloads.
+
+SUPABASE_FAKE_LATENCY_MS adds a delay to every call (set `latency` in seconds
+at runtime), SUPABASE_FAKE_DATA points at a JSON file of rows to load instead
+of the demo data ({"users": [...], "products": [...], ...}). In tests:
+
+    from supabase_fake import fake_supabase
+    fake_supabase.reset()
+    fake_supabase.sign_in(self.client, 'student@cit.edu')
+
+`manage.py test` turns the fake on by itself (settings.TESTING).
+"""
+from datetime import datetime, timedelta, timezone
+from email.parser import BytesParser
+from urllib.parse import unquote, urlsplit
+import asyncio
+import copy
+import itertools
+import json
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+import httpx
+import jwt
+
+FAKE_URL = 'http://supabase.fake'
+JWT_SECRET = 'supabase-fake-jwt-secret-not-for-production'
+ANON_KEY = jwt.encode({'iss': 'supabase-fake', 'role': 'anon'}, JWT_SECRET, algorithm='HS256')
+SERVICE_KEY = jwt.encode({'iss': 'supabase-fake', 'role': 'service_role'}, JWT_SECRET, algorithm='HS256')
+
+TABLES = ('products', 'orders', 'notifications', 'user_profiles', 'activity_log')
+PRIMARY_KEYS = {'user_profiles': 'user_id'}
+# Tables whose rows belong to one user (RLS: students only see their own)
+OWNED_TABLES = ('orders', 'notifications', 'user_profiles')
+ROW_DEFAULTS = {
+    'products': {'description': '', 'stock_quantity': 0, 'category': '', 'size': None, 'image_url': None, 'is_available': True},
+    'orders': {'product_id': None, 'total_price': None, 'status': 'pending', 'order_type': 'order',
+               'payment_method': 'Cash', 'is_urgent': False, 'expires_at': None},
+    'notifications': {'product_id': None, 'link_url': None, 'is_read': False},
+    'user_profiles': {'full_name': '', 'user_type': 'student', 'avatar_url': None, 'student_id': None,
+                      'phone_number': None, 'address': None, 'is_blocked': False},
+    'activity_log': {'user_id': None, 'details': {}},
+}
+RESERVATION_HOLD_DAYS = 3
+# Stored objects up to this size stay in memory, larger ones go to a temporary file
+STORAGE_MEMORY_LIMIT = 1024 * 1024
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+DEMO_USERS = [
+    {'email': 'admin@cit.edu', 'password': 'Admin@123', 'user_type': 'admin', 'full_name': 'Demo Admin'},
+    {'email': 'student@cit.edu', 'password': 'Student@123', 'user_type': 'student', 'full_name': 'Demo Student',
+     'student_id': '21-0001-001', 'phone_number': '09170000001', 'address': 'Cebu City'},
+]
+DEMO_PRODUCTS = [
+    {'name': 'PE Uniform', 'category': 'Uniforms', 'size': 'M', 'price': 450.0, 'stock_quantity': 25},
+    {'name': 'PE Uniform', 'category': 'Uniforms', 'size': 'L', 'price': 450.0, 'stock_quantity': 0},
+    {'name': 'School Lanyard', 'category': 'Accessories', 'price': 80.0, 'stock_quantity': 120},
+    {'name': 'Yellow Pad', 'category': 'Office & School Supplies', 'price': 45.0, 'stock_quantity': 8},
+    {'name': 'Scientific Calculator', 'category': 'Equipment & Tools', 'price': 899.0, 'stock_quantity': 5},
+    {'name': 'Wildcats Mug', 'category': 'Merchandise & Souvenirs', 'price': 250.0, 'stock_quantity': 0,
+     'is_available': False},
+]
+
+
+def _is_upload(request):
+    """Whether a request uploads a storage object (its body is then streamed, not read into memory)."""
+    path = request.url.path
+    return request.method in ('POST', 'PUT') and path.startswith('/storage/v1/object/') \
+        and not path.startswith('/storage/v1/object/list/')
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _iso(moment=None):
+    return (moment or _now()).isoformat()
+
+
+def user_id_for(email):
+    """The fixed user id the fake gives an email address."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f'supabase-fake:{email.lower()}'))
+
+
+class FakeError(Exception):
+    """An error response: PostgREST's {code, message, ...}, GoTrue's {code, msg} or Storage's {error, message}."""
+    def __init__(self, status, body):
+        super().__init__(body.get('message') or body.get('msg'))
+        self.status = status
+        self.body = body
+
+
+def _pgrst_error(status, code, message, details=None, hint=None):
+    return FakeError(status, {'code': code, 'details': details, 'hint': hint, 'message': message})
+
+
+def _auth_error(status, code, message):
+    return FakeError(status, {'code': status, 'error_code': code, 'msg': message})
+
+
+# ----------------------------------------------------------------------------
+# PostgREST query syntax
+# ----------------------------------------------------------------------------
+
+def _split_top(text, sep=','):
+    """Splits on `sep` outside parentheses and double quotes."""
+    parts, depth, quoted, current = [], 0, False, ''
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        if char == sep and depth == 0 and not quoted:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    if current:
+        parts.append(current)
+    return [part.strip() for part in parts]
+
+
+def _comparable(value, raw):
+    """Converts the filter operand `raw` to the type of the column value it is compared with."""
+    raw = raw.strip('"') if isinstance(raw, str) else raw
+    if isinstance(value, bool):
+        return value, raw.lower() == 'true'
+    if isinstance(value, (int, float)):
+        return value, float(raw)
+    if isinstance(value, str) and len(value) >= 10 and value[4:5] == '-' and value[7:8] == '-':
+        try:
+            return datetime.fromisoformat(value), datetime.fromisoformat(raw)
+        except ValueError:
+            pass
+    return str(value), raw
+
+
+def _like(value, pattern, flags=0):
+    regex = ''.join('.*' if char in '%*' else re.escape(char) for char in pattern)
+    return value is not None and re.fullmatch(regex, str(value), flags | re.DOTALL) is not None
+
+
+def _test(value, op, raw):
+    if op == 'is':
+        return value is {'null': None, 'true': True, 'false': False}.get(raw.lower(), raw)
+    if op == 'in':
+        options = [option.strip('"') for option in _split_top(raw.strip('()'))]
+        return value is not None and any(_test(value, 'eq', option) for option in options)
+    if op == 'like':
+        return _like(value, raw)
+    if op == 'ilike':
+        return _like(value, raw, re.IGNORECASE)
+    if value is None:
+        return False  # SQL: comparisons with NULL are never true
+    if op not in ('eq', 'neq', 'gt', 'gte', 'lt', 'lte'):
+        raise _pgrst_error(400, 'PGRST100', f'"failed to parse filter ({op}.{raw})" (line 1, column 1)')
+    try:
+        left, right = _comparable(value, raw)
+    except ValueError:
+        raise _pgrst_error(400, '22P02', f'invalid input syntax for type: "{raw}"')
+    return {
+        'eq': left == right, 'neq': left != right, 'gt': left > right,
+        'gte': left >= right, 'lt': left < right, 'lte': left <= right,
+    }[op]
+
+
+def _condition(column, expression):
+    """A row predicate for `column=expression`, e.g. ('status', 'not.in.(cancelled,rejected)')."""
+    negate = expression.startswith('not.')
+    if negate:
+        expression = expression[4:]
+    op, _, raw = expression.partition('.')
+    raw = unquote(raw)
+    return lambda row: _test(row.get(column), op, raw) != negate
+
+
+def _logic(kind, body):
+    """A row predicate for or=(...) / and=(...), which may nest further and(...)/or(...)."""
+    negate = kind.startswith('not.')
+    kind = kind[4:] if negate else kind
+    predicates = []
+    for item in _split_top(body.strip()[1:-1]):
+        nested = re.match(r'^((?:not\.)?(?:and|or))(\(.*\))$', item)
+        if nested:
+            predicates.append(_logic(*nested.groups()))
+        else:
+            column, _, expression = item.partition('.')
+            predicates.append(_condition(column, expression))
+    combine = any if kind == 'or' else all
+    return lambda row: combine(predicate(row) for predicate in predicates) != negate
+
+
+RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+
+
+def _row_filter(params):
+    predicates = []
+    for key, value in params:
+        if key in RESERVED_PARAMS:
+            continue
+        if key in ('or', 'and', 'not.or', 'not.and'):
+            predicates.append(_logic(key, value))
+        else:
+            predicates.append(_condition(key, value))
+    return lambda row: all(predicate(row) for predicate in predicates)
+
+
+def _sort(rows, order):
+    for term in reversed(_split_top(order)):
+        column, *modifiers = term.split('.')
+        desc = 'desc' in modifiers
+        nulls_first = 'nullsfirst' in modifiers or (desc and 'nullslast' not in modifiers)
+        # Sorting reversed for desc flips the null flag too, so compensate
+        null_rank = (0 if nulls_first else 1) if not desc else (1 if nulls_first else 0)
+
+        def key(row, column=column, null_rank=null_rank):
+            value = row.get(column)
+            return (null_rank, 0) if value is None else (1 - null_rank, value)
+
+        rows.sort(key=key, reverse=desc)
+    return rows
+
+
+class FakeSupabase:
+    """
+    The fake's state: table rows, auth users and storage objects, plus the
+    request handler. All access goes through one lock, so it can serve the
+    threaded and async servers alike.
+    """
+    def __init__(self, latency=0.0, otp_code='123456', token_ttl=3600):
+        self.latency = latency
+        self.otp_code = otp_code
+        self.token_ttl = token_ttl
+        self._lock = threading.RLock()
+        self.reset()
+
+    # --- State ---------------------------------------------------------------
+
+    def reset(self, data=None, demo=True):
+        """
+        Empties every table, user and bucket, then loads `data` (a dict of
+        table name -> rows, plus 'users') or, with demo=True, the demo data.
+        """
+        with self._lock:
+            self.tables = {table: [] for table in TABLES}
+            self.users = {}
+            self.buckets = {}
+            self.revoked_sessions = set()
+            self._ids = {table: itertools.count(1) for table in TABLES}
+            if data is None and demo:
+                data = {'users': DEMO_USERS, 'products': DEMO_PRODUCTS}
+            for user in (data or {}).get('users', []):
+                self.create_user(**user)
+            for table, rows in (data or {}).items():
+                if table != 'users':
+                    self.insert(table, rows)
+
+    def load(self, path):
+        """Resets to the rows in a JSON file (see reset())."""
+        with open(path, encoding='utf-8') as handle:
+            self.reset(json.load(handle))
+
+    def insert(self, table, rows):
+        """Inserts rows directly (no RLS), filling in ids, defaults and timestamps; returns them."""
+        with self._lock:
+            return [self._insert_row(table, row) for row in ([rows] if isinstance(rows, dict) else rows)]
+
+    def _insert_row(self, table, row, upsert_on=None):
+        if table not in self.tables:
+            raise _pgrst_error(404, '42P01', f'relation "public.{table}" does not exist')
+        key = upsert_on or PRIMARY_KEYS.get(table, 'id')
+        if row.get(key) is not None:
+            existing = next((r for r in self.tables[table] if r.get(key) == row[key]), None)
+            if existing is not None:
+                if upsert_on is None:
+                    raise _pgrst_error(409, '23505', f'duplicate key value violates unique constraint "{table}_pkey"',
+                                       details=f'Key ({key})=({row[key]}) already exists.')
+                existing.update(copy.deepcopy(row))
+                if 'updated_at' in existing:
+                    existing['updated_at'] = _iso()
+                return existing
+        new = {**copy.deepcopy(ROW_DEFAULTS.get(table, {})), **copy.deepcopy(row)}
+        if PRIMARY_KEYS.get(table, 'id') == 'id':
+            if new.get('id') is None:
+                new['id'] = next(self._ids[table])
+            else:
+                # Keep generated ids clear of explicitly inserted ones
+                used = max(r['id'] for r in self.tables[table] + [new])
+                self._ids[table] = itertools.count(used + 1)
+        new.setdefault('created_at', _iso())
+        if table != 'activity_log':
+            new.setdefault('updated_at', new['created_at'])
+        self.tables[table].append(new)
+        return new
+
+    def create_user(self, email, password, user_type='student', full_name='', **profile):
+        """Adds an auth user and, like the signup trigger, their user_profiles row; returns the user."""
+        with self._lock:
+            user_id = profile.pop('id', None) or user_id_for(email)
+            metadata = {'full_name': full_name, 'user_type': user_type, **profile}
+            user = {
+                'id': user_id,
+                'email': email.lower(),
+                'password': password,
+                'user_metadata': metadata,
+                'created_at': _iso(),
+            }
+            self.users[user['id']] = user
+            self._insert_row('user_profiles', {
+                'user_id': user['id'], 'email': user['email'], 'full_name': full_name, 'user_type': user_type,
+                **{key: value for key, value in profile.items() if key in ROW_DEFAULTS['user_profiles']},
+            }, upsert_on='user_id')
+            return user
+
+    def user_by_email(self, email):
+        with self._lock:
+            return next((user for user in self.users.values() if user['email'] == email.lower()), None)
+
+    def session_for(self, email):
+        """A signed-in session (access_token, refresh_token, ...) for a user, without a password."""
+        with self._lock:
+            return self._session(self.user_by_email(email))
+
+    def sign_in(self, client, email):
+        """Signs a Django test client in as a user, storing the session tokens like login_view does; returns the session."""
+        session = self.session_for(email)
+        django_session = client.session
+        django_session['supa_access_token'] = session['access_token']
+        django_session['supa_refresh_token'] = session['refresh_token']
+        django_session.save()
+        return session
+
+    # --- Transport -------------------------------------------------------------
+
+    def handle(self, request):
+        """Answers one httpx request to FAKE_URL."""
+        url = urlsplit(str(request.url))
+        if not _is_upload(request):
+            request.read()
+        try:
+            with self._lock:
+                service, _, path = url.path.strip('/').partition('/v1/')
+                if service == 'rest':
+                    status, body, headers = self._rest(request, path)
+                elif service == 'auth':
+                    status, body, headers = self._auth(request, path)
+                elif service == 'storage':
+                    status, body, headers = self._storage(request, path)
+                else:
+                    raise FakeError(404, {'message': f'No fake for {url.path}'})
+        except FakeError as e:
+            status, body, headers = e.status, e.body, {}
+        if isinstance(body, bytes):
+            return httpx.Response(status, content=body, headers=headers)
+        if body is None:
+            return httpx.Response(status, headers=headers)
+        return httpx.Response(status, content=json.dumps(body, default=str).encode(),
+                              headers={'content-type': 'application/json', **headers})
+
+    # --- PostgREST ---------------------------------------------------------------
+
+    def _identity(self, request):
+        """Returns (role, user id) from the request's bearer token or apikey."""
+        token = request.headers.get('authorization', '').removeprefix('Bearer ').strip() or request.headers.get('apikey', '')
+        try:
+            claims = jwt.decode(token, JWT_SECRET, algorithms=['HS256'], options={'verify_aud': False})
+        except jwt.ExpiredSignatureError:
+            raise _pgrst_error(401, 'PGRST301', 'JWT expired')
+        except jwt.InvalidTokenError:
+            raise _pgrst_error(401, 'PGRST301', 'JWSError JWSInvalidSignature')
+        if claims.get('session_id') in self.revoked_sessions:
+            raise _pgrst_error(401, 'PGRST301', 'JWT expired')
+        return claims.get('role', 'anon'), claims.get('sub')
+
+    def _is_admin(self, user_id):
+        profile = next((p for p in self.tables['user_profiles'] if p['user_id'] == user_id), None)
+        return bool(profile) and profile.get('user_type') == 'admin'
+
+    def _visible(self, table, identity, write=False):
+        """The RLS check for a table: a row predicate for this identity."""
+        role, user_id = identity
+        if role == 'service_role' or (role == 'authenticated' and self._is_admin(user_id)):
+            return lambda row: True
+        if table == 'products':
+            return lambda row: not write
+        if role == 'authenticated' and table in OWNED_TABLES:
+            return lambda row: str(row.get('user_id')) == user_id
+        return lambda row: False
+
+    def _project(self, table, row, select):
+        if not select or select == '*':
+            return copy.deepcopy(row)
+        result = {}
+        for item in _split_top(select):
+            alias, _, field = item.rpartition(':') if ':' in item.split('(')[0] else ('', '', item)
+            if '(' in field:
+                name, columns = field[:-1].split('(', 1)
+                name = name.split('!')[0]
+                result[alias or name] = self._embed(table, row, name, columns)
+            elif field == '*':
+                result.update(copy.deepcopy(row))
+            else:
+                result[alias or field] = copy.deepcopy(row.get(field.split('::')[0]))
+        return result
+
+    def _embed(self, table, row, target, columns):
+        """Resolves an embedded resource by foreign key: products(name) on orders, user_profiles(...) by user_id."""
+        if target not in self.tables:
+            raise _pgrst_error(400, 'PGRST200', f"Could not find a relationship between '{table}' and '{target}' in the schema cache")
+        foreign_key = f"{target.removesuffix('s')}_id"
+        target_key = PRIMARY_KEYS.get(target, 'id')
+        if foreign_key not in row and target_key != 'id' and target_key in row:
+            foreign_key = target_key
+        if foreign_key in row:
+            match = next((r for r in self.tables[target] if r.get(target_key) == row[foreign_key]), None)
+            return self._project(target, match, columns) if match else None
+        back_key = f"{table.removesuffix('s')}_id"
+        own_key = row.get(PRIMARY_KEYS.get(table, 'id'))
+        return [self._project(target, r, columns) for r in self.tables[target] if r.get(back_key) == own_key]
+
+    def _shape(self, request, rows, table=None):
+        """Applies filters, order, offset/limit, select and single-object/count headers to result rows."""
+        params = list(request.url.params.multi_items())
+        query = dict(params)
+        rows = [row for row in rows if _row_filter(params)(row)]
+        if query.get('order'):
+            rows = _sort(rows, ','.join(value for key, value in params if key == 'order'))
+        total = len(rows)
+        offset = int(query.get('offset', 0))
+        limit = int(query['limit']) if 'limit' in query else None
+        rows = rows[offset:offset + limit if limit is not None else None]
+        if table:
+            rows = [self._project(table, row, query.get('select')) for row in rows]
+        elif query.get('select') and query['select'] != '*':
+            rows = [{k: row.get(k) for k in _split_top(query['select'])} for row in rows]
+
+        headers = {}
+        if 'count=' in request.headers.get('prefer', ''):
+            headers['content-range'] = f'{offset}-{offset + len(rows) - 1}/{total}' if rows else f'*/{total}'
+        if 'vnd.pgrst.object' in request.headers.get('accept', ''):
+            if len(rows) != 1:
+                raise _pgrst_error(406, 'PGRST116', 'JSON object requested, multiple (or no) rows returned',
+                                   details=f'The result contains {len(rows)} rows')
+            return rows[0], headers
+        return rows, headers
+
+    def _rest(self, request, path):
+        identity = self._identity(request)
+        if path.startswith('rpc/'):
+            return self._rpc(request, path[4:], identity)
+
+        table, method = path, request.method
+        if table not in self.tables:
+            raise _pgrst_error(404, '42P01', f'relation "public.{table}" does not exist')
+        visible = self._visible(table, identity)
+        prefer = request.headers.get('prefer', '')
+
+        if method in ('GET', 'HEAD'):
+            rows = [row for row in self.tables[table] if visible(row)]
+            body, headers = self._shape(request, rows, table)
+            return 200, None if method == 'HEAD' else body, headers
+
+        writable = self._visible(table, identity, write=True)
+        if method == 'POST':
+            payload = json.loads(request.content or b'[]')
+            payload = [payload] if isinstance(payload, dict) else payload
+            for row in payload:
+                if not writable(row):
+                    raise _pgrst_error(403, '42501', f'new row violates row-level security policy for table "{table}"')
+            upsert_on = None
+            if 'resolution=' in prefer:
+                upsert_on = request.url.params.get('on_conflict') or PRIMARY_KEYS.get(table, 'id')
+            rows = [self._insert_row(table, row, upsert_on) for row in payload]
+            status = 201
+        else:
+            matches = _row_filter(list(request.url.params.multi_items()))
+            rows = [row for row in self.tables[table] if visible(row) and writable(row) and matches(row)]
+            if method == 'PATCH':
+                changes = json.loads(request.content or b'{}')
+                for row in rows:
+                    row.update(copy.deepcopy(changes))
+                    if 'updated_at' in row and 'updated_at' not in changes:
+                        row['updated_at'] = _iso()
+            elif method == 'DELETE':
+                removed = {id(row) for row in rows}
+                self.tables[table] = [row for row in self.tables[table] if id(row) not in removed]
+            else:
+                raise _pgrst_error(405, 'PGRST117', f'Unsupported HTTP method: {method}')
+            status = 200
+
+        if 'return=representation' not in prefer:
+            return 204 if status == 200 else status, None, {}
+        query = dict(request.url.params.multi_items())
+        body = [self._project(table, row, query.get('select')) for row in rows]
+        headers = {'content-range': f'*/{len(body)}'} if 'count=' in prefer else {}
+        return status, body, headers
+
+    def _rpc(self, request, name, identity):
+        handler = getattr(self, f'rpc_{name}', None)
+        if handler is None:
+            raise _pgrst_error(404, 'PGRST202', f'Could not find the function public.{name} in the schema cache')
+        params = json.loads(request.content or b'{}') if request.method == 'POST' else {}
+        try:
+            result = handler(identity, **params)
+        except TypeError as e:
+            raise _pgrst_error(404, 'PGRST202', f'Could not find the function public.{name}({", ".join(params)}) in the schema cache', details=str(e))
+        if isinstance(result, list):
+            result, headers = self._shape(request, result)
+            return 200, result, headers
+        return 200, result, {}
+
+    # --- RPCs (the SQL functions, over the in-memory tables) ---------------------
+
+    def _row(self, table, **match):
+        return next((row for row in self.tables[table] if all(row.get(k) == v for k, v in match.items())), None)
+
+    def _product(self, product_id):
+        product = self._row('products', id=int(product_id))
+        if product is None:
+            raise _pgrst_error(400, 'P0001', 'Product not found.')
+        return product
+
+    def _adjust_stock(self, product, delta):
+        product['stock_quantity'] = (product.get('stock_quantity') or 0) + delta
+        product['updated_at'] = _iso()
+
+    def _order_details(self, order, **extra):
+        product = self._row('products', id=order.get('product_id')) or {}
+        return {
+            **copy.deepcopy(order),
+            'product_name': product.get('name'),
+            'product_size': product.get('size'),
+            'product_category': product.get('category'),
+            'product_description': product.get('description'),
+            'product_image_url': product.get('image_url'),
+            'product_price': product.get('price'),
+            'product_stock_quantity': product.get('stock_quantity'),
+            **extra,
+        }
+
+    def _user_orders(self, user_id, order_types):
+        orders = [o for o in self.tables['orders'] if o['user_id'] == str(user_id) and o['order_type'] in order_types]
+        return [self._order_details(o) for o in sorted(orders, key=lambda o: o['created_at'], reverse=True)]
+
+    def _log(self, user_id, action, details):
+        self._insert_row('activity_log', {'user_id': user_id, 'action': action, 'details': details})
+
+    def rpc_get_dashboard_stats(self, identity):
+        products, orders = self.tables['products'], self.tables['orders']
+        return {
+            'total_products': len(products),
+            'active_products': sum(1 for p in products if p.get('is_available')),
+            'total_orders': len(orders),
+            'pending_orders': sum(1 for o in orders if o['status'] == 'pending'),
+        }
+
+    def rpc_get_my_orders(self, identity, p_user_id):
+        return self._user_orders(p_user_id, ('order',))
+
+    def rpc_get_my_detailed_orders(self, identity, p_user_id):
+        return self._user_orders(p_user_id, ('order', 'reservation', 'backorder'))
+
+    def rpc_get_my_detailed_reservations(self, identity, p_user_id):
+        return self._user_orders(p_user_id, ('reservation', 'backorder'))
+
+    def rpc_get_my_detailed_notifications(self, identity, p_user_id):
+        notifications = [n for n in self.tables['notifications'] if n['user_id'] == str(p_user_id)]
+        return [
+            {**copy.deepcopy(n), 'product_image_url': (self._row('products', id=n.get('product_id')) or {}).get('image_url')}
+            for n in sorted(notifications, key=lambda n: n['created_at'], reverse=True)
+        ]
+
+    def rpc_get_all_orders_with_details(self, identity, p_search_term=''):
+        term = (p_search_term or '').lower()
+        results = []
+        for order in sorted(self.tables['orders'], key=lambda o: o['created_at'], reverse=True):
+            profile = self._row('user_profiles', user_id=order['user_id']) or {}
+            row = self._order_details(order, student_name=profile.get('full_name'), student_id=profile.get('student_id'))
+            haystack = ' '.join(str(row.get(k) or '') for k in ('id', 'product_name', 'student_name', 'student_id', 'status'))
+            if term in haystack.lower():
+                results.append(row)
+        return results
+
+    def rpc_get_activity_log(self, identity, p_search_term=''):
+        term = (p_search_term or '').lower()
+        results = []
+        for entry in self.tables['activity_log']:
+            profile = self._row('user_profiles', user_id=entry.get('user_id')) or {}
+            row = {**copy.deepcopy(entry), 'user_full_name': profile.get('full_name')}
+            if term in f"{row['action']} {json.dumps(row['details'])} {row['user_full_name'] or ''}".lower():
+                results.append(row)
+        return results
+
+    def rpc_get_advanced_report_stats(self, identity):
+        products, orders = self.tables['products'], self.tables['orders']
+        by_id = {p['id']: p for p in products}
+        today = _now().date().isoformat()
+        sold = [o for o in orders if o['order_type'] == 'order' and o['status'] in ('approved', 'completed')]
+
+        def top(items, limit=5):
+            ranked = sorted(items.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [{'product_name': name, 'metric_value': value} for name, value in ranked if value]
+
+        def per_product(rows, value):
+            totals = {}
+            for row in rows:
+                name = by_id.get(row.get('product_id'), {}).get('name', 'Unknown')
+                totals[name] = totals.get(name, 0) + value(row)
+            return totals
+
+        categories = sorted({p.get('category') or 'Uncategorized' for p in products})
+        status_counts = {}
+        for order in orders:
+            status_counts[order['status']] = status_counts.get(order['status'], 0) + 1
+        return {
+            'total_products': len(products),
+            'total_orders_reservations': len(orders),
+            'status_counts': status_counts,
+            'kpi': {
+                'total_sales': sum(float(o.get('total_price') or 0) for o in sold),
+                'inventory_value': sum(float(p['price']) * (p.get('stock_quantity') or 0) for p in products),
+                'orders_today': sum(1 for o in orders if o['created_at'][:10] == today),
+                'pending_reservations': sum(1 for o in orders if o['order_type'] == 'reservation' and o['status'] == 'pending'),
+            },
+            'inventory_overview': {
+                'by_category': [{
+                    'category': category,
+                    'item_count': sum(p.get('stock_quantity') or 0 for p in products if (p.get('category') or 'Uncategorized') == category),
+                    'total_value': sum(float(p['price']) * (p.get('stock_quantity') or 0) for p in products
+                                       if (p.get('category') or 'Uncategorized') == category),
+                } for category in categories],
+                'most_stocked': top({p['name']: p.get('stock_quantity') or 0 for p in products}),
+                'highest_value': top({p['name']: float(p['price']) for p in products}),
+            },
+            'reservation_stats': {
+                'most_reserved': top(per_product([o for o in orders if o['order_type'] != 'order'], lambda o: o['quantity'])),
+            },
+            'sales_performance': {
+                'by_category': [{
+                    'category': category,
+                    'total_revenue': sum(float(o.get('total_price') or 0) for o in sold
+                                         if (by_id.get(o.get('product_id'), {}).get('category') or 'Uncategorized') == category),
+                } for category in categories],
+                'best_selling': top(per_product(sold, lambda o: o['quantity'])),
+                'highest_revenue': top(per_product(sold, lambda o: float(o.get('total_price') or 0))),
+            },
+        }
+
+    def rpc_buy_product(self, identity, p_product_id, p_user_id, p_quantity, p_deal_method=None,
+                        p_payment_method='Cash', p_payment_transaction_id=None):
+        product = self._product(p_product_id)
+        quantity = int(p_quantity)
+        if not product.get('is_available') or (product.get('stock_quantity') or 0) < quantity:
+            raise _pgrst_error(400, 'P0001', 'Not enough stock available.')
+        self._adjust_stock(product, -quantity)
+        self._insert_row('orders', {
+            'user_id': str(p_user_id), 'product_id': product['id'], 'quantity': quantity,
+            'total_price': float(product['price']) * quantity, 'order_type': 'order',
+            'payment_method': p_payment_method,
+        })
+        return [{'success': True, 'message': 'Order placed successfully!', 'new_stock_quantity': product['stock_quantity']}]
+
+    def rpc_create_reservation(self, identity, p_product_id, p_user_id, p_quantity, p_deal_method=None, p_is_urgent=False):
+        product = self._product(p_product_id)
+        quantity = int(p_quantity)
+        in_stock = (product.get('stock_quantity') or 0) >= quantity
+        if in_stock:
+            self._adjust_stock(product, -quantity)
+        self._insert_row('orders', {
+            'user_id': str(p_user_id), 'product_id': product['id'], 'quantity': quantity,
+            'total_price': float(product['price']) * quantity, 'is_urgent': bool(p_is_urgent),
+            'order_type': 'reservation' if in_stock else 'backorder',
+            'expires_at': _iso(_now() + timedelta(days=RESERVATION_HOLD_DAYS)) if in_stock else None,
+        })
+        message = 'Item reserved successfully!' if in_stock else 'Item is out of stock; you have been added to the backorder list.'
+        return [{'success': True, 'message': message, 'new_stock_quantity': product['stock_quantity']}]
+
+    def rpc_checkout_reservation(self, identity, p_order_id, p_user_id):
+        order = self._row('orders', id=int(p_order_id), user_id=str(p_user_id))
+        if order is None or order['order_type'] != 'reservation' or order['status'] not in ('pending', 'approved'):
+            raise _pgrst_error(400, 'P0001', 'Reservation not found or cannot be checked out.')
+        order.update({'order_type': 'order', 'status': 'pending', 'expires_at': None, 'updated_at': _iso()})
+        return [{'success': True, 'message': 'Reservation checked out successfully!'}]
+
+    def rpc_cancel_or_reject_order(self, identity, p_order_id, p_new_status):
+        order = self._row('orders', id=int(p_order_id))
+        if order is None:
+            raise _pgrst_error(400, 'P0001', 'Order not found.')
+        if order['status'] in ('pending', 'approved') and order['order_type'] != 'backorder':
+            product = self._row('products', id=order.get('product_id'))
+            if product:
+                self._adjust_stock(product, order['quantity'])
+        order.update({'status': p_new_status, 'updated_at': _iso()})
+        return None
+
+    def rpc_update_my_profile(self, identity, p_full_name=None, p_phone_number=None, p_address=None, p_avatar_url=None):
+        profile = self._row('user_profiles', user_id=identity[1])
+        if profile is None:
+            raise _pgrst_error(400, 'P0001', 'Profile not found.')
+        changes = {'full_name': p_full_name, 'phone_number': p_phone_number, 'address': p_address}
+        if p_avatar_url is not None:
+            changes['avatar_url'] = p_avatar_url
+        profile.update(changes)
+        return None
+
+    def _students(self):
+        return [p for p in self.tables['user_profiles'] if p.get('user_type') == 'student']
+
+    def rpc_get_student_stats(self, identity):
+        students = self._students()
+        return [{'total_students': len(students), 'blocked_students': sum(1 for s in students if s.get('is_blocked'))}]
+
+    def rpc_get_paginated_student_profiles(self, identity, p_search_term='', p_page_size=10, p_page_number=1):
+        term = (p_search_term or '').lower()
+        students = [
+            s for s in sorted(self._students(), key=lambda s: s['created_at'], reverse=True)
+            if term in ' '.join(str(s.get(k) or '') for k in ('full_name', 'email', 'student_id')).lower()
+        ]
+        start = (int(p_page_number) - 1) * int(p_page_size)
+        return [{**copy.deepcopy(s), 'total_count': len(students)} for s in students[start:start + int(p_page_size)]]
+
+    def rpc_admin_update_user_status(self, identity, p_user_id, p_is_blocked):
+        profile = self._row('user_profiles', user_id=str(p_user_id))
+        if profile is None:
+            raise _pgrst_error(400, 'P0001', 'User not found.')
+        profile['is_blocked'] = bool(p_is_blocked)
+        if str(p_user_id) in self.users:
+            self.users[str(p_user_id)]['user_metadata']['is_blocked'] = bool(p_is_blocked)
+        return None
+
+    def rpc_admin_delete_student(self, identity, p_user_id):
+        user_id = str(p_user_id)
+        self.users.pop(user_id, None)
+        for table in OWNED_TABLES:
+            self.tables[table] = [row for row in self.tables[table] if str(row.get('user_id')) != user_id]
+        return None
+
+    # --- GoTrue ------------------------------------------------------------------
+
+    def _user_json(self, user):
+        return {
+            'id': user['id'],
+            'aud': 'authenticated',
+            'role': 'authenticated',
+            'email': user['email'],
+            'email_confirmed_at': user['created_at'],
+            'confirmed_at': user['created_at'],
+            'phone': '',
+            'app_metadata': {'provider': 'email', 'providers': ['email']},
+            'user_metadata': copy.deepcopy(user['user_metadata']),
+            'identities': [],
+            'created_at': user['created_at'],
+            'updated_at': user['created_at'],
+        }
+
+    def _session(self, user):
+        if user is None:
+            raise _auth_error(400, 'invalid_credentials', 'Invalid login credentials')
+        issued = int(time.time())
+        session_id = str(uuid.uuid4())
+        access_token = jwt.encode({
+            'sub': user['id'], 'email': user['email'], 'role': 'authenticated', 'aud': 'authenticated',
+            'session_id': session_id, 'iat': issued, 'exp': issued + self.token_ttl,
+            'user_metadata': user['user_metadata'], 'app_metadata': {'provider': 'email'},
+        }, JWT_SECRET, algorithm='HS256')
+        refresh_token = jwt.encode({'sub': user['id'], 'session_id': session_id, 'typ': 'refresh', 'iat': issued},
+                                   JWT_SECRET, algorithm='HS256')
+        return {
+            'access_token': access_token,
+            'refresh_token': refresh_token,
+            'token_type': 'bearer',
+            'expires_in': self.token_ttl,
+            'expires_at': issued + self.token_ttl,
+            'user': self._user_json(user),
+        }
+
+    def _token_user(self, request):
+        token = request.headers.get('authorization', '').removeprefix('Bearer ').strip()
+        try:
+            claims = jwt.decode(token, JWT_SECRET, algorithms=['HS256'], audience='authenticated')
+        except jwt.InvalidTokenError:
+            raise _auth_error(403, 'bad_jwt', 'invalid JWT: unable to parse or verify signature, token is expired')
+        user = self.users.get(claims.get('sub'))
+        if user is None or claims.get('session_id') in self.revoked_sessions:
+            raise _auth_error(403, 'session_not_found', 'Session from session_id claim in JWT does not exist')
+        return user, claims
+
+    def _update_user(self, user, changes, metadata):
+        if changes.get('password'):
+            user['password'] = changes['password']
+        if changes.get('email'):
+            user['email'] = changes['email'].lower()
+        user['user_metadata'].update(metadata or {})
+
+    def _auth(self, request, path):
+        body = json.loads(request.content or b'{}') if request.method in ('POST', 'PUT') else {}
+
+        if path == 'token':
+            grant_type = request.url.params.get('grant_type')
+            if grant_type == 'password':
+                user = self.user_by_email(body.get('email', ''))
+                if user is None or user['password'] != body.get('password'):
+                    raise _auth_error(400, 'invalid_credentials', 'Invalid login credentials')
+                return 200, self._session(user), {}
+            if grant_type == 'refresh_token':
+                try:
+                    claims = jwt.decode(body.get('refresh_token', ''), JWT_SECRET, algorithms=['HS256'])
+                except jwt.InvalidTokenError:
+                    claims = {}
+                user = self.users.get(claims.get('sub'))
+                if claims.get('typ') != 'refresh' or user is None or claims.get('session_id') in self.revoked_sessions:
+                    raise _auth_error(400, 'refresh_token_not_found', 'Invalid Refresh Token: Refresh Token Not Found')
+                self.revoked_sessions.add(claims['session_id'])  # Refresh tokens are single use
+                return 200, self._session(user), {}
+            raise _auth_error(400, 'unsupported_grant_type', f'Unsupported grant type: {grant_type}')
+
+        if path == 'signup':
+            if self.user_by_email(body.get('email', '')):
+                raise _auth_error(422, 'user_already_exists', 'User already registered')
+            data = body.get('data') or {}
+            user = self.create_user(body['email'], body.get('password'), **data)
+            return 200, self._session(user), {}
+
+        if path == 'user':
+            user, _ = self._token_user(request)
+            if request.method == 'PUT':
+                self._update_user(user, body, body.get('data'))
+            return 200, self._user_json(user), {}
+
+        if path.startswith('admin/users/'):
+            if self._identity(request)[0] != 'service_role':
+                raise _auth_error(403, 'not_admin', 'User not allowed')
+            user = self.users.get(path.removeprefix('admin/users/'))
+            if user is None:
+                raise _auth_error(404, 'user_not_found', 'User not found')
+            if request.method == 'PUT':
+                self._update_user(user, body, body.get('user_metadata'))
+            return 200, self._user_json(user), {}
+
+        if path == 'logout':
+            try:
+                _, claims = self._token_user(request)
+                self.revoked_sessions.add(claims['session_id'])
+            except FakeError:
+                pass  # Logging out an expired session succeeds
+            return 204, None, {}
+
+        if path == 'otp':
+            if self.user_by_email(body.get('email', '')) is None and not body.get('create_user', True):
+                raise _auth_error(422, 'otp_disabled', 'Signups not allowed for otp')
+            return 200, {}, {}
+
+        if path == 'verify':
+            user = self.user_by_email(body.get('email', ''))
+            if user is None or body.get('token') != self.otp_code:
+                raise _auth_error(403, 'otp_expired', 'Token has expired or is invalid')
+            return 200, self._session(user), {}
+
+        raise _auth_error(404, 'not_found', f'No fake for /auth/v1/{path}')
+
+    # --- Storage -----------------------------------------------------------------
+
+    def _spool_body(self, request):
+        """The request body in a temporary file, copied chunk by chunk if the transport left it unread (uploads)."""
+        body = tempfile.TemporaryFile()
+        try:
+            body.write(request.content)
+        except httpx.RequestNotRead:
+            for chunk in request.stream:
+                body.write(chunk)
+        body.seek(0)
+        return body
+
+    def _upload_content(self, request):
+        """
+        Copies an upload's file (the multipart 'file' part, or the whole body)
+        into a spooled temporary file; returns (file, size, content type). The
+        body is searched through an mmap and copied in chunks, so large uploads
+        never sit in memory and memory tests measure the app, not the fake.
+        """
+        content_type = request.headers.get('content-type', 'application/octet-stream')
+        stored = tempfile.SpooledTemporaryFile(max_size=STORAGE_MEMORY_LIMIT)
+        with self._spool_body(request) as body:
+            if not content_type.startswith('multipart/form-data'):
+                shutil.copyfileobj(body, stored, UPLOAD_CHUNK_SIZE)
+                return stored, stored.tell(), content_type
+            boundary = re.search(r'boundary="?([^";]+)"?', content_type).group(1).encode()
+            delimiter = b'\r\n--' + boundary
+            if os.fstat(body.fileno()).st_size:
+                with mmap.mmap(body.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    position = data.find(delimiter[2:])
+                    while position != -1:
+                        headers_end = data.find(b'\r\n\r\n', position)
+                        if headers_end == -1:
+                            break
+                        part = BytesParser().parsebytes(data[data.find(b'\r\n', position) + 2:headers_end + 4])
+                        end = data.find(delimiter, headers_end + 4)
+                        if part.get_param('name', header='content-disposition') == 'file' and end != -1:
+                            for offset in range(headers_end + 4, end, UPLOAD_CHUNK_SIZE):
+                                stored.write(data[offset:min(offset + UPLOAD_CHUNK_SIZE, end)])
+                            return stored, stored.tell(), part.get_content_type()
+                        position = end + 2 if end != -1 else -1
+        stored.close()
+        raise FakeError(400, {'statusCode': '400', 'error': 'invalid_request', 'message': 'No file in the upload'})
+
+    def _upload(self, request, bucket, name):
+        objects = self.buckets.setdefault(bucket, {})
+        upsert = request.method == 'PUT' or request.headers.get('x-upsert', '').lower() == 'true'
+        if name in objects and not upsert:
+            raise FakeError(400, {'statusCode': '409', 'error': 'Duplicate', 'message': 'The resource already exists'})
+        content, size, content_type = self._upload_content(request)
+        now = _iso()
+        previous = objects.get(name)
+        if previous:
+            previous['content'].close()
+        objects[name] = {
+            'id': previous['id'] if previous else str(uuid.uuid4()),
+            'content': content,
+            'size': size,
+            'content_type': content_type,
+            'created_at': previous['created_at'] if previous else now,
+            'updated_at': now,
+        }
+        return 200, {'Key': f'{bucket}/{name}', 'Id': objects[name]['id']}, {}
+
+    def _read(self, stored):
+        stored['content'].seek(0)
+        return stored['content'].read()
+
+    def _entry(self, name, stored):
+        return {
+            'name': name,
+            'id': stored['id'],
+            'created_at': stored['created_at'],
+            'updated_at': stored['updated_at'],
+            'last_accessed_at': stored['updated_at'],
+            'metadata': {'size': stored['size'], 'mimetype': stored['content_type'],
+                         'cacheControl': 'max-age=3600', 'lastModified': stored['updated_at']},
+        }
+
+    def _list(self, bucket, options):
+        prefix = (options.get('prefix') or '').strip('/')
+        search = options.get('search') or ''
+        entries, folders = [], set()
+        for path, stored in self.buckets.get(bucket, {}).items():
+            if prefix and not path.startswith(prefix + '/'):
+                continue
+            rest = path[len(prefix) + 1:] if prefix else path
+            name, slash, _ = rest.partition('/')
+            if search and search.lower() not in name.lower():
+                continue
+            if slash:
+                if name not in folders:
+                    folders.add(name)
+                    entries.append({'name': name, 'id': None, 'created_at': None, 'updated_at': None,
+                                    'last_accessed_at': None, 'metadata': None})
+            else:
+                entries.append(self._entry(name, stored))
+        sort_by = options.get('sortBy') or {'column': 'name', 'order': 'asc'}
+        column = sort_by.get('column', 'name')
+        entries.sort(key=lambda entry: (entry.get(column) is None, entry.get(column) or ''),
+                     reverse=sort_by.get('order') == 'desc')
+        offset, limit = int(options.get('offset', 0)), int(options.get('limit', 100))
+        return entries[offset:offset + limit]
+
+    def _storage(self, request, path):
+        parts = path.split('/')
+        if parts[0] != 'object' or len(parts) < 2:
+            raise FakeError(404, {'statusCode': '404', 'error': 'not_found', 'message': f'No fake for /storage/v1/{path}'})
+        if parts[1] == 'list' and request.method == 'POST':
+            return 200, self._list(parts[2], json.loads(request.content or b'{}')), {}
+        if parts[1] in ('public', 'authenticated') and request.method == 'GET':
+            parts = parts[1:]
+        bucket, name = parts[1], unquote('/'.join(parts[2:]))
+        if request.method in ('POST', 'PUT') and name:
+            return self._upload(request, bucket, name)
+        if request.method == 'DELETE' and not name:
+            objects = self.buckets.get(bucket, {})
+            removed = []
+            for prefix in json.loads(request.content or b'{}').get('prefixes', []):
+                stored = objects.pop(prefix, None)
+                if stored:
+                    removed.append({**self._entry(prefix, stored), 'bucket_id': bucket})
+                    stored['content'].close()
+            return 200, removed, {}
+        if request.method == 'GET':
+            stored = self.buckets.get(bucket, {}).get(name)
+            if stored is None:
+                raise FakeError(400, {'statusCode': '404', 'error': 'not_found', 'message': 'Object not found'})
+            return 200, self._read(stored), {'content-type': stored['content_type']}
+        raise FakeError(405, {'statusCode': '405', 'error': 'method_not_allowed', 'message': request.method})
+
+
+def _initial_fake():
+    fake = FakeSupabase(latency=float(os.environ.get('SUPABASE_FAKE_LATENCY_MS', '0')) / 1000)
+    if os.environ.get('SUPABASE_FAKE_DATA'):
+        fake.load(os.environ['SUPABASE_FAKE_DATA'])
+    return fake
+
+
+fake_supabase = _initial_fake()
+
+_install_lock = threading.Lock()
+_installed = False
+
+
+def configure_environment():
+    """Points SUPABASE_URL and the keys at the fake (and turns on SUPABASE_FAKE); settings.py and supabase_client.py read them from the environment."""
+    os.environ['SUPABASE_FAKE'] = 'True'
+    os.environ['SUPABASE_URL'] = FAKE_URL
+    os.environ['SUPABASE_ANON_KEY'] = ANON_KEY
+    os.environ['SUPABASE_SERVICE_ROLE'] = SERVICE_KEY
+
+
+def install():
+    """
+    Routes httpx requests for FAKE_URL's host to `fake_supabase`.
+
+    Wraps the default sync and async transports' request handlers, below
+    Client.send, so connection pooling is bypassed but everything above it
+    (clients, auth headers, our call accounting) behaves as with the real
+    service. Requests to any other host go out as usual.
+    """
+    global _installed
+    configure_environment()
+    with _install_lock:
+        if _installed:
+            return
+        host = urlsplit(FAKE_URL).hostname
+        handle_request = httpx.HTTPTransport.handle_request
+        handle_async_request = httpx.AsyncHTTPTransport.handle_async_request
+
+        def fake_handle_request(self, request):
+            if request.url.host != host:
+                return handle_request(self, request)
+            if fake_supabase.latency:
+                time.sleep(fake_supabase.latency)
+            return fake_supabase.handle(request)
+
+        async def fake_handle_async_request(self, request):
+            if request.url.host != host:
+                return await handle_async_request(self, request)
+            await request.aread()
+            if fake_supabase.latency:
+                await asyncio.sleep(fake_supabase.latency)
+            return fake_supabase.handle(request)
+
+        httpx.HTTPTransport.handle_request = fake_handle_request
+        httpx.AsyncHTTPTransport.handle_async_request = fake_handle_async_request
+        _installed = True